@@ -2,7 +2,9 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
+from video_studio.pagination import ApproximateCountPaginator
 from .models import CandidateProfile, VideoViewLog, CVVideoSyncLog
+from .signals import notify_profiles_changed
 
 
 # 🔹 Filtre custom pour savoir si un candidat a une vidéo ou pas
@@ -168,18 +170,62 @@ class CandidateProfileAdmin(admin.ModelAdmin):
     actions = ['recalculate_completeness', 'approve_profiles']
 
     def recalculate_completeness(self, request, queryset):
-        for profile in queryset:
-            profile.calculate_profile_completeness()
+        updated = queryset.recalculate_completeness()
         self.message_user(
             request,
-            f"Complétude recalculée pour {queryset.count()} profil(s)."
+            f"Complétude recalculée pour {updated} profil(s)."
         )
     recalculate_completeness.short_description = "Recalculer la complétude"
 
     def approve_profiles(self, request, queryset):
+        profile_ids = list(queryset.values_list('pk', flat=True))
         updated = queryset.update(is_profile_public=True)
+        # update() ne déclenche pas les signaux
+        notify_profiles_changed(profile_ids)
         self.message_user(
             request,
             f"{updated} profil(s) rendu(s) public(s)."
         )
     approve_profiles.short_description = "Rendre les profils publics"
+
+
+@admin.register(VideoViewLog)
+class VideoViewLogAdmin(admin.ModelAdmin):
+    # Table volumineuse : total estimé au-delà du seuil
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+
+    list_display = [
+        'candidate_name',
+        'viewer_name',
+        'viewed_at',
+        'view_duration',
+        'completed_viewing',
+        'rating'
+    ]
+    list_filter = [
+        'viewed_at',
+        'completed_viewing',
+        'rating'
+    ]
+    search_fields = [
+        'candidate_profile__first_name',
+        'candidate_profile__last_name',
+        'viewer__username',
+        'viewer__email'
+    ]
+    readonly_fields = ['viewed_at']
+    raw_id_fields = ['video', 'viewer', 'candidate_profile']
+
+    def candidate_name(self, obj):
+        return obj.candidate_profile.full_name
+    candidate_name.short_description = 'Candidat'
+
+    def viewer_name(self, obj):
+        return obj.viewer.get_full_name() or obj.viewer.username
+    viewer_name.short_description = 'Recruteur'
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'candidate_profile', 'viewer'
+        )
@@ -0,0 +1,141 @@
+# backend/candidate/change_log.py
+"""
+Synchronisation incrémentale des clients recruteurs ("changements depuis le curseur")
+
+CandidateChangeLog est alimenté dans la transaction qui écrit les documents de
+recherche. Un client garde un curseur opaque (id de la dernière entrée lue,
+signé) et ne reçoit que les profils modifiés depuis : documents à jour pour
+les profils publics, tombstones pour les profils privés, supprimés ou (vue
+"avec vidéo") sans vidéo.
+
+La compaction supprime les entrées remplacées par une entrée plus récente du
+même profil : le journal reste borné par le nombre de profils, et tout curseur
+reste valide (la dernière entrée d'un profil est toujours après celles qu'elle
+remplace).
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Exists, Max, OuterRef
+from django.utils import timezone
+
+
+DEFAULT_CHANGE_LOG_CONFIG = {
+    'page_size': 500,
+    'max_page_size': 2000,
+    # Entrées trop récentes non servies : une transaction plus ancienne peut encore valider un id inférieur
+    'visibility_lag_seconds': 2,
+    'compaction_batch_size': 50_000,
+}
+
+CURSOR_SALT = 'candidate.change_log'
+
+
+def get_change_log_config():
+    """Configuration par défaut surchargée par settings.CANDIDATE_CHANGE_LOG"""
+    return {**DEFAULT_CHANGE_LOG_CONFIG, **getattr(settings, 'CANDIDATE_CHANGE_LOG', {})}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(last_id):
+    return signing.dumps(last_id, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(cursor):
+    """Id de la dernière entrée lue, 0 sans curseur (synchronisation complète)"""
+    if not cursor:
+        return 0
+    try:
+        last_id = signing.loads(cursor, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        raise InvalidCursor(cursor)
+    if not isinstance(last_id, int) or last_id < 0:
+        raise InvalidCursor(cursor)
+    return last_id
+
+
+def get_changes(cursor=None, limit=None, with_video_only=False):
+    """
+    Changements après le curseur : {'cursor', 'has_more', 'upserts', 'removed'}
+    upserts : documents sérialisés à jour ; removed : [{'id', 'reason'}]
+    Lève InvalidCursor pour un curseur altéré
+    """
+    from .models import CandidateChangeLog, CandidateSearchDocument
+    from .serializers import CandidateSearchDocumentSerializer
+
+    config = get_change_log_config()
+    limit = min(limit or config['page_size'], config['max_page_size'])
+    last_id = decode_cursor(cursor)
+    visible_before = timezone.now() - timedelta(seconds=config['visibility_lag_seconds'])
+
+    entries = list(
+        CandidateChangeLog.objects.filter(id__gt=last_id, created_at__lte=visible_before)
+        .order_by('id')
+        .values_list('id', 'profile_id', 'change_type')[:limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if entries:
+        last_id = entries[-1][0]
+
+    # Dernier changement de chaque profil de la page
+    latest = {}
+    for _, profile_id, change_type in entries:
+        latest.pop(profile_id, None)
+        latest[profile_id] = change_type
+    documents = CandidateSearchDocument.objects.select_related('presentation_video').in_bulk(list(latest))
+
+    upserts, removed = [], []
+    for profile_id, change_type in latest.items():
+        document = documents.get(profile_id)
+        if document is None:
+            # Document absent : privé ou supprimé depuis, quelle que soit l'entrée lue
+            reason = change_type if change_type in ('private', 'deleted') else 'private'
+            removed.append({'id': profile_id, 'reason': reason})
+        elif with_video_only and not document.has_presentation_video:
+            removed.append({'id': profile_id, 'reason': 'video_unlinked'})
+        else:
+            upserts.append(document)
+
+    return {
+        'cursor': encode_cursor(last_id),
+        'has_more': has_more,
+        'upserts': CandidateSearchDocumentSerializer(upserts, many=True).data,
+        'removed': removed,
+    }
+
+
+def latest_change():
+    """
+    Version des données publiques des profils : (id, date) de la dernière entrée, (0, None) sans entrée
+    Toute écriture d'un document de recherche ajoute une entrée ; la compaction garde la dernière
+    """
+    from .models import CandidateChangeLog
+
+    latest = CandidateChangeLog.objects.order_by('-id').values_list('id', 'created_at').first()
+    return latest or (0, None)
+
+
+def compact_change_log(batch_size=None):
+    """
+    Supprimer les entrées remplacées par une entrée plus récente du même profil
+    Parcours par tranches d'ids ; retourne le nombre d'entrées supprimées
+    """
+    from .models import CandidateChangeLog
+
+    batch_size = batch_size or get_change_log_config()['compaction_batch_size']
+    upper = CandidateChangeLog.objects.aggregate(upper=Max('id'))['upper'] or 0
+    newer = CandidateChangeLog.objects.filter(profile_id=OuterRef('profile_id'), id__gt=OuterRef('id'))
+
+    deleted = 0
+    for start in range(0, upper, batch_size):
+        # Aucune relation ni signal : un seul DELETE par tranche
+        count, _ = CandidateChangeLog.objects.filter(
+            id__gt=start, id__lte=start + batch_size
+        ).filter(Exists(newer)).delete()
+        deleted += count
+    return deleted
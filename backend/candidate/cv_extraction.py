@@ -0,0 +1,227 @@
+# backend/candidate/cv_extraction.py
+"""
+Extraction du texte des CV (PDF, DOCX, TXT) pour la recherche et le matching
+
+L'analyse des fichiers tourne dans un pool de processus (CPU, hors GIL du
+worker web). Une extraction lancée depuis une tâche d'arrière-plan n'attend pas
+son résultat : l'enregistrement est relancé dans le pool de threads partagé à
+la fin de l'analyse, qui n'est pas bloqué pendant ce temps. Chaque extraction est identifiée par l'empreinte SHA-256 du
+fichier : un CV ré-envoyé à l'identique n'est pas retraité.
+"""
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from xml.etree import ElementTree
+
+from django.conf import settings
+from django.utils import timezone
+
+from matching.text import fold, tokenize
+from video_studio.background import run_in_background
+
+
+logger = logging.getLogger('candidate')
+
+# Taille maximale du texte conservé (caractères)
+MAX_CV_TEXT_LENGTH = 100_000
+
+DEFAULT_SKILL_KEYWORDS = [
+    # Développement
+    'python', 'java', 'javascript', 'typescript', 'php', 'c++', 'c#', 'go', 'ruby', 'kotlin', 'swift',
+    'django', 'flask', 'spring', 'react', 'angular', 'vue', 'node', 'laravel', '.net',
+    'sql', 'postgresql', 'mysql', 'mongodb', 'redis', 'oracle',
+    'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'linux', 'git', 'devops',
+    # Données
+    'machine learning', 'deep learning', 'data science', 'power bi', 'tableau', 'excel',
+    'pandas', 'tensorflow', 'pytorch', 'spark', 'hadoop',
+    # Gestion et métiers
+    'gestion de projet', 'scrum', 'agile', 'comptabilite', 'audit', 'finance', 'marketing digital',
+    'communication', 'sap', 'autocad', 'solidworks', 'matlab',
+    # Langues
+    'anglais', 'francais', 'arabe', 'espagnol', 'allemand',
+]
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def get_skill_keywords():
+    return getattr(settings, 'CV_SKILL_KEYWORDS', DEFAULT_SKILL_KEYWORDS)
+
+
+def file_sha256(field_file, chunk_size=1024 * 1024):
+    """Empreinte du fichier lue par blocs"""
+    digest = hashlib.sha256()
+    with field_file.open('rb') as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _pdf_text(content):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        logger.warning("pypdf n'est pas installé : texte des CV PDF non extrait")
+        return ''
+    reader = PdfReader(io.BytesIO(content))
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+def _docx_text(content):
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        root = ElementTree.fromstring(archive.read('word/document.xml'))
+    paragraphs = []
+    for paragraph in root.iter(f'{WORD_NAMESPACE}p'):
+        paragraphs.append(''.join(node.text or '' for node in paragraph.iter(f'{WORD_NAMESPACE}t')))
+    return '\n'.join(paragraphs)
+
+
+def extract_text(content, filename):
+    """Texte brut d'un CV selon son extension (exécuté dans un processus du pool)"""
+    extension = os.path.splitext(filename)[1].lower()
+    try:
+        if extension == '.pdf':
+            return _pdf_text(content)
+        if extension == '.docx':
+            return _docx_text(content)
+        if extension == '.txt':
+            return content.decode('utf-8', errors='ignore')
+    except Exception:
+        logger.exception("Extraction impossible pour %s", filename)
+        return ''
+    logger.info("Format de CV non pris en charge : %s", filename)
+    return ''
+
+
+def normalize_text(text):
+    """Minuscules, sans accents, espaces compactés, longueur bornée"""
+    return WHITESPACE_RE.sub(' ', fold(text)).strip()[:MAX_CV_TEXT_LENGTH]
+
+
+def extract_skills(normalized_text):
+    """Compétences connues présentes dans le texte (expressions de plusieurs mots comprises)"""
+    tokens = tokenize(normalized_text)
+    padded = f" {' '.join(tokens)} "
+    raw = f" {normalized_text} "
+    skills = []
+    for keyword in get_skill_keywords():
+        folded = fold(keyword)
+        phrase = ' '.join(tokenize(folded))
+        # Mots-clés à symboles (c++, .net) cherchés dans le texte brut
+        if (phrase and phrase == folded and f' {phrase} ' in padded) or f' {folded} ' in raw:
+            skills.append(folded)
+    return skills
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool():
+    """Pool de processus partagé, créé à la première extraction"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn : pas de fork d'un processus web multithreadé
+            _pool = ProcessPoolExecutor(
+                max_workers=getattr(settings, 'CV_EXTRACTION_WORKERS', 2),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _pool
+
+
+def _read(field_file):
+    with field_file.open('rb') as handle:
+        return handle.read()
+
+
+def _store(profile, digest, text):
+    """Enregistrer le résultat si le fichier n'a pas changé entre-temps"""
+    from .models import CandidateProfile
+
+    if not CandidateProfile.objects.filter(pk=profile.pk, cv_file=profile.cv_file.name).exists():
+        return False
+    profile.cv_text = normalize_text(text)
+    profile.cv_skills = extract_skills(profile.cv_text)
+    profile.cv_sha256 = digest
+    profile.cv_extracted_at = timezone.now()
+    # Les signaux resynchronisent le document de recherche et le vecteur de termes
+    profile.save(update_fields=['cv_text', 'cv_skills', 'cv_sha256', 'cv_extracted_at', 'updated_at'])
+    return True
+
+
+def _clear(profile):
+    if profile.cv_text or profile.cv_skills or profile.cv_sha256:
+        profile.cv_text, profile.cv_skills, profile.cv_sha256 = '', [], ''
+        profile.cv_extracted_at = timezone.now()
+        profile.save(update_fields=['cv_text', 'cv_skills', 'cv_sha256', 'cv_extracted_at', 'updated_at'])
+
+
+def _extraction_done(profile, digest, future):
+    """
+    Fin d'une extraction (thread du pool de processus) : enregistrement dans
+    le pool de threads partagé, qui gère les connexions à la base
+    """
+    try:
+        text = future.result()
+    except Exception:
+        logger.exception("Échec de l'extraction du CV du profil %s", profile.pk)
+        return
+    run_in_background(_store, profile, digest, text)
+
+
+def process_profile_cv(profile_id, force=False):
+    """
+    Extraire le CV d'un profil (tâche d'arrière-plan)
+    Retourne 'submitted' (texte enregistré à la fin de l'analyse), 'skipped'
+    (même empreinte), 'cleared' ou 'missing'
+    """
+    from .models import CandidateProfile
+
+    try:
+        profile = CandidateProfile.objects.get(pk=profile_id)
+    except CandidateProfile.DoesNotExist:
+        return 'missing'
+    if not profile.cv_file:
+        _clear(profile)
+        return 'cleared'
+
+    digest = file_sha256(profile.cv_file)
+    if digest == profile.cv_sha256 and not force:
+        return 'skipped'
+
+    future = get_extraction_pool().submit(extract_text, _read(profile.cv_file), profile.cv_file.name)
+    future.add_done_callback(partial(_extraction_done, profile, digest))
+    return 'submitted'
+
+
+def process_profiles_cv(profiles, force=False, pool=None):
+    """
+    Extraire les CV de plusieurs profils en parallèle (backfill)
+    Retourne un dict de compteurs
+    """
+    pool = pool or get_extraction_pool()
+    stats = {'extracted': 0, 'skipped': 0, 'cleared': 0}
+    pending = []
+    for profile in profiles:
+        if not profile.cv_file:
+            _clear(profile)
+            stats['cleared'] += 1
+            continue
+        digest = file_sha256(profile.cv_file)
+        if digest == profile.cv_sha256 and not force:
+            stats['skipped'] += 1
+            continue
+        pending.append((profile, digest, pool.submit(extract_text, _read(profile.cv_file), profile.cv_file.name)))
+
+    for profile, digest, future in pending:
+        stats['extracted' if _store(profile, digest, future.result()) else 'skipped'] += 1
+    return stats
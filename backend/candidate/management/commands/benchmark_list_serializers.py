@@ -0,0 +1,97 @@
+import json
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from candidate.models import CandidateProfile
+from candidate.projections import candidate_list_records, project_candidate_list
+from candidate.serializers import CandidateProfileListSerializer
+from video_studio.renderers import ORJSONRenderer, orjson
+from videos.models import Video
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Comparer la liste des candidats par le serializer DRF et par la projection values_list + orjson "
+        "(profils synthétiques créés puis annulés)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10_000)
+        parser.add_argument('--repeat', type=int, default=3, help='Meilleur temps sur N passages')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson absent : rendu par le JSONRenderer de DRF"))
+
+        try:
+            with transaction.atomic():
+                self._create_candidates(rows)
+                queryset = CandidateProfile.objects.order_by('pk')
+                drf = self._measure(
+                    lambda: CandidateProfileListSerializer(
+                        queryset.select_related('user', 'presentation_video'), many=True
+                    ).data,
+                    JSONRenderer(), options['repeat'],
+                )
+                fast = self._measure(
+                    lambda: candidate_list_records(project_candidate_list(queryset)),
+                    ORJSONRenderer(), options['repeat'],
+                )
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        if json.loads(drf['payload']) != json.loads(fast['payload']):
+            raise CommandError("Les deux chemins ne produisent pas le même JSON")
+
+        for name, measure in (('DRF (serializer + JSONRenderer)', drf), ('Projection + orjson', fast)):
+            self.stdout.write(
+                f"{name} : lecture + sérialisation {measure['serialize']:.3f} s, rendu {measure['render']:.3f} s, "
+                f"{rows / (measure['serialize'] + measure['render']):,.0f} lignes/s"
+            )
+        speedup = (drf['serialize'] + drf['render']) / (fast['serialize'] + fast['render'])
+        self.stdout.write(self.style.SUCCESS(f"Sortie identique, gain x{speedup:.1f} sur {rows} lignes"))
+
+    def _measure(self, serialize, renderer, repeat):
+        best = {'serialize': float('inf'), 'render': float('inf')}
+        for _ in range(repeat):
+            started = time.perf_counter()
+            data = serialize()
+            serialized = time.perf_counter()
+            payload = renderer.render(data)
+            rendered = time.perf_counter()
+            best['serialize'] = min(best['serialize'], serialized - started)
+            best['render'] = min(best['render'], rendered - serialized)
+        best['payload'] = payload
+        return best
+
+    def _create_candidates(self, count):
+        """Profils en masse (bulk_create, sans signaux), une vidéo pour un profil sur deux"""
+        users = User.objects.bulk_create(
+            User(username=f'benchmark-list-{position}', email=f'candidat{position}@example.com')
+            for position in range(count)
+        )
+        videos = Video.objects.bulk_create(
+            Video(user=user, title='Présentation', video_file=f'videos/{user.pk}/presentation.mp4',
+                  is_approved=position % 4 != 1)
+            for position, user in enumerate(users) if position % 2
+        )
+        videos_by_user = {video.user_id: video for video in videos}
+        CandidateProfile.objects.bulk_create(
+            CandidateProfile(
+                user=user, first_name='Candidat', last_name=str(position), location='Casablanca',
+                university='Université Hassan II', major='Informatique', graduation_year=2020,
+                experience_years=position % 12, cv_skills=['python', 'django', 'sql'][:position % 4],
+                profile_completeness=position % 101, presentation_video=videos_by_user.get(user.pk),
+            )
+            for position, user in enumerate(users)
+        )
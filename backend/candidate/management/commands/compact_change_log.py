@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from candidate.change_log import compact_change_log
+
+
+class Command(BaseCommand):
+    help = (
+        "Compacter le journal des changements de profils (à planifier, ex. chaque nuit) : "
+        "seule la dernière entrée de chaque profil est conservée"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help="Taille des tranches d'ids parcourues"
+        )
+
+    def handle(self, *args, **options):
+        deleted = compact_change_log(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"{deleted} entrée(s) remplacée(s) supprimée(s)"))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from candidate.cv_extraction import get_extraction_pool, process_profiles_cv
+from candidate.models import CandidateProfile
+
+
+class Command(BaseCommand):
+    help = "Extraire le texte et les compétences des CV (backfill, fichiers inchangés ignorés)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Retraiter les CV même si leur empreinte est inchangée'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Nombre de profils traités par lot'
+        )
+
+    def handle(self, *args, **options):
+        # CV présents, ou texte extrait d'un CV depuis supprimé
+        queryset = CandidateProfile.objects.filter(
+            Q(cv_file__gt='') | ~Q(cv_sha256='')
+        ).order_by('pk')
+        pool = get_extraction_pool()
+        totals = {'extracted': 0, 'skipped': 0, 'cleared': 0}
+
+        last_pk = 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk)[:options['batch_size']])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            for key, count in process_profiles_cv(batch, force=options['force'], pool=pool).items():
+                totals[key] += count
+            self.stdout.write(f"  … profil {last_pk} : {totals['extracted']} extrait(s)")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals['extracted']} CV extrait(s), {totals['skipped']} inchangé(s), "
+            f"{totals['cleared']} effacé(s)"
+        ))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from candidate.search_documents import SYNC_BATCH_SIZE, rebuild_search_documents
+
+
+class Command(BaseCommand):
+    help = "Reconstruire la table CandidateSearchDocument à partir des profils candidats"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=SYNC_BATCH_SIZE,
+            help='Nombre de profils traités par lot'
+        )
+
+    def handle(self, *args, **options):
+        synced = rebuild_search_documents(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"{synced} profil(s) synchronisé(s)"))
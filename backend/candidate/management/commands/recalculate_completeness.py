@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min
+
+from candidate.models import CandidateProfile
+
+
+class Command(BaseCommand):
+    help = "Recalculer la complétude de tous les profils par UPDATE ensemblistes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=10000,
+            help='Largeur des plages de clés primaires traitées par UPDATE'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        bounds = CandidateProfile.objects.aggregate(first=Min('pk'), last=Max('pk'))
+        if bounds['first'] is None:
+            self.stdout.write("Aucun profil à traiter")
+            return
+
+        updated = 0
+        for start in range(bounds['first'], bounds['last'] + 1, chunk_size):
+            updated += CandidateProfile.objects.filter(
+                pk__gte=start,
+                pk__lt=start + chunk_size
+            ).recalculate_completeness()
+            if options['verbosity'] > 1:
+                self.stdout.write(f"  … {updated} profil(s) recalculé(s)")
+
+        self.stdout.write(self.style.SUCCESS(f"Complétude recalculée pour {updated} profil(s)"))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from candidate.models import CandidateProfile
+from candidate.ranking import RANK_BATCH_SIZE, refresh_rank_scores
+
+
+class Command(BaseCommand):
+    help = "Rafraîchir la décroissance des scores de classement (à planifier, ex. toutes les heures)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=RANK_BATCH_SIZE * 10,
+            help='Nombre de profils lus par itération'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        now = timezone.now()
+        refreshed = 0
+        last_pk = 0
+
+        # Même instant de référence pour toute la passe : ordre cohérent entre lots
+        while True:
+            batch = list(
+                CandidateProfile.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+            refreshed += refresh_rank_scores(batch, now=now)
+            last_pk = batch[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"{refreshed} score(s) de classement rafraîchi(s)"))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from candidate.models import CandidateProfile
+from candidate.payloads import RENDER_BATCH_SIZE, render_candidate_payloads
+
+
+class Command(BaseCommand):
+    help = "Pré-rendre le JSON (carte et détail) des profils publics (backfill, profils déjà rendus ignorés)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rendre à nouveau les profils déjà rendus'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=RENDER_BATCH_SIZE,
+            help='Nombre de profils rendus par lot'
+        )
+
+    def handle(self, *args, **options):
+        queryset = CandidateProfile.objects.filter(is_profile_public=True).order_by('pk')
+        if not options['force']:
+            queryset = queryset.filter(Q(payload__isnull=True) | Q(payload__card__isnull=True))
+
+        stored = 0
+        last_pk = 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk).values_list('pk', flat=True)[:options['batch_size']])
+            if not batch:
+                break
+            last_pk = batch[-1]
+            stored += render_candidate_payloads(batch, batch_size=options['batch_size'])
+            self.stdout.write(f"  … profil {last_pk} : {stored} rendu(s)")
+
+        self.stdout.write(self.style.SUCCESS(f"{stored} profil(s) pré-rendu(s)"))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.urls import get_resolver
+
+from video_studio.response_cache import get_metrics, reset_metrics
+
+
+class Command(BaseCommand):
+    help = (
+        "Hits / misses du cache des réponses par endpoint "
+        "(compteurs partagés par le cache configuré : Redis pour l'ensemble des processus web)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Remettre les compteurs à zéro après affichage')
+
+    def handle(self, *args, **options):
+        # Import des vues : endpoints déclarés par cached_response
+        get_resolver().url_patterns
+        metrics = get_metrics()
+        for name, counters in metrics.items():
+            hit_rate = '-' if counters['hit_rate'] is None else f"{counters['hit_rate']:.1%}"
+            self.stdout.write(
+                f"{name:<40} {counters['hits']:>8} hit(s) {counters['misses']:>8} miss(es)  {hit_rate}"
+            )
+        if options['reset']:
+            reset_metrics(list(metrics))
+            self.stdout.write(self.style.SUCCESS("Compteurs remis à zéro"))
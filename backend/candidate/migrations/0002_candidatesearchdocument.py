@@ -0,0 +1,97 @@
+# Generated by Django 5.0.8 on 2026-10-19 02:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_search_documents(apps, schema_editor):
+    """Remplir la table pour les profils publics existants"""
+    from django.core.files.storage import default_storage
+
+    CandidateProfile = apps.get_model('candidate', 'CandidateProfile')
+    CandidateSearchDocument = apps.get_model('candidate', 'CandidateSearchDocument')
+
+    profiles = CandidateProfile.objects.filter(
+        is_profile_public=True
+    ).select_related('user', 'presentation_video')
+
+    documents = []
+    for profile in profiles.iterator(chunk_size=500):
+        video = profile.presentation_video
+        documents.append(CandidateSearchDocument(
+            profile_id=profile.pk,
+            user_id=profile.user_id,
+            username=profile.user.username,
+            email=profile.user.email,
+            user_first_name=profile.user.first_name,
+            user_last_name=profile.user.last_name,
+            date_joined=profile.user.date_joined,
+            first_name=profile.first_name,
+            last_name=profile.last_name,
+            location=profile.location,
+            education_level=profile.education_level,
+            university=profile.university,
+            major=profile.major,
+            graduation_year=profile.graduation_year,
+            experience_years=profile.experience_years,
+            status=profile.status,
+            presentation_video_id=profile.presentation_video_id,
+            has_presentation_video=bool(video and video.is_approved),
+            video_url=default_storage.url(video.video_file.name) if video and video.video_file else None,
+            video_quality_score=profile.video_quality_score,
+            profile_completeness=profile.profile_completeness,
+            created_at=profile.created_at,
+            updated_at=profile.updated_at,
+        ))
+        if len(documents) >= 500:
+            CandidateSearchDocument.objects.bulk_create(documents)
+            documents = []
+    CandidateSearchDocument.objects.bulk_create(documents)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate', '0001_initial'),
+        ('videos', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateSearchDocument',
+            fields=[
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='candidate.candidateprofile')),
+                ('username', models.CharField(max_length=150)),
+                ('email', models.EmailField(blank=True, max_length=254)),
+                ('user_first_name', models.CharField(blank=True, max_length=150)),
+                ('user_last_name', models.CharField(blank=True, max_length=150)),
+                ('date_joined', models.DateTimeField()),
+                ('first_name', models.CharField(max_length=100)),
+                ('last_name', models.CharField(max_length=100)),
+                ('location', models.CharField(blank=True, max_length=200)),
+                ('education_level', models.CharField(blank=True, max_length=100)),
+                ('university', models.CharField(blank=True, max_length=200)),
+                ('major', models.CharField(blank=True, max_length=200)),
+                ('graduation_year', models.IntegerField(blank=True, null=True)),
+                ('experience_years', models.IntegerField(default=0)),
+                ('status', models.CharField(choices=[('active', 'Recherche active'), ('passive', 'Recherche passive'), ('not_available', 'Non disponible')], max_length=20)),
+                ('has_presentation_video', models.BooleanField(default=False)),
+                ('video_url', models.CharField(blank=True, max_length=500, null=True)),
+                ('video_quality_score', models.IntegerField(default=0)),
+                ('profile_completeness', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('presentation_video', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='videos.video')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Document de recherche candidat',
+                'verbose_name_plural': 'Documents de recherche candidats',
+                'ordering': ['-updated_at'],
+                'indexes': [models.Index(fields=['created_at'], name='candidate_c_created_9a4e07_idx'), models.Index(fields=['updated_at'], name='candidate_c_updated_eefb19_idx'), models.Index(fields=['profile_completeness'], name='candidate_c_profile_f100f1_idx'), models.Index(fields=['video_quality_score'], name='candidate_c_video_q_175e87_idx'), models.Index(fields=['first_name'], name='candidate_c_first_n_802b0c_idx'), models.Index(fields=['last_name'], name='candidate_c_last_na_b298a8_idx'), models.Index(fields=['status', '-updated_at'], name='candidate_c_status_7f3d69_idx'), models.Index(fields=['has_presentation_video', '-updated_at'], name='candidate_c_has_pre_e76b3d_idx')],
+            },
+        ),
+        migrations.RunPython(populate_search_documents, migrations.RunPython.noop),
+    ]
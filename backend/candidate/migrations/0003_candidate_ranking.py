@@ -0,0 +1,40 @@
+# Generated by Django 5.0.8 on 2026-10-19 02:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate', '0002_candidatesearchdocument'),
+        ('videos', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='engagement_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='engagement_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='rank_score',
+            field=models.FloatField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='candidatesearchdocument',
+            name='rank_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='candidatesearchdocument',
+            index=models.Index(fields=['rank_score'], name='candidate_c_rank_sc_2bb1b5_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.8 on 2026-10-19 02:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate', '0003_candidate_ranking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='cv_extracted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='cv_sha256',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='cv_skills',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='cv_text',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='candidatesearchdocument',
+            name='cv_skills',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='candidatesearchdocument',
+            name='cv_text',
+            field=models.TextField(blank=True),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.8 on 2026-10-19 02:58
+
+from django.db import migrations, models
+
+
+def seed_change_log(apps, schema_editor):
+    """Une entrée 'upsert' par document existant : un curseur vide synchronise tout"""
+    CandidateChangeLog = apps.get_model('candidate', 'CandidateChangeLog')
+    CandidateSearchDocument = apps.get_model('candidate', 'CandidateSearchDocument')
+
+    profile_ids = list(CandidateSearchDocument.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(profile_ids), 5000):
+        CandidateChangeLog.objects.bulk_create([
+            CandidateChangeLog(profile_id=profile_id, change_type='upsert')
+            for profile_id in profile_ids[start:start + 5000]
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate', '0005_profile_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateChangeLog',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('profile_id', models.IntegerField()),
+                ('change_type', models.CharField(choices=[('upsert', 'Profil public créé ou modifié'), ('video_unlinked', 'Vidéo de présentation retirée'), ('private', 'Profil rendu privé'), ('deleted', 'Profil supprimé')], max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Changement de profil',
+                'verbose_name_plural': 'Journal des changements de profils',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['profile_id', 'id'], name='candidate_c_profile_d47a87_idx')],
+            },
+        ),
+        migrations.RunPython(seed_change_log, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.8 on 2026-10-19 03:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate', '0006_change_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidatePayload',
+            fields=[
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='payload', serialize=False, to='candidate.candidateprofile')),
+                ('generation', models.PositiveIntegerField(default=0)),
+                ('card', models.BinaryField(null=True)),
+                ('detail', models.BinaryField(null=True)),
+                ('rendered_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'JSON pré-rendu candidat',
+                'verbose_name_plural': 'JSON pré-rendus candidats',
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_rank_scores(apps, schema_editor):
+    """Score de classement des profils créés avant 0003 (restés à 0), recopié dans les documents"""
+    from candidate.ranking import RANK_BATCH_SIZE, RANK_INPUT_FIELDS, compute_rank, get_ranking_config
+    from django.utils import timezone
+
+    CandidateProfile = apps.get_model('candidate', 'CandidateProfile')
+    CandidateSearchDocument = apps.get_model('candidate', 'CandidateSearchDocument')
+
+    config = get_ranking_config()
+    now = timezone.now()
+    profile_ids = list(CandidateProfile.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(profile_ids), RANK_BATCH_SIZE):
+        batch = profile_ids[start:start + RANK_BATCH_SIZE]
+        CandidateProfile.objects.bulk_update([
+            CandidateProfile(pk=pk, rank_score=compute_rank(*inputs, now=now, config=config))
+            for pk, *inputs in CandidateProfile.objects.filter(pk__in=batch).values_list(*RANK_INPUT_FIELDS)
+        ], ['rank_score'])
+        CandidateSearchDocument.objects.filter(profile_id__in=batch).update(rank_score=Subquery(
+            CandidateProfile.objects.filter(pk=OuterRef('profile_id')).values('rank_score')[:1]
+        ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate', '0007_candidate_payloads'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rank_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.8 on 2026-10-19 03:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate', '0008_backfill_rank_scores'),
+        ('videos', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidatesearchdocument',
+            name='indexed_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='candidatesearchdocument',
+            index=models.Index(fields=['indexed_at'], name='candidate_c_indexed_dfd66c_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def create_cv_text_trigram_index(apps, schema_editor):
+    """
+    Index GIN trigramme sur le texte du CV des documents (LIKE '%…%' indexé)
+    PostgreSQL uniquement ; hors de Meta.indexes pour que les autres bases migrent
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS candidate_document_cv_text_trgm '
+        'ON candidate_candidatesearchdocument USING gin (cv_text gin_trgm_ops)'
+    )
+
+
+def drop_cv_text_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS candidate_document_cv_text_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate', '0009_search_document_indexed_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cv_text_trigram_index, drop_cv_text_trigram_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.8 on 2026-10-19 03:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate', '0010_search_document_cv_text_trigram'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='candidatechangelog',
+            name='profile_id',
+            field=models.BigIntegerField(),
+        ),
+    ]
@@ -3,6 +3,83 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models import Case, Exists, OuterRef, Q, Value, When
+from django.db.models.functions import Least
+
+from videos.models import Video
+from .ranking import compute_profile_rank
+
+
+# Barème de complétude : points par critère, sur COMPLETENESS_TOTAL_POINTS
+COMPLETENESS_TOTAL_POINTS = 10
+COMPLETENESS_BATCH_SIZE = 1000
+
+# Écrits uniquement par candidate.ranking.record_engagement
+ENGAGEMENT_FIELDS = ('engagement_score', 'engagement_updated_at')
+
+
+def _completeness_points(condition, points):
+    return Case(When(condition, then=Value(points)), default=Value(0))
+
+
+def profile_completeness_expression():
+    """
+    Complétude du profil sous forme d'expression SQL
+    Colonnes du profil + sous-requêtes corrélées sur User et Video,
+    utilisable dans un UPDATE ensembliste (pas de jointure)
+    """
+    points = (
+        _completeness_points(~Q(first_name=''), 2) +
+        _completeness_points(~Q(last_name=''), 2) +
+        _completeness_points(
+            Exists(User.objects.filter(pk=OuterRef('user_id')).exclude(email='')), 1
+        ) +
+        _completeness_points(~Q(phone=''), 1) +
+        _completeness_points(~Q(education_level=''), 1) +
+        _completeness_points(~Q(university=''), 1) +
+        _completeness_points(Q(cv_file__isnull=False) & ~Q(cv_file=''), 2) +
+        _completeness_points(
+            Exists(Video.objects.filter(pk=OuterRef('presentation_video_id'), is_approved=True)), 2
+        )
+    )
+    return Least(Value(100), points * Value(100 // COMPLETENESS_TOTAL_POINTS))
+
+
+class CandidateProfileQuerySet(models.QuerySet):
+    """QuerySet des profils candidats"""
+    
+    def with_completeness(self):
+        """Annoter la complétude calculée en SQL"""
+        return self.annotate(computed_completeness=profile_completeness_expression())
+    
+    def recalculate_completeness(self):
+        """
+        Recalculer la complétude avec un UPDATE par lot de profils
+        Seuls les profils dont la valeur change sont écrits ; update() ne déclenche
+        pas post_save : leurs documents, JSON pré-rendu et cache des réponses sont
+        invalidés comme pour une sauvegarde
+        """
+        from .ranking import refresh_rank_scores
+        from .signals import notify_profiles_changed
+        
+        profile_ids = list(self.values_list('pk', flat=True))
+        updated = 0
+        for start in range(0, len(profile_ids), COMPLETENESS_BATCH_SIZE):
+            changed = list(
+                self.model.objects.filter(pk__in=profile_ids[start:start + COMPLETENESS_BATCH_SIZE])
+                .exclude(profile_completeness=profile_completeness_expression())
+                .values_list('pk', flat=True)
+            )
+            if not changed:
+                continue
+            updated += self.model.objects.filter(pk__in=changed).update(
+                profile_completeness=profile_completeness_expression()
+            )
+            # La complétude entre dans le score de classement
+            refresh_rank_scores(changed)
+            notify_profiles_changed(changed)
+        return updated
+
 
 class CandidateProfile(models.Model):
     """Profil candidat avec intégration vidéo"""
@@ -33,6 +110,11 @@ class CandidateProfile(models.Model):
     # CV et documents
     cv_file = models.FileField(upload_to='cvs/', null=True, blank=True)
     cv_last_updated = models.DateTimeField(null=True, blank=True)
+    # Contenu extrait du CV (voir candidate.cv_extraction)
+    cv_text = models.TextField(blank=True)  # Texte normalisé (minuscules, sans accents)
+    cv_skills = models.JSONField(default=list, blank=True)
+    cv_sha256 = models.CharField(max_length=64, blank=True)  # Empreinte du fichier extrait
+    cv_extracted_at = models.DateTimeField(null=True, blank=True)
     portfolio_url = models.URLField(blank=True)
     linkedin_url = models.URLField(blank=True)
     
@@ -60,9 +142,16 @@ class CandidateProfile(models.Model):
     
     # Métadonnées
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     profile_completeness = models.IntegerField(default=0)  # Pourcentage de complétude
     
+    # Classement composite (voir candidate.ranking)
+    engagement_score = models.FloatField(default=0)  # Compteur décroissant, valeur à engagement_updated_at
+    engagement_updated_at = models.DateTimeField(null=True, blank=True)
+    rank_score = models.FloatField(default=0, db_index=True)
+    
+    objects = CandidateProfileQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Profil candidat'
         verbose_name_plural = 'Profils candidats'
@@ -71,6 +160,34 @@ class CandidateProfile(models.Model):
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.user.email})"
     
+    def save(self, *args, **kwargs):
+        """
+        Recalculer le score de classement à chaque sauvegarde
+        L'engagement n'est écrit que par record_engagement (update()) : celui de
+        l'instance peut être périmé, il est relu en base et jamais réécrit ici
+        """
+        update_fields = kwargs.get('update_fields')
+        if not self._state.adding and not kwargs.get('force_insert'):
+            current = CandidateProfile.objects.filter(pk=self.pk).values_list(
+                *ENGAGEMENT_FIELDS
+            ).first()
+            if current is not None:
+                self.engagement_score, self.engagement_updated_at = current
+                if update_fields is None:
+                    excluded = {*ENGAGEMENT_FIELDS, *self.get_deferred_fields()}
+                    update_fields = [
+                        field.name for field in self._meta.concrete_fields
+                        if not field.primary_key and field.attname not in excluded
+                    ]
+        if update_fields is None or 'updated_at' in update_fields:
+            # auto_now : updated_at prendra la valeur courante
+            self.rank_score = compute_profile_rank(self, updated_at=timezone.now())
+        else:
+            self.rank_score = compute_profile_rank(self)
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'rank_score'} - set(ENGAGEMENT_FIELDS)
+        super().save(*args, **kwargs)
+    
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
@@ -91,15 +208,18 @@ class CandidateProfile(models.Model):
         self.video_last_updated = timezone.now()
         self.video_linked_at = timezone.now()
         self.video_quality_score = video.overall_quality_score
-        self.save()
         
-        # Mettre à jour le score de complétude
-        self.calculate_profile_completeness()
+        # Mettre à jour le score de complétude (une seule sauvegarde)
+        self.calculate_profile_completeness(commit=False)
+        self.save()
     
-    def calculate_profile_completeness(self):
-        """Calculer le pourcentage de complétude du profil"""
+    def calculate_profile_completeness(self, commit=True):
+        """
+        Calculer le pourcentage de complétude du profil
+        Même barème que profile_completeness_expression() ; avec commit=False
+        la sauvegarde est laissée à l'appelant
+        """
         score = 0
-        total_fields = 10
         
         # Champs obligatoires (20 points chacun)
         if self.first_name: score += 2
@@ -115,12 +235,124 @@ class CandidateProfile(models.Model):
         # Vidéo de présentation (20 points)
         if self.has_presentation_video: score += 2
         
-        self.profile_completeness = min(100, int((score / total_fields) * 100))
-        self.save(update_fields=['profile_completeness'])
+        self.profile_completeness = min(100, score * 100 // COMPLETENESS_TOTAL_POINTS)
+        if commit:
+            self.save(update_fields=['profile_completeness'])
         
         return self.profile_completeness
 
 
+class CandidateSearchDocument(models.Model):
+    """
+    Document de recherche dénormalisé (un par profil public)
+    Maintenu par candidate.signals, lu par les endpoints recruteur sans jointure
+    """
+    
+    profile = models.OneToOneField(
+        CandidateProfile,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='search_document'
+    )
+    
+    # Utilisateur (copie de UserBasicSerializer)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    username = models.CharField(max_length=150)
+    email = models.EmailField(blank=True)
+    user_first_name = models.CharField(max_length=150, blank=True)
+    user_last_name = models.CharField(max_length=150, blank=True)
+    date_joined = models.DateTimeField()
+    
+    # Champs d'affichage de CandidateProfileListSerializer
+    first_name = models.CharField(max_length=100)
+    last_name = models.CharField(max_length=100)
+    location = models.CharField(max_length=200, blank=True)
+    education_level = models.CharField(max_length=100, blank=True)
+    university = models.CharField(max_length=200, blank=True)
+    major = models.CharField(max_length=200, blank=True)
+    graduation_year = models.IntegerField(null=True, blank=True)
+    experience_years = models.IntegerField(default=0)
+    status = models.CharField(max_length=20, choices=CandidateProfile.STATUS_CHOICES)
+    
+    # Contenu du CV (recherche plein texte et compétences)
+    # Index GIN trigramme sur PostgreSQL (migration 0010)
+    cv_text = models.TextField(blank=True)
+    cv_skills = models.JSONField(default=list, blank=True)
+    
+    # Vidéo précalculée
+    presentation_video = models.ForeignKey(
+        'videos.Video',
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='+'
+    )
+    has_presentation_video = models.BooleanField(default=False)
+    video_url = models.CharField(max_length=500, null=True, blank=True)
+    
+    # Scores triables
+    video_quality_score = models.IntegerField(default=0)
+    profile_completeness = models.IntegerField(default=0)
+    rank_score = models.FloatField(default=0)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    # Dernière écriture du document (profil, utilisateur, vidéo, scores recopiés) :
+    # curseur des index en mémoire, updated_at n'étant que la copie de celui du profil
+    indexed_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Document de recherche candidat'
+        verbose_name_plural = 'Documents de recherche candidats'
+        ordering = ['-updated_at']
+        indexes = [
+            # Un index par tri autorisé dans les recherches recruteur
+            models.Index(fields=['created_at']),
+            models.Index(fields=['updated_at']),
+            models.Index(fields=['profile_completeness']),
+            models.Index(fields=['video_quality_score']),
+            models.Index(fields=['rank_score']),
+            models.Index(fields=['first_name']),
+            models.Index(fields=['last_name']),
+            models.Index(fields=['status', '-updated_at']),
+            models.Index(fields=['has_presentation_video', '-updated_at']),
+            models.Index(fields=['indexed_at']),
+        ]
+    
+    def __str__(self):
+        return f"Document - {self.full_name}"
+    
+    @property
+    def full_name(self):
+        return f"{self.first_name} {self.last_name}"
+
+
+class CandidatePayload(models.Model):
+    """
+    JSON pré-rendu d'un profil public (voir candidate.payloads)
+    Carte (CandidateProfileListSerializer) et détail (CandidateProfileDetailSerializer),
+    recopiés tels quels dans les réponses ; generation est incrémenté à chaque
+    invalidation pour écarter un rendu commencé avant
+    """
+    
+    profile = models.OneToOneField(
+        CandidateProfile,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='payload'
+    )
+    generation = models.PositiveIntegerField(default=0)
+    card = models.BinaryField(null=True)
+    detail = models.BinaryField(null=True)
+    rendered_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = 'JSON pré-rendu candidat'
+        verbose_name_plural = 'JSON pré-rendus candidats'
+    
+    def __str__(self):
+        return f"JSON pré-rendu - profil {self.profile_id} (génération {self.generation})"
+
+
 class VideoViewLog(models.Model):
     """Log des consultations de vidéos par les recruteurs"""
     
@@ -153,6 +385,38 @@ class VideoViewLog(models.Model):
         return f"{self.viewer.username} - {self.candidate_profile.full_name} - {self.viewed_at}"
 
 
+class CandidateChangeLog(models.Model):
+    """
+    Journal append-only des changements visibles par les recruteurs (voir candidate.change_log)
+    L'id sert de curseur de synchronisation ; la compaction ne garde que
+    la dernière entrée de chaque profil
+    """
+    
+    CHANGE_TYPES = [
+        ('upsert', 'Profil public créé ou modifié'),
+        ('video_unlinked', 'Vidéo de présentation retirée'),
+        ('private', 'Profil rendu privé'),
+        ('deleted', 'Profil supprimé'),
+    ]
+    
+    id = models.BigAutoField(primary_key=True)
+    # Pas de clé étrangère : l'entrée survit à la suppression du profil
+    profile_id = models.BigIntegerField()
+    change_type = models.CharField(max_length=20, choices=CHANGE_TYPES)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Changement de profil'
+        verbose_name_plural = 'Journal des changements de profils'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['profile_id', 'id']),
+        ]
+    
+    def __str__(self):
+        return f"#{self.id} {self.change_type} - profil {self.profile_id}"
+
+
 class CVVideoSyncLog(models.Model):
     """Log des synchronisations entre CV et vidéo"""
     
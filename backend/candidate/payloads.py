@@ -0,0 +1,159 @@
+# backend/candidate/payloads.py
+"""
+JSON pré-rendu des profils publics (carte et détail)
+
+Chaque profil public est rendu une fois (CandidateProfileListSerializer et
+CandidateProfileDetailSerializer, ORJSONRenderer) et stocké en octets dans
+CandidatePayload ; les endpoints recopient ces fragments dans leurs réponses
+(RawJSON) au lieu de resérialiser.
+
+Invalidation dans la transaction qui modifie les données (profil, utilisateur,
+vidéo liée via la synchronisation des documents de recherche ; tests qualité,
+session d'enregistrement et analytics via candidate.signals), nouveau rendu en
+arrière-plan après le commit. Un rendu ne s'enregistre que si aucune
+invalidation n'est intervenue depuis sa lecture (generation inchangée).
+Fragments manquants à la lecture : rendus en arrière-plan, au plus un rendu
+en attente par profil, profils publics (avec document de recherche) seulement.
+"""
+import threading
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery
+from django.utils import timezone
+
+from video_studio.background import run_after_commit, run_in_background
+from video_studio.renderers import ORJSONRenderer, RawJSON
+
+
+RENDER_BATCH_SIZE = 200
+# Profils manquants rendus en arrière-plan par lecture (les suivants le seront aux lectures suivantes)
+MAX_READ_RENDERS = RENDER_BATCH_SIZE
+
+PAYLOAD_KINDS = ('card', 'detail')
+
+
+def invalidate_payloads(profile_ids, render=True):
+    """
+    Écarter les JSON stockés des profils (à appeler dans la transaction de la modification)
+    render : nouveau rendu en arrière-plan après le commit
+    """
+    from .models import CandidatePayload
+
+    profile_ids = sorted(set(profile_ids))
+    if not profile_ids:
+        return
+    CandidatePayload.objects.filter(profile_id__in=profile_ids).update(
+        generation=F('generation') + 1, card=None, detail=None, rendered_at=None
+    )
+    if render:
+        run_after_commit(render_candidate_payloads, profile_ids)
+
+
+def delete_payloads(profile_ids):
+    """Profils devenus privés : plus de JSON stocké"""
+    from .models import CandidatePayload
+
+    CandidatePayload.objects.filter(profile_id__in=list(profile_ids)).delete()
+
+
+def render_candidate_payloads(profile_ids, batch_size=RENDER_BATCH_SIZE):
+    """Rendre et stocker la carte et le détail des profils publics donnés, retourne le nombre stocké"""
+    stored = 0
+    profile_ids = sorted(set(profile_ids))
+    for start in range(0, len(profile_ids), batch_size):
+        stored += _render_batch(profile_ids[start:start + batch_size])
+    return stored
+
+
+def _render_batch(profile_ids):
+    from video_studio.fieldsets import eager_loading
+    from .models import CandidatePayload, CandidateProfile
+    from .serializers import CandidateProfileDetailSerializer, CandidateProfileListSerializer
+
+    # Profils sans JSON stocké (privés, supprimés)
+    public_ids = list(
+        CandidateProfile.objects.filter(pk__in=profile_ids, is_profile_public=True).values_list('pk', flat=True)
+    )
+    delete_payloads(set(profile_ids) - set(public_ids))
+
+    # Générations lues avant les données : une invalidation ultérieure écarte ce rendu
+    CandidatePayload.objects.bulk_create(
+        [CandidatePayload(profile_id=profile_id) for profile_id in public_ids], ignore_conflicts=True
+    )
+    generations = dict(
+        CandidatePayload.objects.filter(profile_id__in=public_ids).values_list('profile_id', 'generation')
+    )
+
+    detail_serializer = CandidateProfileDetailSerializer(many=True)
+    profiles = list(eager_loading(
+        detail_serializer, CandidateProfile.objects.filter(pk__in=public_ids, is_profile_public=True)
+    ))
+    renderer = ORJSONRenderer()
+    cards = CandidateProfileListSerializer(profiles, many=True).data
+    detail_serializer.instance = profiles
+    details = detail_serializer.data
+
+    rendered_at = timezone.now()
+    stored = 0
+    with transaction.atomic():
+        for profile, card, detail in zip(profiles, cards, details):
+            stored += CandidatePayload.objects.filter(
+                profile_id=profile.pk, generation=generations[profile.pk]
+            ).update(card=renderer.render(card), detail=renderer.render(detail), rendered_at=rendered_at)
+    return stored
+
+
+def payload_version(profile_id):
+    """
+    Version du JSON stocké d'un profil : (generation, rendered_at), None s'il n'est pas rendu
+    Sert de validateur HTTP sans lire les fragments
+    """
+    from .models import CandidatePayload
+
+    return CandidatePayload.objects.filter(
+        profile_id=profile_id, rendered_at__isnull=False
+    ).values_list('generation', 'rendered_at').first()
+
+
+_pending_renders = set()
+_pending_lock = threading.Lock()
+
+
+def _render_pending(profile_ids):
+    try:
+        return render_candidate_payloads(profile_ids)
+    finally:
+        with _pending_lock:
+            _pending_renders.difference_update(profile_ids)
+
+
+def schedule_renders(profile_ids):
+    """Rendre en arrière-plan les profils sans rendu déjà en attente (au plus MAX_READ_RENDERS)"""
+    with _pending_lock:
+        profile_ids = [profile_id for profile_id in profile_ids if profile_id not in _pending_renders]
+        profile_ids = profile_ids[:MAX_READ_RENDERS]
+        _pending_renders.update(profile_ids)
+    if profile_ids:
+        run_in_background(_render_pending, profile_ids)
+
+
+def get_payloads(profile_ids, kind):
+    """
+    Fragments stockés {profile_id: RawJSON} ('card' ou 'detail')
+    Les profils sans fragment sont absents du résultat ; ceux qui ont un document
+    de recherche (publics) sont rendus en arrière-plan. Une seule requête
+    """
+    from .models import CandidatePayload, CandidateSearchDocument
+
+    if kind not in PAYLOAD_KINDS:
+        raise ValueError(kind)
+    profile_ids = list(profile_ids)
+    stored = dict(CandidateSearchDocument.objects.filter(pk__in=profile_ids).values_list(
+        'pk', Subquery(CandidatePayload.objects.filter(profile_id=OuterRef('pk')).values(kind)[:1])
+    ))
+    payloads = {profile_id: RawJSON(payload) for profile_id, payload in stored.items() if payload is not None}
+    # Dans l'ordre demandé : les premiers résultats affichés sont rendus d'abord
+    missing = [profile_id for profile_id in profile_ids if profile_id in stored and profile_id not in payloads]
+    if missing:
+        schedule_renders(missing)
+    return payloads
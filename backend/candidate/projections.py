@@ -0,0 +1,89 @@
+# backend/candidate/projections.py
+"""
+Lecture rapide des listes de candidats
+
+Même format que CandidateProfileListSerializer, sans instancier de modèles
+ni de serializers : une projection values_list() des seules colonnes utiles
+(utilisateur et vidéo par jointure), puis des dicts construits en une passe.
+Les champs dérivés (full_name, has_presentation_video, video_url) sont
+calculés à partir des colonnes du tuple, les dates formatées comme par
+DateTimeField avec le fuseau courant lu une seule fois.
+"""
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from videos.models import Video
+
+
+LIST_COLUMNS = (
+    'id', 'user_id', 'user__username', 'user__email', 'user__first_name', 'user__last_name',
+    'user__date_joined', 'first_name', 'last_name', 'location', 'education_level', 'university',
+    'major', 'graduation_year', 'experience_years', 'cv_skills', 'status', 'profile_completeness',
+    'presentation_video__is_approved', 'presentation_video__video_file', 'video_quality_score',
+    'created_at', 'updated_at',
+)
+
+
+def datetime_formatter():
+    """Équivalent de DateTimeField().to_representation pour une série de valeurs"""
+    if api_settings.DATETIME_FORMAT != ISO_8601:
+        return serializers.DateTimeField().to_representation
+    current_timezone = timezone.get_current_timezone() if settings.USE_TZ else None
+
+    def format_datetime(value):
+        if not value:
+            return None
+        if current_timezone is not None and timezone.is_aware(value):
+            value = value.astimezone(current_timezone)
+        value = value.isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return format_datetime
+
+
+def project_candidate_list(queryset):
+    """Tuples de LIST_COLUMNS (jointures et préchargements du queryset ignorés)"""
+    return queryset.select_related(None).prefetch_related(None).values_list(*LIST_COLUMNS)
+
+
+def candidate_list_records(rows):
+    """Dicts au format de CandidateProfileListSerializer à partir des tuples projetés"""
+    format_datetime = datetime_formatter()
+    video_url = Video._meta.get_field('video_file').storage.url
+
+    records = []
+    for (
+        pk, user_id, username, email, user_first_name, user_last_name, date_joined,
+        first_name, last_name, location, education_level, university, major, graduation_year,
+        experience_years, cv_skills, status, profile_completeness, video_approved, video_file,
+        video_quality_score, created_at, updated_at,
+    ) in rows:
+        records.append({
+            'id': pk,
+            'user': {
+                'id': user_id,
+                'username': username,
+                'email': email,
+                'first_name': user_first_name,
+                'last_name': user_last_name,
+                'date_joined': format_datetime(date_joined),
+            },
+            'full_name': f"{first_name} {last_name}",
+            'location': location,
+            'education_level': education_level,
+            'university': university,
+            'major': major,
+            'graduation_year': graduation_year,
+            'experience_years': experience_years,
+            'cv_skills': cv_skills,
+            'status': status,
+            'profile_completeness': profile_completeness,
+            # Vidéo absente : colonnes de la jointure à None
+            'has_presentation_video': bool(video_approved),
+            'video_url': video_url(video_file) if video_file else None,
+            'video_quality_score': video_quality_score,
+            'created_at': format_datetime(created_at),
+            'updated_at': format_datetime(updated_at),
+        })
+    return records
@@ -0,0 +1,160 @@
+# backend/candidate/ranking.py
+"""
+Score de classement composite des profils candidats
+Mélange qualité vidéo, complétude, récence, statut et engagement recruteur (avec décroissance)
+"""
+import math
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+
+DEFAULT_RANKING_CONFIG = {
+    # Poids relatifs des composantes (normalisés à la somme)
+    'weights': {
+        'video_quality': 0.30,
+        'completeness': 0.25,
+        'recency': 0.15,
+        'status': 0.10,
+        'engagement': 0.20,
+    },
+    'status_scores': {
+        'active': 1.0,
+        'passive': 0.5,
+        'not_available': 0.0,
+    },
+    # Demi-vies en jours
+    'recency_half_life_days': 30,
+    'engagement_half_life_days': 14,
+    # Engagement pour lequel la composante atteint 50 %
+    'engagement_saturation': 10.0,
+    # Poids des événements d'engagement
+    'event_weights': {
+        'video_view': 1.0,
+        'video_view_completed': 2.0,
+        'favorite_added': 3.0,
+    },
+}
+
+RANK_BATCH_SIZE = 2000
+
+
+def get_ranking_config():
+    """Configuration par défaut surchargée par settings.CANDIDATE_RANKING"""
+    overrides = getattr(settings, 'CANDIDATE_RANKING', {})
+    config = {**DEFAULT_RANKING_CONFIG, **overrides}
+    for key in ('weights', 'status_scores', 'event_weights'):
+        config[key] = {**DEFAULT_RANKING_CONFIG[key], **overrides.get(key, {})}
+    return config
+
+
+def decay(value, since, now, half_life_days):
+    """Décroissance exponentielle d'une valeur mesurée à `since`"""
+    if not value or since is None:
+        return value or 0.0
+    elapsed_days = max(0.0, (now - since).total_seconds() / 86400)
+    return value * math.pow(2.0, -elapsed_days / half_life_days)
+
+
+def compute_rank(video_quality_score, profile_completeness, updated_at, status,
+                 engagement_score, engagement_updated_at, now=None, config=None):
+    """Score composite entre 0 et 100"""
+    config = config or get_ranking_config()
+    now = now or timezone.now()
+    weights = config['weights']
+
+    engagement = decay(
+        engagement_score, engagement_updated_at, now, config['engagement_half_life_days']
+    )
+    components = {
+        'video_quality': (video_quality_score or 0) / 100,
+        'completeness': (profile_completeness or 0) / 100,
+        'recency': decay(1.0, updated_at, now, config['recency_half_life_days']) if updated_at else 0.0,
+        'status': config['status_scores'].get(status, 0.0),
+        'engagement': engagement / (engagement + config['engagement_saturation']),
+    }
+
+    total_weight = sum(weights.values()) or 1.0
+    score = sum(weights[name] * value for name, value in components.items())
+    return round(100 * score / total_weight, 4)
+
+
+def compute_profile_rank(profile, now=None, config=None, updated_at=None):
+    """Score composite d'une instance CandidateProfile"""
+    return compute_rank(
+        profile.video_quality_score,
+        profile.profile_completeness,
+        updated_at or profile.updated_at,
+        profile.status,
+        profile.engagement_score,
+        profile.engagement_updated_at,
+        now=now,
+        config=config,
+    )
+
+
+RANK_INPUT_FIELDS = [
+    'pk', 'video_quality_score', 'profile_completeness', 'updated_at', 'status',
+    'engagement_score', 'engagement_updated_at',
+]
+
+
+def refresh_rank_scores(profile_ids, now=None):
+    """
+    Recalculer le score des profils donnés (rafraîchissement de la décroissance)
+    Lecture des seules colonnes utiles puis bulk_update par lot
+    """
+    from .models import CandidateProfile
+    from .search_documents import refresh_document_fields
+
+    config = get_ranking_config()
+    now = now or timezone.now()
+    profile_ids = list(profile_ids)
+    updated = 0
+
+    for start in range(0, len(profile_ids), RANK_BATCH_SIZE):
+        batch = profile_ids[start:start + RANK_BATCH_SIZE]
+        profiles = [
+            CandidateProfile(pk=pk, rank_score=compute_rank(*inputs, now=now, config=config))
+            for pk, *inputs in CandidateProfile.objects.filter(pk__in=batch).values_list(*RANK_INPUT_FIELDS)
+        ]
+        updated += CandidateProfile.objects.bulk_update(profiles, ['rank_score'])
+        # Dérive du score seule : pas d'entrée au journal de synchronisation des clients
+        refresh_document_fields(batch, ['rank_score'], log_changes=False)
+
+    return updated
+
+
+def record_engagement(profile_id, event, at=None):
+    """
+    Ajouter un événement d'engagement en O(1) : score·2^(−Δt/demi-vie) + poids
+    Le score composite du profil est recalculé dans la foulée
+    """
+    from .models import CandidateProfile
+    from .search_documents import refresh_document_fields
+
+    config = get_ranking_config()
+    weight = config['event_weights'].get(event, 0.0)
+    if not weight:
+        return None
+
+    now = at or timezone.now()
+    with transaction.atomic():
+        profile = CandidateProfile.objects.select_for_update().only(*RANK_INPUT_FIELDS[1:]).get(pk=profile_id)
+        profile.engagement_score = decay(
+            profile.engagement_score, profile.engagement_updated_at, now,
+            config['engagement_half_life_days']
+        ) + weight
+        profile.engagement_updated_at = now
+        profile.rank_score = compute_profile_rank(profile, now=now, config=config)
+
+        # update() : ni updated_at ni signaux, seul le score change
+        CandidateProfile.objects.filter(pk=profile_id).update(
+            engagement_score=profile.engagement_score,
+            engagement_updated_at=now,
+            rank_score=profile.rank_score,
+        )
+        refresh_document_fields([profile_id], ['rank_score'], log_changes=False)
+
+    return profile.rank_score
@@ -0,0 +1,195 @@
+# backend/candidate/search_documents.py
+"""
+Maintenance du modèle de lecture CandidateSearchDocument
+Les documents sont recalculés par lots de profils, jamais ligne par ligne
+"""
+import threading
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from .models import CandidateChangeLog, CandidateProfile, CandidateSearchDocument
+from .payloads import delete_payloads, invalidate_payloads
+
+
+SYNC_BATCH_SIZE = 500
+
+DOCUMENT_UPDATE_FIELDS = [
+    'user', 'username', 'email', 'user_first_name', 'user_last_name', 'date_joined',
+    'first_name', 'last_name', 'location', 'education_level', 'university', 'major',
+    'graduation_year', 'experience_years', 'status', 'cv_text', 'cv_skills', 'presentation_video',
+    'has_presentation_video', 'video_url', 'video_quality_score',
+    'profile_completeness', 'rank_score', 'created_at', 'updated_at', 'indexed_at',
+]
+
+
+def build_search_document(profile):
+    """Construire le document d'un profil (user et vidéo déjà chargés)"""
+    user = profile.user
+    return CandidateSearchDocument(
+        profile_id=profile.pk,
+        user_id=user.pk,
+        username=user.username,
+        email=user.email,
+        user_first_name=user.first_name,
+        user_last_name=user.last_name,
+        date_joined=user.date_joined,
+        first_name=profile.first_name,
+        last_name=profile.last_name,
+        location=profile.location,
+        education_level=profile.education_level,
+        university=profile.university,
+        major=profile.major,
+        graduation_year=profile.graduation_year,
+        experience_years=profile.experience_years,
+        status=profile.status,
+        cv_text=profile.cv_text,
+        cv_skills=profile.cv_skills,
+        presentation_video_id=profile.presentation_video_id,
+        has_presentation_video=profile.has_presentation_video,
+        video_url=profile.video_url,
+        video_quality_score=profile.video_quality_score,
+        profile_completeness=profile.profile_completeness,
+        rank_score=profile.rank_score,
+        created_at=profile.created_at,
+        updated_at=profile.updated_at,
+    )
+
+
+def sync_search_documents(profile_ids):
+    """
+    Recalculer les documents des profils donnés
+    Upsert pour les profils publics, suppression pour les autres
+    """
+    profile_ids = list(set(profile_ids))
+    for start in range(0, len(profile_ids), SYNC_BATCH_SIZE):
+        _sync_batch(profile_ids[start:start + SYNC_BATCH_SIZE])
+
+
+def _sync_batch(profile_ids):
+    profiles = CandidateProfile.objects.filter(
+        pk__in=profile_ids,
+        is_profile_public=True
+    ).select_related('user', 'presentation_video')
+
+    documents = [build_search_document(profile) for profile in profiles]
+    public_ids = {document.profile_id for document in documents}
+
+    with transaction.atomic():
+        # Vidéo des documents existants : détecter les vidéos retirées
+        previous_videos = dict(
+            CandidateSearchDocument.objects.filter(profile_id__in=profile_ids)
+            .values_list('profile_id', 'presentation_video_id')
+        )
+        removed_ids = [pk for pk in previous_videos if pk not in public_ids]
+        CandidateSearchDocument.objects.filter(profile_id__in=removed_ids).delete()
+
+        if documents:
+            CandidateSearchDocument.objects.bulk_create(
+                documents,
+                update_conflicts=True,
+                unique_fields=['profile'],
+                update_fields=DOCUMENT_UPDATE_FIELDS,
+            )
+
+        changes = [CandidateChangeLog(profile_id=pk, change_type='private') for pk in removed_ids]
+        changes.extend(
+            CandidateChangeLog(
+                profile_id=document.profile_id,
+                change_type=(
+                    'video_unlinked'
+                    if previous_videos.get(document.profile_id) and document.presentation_video_id is None
+                    else 'upsert'
+                ),
+            )
+            for document in documents
+        )
+        CandidateChangeLog.objects.bulk_create(changes)
+
+        # JSON pré-rendu : écarté dans la transaction, rendu à nouveau après le commit
+        delete_payloads(removed_ids)
+        invalidate_payloads(public_ids)
+
+
+def refresh_document_fields(profile_ids, fields, log_changes=True):
+    """
+    Recopier des colonnes du profil vers les documents existants
+    Un seul UPDATE avec sous-requêtes corrélées, sans charger les lignes
+    log_changes : journaliser les documents modifiés pour la synchronisation des clients
+    et avancer indexed_at (curseur des index de similarité et des flux) ; False pour
+    une dérive de score seule, reprise par les reconstructions complètes
+    """
+    profiles = CandidateProfile.objects.filter(pk=OuterRef('profile_id'))
+    values = {field: Subquery(profiles.values(field)[:1]) for field in fields}
+    if log_changes:
+        values['indexed_at'] = timezone.now()
+    with transaction.atomic():
+        updated = CandidateSearchDocument.objects.filter(profile_id__in=profile_ids).update(**values)
+        if log_changes and updated:
+            CandidateChangeLog.objects.bulk_create(
+                CandidateChangeLog(profile_id=profile_id, change_type='upsert')
+                for profile_id in CandidateSearchDocument.objects.filter(
+                    profile_id__in=profile_ids
+                ).values_list('profile_id', flat=True)
+            )
+    return updated
+
+
+def rebuild_search_documents(batch_size=SYNC_BATCH_SIZE):
+    """Reconstruire toute la table par lots de clés primaires"""
+    synced = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            CandidateProfile.objects.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not batch:
+            break
+        _sync_batch(batch)
+        synced += len(batch)
+        last_pk = batch[-1]
+
+    # Documents orphelins (profils supprimés hors signaux)
+    with transaction.atomic():
+        orphan_ids = list(CandidateSearchDocument.objects.exclude(
+            profile_id__in=CandidateProfile.objects.values('pk')
+        ).values_list('profile_id', flat=True))
+        CandidateSearchDocument.objects.filter(profile_id__in=orphan_ids).delete()
+        CandidateChangeLog.objects.bulk_create(
+            CandidateChangeLog(profile_id=profile_id, change_type='deleted') for profile_id in orphan_ids
+        )
+    return synced
+
+
+# Regroupement des événements de changement par transaction
+_pending = threading.local()
+
+
+def schedule_search_document_sync(profile_ids):
+    """
+    Planifier la resynchronisation après le commit de la transaction courante
+    Plusieurs événements dans une même transaction donnent un seul lot
+    """
+    profile_ids = [pk for pk in profile_ids if pk is not None]
+    if not profile_ids:
+        return
+
+    connection = transaction.get_connection()
+    pending = getattr(_pending, 'profile_ids', None)
+    # Après un rollback, le callback a disparu de la file : en réenregistrer un
+    registered = any(entry[1] is _flush_pending for entry in connection.run_on_commit)
+    if pending is None or not registered:
+        pending = _pending.profile_ids = set()
+        pending.update(profile_ids)
+        transaction.on_commit(_flush_pending)
+        return
+    pending.update(profile_ids)
+
+
+def _flush_pending():
+    profile_ids = getattr(_pending, 'profile_ids', None) or set()
+    _pending.profile_ids = None
+    sync_search_documents(profile_ids)
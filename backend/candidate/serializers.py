@@ -1,7 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.utils import timezone
-from .models import CandidateProfile, VideoViewLog, CVVideoSyncLog
+from video_studio.background import run_after_commit
+from video_studio.fieldsets import SparseFieldsetMixin
+from .cv_extraction import process_profile_cv
+from .models import CandidateProfile, CandidateSearchDocument, VideoViewLog, CVVideoSyncLog
 from videos.serializers import VideoDetailSerializer
 
 
@@ -12,24 +15,50 @@ class UserBasicSerializer(serializers.ModelSerializer):
         fields = ['id', 'username', 'email', 'first_name', 'last_name', 'date_joined']
 
 
-class CandidateProfileListSerializer(serializers.ModelSerializer):
+class CandidateProfileListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer pour la liste des profils candidats (vue recruteur)"""
     user = UserBasicSerializer(read_only=True)
     full_name = serializers.ReadOnlyField()
     has_presentation_video = serializers.ReadOnlyField()
     video_url = serializers.ReadOnlyField()
     
+    field_relations = {'has_presentation_video': 'presentation_video', 'video_url': 'presentation_video'}
+    
     class Meta:
         model = CandidateProfile
         fields = [
             'id', 'user', 'full_name', 'location', 'education_level',
             'university', 'major', 'graduation_year', 'experience_years',
-            'status', 'profile_completeness', 'has_presentation_video',
+            'cv_skills', 'status', 'profile_completeness', 'has_presentation_video',
             'video_url', 'video_quality_score', 'created_at', 'updated_at'
         ]
 
 
-class CandidateProfileDetailSerializer(serializers.ModelSerializer):
+class CandidateSearchDocumentSerializer(serializers.ModelSerializer):
+    """
+    Serializer des documents de recherche (vue recruteur)
+    Même format que CandidateProfileListSerializer, sans jointure
+    """
+    id = serializers.ReadOnlyField(source='profile_id')
+    user = serializers.SerializerMethodField()
+    full_name = serializers.ReadOnlyField()
+    
+    class Meta:
+        model = CandidateSearchDocument
+        fields = CandidateProfileListSerializer.Meta.fields
+    
+    def get_user(self, obj):
+        return {
+            'id': obj.user_id,
+            'username': obj.username,
+            'email': obj.email,
+            'first_name': obj.user_first_name,
+            'last_name': obj.user_last_name,
+            'date_joined': serializers.DateTimeField().to_representation(obj.date_joined),
+        }
+
+
+class CandidateProfileDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer détaillé pour un profil candidat"""
     user = UserBasicSerializer(read_only=True)
     presentation_video = VideoDetailSerializer(read_only=True)
@@ -37,13 +66,15 @@ class CandidateProfileDetailSerializer(serializers.ModelSerializer):
     has_presentation_video = serializers.ReadOnlyField()
     video_url = serializers.ReadOnlyField()
     
+    field_relations = CandidateProfileListSerializer.field_relations
+    
     class Meta:
         model = CandidateProfile
         fields = [
             'id', 'user', 'full_name', 'first_name', 'last_name', 'phone',
             'location', 'birth_date', 'education_level', 'university', 'major',
             'graduation_year', 'experience_years', 'cv_file', 'cv_last_updated',
-            'portfolio_url', 'linkedin_url', 'presentation_video', 'video_last_updated',
+            'cv_skills', 'portfolio_url', 'linkedin_url', 'presentation_video', 'video_last_updated',
             'video_quality_score', 'video_linked_at', 'status', 'is_profile_public',
             'accepts_offers', 'preferred_salary_min', 'preferred_salary_max',
             'created_at', 'updated_at', 'profile_completeness',
@@ -65,16 +96,28 @@ class CandidateProfileUpdateSerializer(serializers.ModelSerializer):
             'preferred_salary_min', 'preferred_salary_max'
         ]
     
+    def create(self, validated_data):
+        instance = super().create(validated_data)
+        if instance.cv_file:
+            run_after_commit(process_profile_cv, instance.pk)
+        return instance
+    
     def update(self, instance, validated_data):
         # Détecter si le CV a été mis à jour
         cv_updated = 'cv_file' in validated_data and validated_data['cv_file'] != instance.cv_file
         
-        instance = super().update(instance, validated_data)
+        serializers.raise_errors_on_nested_writes('update', self, validated_data)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
         
         if cv_updated:
             instance.cv_last_updated = timezone.now()
-            instance.save()
-            
+        
+        # Recalculer la complétude avant l'unique sauvegarde
+        instance.calculate_profile_completeness(commit=False)
+        instance.save()
+        
+        if cv_updated:
             # Créer un log de synchronisation CV-Vidéo
             CVVideoSyncLog.objects.create(
                 candidate_profile=instance,
@@ -82,9 +125,8 @@ class CandidateProfileUpdateSerializer(serializers.ModelSerializer):
                 sync_needed=instance.has_presentation_video,
                 notes='CV mis à jour, synchronisation vidéo recommandée'
             )
-            
-            # Recalculer la complétude du profil
-            instance.calculate_profile_completeness()
+            # Extraction du texte hors requête (ignorée si le fichier est identique)
+            run_after_commit(process_profile_cv, instance.pk)
         
         return instance
 
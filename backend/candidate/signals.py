@@ -0,0 +1,184 @@
+# backend/candidate/signals.py
+"""
+Signaux de l'app candidate
+Propagent les changements de CandidateProfile, User et Video vers les documents de recherche,
+ceux des tests qualité, sessions et analytics vers le JSON pré-rendu des profils,
+les événements d'engagement vers le score de classement,
+et tous ces changements vers les générations du cache des réponses
+"""
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+
+from video_studio.response_cache import (
+    PUBLIC_POOL, bump_generations, profile_scope, recruiter_scope, video_scope,
+)
+from videos.models import QualityCheck, RecordingSession, Video, VideoAnalytics
+from .models import CandidateChangeLog, CandidateProfile, CVVideoSyncLog, VideoViewLog
+from .payloads import invalidate_payloads
+from .ranking import record_engagement
+from .search_documents import schedule_search_document_sync
+
+
+# Champs User modifiés à chaque connexion, sans effet sur les documents
+IGNORED_USER_FIELDS = {'last_login', 'password'}
+
+# Profils modifiés par update() ou bulk_update (argument profile_ids) : modèles dérivés des autres apps
+profiles_changed = Signal()
+
+
+def notify_profiles_changed(profile_ids):
+    """
+    Équivalent de post_save pour les profils modifiés par update() ou bulk_update
+    Document de recherche, journal de synchronisation, JSON pré-rendu et cache des réponses,
+    puis profiles_changed (vecteurs de termes du matching)
+    """
+    profile_ids = list(profile_ids)
+    if not profile_ids:
+        return
+    schedule_search_document_sync(profile_ids)
+    bump_generations([profile_scope(profile_id) for profile_id in profile_ids] + [PUBLIC_POOL])
+    profiles_changed.send(sender=CandidateProfile, profile_ids=profile_ids)
+
+
+@receiver(post_save, sender=CandidateProfile)
+def sync_profile_document(sender, instance, raw=False, **kwargs):
+    """Profil créé ou modifié"""
+    if raw:
+        return
+    schedule_search_document_sync([instance.pk])
+
+
+@receiver(post_delete, sender=CandidateProfile)
+def log_deleted_profile(sender, instance, **kwargs):
+    """Profil supprimé (le document part en cascade) : tombstone pour les clients synchronisés"""
+    CandidateChangeLog.objects.create(profile_id=instance.pk, change_type='deleted')
+
+
+@receiver(post_save, sender=User)
+def sync_user_documents(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Email ou nom de l'utilisateur modifié"""
+    if raw or created:
+        return
+    if update_fields and set(update_fields) <= IGNORED_USER_FIELDS:
+        return
+    schedule_search_document_sync(
+        CandidateProfile.objects.filter(user_id=instance.pk).values_list('pk', flat=True)
+    )
+
+
+@receiver(post_save, sender=Video)
+def sync_video_documents(sender, instance, created, raw=False, **kwargs):
+    """Approbation, fichier ou score de la vidéo modifié"""
+    if raw or created:
+        return
+    schedule_search_document_sync(
+        CandidateProfile.objects.filter(presentation_video_id=instance.pk).values_list('pk', flat=True)
+    )
+
+
+@receiver(pre_delete, sender=Video)
+def sync_deleted_video_documents(sender, instance, **kwargs):
+    """Vidéo supprimée : le SET_NULL du profil ne déclenche aucun post_save"""
+    schedule_search_document_sync(
+        list(CandidateProfile.objects.filter(presentation_video_id=instance.pk).values_list('pk', flat=True))
+    )
+
+
+@receiver(post_save, sender=QualityCheck)
+@receiver(post_delete, sender=QualityCheck)
+@receiver(post_save, sender=RecordingSession)
+@receiver(post_delete, sender=RecordingSession)
+@receiver(post_save, sender=VideoAnalytics)
+@receiver(post_delete, sender=VideoAnalytics)
+def invalidate_video_detail_payloads(sender, instance, raw=False, **kwargs):
+    """Données du détail de la vidéo liée (hors document de recherche) modifiées"""
+    if raw:
+        return
+    invalidate_payloads(
+        CandidateProfile.objects.filter(
+            presentation_video_id=instance.video_id, is_profile_public=True
+        ).values_list('pk', flat=True)
+    )
+
+
+@receiver(post_save, sender=VideoViewLog)
+def record_video_view_engagement(sender, instance, created, raw=False, **kwargs):
+    """Consultation vidéo : engagement du candidat (score de classement)"""
+    if raw or not created:
+        return
+    event = 'video_view_completed' if instance.completed_viewing else 'video_view'
+    record_engagement(instance.candidate_profile_id, event, at=instance.viewed_at)
+
+
+# Cache des réponses (voir video_studio/response_cache.py)
+
+def _linked_profile_scopes(video_id):
+    return [
+        profile_scope(profile_id)
+        for profile_id in CandidateProfile.objects.filter(presentation_video_id=video_id).values_list('pk', flat=True)
+    ]
+
+
+@receiver(post_save, sender=CandidateProfile)
+@receiver(post_delete, sender=CandidateProfile)
+def bump_profile_generations(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bump_generations([profile_scope(instance.pk), PUBLIC_POOL])
+
+
+@receiver(post_save, sender=User)
+def bump_user_generations(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Email et nom affichés dans les profils"""
+    if raw or created:
+        return
+    if update_fields and set(update_fields) <= IGNORED_USER_FIELDS:
+        return
+    profile_ids = list(CandidateProfile.objects.filter(user_id=instance.pk).values_list('pk', flat=True))
+    if profile_ids:
+        bump_generations([profile_scope(profile_id) for profile_id in profile_ids] + [PUBLIC_POOL])
+
+
+@receiver(post_save, sender=Video)
+@receiver(pre_delete, sender=Video)
+def bump_video_generations(sender, instance, raw=False, **kwargs):
+    """pre_delete : profils liés lus avant le SET_NULL"""
+    if raw:
+        return
+    bump_generations([video_scope(instance.pk), PUBLIC_POOL] + _linked_profile_scopes(instance.pk))
+
+
+@receiver(post_save, sender=QualityCheck)
+@receiver(post_delete, sender=QualityCheck)
+@receiver(post_save, sender=RecordingSession)
+@receiver(post_delete, sender=RecordingSession)
+@receiver(post_save, sender=VideoAnalytics)
+@receiver(post_delete, sender=VideoAnalytics)
+def bump_video_detail_generations(sender, instance, raw=False, **kwargs):
+    """Données du détail de la vidéo (sans effet sur les listes)"""
+    if raw:
+        return
+    bump_generations([video_scope(instance.video_id)] + _linked_profile_scopes(instance.video_id))
+
+
+@receiver(post_save, sender=VideoViewLog)
+@receiver(post_delete, sender=VideoViewLog)
+def bump_view_generations(sender, instance, raw=False, **kwargs):
+    """Statistiques de consultation du candidat, de la vidéo et du recruteur"""
+    if raw:
+        return
+    bump_generations([
+        profile_scope(instance.candidate_profile_id),
+        video_scope(instance.video_id),
+        recruiter_scope(instance.viewer_id),
+    ])
+
+
+@receiver(post_save, sender=CVVideoSyncLog)
+@receiver(post_delete, sender=CVVideoSyncLog)
+def bump_sync_log_generations(sender, instance, raw=False, **kwargs):
+    """Synchronisation CV / vidéo en attente (dashboard candidat)"""
+    if raw:
+        return
+    bump_generations([profile_scope(instance.candidate_profile_id)])
@@ -0,0 +1,217 @@
+import tempfile
+from concurrent.futures import Future
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from video_studio.response_cache import get_generations, profile_scope
+from . import payloads
+from .cv_extraction import process_profile_cv
+from .models import CandidateChangeLog, CandidatePayload, CandidateProfile, CandidateSearchDocument
+from .ranking import record_engagement, refresh_rank_scores
+from .search_documents import refresh_document_fields, sync_search_documents
+
+
+class RecalculateCompletenessTests(TestCase):
+    def setUp(self):
+        # Rendu des JSON en arrière-plan désactivé : les tests vérifient l'invalidation
+        patcher = mock.patch('candidate.payloads.run_after_commit')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        user = User.objects.create(username='candidat', email='candidat@example.com')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile = CandidateProfile.objects.create(user=user, first_name='Salma', last_name='Idrissi')
+        CandidatePayload.objects.create(profile=self.profile, card=b'{}', detail=b'{}')
+
+    def test_invalidates_like_a_save(self):
+        CandidateProfile.objects.filter(pk=self.profile.pk).update(profile_completeness=0)
+        scope = profile_scope(self.profile.pk)
+        generation = get_generations([scope])[scope]
+        last_change = CandidateChangeLog.objects.order_by('-pk').values_list('pk', flat=True).first()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            updated = CandidateProfile.objects.filter(pk=self.profile.pk).recalculate_completeness()
+
+        self.assertEqual(updated, 1)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.profile_completeness, 50)
+        document = CandidateSearchDocument.objects.get(profile=self.profile)
+        self.assertEqual(document.profile_completeness, 50)
+        self.assertEqual(document.rank_score, self.profile.rank_score)
+        # JSON pré-rendu écarté, cache des réponses et journal de synchronisation avancés
+        self.assertIsNone(CandidatePayload.objects.get(profile=self.profile).card)
+        self.assertNotEqual(get_generations([scope])[scope], generation)
+        self.assertTrue(CandidateChangeLog.objects.filter(pk__gt=last_change, profile_id=self.profile.pk).exists())
+
+    def test_unchanged_profiles_left_alone(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            CandidateProfile.objects.filter(pk=self.profile.pk).recalculate_completeness()
+        scope = profile_scope(self.profile.pk)
+        generation = get_generations([scope])[scope]
+        last_change = CandidateChangeLog.objects.order_by('-pk').values_list('pk', flat=True).first()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            updated = CandidateProfile.objects.all().recalculate_completeness()
+
+        self.assertEqual(updated, 0)
+        self.assertEqual(callbacks, [])
+        self.assertEqual(get_generations([scope])[scope], generation)
+        self.assertFalse(CandidateChangeLog.objects.filter(pk__gt=last_change).exists())
+
+    def test_approve_profiles_syncs_documents(self):
+        CandidateProfile.objects.filter(pk=self.profile.pk).update(is_profile_public=False)
+        sync_search_documents([self.profile.pk])
+        self.assertFalse(CandidateSearchDocument.objects.filter(profile=self.profile).exists())
+
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'secret')
+        self.client.force_login(admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/admin/candidate/candidateprofile/', {
+                'action': 'approve_profiles', '_selected_action': [self.profile.pk],
+            })
+
+        self.assertTrue(CandidateSearchDocument.objects.filter(profile=self.profile).exists())
+
+
+class RankScoreSaveTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch('candidate.payloads.run_after_commit')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        user = User.objects.create(username='candidat', email='candidat@example.com')
+        self.profile = CandidateProfile.objects.create(user=user, first_name='Salma', last_name='Idrissi')
+
+    def test_update_fields_with_updated_at_writes_rank_score(self):
+        CandidateProfile.objects.filter(pk=self.profile.pk).update(rank_score=0)
+        self.profile.status = 'passive'
+        self.profile.save(update_fields=['status', 'updated_at'])
+        self.assertEqual(
+            CandidateProfile.objects.get(pk=self.profile.pk).rank_score, self.profile.rank_score
+        )
+        self.assertGreater(self.profile.rank_score, 0)
+
+    def test_full_save_keeps_concurrent_engagement(self):
+        stale = CandidateProfile.objects.get(pk=self.profile.pk)
+        record_engagement(self.profile.pk, 'favorite_added')
+        engaged = CandidateProfile.objects.get(pk=self.profile.pk)
+
+        stale.phone = '0600000000'
+        stale.save()
+
+        saved = CandidateProfile.objects.get(pk=self.profile.pk)
+        self.assertEqual(saved.phone, '0600000000')
+        self.assertEqual(saved.engagement_score, engaged.engagement_score)
+        self.assertEqual(saved.engagement_updated_at, engaged.engagement_updated_at)
+        self.assertEqual(saved.rank_score, stale.rank_score)
+
+    def test_score_refresh_keeps_indexed_at(self):
+        sync_search_documents([self.profile.pk])
+        indexed_at = CandidateSearchDocument.objects.get(profile=self.profile).indexed_at
+
+        refresh_rank_scores([self.profile.pk])
+        record_engagement(self.profile.pk, 'favorite_added')
+        document = CandidateSearchDocument.objects.get(profile=self.profile)
+        self.assertEqual(document.rank_score, CandidateProfile.objects.get(pk=self.profile.pk).rank_score)
+        self.assertEqual(document.indexed_at, indexed_at)
+
+        refresh_document_fields([self.profile.pk], ['status'])
+        self.assertGreater(CandidateSearchDocument.objects.get(profile=self.profile).indexed_at, indexed_at)
+
+
+class CandidateSearchTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch('candidate.payloads.run_after_commit')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        with self.captureOnCommitCallbacks(execute=True):
+            for position, cv_text in enumerate(['developpeur python django', 'comptable sage']):
+                user = User.objects.create(username=f'candidat-{position}', email=f'candidat-{position}@example.com')
+                CandidateProfile.objects.create(
+                    user=user, first_name='Candidat', last_name=str(position), cv_text=cv_text
+                )
+
+    def search(self, query):
+        response = self.client.get('/api/candidate/profiles/search/', {'q': query})
+        return sorted(result['last_name'] for result in response.json()['results'])
+
+    def test_cv_text_through_search_documents(self):
+        self.assertEqual(self.search('Développeur'), ['0'])
+
+    def test_query_empty_once_normalized(self):
+        self.assertEqual(self.search(' '), [])
+
+
+class PayloadRenderSchedulingTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch('candidate.payloads.run_after_commit')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch('candidate.payloads.run_in_background')
+        self.run_in_background = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(payloads._pending_renders.clear)
+        self.profile_ids = []
+        with self.captureOnCommitCallbacks(execute=True):
+            for position in range(3):
+                user = User.objects.create(username=f'candidat-{position}', email=f'candidat-{position}@example.com')
+                self.profile_ids.append(CandidateProfile.objects.create(
+                    user=user, first_name='Candidat', last_name=str(position), is_profile_public=position != 2
+                ).pk)
+
+    def test_missing_public_payloads_rendered_once(self):
+        public_ids = self.profile_ids[:2]
+        for _ in range(3):
+            self.assertEqual(payloads.get_payloads(public_ids, 'detail'), {})
+        self.run_in_background.assert_called_once_with(payloads._render_pending, public_ids)
+
+        # Rendu terminé : un nouveau manque est de nouveau planifié
+        payloads._render_pending(public_ids)
+        CandidatePayload.objects.filter(profile_id=public_ids[0]).update(detail=None)
+        payloads.get_payloads(public_ids, 'detail')
+        self.run_in_background.assert_called_with(payloads._render_pending, [public_ids[0]])
+
+    def test_private_and_unknown_profiles_not_rendered(self):
+        payloads.get_payloads([self.profile_ids[2], 999999], 'card')
+        self.run_in_background.assert_not_called()
+
+    @mock.patch('candidate.payloads.MAX_READ_RENDERS', 1)
+    def test_renders_per_read_capped(self):
+        payloads.get_payloads(self.profile_ids, 'card')
+        self.run_in_background.assert_called_once_with(payloads._render_pending, self.profile_ids[:1])
+
+
+class CvExtractionTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        patcher = mock.patch('candidate.payloads.run_after_commit')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        user = User.objects.create(username='candidat', email='candidat@example.com')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile = CandidateProfile.objects.create(
+                user=user, first_name='Salma', last_name='Idrissi',
+                cv_file=SimpleUploadedFile('cv.txt', b'Python et Django'),
+            )
+
+    def test_background_thread_not_blocked_by_extraction(self):
+        future = Future()
+        pool = mock.Mock(**{'submit.return_value': future})
+        with mock.patch('candidate.cv_extraction.get_extraction_pool', return_value=pool), \
+                mock.patch('candidate.cv_extraction.run_in_background', side_effect=lambda func, *args: func(*args)):
+            # Analyse toujours en cours : la tâche rend la main sans attendre
+            self.assertEqual(process_profile_cv(self.profile.pk), 'submitted')
+            self.profile.refresh_from_db()
+            self.assertEqual(self.profile.cv_text, '')
+
+            future.set_result('Python et Django')
+
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.cv_skills, ['python', 'django'])
+        self.assertTrue(self.profile.cv_sha256)
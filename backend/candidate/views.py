@@ -5,13 +5,16 @@ from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.contrib.auth.models import User
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.db.models import Q, Count, Avg
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 import json
 
-from .models import CandidateProfile, VideoViewLog, CVVideoSyncLog
+from .cv_extraction import normalize_text
+from .models import CandidateProfile, CandidateSearchDocument, VideoViewLog, CVVideoSyncLog
+from .projections import candidate_list_records, project_candidate_list
 from .serializers import (
     CandidateProfileListSerializer, CandidateProfileDetailSerializer,
     CandidateProfileUpdateSerializer, VideoViewLogSerializer,
@@ -19,11 +22,19 @@ from .serializers import (
     VideoLinkRequestSerializer
 )
 from videos.models import Video
+from video_studio.fieldsets import SparseFieldsetViewMixin, get_fieldset, select_fields
+from video_studio.response_cache import cached_response, profile_scope
 
 
-class CandidateProfileViewSet(viewsets.ModelViewSet):
+def profile_scopes(request, pk=None, candidate_id=None):
+    """Cache des réponses : données d'un profil"""
+    return [profile_scope(pk or candidate_id)]
+
+
+class CandidateProfileViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet pour la gestion des profils candidats avec intégration vidéo
+    Lectures : ?fields= / ?include= (voir video_studio/fieldsets.py)
     """
     queryset = CandidateProfile.objects.all()
     parser_classes = (MultiPartParser, FormParser, JSONParser)
@@ -40,9 +51,8 @@ class CandidateProfileViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filtrer et optimiser les requêtes"""
-        queryset = CandidateProfile.objects.select_related(
-            'user', 'presentation_video'
-        ).prefetch_related('presentation_video__quality_checks')
+        # Relations chargées selon les champs que le serializer (élagué) lira
+        queryset = self.eager_load(CandidateProfile.objects.all())
         
         # Filtres pour les recruteurs
         has_video = self.request.query_params.get('has_video', None)
@@ -75,6 +85,28 @@ class CandidateProfileViewSet(viewsets.ModelViewSet):
         
         return queryset
     
+    @method_decorator(cached_response('candidate_profiles'))
+    def list(self, request, *args, **kwargs):
+        """
+        Liste en lecture rapide : projection des colonnes au format du serializer
+        ?include= (relations imbriquées à la carte) passe par le serializer
+        """
+        fieldset = get_fieldset(request.query_params)
+        if fieldset['include'] is not None:
+            return super().list(request, *args, **kwargs)
+        
+        # get_queryset valide aussi ?fields= (champ inconnu : 400)
+        queryset = project_candidate_list(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        records = select_fields(candidate_list_records(queryset if page is None else page), fieldset['fields'])
+        if page is not None:
+            return self.get_paginated_response(records)
+        return Response(records)
+    
+    @method_decorator(cached_response('candidate_profile_detail', profile_scopes))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+    
     @action(detail=True, methods=['post'])
     def link_video(self, request, pk=None):
         """Lier une vidéo au profil candidat"""
@@ -138,10 +170,10 @@ class CandidateProfileViewSet(viewsets.ModelViewSet):
         candidate_profile.video_last_updated = None
         candidate_profile.video_linked_at = None
         candidate_profile.video_quality_score = 0
-        candidate_profile.save()
         
-        # Recalculer la complétude
-        candidate_profile.calculate_profile_completeness()
+        # Recalculer la complétude (une seule sauvegarde)
+        candidate_profile.calculate_profile_completeness(commit=False)
+        candidate_profile.save()
         
         # Log de synchronisation
         CVVideoSyncLog.objects.create(
@@ -155,6 +187,7 @@ class CandidateProfileViewSet(viewsets.ModelViewSet):
         return Response({'message': 'Vidéo dissociée du profil avec succès'})
     
     @action(detail=True, methods=['get'])
+    @method_decorator(cached_response('candidate_video_stats', profile_scopes))
     def video_stats(self, request, pk=None):
         """Statistiques de consultation de la vidéo du candidat"""
         candidate_profile = self.get_object()
@@ -187,23 +220,32 @@ class CandidateProfileViewSet(viewsets.ModelViewSet):
         # Recherche textuelle
         search_query = request.query_params.get('q', '')
         if search_query:
-            queryset = queryset.filter(
+            text_filter = (
                 Q(first_name__icontains=search_query) |
                 Q(last_name__icontains=search_query) |
                 Q(university__icontains=search_query) |
                 Q(major__icontains=search_query) |
                 Q(user__email__icontains=search_query)
             )
+            # Texte du CV via le document de recherche (index trigramme) ;
+            # une requête vide une fois normalisée correspondrait à tous les profils
+            cv_query = normalize_text(search_query)
+            if cv_query:
+                text_filter |= Q(pk__in=CandidateSearchDocument.objects.filter(
+                    cv_text__contains=cv_query
+                ).values('profile_id'))
+            queryset = queryset.filter(text_filter)
         
         # Tri
-        order_by = request.query_params.get('order_by', '-updated_at')
+        order_by = request.query_params.get('order_by', '-rank')
         valid_orders = [
             'created_at', '-created_at', 'updated_at', '-updated_at',
             'profile_completeness', '-profile_completeness',
-            'video_quality_score', '-video_quality_score'
+            'video_quality_score', '-video_quality_score',
+            'rank', '-rank'
         ]
         if order_by in valid_orders:
-            queryset = queryset.order_by(order_by)
+            queryset = queryset.order_by(order_by.replace('rank', 'rank_score'))
         
         # Pagination
         page = self.paginate_queryset(queryset)
@@ -374,6 +416,7 @@ def quick_video_link(request):
 
 @csrf_exempt 
 @require_http_methods(["GET"])
+@cached_response('candidate_dashboard_stats', profile_scopes)
 def candidate_dashboard_stats(request, candidate_id):
     """
     Statistiques pour le dashboard candidat
@@ -392,13 +435,12 @@ def candidate_dashboard_stats(request, candidate_id):
             'sync_needed': False
         }
         
-        # Statistiques vidéo si disponible
+        # Statistiques vidéo si disponible (activité journalière du candidat)
         if candidate_profile.presentation_video:
-            video_views = VideoViewLog.objects.filter(
-                candidate_profile=candidate_profile
-            )
-            stats['video_views'] = video_views.count()
-            stats['video_unique_viewers'] = video_views.values('viewer').distinct().count()
+            from recruiter.rollups import candidate_activity
+            activity = candidate_activity([candidate_profile.pk])[candidate_profile.pk]
+            stats['video_views'] = activity['video_views']
+            stats['video_unique_viewers'] = len(activity['video_viewer_ids'])
             
             # Vérifier si une sync est nécessaire
             recent_sync_logs = CVVideoSyncLog.objects.filter(
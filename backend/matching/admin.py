@@ -0,0 +1,42 @@
+# backend/matching/admin.py
+from django.contrib import admin
+
+from .models import JobPosting, CandidateTermVector
+
+
+@admin.register(JobPosting)
+class JobPostingAdmin(admin.ModelAdmin):
+    list_display = [
+        'title',
+        'company_name',
+        'recruiter',
+        'contract_type',
+        'location',
+        'is_active',
+        'created_at'
+    ]
+    list_filter = [
+        'is_active',
+        'contract_type',
+        'created_at'
+    ]
+    search_fields = [
+        'title',
+        'company_name',
+        'required_major',
+        'keywords',
+        'recruiter__username'
+    ]
+    readonly_fields = ['created_at', 'updated_at']
+    raw_id_fields = ['recruiter']
+
+
+@admin.register(CandidateTermVector)
+class CandidateTermVectorAdmin(admin.ModelAdmin):
+    list_display = ['profile', 'is_active', 'updated_at']
+    list_filter = ['is_active']
+    readonly_fields = ['profile', 'terms', 'is_active', 'updated_at']
+    show_full_result_count = False
+    
+    def has_add_permission(self, request):
+        return False
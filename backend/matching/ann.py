@@ -0,0 +1,346 @@
+# backend/matching/ann.py
+"""
+Index IVF (inverted file) pour la recherche approchée des plus proches voisins
+
+Les embeddings sont regroupés par k-means en `nlist` listes, stockées
+contiguës et triées par liste : une requête ne compare que les vecteurs des
+`nprobe` listes dont le centroïde est le plus proche. Les tableaux sont
+persistés en .npy et relus en mmap (pages partagées entre workers).
+
+Mise à jour incrémentale : les profils modifiés depuis la construction sont
+servis par un tampon delta comparé en force brute, leurs anciennes lignes
+étant masquées (tombstones). Curseur : CandidateSearchDocument.indexed_at,
+retraits lus dans le journal des changements. Resynchronisation et
+reconstruction en arrière-plan, jamais pendant une requête.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from video_studio.artifacts import current_version, load_version, prune_versions, save_version
+from video_studio.background import run_once_in_background
+
+
+logger = logging.getLogger('matching')
+
+DEFAULT_SIMILARITY_CONFIG = {
+    'index_dir': os.path.join(settings.BASE_DIR, 'var', 'similarity'),
+    # Listes inspectées par requête (compromis rappel / latence)
+    'nprobe': 8,
+    'latency_target_ms': 50,
+    'sync_interval_seconds': 10,
+    'sync_overlap_seconds': 30,
+    'rebuild_ratio': 0.05,
+    'min_rebuild_rows': 1000,
+    'kmeans_iterations': 15,
+    'kmeans_sample_size': 100_000,
+    'build_chunk_size': 5000,
+    'kept_versions': 2,
+}
+
+ARRAY_NAMES = ('centroids', 'vectors', 'ids', 'offsets')
+
+# Entrées du journal des changements qui retirent un profil de l'index
+REMOVAL_CHANGE_TYPES = ('private', 'deleted')
+
+
+def get_similarity_config():
+    """Configuration par défaut surchargée par settings.CANDIDATE_SIMILARITY"""
+    return {**DEFAULT_SIMILARITY_CONFIG, **getattr(settings, 'CANDIDATE_SIMILARITY', {})}
+
+
+def default_nlist(n):
+    """≈ √n listes, bornées"""
+    return int(min(4096, max(1, round(np.sqrt(n)))))
+
+
+def kmeans(vectors, nlist, iterations=15, sample_size=100_000, seed=0):
+    """k-means sphérique (produit scalaire) sur un échantillon"""
+    rng = np.random.default_rng(seed)
+    if len(vectors) > sample_size:
+        vectors = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+    nlist = min(nlist, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # Liste vide : on garde l'ancien centroïde
+        empty = norms[:, 0] == 0
+        centroids = np.where(empty[:, None], centroids, sums / np.where(norms == 0, 1, norms))
+    return centroids.astype(np.float32)
+
+
+def _assign(vectors, centroids, chunk_size=65536):
+    assignment = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), chunk_size):
+        assignment[start:start + chunk_size] = np.argmax(
+            vectors[start:start + chunk_size] @ centroids.T, axis=1
+        )
+    return assignment
+
+
+def _top(ids, scores, k):
+    if k < len(scores):
+        best = np.argpartition(-scores, k)[:k]
+    else:
+        best = np.arange(len(scores))
+    best = best[np.argsort(-scores[best], kind='stable')]
+    return ids[best], scores[best]
+
+
+class IVFIndex:
+    """Listes inversées sur embeddings L2-normalisés, avec delta et tombstones"""
+
+    def __init__(self, centroids, vectors, ids, offsets, watermark=None, version=None):
+        self.version = version
+        self.centroids = centroids
+        self.vectors = vectors
+        self.ids = ids
+        self.offsets = offsets
+        self.watermark = watermark
+        self.synced_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._delta_vectors = {}
+        # Instantané lu sans verrou par search : (ids masqués, ids delta, vecteurs delta)
+        self._delta = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), None)
+
+    @classmethod
+    def build(cls, ids, vectors, nlist=None, config=None, watermark=None):
+        config = config or get_similarity_config()
+        if not len(ids):
+            return cls(
+                np.empty((0, vectors.shape[1]), dtype=np.float32), vectors, ids,
+                np.zeros(1, dtype=np.int64), watermark,
+            )
+        nlist = nlist or default_nlist(len(ids))
+        centroids = kmeans(
+            vectors, nlist, config['kmeans_iterations'], config['kmeans_sample_size']
+        )
+        assignment = _assign(vectors, centroids)
+        order = np.argsort(assignment, kind='stable')
+        offsets = np.zeros(len(centroids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignment, minlength=len(centroids)), out=offsets[1:])
+        return cls(
+            centroids,
+            np.ascontiguousarray(vectors[order]),
+            np.ascontiguousarray(ids[order]),
+            offsets,
+            watermark,
+        )
+
+    @classmethod
+    def from_database(cls, config=None):
+        """Embeddings de tous les documents de recherche (profils publics)"""
+        from candidate.models import CandidateSearchDocument
+        from .embeddings import EMBEDDING_FIELDS, embed_rows
+
+        config = config or get_similarity_config()
+        watermark = timezone.now()
+        rows = CandidateSearchDocument.objects.values(*EMBEDDING_FIELDS).iterator(
+            chunk_size=config['build_chunk_size']
+        )
+        ids, vectors = embed_rows(rows, now=watermark)
+        return cls.build(ids, vectors, config=config, watermark=watermark)
+
+    # Persistance
+
+    def save(self, directory):
+        """Écrire une nouvelle version de l'index"""
+        return save_version(
+            directory,
+            {name: getattr(self, name) for name in ARRAY_NAMES},
+            {'watermark': self.watermark.isoformat() if self.watermark else None},
+        )
+
+    @classmethod
+    def load(cls, directory):
+        """Ouvrir la version courante en mmap, None si aucune n'existe"""
+        loaded = load_version(directory, ARRAY_NAMES)
+        if loaded is None:
+            return None
+        version, arrays, meta = loaded
+        watermark = meta.get('watermark')
+        return cls(
+            watermark=datetime.fromisoformat(watermark) if watermark else None,
+            version=version,
+            **arrays
+        )
+
+    # Delta
+
+    def __len__(self):
+        tombstones, delta_ids, _ = self._delta
+        return len(self.ids) + len(delta_ids)
+
+    @property
+    def delta_size(self):
+        tombstones, delta_ids, _ = self._delta
+        return len(tombstones) + len(delta_ids)
+
+    def needs_rebuild(self, config=None):
+        config = config or get_similarity_config()
+        limit = max(config['min_rebuild_rows'], config['rebuild_ratio'] * len(self.ids))
+        return self.delta_size > limit
+
+    def apply_changes(self, ids, vectors, removed=()):
+        """Remplacer les embeddings de profils modifiés, masquer les profils retirés"""
+        with self._lock:
+            for profile_id, vector in zip(ids.tolist(), vectors):
+                self._delta_vectors[profile_id] = vector
+            for profile_id in removed:
+                self._delta_vectors.pop(profile_id, None)
+
+            tombstones, _, _ = self._delta
+            tombstones = np.union1d(tombstones, np.concatenate([ids, np.asarray(list(removed), dtype=np.int64)]))
+            delta_ids = np.fromiter(self._delta_vectors, dtype=np.int64, count=len(self._delta_vectors))
+            delta_vectors = np.vstack(list(self._delta_vectors.values())) if len(delta_ids) else None
+            self._delta = (tombstones, delta_ids, delta_vectors)
+
+    def sync(self, config=None):
+        """
+        Recalculer les embeddings des documents écrits depuis le dernier passage (indexed_at)
+        Les profils rendus privés ou supprimés (journal des changements, plus de document) sont retirés
+        """
+        from candidate.models import CandidateChangeLog, CandidateSearchDocument
+        from .embeddings import EMBEDDING_FIELDS, embed_rows
+
+        config = config or get_similarity_config()
+        started_at = timezone.now()
+        if self.watermark is not None:
+            since = self.watermark - timedelta(seconds=config['sync_overlap_seconds'])
+            rows = CandidateSearchDocument.objects.filter(indexed_at__gte=since).values(*EMBEDDING_FIELDS)
+            ids, vectors = embed_rows(rows, now=started_at)
+            removed = set(
+                CandidateChangeLog.objects.filter(
+                    created_at__gte=since, change_type__in=REMOVAL_CHANGE_TYPES
+                ).exclude(
+                    profile_id__in=CandidateSearchDocument.objects.values('pk')
+                ).values_list('profile_id', flat=True)
+            )
+            if len(ids) or removed:
+                self.apply_changes(ids, vectors, removed)
+        self.watermark = started_at
+        self.synced_at = time.monotonic()
+
+    # Recherche
+
+    def search(self, query, k=10, nprobe=None, exclude=()):
+        """Les k plus proches voisins : (ids, similarités)"""
+        tombstones, delta_ids, delta_vectors = self._delta
+        exclude = np.asarray(list(exclude), dtype=np.int64)
+        candidate_ids, candidate_scores = [], []
+
+        nprobe = min(nprobe or get_similarity_config()['nprobe'], len(self.centroids))
+        if nprobe:
+            lists = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+            for position in lists:
+                start, end = self.offsets[position], self.offsets[position + 1]
+                if start < end:
+                    ids = self.ids[start:end]
+                    scores = self.vectors[start:end] @ query
+                    # Lignes remplacées par le delta ou retirées
+                    masked = np.isin(ids, tombstones) | np.isin(ids, exclude)
+                    candidate_ids.append(ids[~masked])
+                    candidate_scores.append(scores[~masked])
+
+        if delta_vectors is not None:
+            kept = ~np.isin(delta_ids, exclude)
+            candidate_ids.append(delta_ids[kept])
+            candidate_scores.append(delta_vectors[kept] @ query)
+
+        if not candidate_ids:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        return _top(np.concatenate(candidate_ids), np.concatenate(candidate_scores), k)
+
+    def brute_force(self, query, k=10):
+        """Recherche exacte (référence pour mesurer le rappel)"""
+        return _top(self.ids, np.asarray(self.vectors @ query), k)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def _rebuild_in_background(config):
+    global _index
+    index = rebuild_similarity_index(config)
+    with _index_lock:
+        _index = index
+    return index
+
+
+def get_similarity_index():
+    """
+    Index du processus : version persistée ouverte en mmap, None si aucune n'existe encore
+    Resynchronisation et reconstruction (index absent ou delta trop gros) en
+    arrière-plan : l'index courant reste servi, aucune requête ne l'attend
+    """
+    global _index
+    config = get_similarity_config()
+    directory = config['index_dir']
+    with _index_lock:
+        if _index is None:
+            _index = IVFIndex.load(directory)
+        elif time.monotonic() - _index.synced_at >= config['sync_interval_seconds']:
+            # Version reconstruite par un autre processus (commande planifiée)
+            if current_version(directory) != _index.version:
+                _index = IVFIndex.load(directory) or _index
+            run_once_in_background('similarity-index:sync', _index.sync, config)
+        index = _index
+
+    if index is None or index.needs_rebuild(config):
+        run_once_in_background('similarity-index:rebuild', _rebuild_in_background, config)
+    return index
+
+
+def rebuild_similarity_index(config=None):
+    """Reconstruire depuis la base, sauvegarder et rouvrir en mmap"""
+    config = config or get_similarity_config()
+    directory = config['index_dir']
+    IVFIndex.from_database(config).save(directory)
+    prune_versions(directory, config['kept_versions'])
+    return IVFIndex.load(directory)
+
+
+def similar_candidates(document, limit=10, nprobe=None):
+    """
+    Profils les plus proches d'un document de recherche : liste de (document, similarité)
+    L'embedding de référence est recalculé (toujours à jour, même hors index)
+    """
+    from candidate.models import CandidateSearchDocument
+    from .embeddings import EMBEDDING_FIELDS, embed
+
+    config = get_similarity_config()
+    started = time.perf_counter()
+
+    index = get_similarity_index()
+    if index is None:
+        # Première construction en cours
+        return []
+    values = CandidateSearchDocument.objects.filter(pk=document.pk).values(*EMBEDDING_FIELDS).get()
+    ids, scores = index.search(
+        embed(values), k=limit * 2, nprobe=nprobe, exclude=[document.pk]
+    )
+    documents = CandidateSearchDocument.objects.in_bulk(ids.tolist())
+    results = [
+        (documents[profile_id], score)
+        for profile_id, score in zip(ids.tolist(), scores.tolist())
+        if profile_id in documents and score > 0
+    ][:limit]
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if elapsed_ms > config['latency_target_ms']:
+        logger.warning(
+            "Profils similaires à %s : %.1f ms (objectif %s ms)",
+            document.pk, elapsed_ms, config['latency_target_ms']
+        )
+    return results
@@ -0,0 +1,36 @@
+# backend/matching/apps.py
+from django.apps import AppConfig
+from django.core.signals import request_started
+
+
+def warm_indexes(sender, **kwargs):
+    """
+    Index en mémoire construits en arrière-plan dès la première requête du worker
+    Pas à l'import de wsgi.py : avec gunicorn --preload, les threads lancés avant le
+    fork n'existent pas dans les workers
+    """
+    from django.core.handlers.asgi import ASGIHandler
+    from django.core.handlers.wsgi import WSGIHandler
+    from .autocomplete import warm_autocomplete_index
+    from .index import warm_index
+
+    if not issubclass(sender, (WSGIHandler, ASGIHandler)):
+        # Client de test : les tests construisent les index eux-mêmes
+        return
+    request_started.disconnect(warm_indexes)
+    warm_index()
+    warm_autocomplete_index()
+
+
+class MatchingConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'matching'
+    verbose_name = 'Candidate-Job Matching'
+    
+    def ready(self):
+        """
+        Code exécuté au démarrage de l'application matching
+        """
+        # Maintenir les vecteurs de termes à jour lors des changements de profil
+        import matching.signals  # noqa: F401
+        request_started.connect(warm_indexes)
@@ -0,0 +1,343 @@
+# backend/matching/autocomplete.py
+"""
+Index de préfixes en mémoire pour l'autocomplétion des filtres
+
+Les valeurs distinctes (universités, spécialisations, niveaux d'études,
+villes, compétences extraites des CV) sont comptées sur les profils publics.
+Chaque valeur est indexée sans accents à chaque début de mot
+("genie civil" et "civil") dans une liste triée : une frappe est un
+bisect suivi d'un parcours de la plage du préfixe, sans requête SQL.
+
+Mise à jour incrémentale : les profils dont le document de recherche a été
+écrit depuis le dernier passage (CandidateSearchDocument.indexed_at, avancé
+aussi par les update() suivis de notify_profiles_changed) retirent leurs
+anciennes valeurs des compteurs et ajoutent les nouvelles ; les profils rendus
+privés ou supprimés (journal des changements) retirent les leurs.
+Construction et resynchronisation en arrière-plan, jamais pendant une requête.
+"""
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from video_studio.background import run_once_in_background
+from .text import fold
+
+
+DEFAULT_AUTOCOMPLETE_CONFIG = {
+    'sync_interval_seconds': 5,
+    'sync_overlap_seconds': 30,
+    # Reconstruction périodique (filet de sécurité) ou quand le delta est trop gros
+    'rebuild_interval_seconds': 3600,
+    'rebuild_ratio': 0.05,
+    'min_rebuild_rows': 1000,
+    'build_chunk_size': 5000,
+    # Réponses mémorisées entre deux modifications des compteurs
+    'cache_size': 2048,
+}
+
+AUTOCOMPLETE_FIELDS = ['university', 'major', 'education_level', 'location', 'skill']
+
+# Colonnes du profil lues pour alimenter l'index
+SOURCE_FIELDS = [
+    'pk', 'is_profile_public', 'university', 'major', 'education_level', 'location', 'cv_skills',
+]
+
+WHITESPACE_RE = re.compile(r'\s+')
+WORD_START_RE = re.compile(r'(?<=[^a-z0-9])[a-z0-9]')
+
+
+def get_autocomplete_config():
+    """Configuration par défaut surchargée par settings.AUTOCOMPLETE"""
+    return {**DEFAULT_AUTOCOMPLETE_CONFIG, **getattr(settings, 'AUTOCOMPLETE', {})}
+
+
+def _clean(text):
+    return WHITESPACE_RE.sub(' ', text or '').strip()
+
+
+def profile_values(values):
+    """Valeurs (champ, libellé) apportées par un profil, aucune s'il est privé"""
+    if not values['is_profile_public']:
+        return []
+    found = []
+    for field in ('university', 'major', 'education_level', 'location'):
+        label = _clean(values[field])
+        if label:
+            found.append((field, label))
+    for skill in values['cv_skills'] or []:
+        found.append(('skill', skill))
+    return found
+
+
+def prefix_keys(label):
+    """Clés indexées d'un libellé : le libellé replié puis chaque suffixe à partir d'un mot"""
+    folded = fold(label)
+    return [folded] + [folded[match.start():] for match in WORD_START_RE.finditer(folded)]
+
+
+def _top_values(candidates, counts, capacity, limit):
+    """
+    Les `limit` valeurs distinctes les plus fréquentes (puis par ordre d'apparition)
+    Une valeur peut figurer sous plusieurs clés de la plage : on dédoublonne
+    les meilleures entrées, et on ne trie toute la plage qu'à défaut
+    """
+    order = counts * capacity - candidates
+    for size in (limit * 4, len(order)):
+        if size < len(order):
+            best = np.argpartition(-order, size)[:size]
+        else:
+            best = np.arange(len(order))
+        ranked = candidates[best[np.argsort(-order[best], kind='stable')]].tolist()
+        distinct = list(dict.fromkeys(ranked))
+        if len(distinct) >= limit or size >= len(order):
+            return distinct[:limit]
+
+
+class AutocompleteIndex:
+    """Valeurs distinctes comptées, clés de préfixes triées, contributions par profil"""
+
+    def __init__(self, watermark=None):
+        self.labels = []
+        self.fields = []
+        self._value_ids = {}
+        # Compteurs et codes de champ par valeur (tableaux à capacité doublée)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.field_codes = np.zeros(0, dtype=np.int8)
+        # Clés triées (bisect) et valeur de chaque clé
+        self.keys = []
+        self.key_values = np.empty(0, dtype=np.int32)
+        # Contributions des profils au moment de la construction (CSR trié par profile_id)
+        self.profile_ids = np.empty(0, dtype=np.int64)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.empty(0, dtype=np.int32)
+        # Contributions des profils modifiés depuis
+        self._changed = {}
+        self.watermark = watermark
+        self.built_at = self.synced_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self.cache_size = get_autocomplete_config()['cache_size']
+
+    @classmethod
+    def from_rows(cls, rows, watermark=None):
+        """Construire l'index depuis des dicts de SOURCE_FIELDS triés par pk"""
+        index = cls(watermark)
+        pending_keys = []
+        ids = array('q')
+        indptr = array('q', [0])
+        indices = array('i')
+        for values in rows:
+            for field, label in profile_values(values):
+                indices.append(index._value_id(field, label, pending_keys))
+            ids.append(values['pk'])
+            indptr.append(len(indices))
+
+        pending_keys.sort()
+        index.keys = [key for key, _ in pending_keys]
+        index.key_values = np.array([value_id for _, value_id in pending_keys], dtype=np.int32)
+        index.profile_ids = np.frombuffer(ids, dtype=np.int64)
+        index.indptr = np.frombuffer(indptr, dtype=np.int64)
+        index.indices = np.frombuffer(indices, dtype=np.int32)
+        index.counts[:len(index.labels)] = np.bincount(index.indices, minlength=len(index.labels))
+        return index
+
+    @classmethod
+    def from_database(cls, config=None):
+        from candidate.models import CandidateProfile
+
+        config = config or get_autocomplete_config()
+        watermark = timezone.now()
+        rows = (
+            CandidateProfile.objects.order_by('pk')
+            .values(*SOURCE_FIELDS)
+            .iterator(chunk_size=config['build_chunk_size'])
+        )
+        return cls.from_rows(rows, watermark=watermark)
+
+    def _value_id(self, field, label, pending_keys=None):
+        """Identifiant d'une valeur, créée (et indexée) à la première occurrence"""
+        identity = (field, fold(label))
+        value_id = self._value_ids.get(identity)
+        if value_id is not None:
+            return value_id
+
+        value_id = self._value_ids[identity] = len(self.labels)
+        self.labels.append(label)
+        self.fields.append(field)
+        if value_id >= len(self.counts):
+            capacity = max(1024, 2 * len(self.counts))
+            self.counts = np.concatenate([self.counts, np.zeros(capacity - len(self.counts), dtype=np.int64)])
+            self.field_codes = np.concatenate([
+                self.field_codes, np.zeros(capacity - len(self.field_codes), dtype=np.int8)
+            ])
+        self.field_codes[value_id] = AUTOCOMPLETE_FIELDS.index(field)
+
+        for key in prefix_keys(label):
+            if pending_keys is not None:
+                pending_keys.append((key, value_id))
+            else:
+                position = bisect_left(self.keys, key)
+                self.keys.insert(position, key)
+                self.key_values = np.insert(self.key_values, position, value_id)
+        return value_id
+
+    def _contribution(self, profile_id):
+        if profile_id in self._changed:
+            return self._changed[profile_id]
+        row = np.searchsorted(self.profile_ids, profile_id)
+        if row < len(self.profile_ids) and self.profile_ids[row] == profile_id:
+            return tuple(self.indices[self.indptr[row]:self.indptr[row + 1]].tolist())
+        return ()
+
+    # Mise à jour
+
+    @property
+    def delta_size(self):
+        return len(self._changed)
+
+    def needs_rebuild(self, config=None):
+        config = config or get_autocomplete_config()
+        limit = max(config['min_rebuild_rows'], config['rebuild_ratio'] * len(self.profile_ids))
+        return (
+            self.delta_size > limit
+            or time.monotonic() - self.built_at >= config['rebuild_interval_seconds']
+        )
+
+    def apply_changes(self, rows):
+        """
+        Remplacer les contributions de profils modifiés (dicts de SOURCE_FIELDS)
+        Opération idempotente (une même modification peut être relue)
+        """
+        with self._lock:
+            changed = False
+            for values in rows:
+                profile_id = values['pk']
+                old = self._contribution(profile_id)
+                new = tuple(self._value_id(field, label) for field, label in profile_values(values))
+                if new == old:
+                    continue
+                for value_id in old:
+                    self.counts[value_id] -= 1
+                for value_id in new:
+                    self.counts[value_id] += 1
+                self._changed[profile_id] = new
+                changed = True
+            if changed:
+                self._cache.clear()
+
+    def sync(self, config=None):
+        """
+        Lire les profils dont le document a été écrit depuis le dernier passage (indexed_at)
+        Les profils rendus privés ou supprimés (journal des changements, plus de document) sont retirés
+        """
+        from candidate.models import CandidateChangeLog, CandidateProfile, CandidateSearchDocument
+        from .ann import REMOVAL_CHANGE_TYPES
+
+        config = config or get_autocomplete_config()
+        started_at = timezone.now()
+        since = self.watermark - timedelta(seconds=config['sync_overlap_seconds'])
+        # Lus avant de prendre le verrou de l'index : les suggestions n'attendent pas la base
+        rows = list(CandidateProfile.objects.filter(
+            pk__in=CandidateSearchDocument.objects.filter(indexed_at__gte=since).values('pk')
+        ).values(*SOURCE_FIELDS))
+        removed = set(
+            CandidateChangeLog.objects.filter(
+                created_at__gte=since, change_type__in=REMOVAL_CHANGE_TYPES
+            ).exclude(
+                profile_id__in=CandidateSearchDocument.objects.values('pk')
+            ).values_list('profile_id', flat=True)
+        )
+        rows.extend({'pk': profile_id, 'is_profile_public': False} for profile_id in removed)
+        self.apply_changes(rows)
+        self.watermark = started_at
+        self.synced_at = time.monotonic()
+
+    # Suggestions
+
+    def suggest(self, prefix, field=None, limit=10):
+        """
+        Valeurs les plus fréquentes dont un mot commence par `prefix`
+        Liste de {'value', 'field', 'count'}
+        """
+        folded = _clean(fold(prefix))
+        if not folded:
+            return []
+        cache_key = (folded, field, limit)
+        with self._lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                return cached
+
+            start = bisect_left(self.keys, folded)
+            end = bisect_left(self.keys, folded + '\uffff', start)
+            candidates = self.key_values[start:end]
+            if field is not None:
+                candidates = candidates[self.field_codes[candidates] == AUTOCOMPLETE_FIELDS.index(field)]
+            counts = self.counts[candidates]
+            candidates, counts = candidates[counts > 0], counts[counts > 0]
+            best = _top_values(candidates, counts, len(self.counts), limit)
+            suggestions = [
+                {'value': self.labels[value_id], 'field': self.fields[value_id], 'count': int(self.counts[value_id])}
+                for value_id in best
+            ]
+
+            self._cache[cache_key] = suggestions
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return suggestions
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def _build_index(config):
+    global _index
+    index = AutocompleteIndex.from_database(config)
+    with _index_lock:
+        _index = index
+    return index
+
+
+def warm_autocomplete_index():
+    """Lancer la construction de l'index en arrière-plan (première requête du worker)"""
+    return run_once_in_background('autocomplete-index:build', _build_index, get_autocomplete_config())
+
+
+def get_autocomplete_index():
+    """
+    Index du processus, None tant que la première construction n'est pas terminée
+    Construction et resynchronisation en arrière-plan, hors de _index_lock :
+    l'index courant reste servi pendant la lecture de la base
+    """
+    config = get_autocomplete_config()
+    index = _index
+    if index is None or index.needs_rebuild(config):
+        run_once_in_background('autocomplete-index:build', _build_index, config)
+    elif time.monotonic() - index.synced_at >= config['sync_interval_seconds']:
+        run_once_in_background('autocomplete-index:sync', index.sync, config)
+    return index
+
+
+def reset_autocomplete_index():
+    """Oublier l'index du processus (reconstruit en arrière-plan à la prochaine requête)"""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def autocomplete(prefix, field=None, limit=10):
+    """Suggestions pour une saisie partielle (aucune pendant la première construction)"""
+    index = get_autocomplete_index()
+    if index is None:
+        return []
+    return index.suggest(prefix, field, limit)
@@ -0,0 +1,98 @@
+# backend/matching/embeddings.py
+"""
+Embeddings des profils candidats pour la recherche de profils similaires
+
+Vecteur dense L2-normalisé : termes des champs structurés et compétences du CV hachés (signe ±)
+dans TEXT_DIMENSIONS composantes, puis quelques caractéristiques numériques
+(expérience, qualité vidéo, complétude, statut, engagement). Le produit
+scalaire de deux embeddings est leur similarité cosinus.
+"""
+import hashlib
+import math
+
+import numpy as np
+from django.utils import timezone
+
+from candidate.ranking import decay, get_ranking_config
+from .vectors import candidate_terms
+
+
+TEXT_DIMENSIONS = 48
+NUMERIC_FEATURES = [
+    'experience', 'graduation_recency', 'video_quality', 'completeness',
+    'has_video', 'status_active', 'status_passive', 'engagement',
+]
+DIMENSIONS = TEXT_DIMENSIONS + len(NUMERIC_FEATURES)
+
+# Part des caractéristiques numériques dans la similarité
+NUMERIC_WEIGHT = 0.35
+
+# Colonnes du document de recherche lues pour calculer un embedding
+EMBEDDING_FIELDS = [
+    'profile_id', 'major', 'education_level', 'university', 'location', 'cv_skills',
+    'experience_years', 'graduation_year', 'video_quality_score',
+    'profile_completeness', 'has_presentation_video', 'status',
+    'profile__engagement_score', 'profile__engagement_updated_at',
+]
+
+_term_slots = {}
+
+
+def _term_slot(term):
+    """Composante et signe d'un terme (hachage stable entre processus)"""
+    slot = _term_slots.get(term)
+    if slot is None:
+        digest = int.from_bytes(hashlib.blake2b(term.encode(), digest_size=8).digest(), 'little')
+        slot = _term_slots[term] = (digest % TEXT_DIMENSIONS, 1.0 if digest >> 63 else -1.0)
+    return slot
+
+
+def embed(values, now=None, config=None):
+    """Embedding d'un profil à partir d'un dict de EMBEDDING_FIELDS"""
+    now = now or timezone.now()
+    config = config or get_ranking_config()
+    vector = np.zeros(DIMENSIONS, dtype=np.float32)
+
+    for term, weight in candidate_terms(values).items():
+        column, sign = _term_slot(term)
+        vector[column] += sign * math.log1p(weight)
+    text_norm = np.linalg.norm(vector[:TEXT_DIMENSIONS])
+    if text_norm:
+        vector[:TEXT_DIMENSIONS] *= (1 - NUMERIC_WEIGHT) / text_norm
+
+    engagement = decay(
+        values['profile__engagement_score'], values['profile__engagement_updated_at'],
+        now, config['engagement_half_life_days']
+    )
+    graduation_year = values['graduation_year']
+    numeric = np.array([
+        min(values['experience_years'] or 0, 20) / 20,
+        max(0.0, 1 - (now.year - graduation_year) / 20) if graduation_year else 0.0,
+        (values['video_quality_score'] or 0) / 100,
+        (values['profile_completeness'] or 0) / 100,
+        1.0 if values['has_presentation_video'] else 0.0,
+        1.0 if values['status'] == 'active' else 0.0,
+        1.0 if values['status'] == 'passive' else 0.0,
+        engagement / (engagement + config['engagement_saturation']),
+    ], dtype=np.float32)
+    numeric_norm = np.linalg.norm(numeric)
+    if numeric_norm:
+        vector[TEXT_DIMENSIONS:] = numeric * (NUMERIC_WEIGHT / numeric_norm)
+
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    return vector
+
+
+def embed_rows(rows, now=None):
+    """(ids, matrice d'embeddings) depuis des dicts de EMBEDDING_FIELDS"""
+    now = now or timezone.now()
+    config = get_ranking_config()
+    ids, vectors = [], []
+    for values in rows:
+        ids.append(values['profile_id'])
+        vectors.append(embed(values, now, config))
+    if not vectors:
+        return np.empty(0, dtype=np.int64), np.empty((0, DIMENSIONS), dtype=np.float32)
+    return np.array(ids, dtype=np.int64), np.vstack(vectors)
@@ -0,0 +1,313 @@
+# backend/matching/index.py
+"""
+Index TF-IDF en mémoire des profils candidats publics
+
+Chaque ligne de la matrice CSR est le vecteur L2-normalisé d'un profil
+(poids log(1 + tf) · idf) : le score cosinus d'une offre contre tous les
+profils est un seul produit matrice creuse × vecteur, suivi d'un argpartition.
+
+Mise à jour incrémentale : les vecteurs modifiés depuis le dernier passage
+(CandidateTermVector.updated_at) invalident leur ligne et sont servis par une
+petite matrice delta, jusqu'à la prochaine reconstruction complète.
+Construction et resynchronisation en arrière-plan (run_once_in_background),
+lancées à la première requête du worker (matching.apps) puis à la demande.
+"""
+import math
+import threading
+import time
+from array import array
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+from scipy import sparse
+
+from video_studio.background import run_once_in_background
+
+
+DEFAULT_MATCHING_CONFIG = {
+    # Intervalle minimal entre deux lectures des vecteurs modifiés
+    'sync_interval_seconds': 5,
+    # Recouvrement de la fenêtre delta (transactions validées en retard)
+    'sync_overlap_seconds': 30,
+    # Reconstruction quand le delta dépasse cette part de l'index
+    'rebuild_ratio': 0.05,
+    'min_rebuild_rows': 1000,
+    'build_chunk_size': 5000,
+}
+
+
+def get_matching_config():
+    """Configuration par défaut surchargée par settings.MATCHING"""
+    return {**DEFAULT_MATCHING_CONFIG, **getattr(settings, 'MATCHING', {})}
+
+
+def _csr_from_rows(rows, vocabulary, grow_vocabulary):
+    """
+    Construire (ids, matrice de tf bruts) depuis des (profile_id, {terme: poids})
+    Les termes inconnus sont ajoutés au vocabulaire ou ignorés
+    """
+    ids = array('q')
+    indptr = array('q', [0])
+    indices = array('i')
+    data = array('f')
+
+    for profile_id, terms in rows:
+        for term, weight in terms.items():
+            column = vocabulary.get(term)
+            if column is None:
+                if not grow_vocabulary:
+                    continue
+                column = vocabulary[term] = len(vocabulary)
+            indices.append(column)
+            data.append(weight)
+        ids.append(profile_id)
+        indptr.append(len(indices))
+
+    matrix = sparse.csr_matrix(
+        (
+            np.log1p(np.frombuffer(data, dtype=np.float32)),
+            np.frombuffer(indices, dtype=np.int32),
+            np.frombuffer(indptr, dtype=np.int64),
+        ),
+        shape=(len(ids), len(vocabulary)),
+    )
+    return np.frombuffer(ids, dtype=np.int64), matrix
+
+
+def _apply_idf(matrix, idf):
+    """Pondération idf puis normalisation L2 des lignes (en place)"""
+    matrix.data *= idf[matrix.indices]
+    row_lengths = np.diff(matrix.indptr)
+    norms = np.sqrt(np.bincount(
+        np.repeat(np.arange(matrix.shape[0]), row_lengths),
+        weights=matrix.data.astype(np.float64) ** 2,
+        minlength=matrix.shape[0],
+    )).astype(np.float32)
+    norms[norms == 0] = 1.0
+    matrix.data /= np.repeat(norms, row_lengths)
+    return matrix
+
+
+def _top_scores(scores, k):
+    """Indices des k meilleurs scores positifs, triés par score décroissant"""
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    candidates = candidates[scores[candidates] > 0]
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+class MatchingIndex:
+    """Matrice TF-IDF des profils publics avec delta incrémental"""
+
+    def __init__(self, profile_ids, matrix, vocabulary, idf, watermark=None):
+        # profile_ids trié : recherche de ligne par searchsorted (pas de dict de 1M entrées)
+        self.profile_ids = profile_ids
+        self.matrix = matrix
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.watermark = watermark
+        self.synced_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._delta_terms = {}
+        # Instantané lu sans verrou par top_k : (lignes invalidées, ids delta, matrice delta)
+        self._delta = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), None)
+
+    @classmethod
+    def from_rows(cls, rows, watermark=None):
+        """Construire l'index depuis des (profile_id, {terme: poids}) triés par profile_id"""
+        vocabulary = {}
+        profile_ids, matrix = _csr_from_rows(rows, vocabulary, grow_vocabulary=True)
+        document_frequency = np.bincount(matrix.indices, minlength=len(vocabulary))
+        idf = (np.log((1 + len(profile_ids)) / (1 + document_frequency)) + 1).astype(np.float32)
+        return cls(profile_ids, _apply_idf(matrix, idf), vocabulary, idf, watermark)
+
+    @classmethod
+    def from_database(cls, config=None):
+        """Charger les vecteurs actifs depuis CandidateTermVector"""
+        from .models import CandidateTermVector
+
+        config = config or get_matching_config()
+        watermark = timezone.now()
+        rows = (
+            CandidateTermVector.objects.filter(is_active=True)
+            .order_by('profile_id')
+            .values_list('profile_id', 'terms')
+            .iterator(chunk_size=config['build_chunk_size'])
+        )
+        return cls.from_rows(rows, watermark=watermark)
+
+    def __len__(self):
+        stale_rows, delta_ids, _ = self._delta
+        return len(self.profile_ids) - len(stale_rows) + len(delta_ids)
+
+    @property
+    def delta_size(self):
+        stale_rows, delta_ids, _ = self._delta
+        return len(stale_rows) + len(delta_ids)
+
+    def needs_rebuild(self, config=None):
+        config = config or get_matching_config()
+        limit = max(config['min_rebuild_rows'], config['rebuild_ratio'] * len(self.profile_ids))
+        return self.delta_size > limit
+
+    def _idf_for(self, column):
+        if column < len(self.idf):
+            return float(self.idf[column])
+        # Terme apparu après la construction : document_frequency = 0
+        return math.log(1 + len(self.profile_ids)) + 1
+
+    def apply_changes(self, changes):
+        """
+        Appliquer des vecteurs modifiés : (profile_id, {terme: poids}, is_active)
+        Opération idempotente (une même modification peut être relue)
+        """
+        with self._lock:
+            stale_rows, _, _ = self._delta
+            stale = set(stale_rows.tolist())
+            for profile_id, terms, is_active in changes:
+                row = np.searchsorted(self.profile_ids, profile_id)
+                if row < len(self.profile_ids) and self.profile_ids[row] == profile_id:
+                    stale.add(int(row))
+                if is_active:
+                    self._delta_terms[profile_id] = terms
+                else:
+                    self._delta_terms.pop(profile_id, None)
+
+            delta_ids, delta_matrix = _csr_from_rows(
+                sorted(self._delta_terms.items()), self.vocabulary, grow_vocabulary=True
+            )
+            idf = np.array(
+                [self._idf_for(column) for column in range(len(self.vocabulary))],
+                dtype=np.float32,
+            ) if len(self.vocabulary) > len(self.idf) else self.idf
+            self._delta = (
+                np.fromiter(sorted(stale), dtype=np.int64, count=len(stale)),
+                delta_ids,
+                _apply_idf(delta_matrix, idf),
+            )
+
+    def sync(self, config=None):
+        """Lire les vecteurs modifiés depuis le dernier passage"""
+        from .models import CandidateTermVector
+
+        config = config or get_matching_config()
+        started_at = timezone.now()
+        since = self.watermark - timedelta(seconds=config['sync_overlap_seconds'])
+        changes = CandidateTermVector.objects.filter(
+            updated_at__gte=since
+        ).values_list('profile_id', 'terms', 'is_active')
+        self.apply_changes(changes.iterator(chunk_size=config['build_chunk_size']))
+        self.watermark = started_at
+        self.synced_at = time.monotonic()
+
+    def query_vector(self, terms):
+        """Vecteur TF-IDF L2-normalisé d'une requête : (colonnes, poids)"""
+        columns, weights = [], []
+        for term, weight in terms.items():
+            column = self.vocabulary.get(term)
+            if column is None:
+                continue
+            columns.append(column)
+            weights.append(math.log1p(weight) * self._idf_for(column))
+
+        columns = np.array(columns, dtype=np.int64)
+        weights = np.array(weights, dtype=np.float32)
+        norm = np.linalg.norm(weights)
+        if norm:
+            weights /= norm
+        return columns, weights
+
+    def top_k(self, terms, k=20):
+        """Les k profils les plus proches : liste de (profile_id, score cosinus)"""
+        columns, weights = self.query_vector(terms)
+        if not len(columns):
+            return []
+        stale_rows, delta_ids, delta_matrix = self._delta
+
+        # Index principal : un produit CSR × vecteur dense
+        query = np.zeros(self.matrix.shape[1], dtype=np.float32)
+        in_main = columns < self.matrix.shape[1]
+        query[columns[in_main]] = weights[in_main]
+        scores = self.matrix @ query
+        scores[stale_rows] = 0
+        best = _top_scores(scores, k)
+        results = list(zip(self.profile_ids[best].tolist(), scores[best].tolist()))
+
+        # Delta : même produit sur la petite matrice des profils modifiés
+        if delta_matrix is not None and delta_matrix.shape[0]:
+            delta_query = np.zeros(delta_matrix.shape[1], dtype=np.float32)
+            in_delta = columns < delta_matrix.shape[1]
+            delta_query[columns[in_delta]] = weights[in_delta]
+            delta_scores = delta_matrix @ delta_query
+            best = _top_scores(delta_scores, k)
+            results.extend(zip(delta_ids[best].tolist(), delta_scores[best].tolist()))
+            results.sort(key=lambda item: -item[1])
+
+        return results[:k]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def _build_index(config):
+    global _index
+    index = MatchingIndex.from_database(config)
+    with _index_lock:
+        _index = index
+    return index
+
+
+def warm_index():
+    """Lancer la construction de l'index en arrière-plan (première requête du worker)"""
+    return run_once_in_background('matching-index:build', _build_index, get_matching_config())
+
+
+def get_index():
+    """
+    Index du processus, None tant que la première construction n'est pas terminée
+    Construction et resynchronisation en arrière-plan : l'index courant reste
+    servi pendant ce temps, aucune requête n'attend une lecture des vecteurs
+    """
+    config = get_matching_config()
+    index = _index
+    if index is None or index.needs_rebuild(config):
+        run_once_in_background('matching-index:build', _build_index, config)
+    elif time.monotonic() - index.synced_at >= config['sync_interval_seconds']:
+        run_once_in_background('matching-index:sync', index.sync, config)
+    return index
+
+
+def reset_index():
+    """Oublier l'index du processus (reconstruit en arrière-plan à la prochaine requête)"""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def match_job(job_posting, limit=20):
+    """
+    Meilleurs candidats pour une offre : liste de (CandidateSearchDocument, score)
+    Les résultats passent par le modèle de lecture (profils publics uniquement)
+    None tant que la première construction de l'index est en cours
+    """
+    from candidate.models import CandidateSearchDocument
+    from .vectors import job_terms
+
+    index = get_index()
+    if index is None:
+        return None
+    # Marge pour les profils filtrés (privés, supprimés, expérience insuffisante)
+    scored = index.top_k(job_terms(job_posting), k=limit * 3)
+    documents = CandidateSearchDocument.objects.filter(
+        experience_years__gte=job_posting.min_experience_years
+    ).in_bulk([profile_id for profile_id, _ in scored])
+
+    return [
+        (documents[profile_id], score)
+        for profile_id, score in scored if profile_id in documents
+    ][:limit]
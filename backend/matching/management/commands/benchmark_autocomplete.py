@@ -0,0 +1,72 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from matching.autocomplete import AutocompleteIndex
+
+
+class Command(BaseCommand):
+    help = "Mesurer les suggestions d'autocomplétion sur un index synthétique (aucun accès base)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--candidates', type=int, default=200_000)
+        parser.add_argument('--distinct-values', type=int, default=5000, help='Valeurs distinctes par champ')
+        parser.add_argument('--queries', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        n = options['candidates']
+        distinct = options['distinct_values']
+
+        # Libellés de deux mots, fréquences de type Zipf
+        syllables = ['ma', 'ra', 'ba', 'te', 'ni', 'lo', 'su', 'ke', 'di', 'po', 'fa', 'ge']
+        def label(value):
+            first = ''.join(syllables[(value >> shift) % len(syllables)] for shift in (0, 4, 8))
+            return f"{first.title()} {syllables[value % 7].title()}{value}"
+
+        probabilities = 1.0 / np.arange(1, distinct + 1)
+        probabilities /= probabilities.sum()
+        columns = {
+            field: rng.choice(distinct, size=n, p=probabilities)
+            for field in ('university', 'major', 'location')
+        }
+
+        started = time.perf_counter()
+        index = AutocompleteIndex.from_rows(
+            {
+                'pk': profile_id + 1, 'is_profile_public': True,
+                'university': label(columns['university'][profile_id]),
+                'major': label(columns['major'][profile_id] + distinct),
+                'location': label(columns['location'][profile_id] + 2 * distinct),
+                'education_level': 'Master', 'cv_skills': ['python'] if profile_id % 3 else [],
+            }
+            for profile_id in range(n)
+        )
+        self.stdout.write(
+            f"Index : {n} profils, {len(index.labels)} valeurs, {len(index.keys)} clés "
+            f"({time.perf_counter() - started:.1f} s)"
+        )
+
+        prefixes = [
+            index.keys[position][:length]
+            for position, length in zip(
+                rng.integers(0, len(index.keys), options['queries']),
+                rng.integers(1, 6, options['queries']),
+            )
+        ]
+        for cached in (False, True):
+            timings = []
+            for prefix in prefixes:
+                if not cached:
+                    index._cache.clear()
+                started = time.perf_counter()
+                index.suggest(prefix, limit=10)
+                timings.append((time.perf_counter() - started) * 1e6)
+            timings = np.array(timings)
+            self.stdout.write(
+                f"Suggestions {'(cache)' if cached else '(sans cache)'} : "
+                f"médiane {np.median(timings):.0f} µs, p95 {np.percentile(timings, 95):.0f} µs, "
+                f"max {timings.max():.0f} µs"
+            )
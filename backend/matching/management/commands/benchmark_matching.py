@@ -0,0 +1,84 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from scipy import sparse
+
+from matching.index import MatchingIndex, _apply_idf
+
+
+class Command(BaseCommand):
+    help = "Mesurer le scoring d'une offre contre un index synthétique (aucun accès base)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--candidates', type=int, default=1_000_000)
+        parser.add_argument('--vocabulary', type=int, default=20_000)
+        parser.add_argument('--terms-per-profile', type=int, default=12)
+        parser.add_argument('--query-terms', type=int, default=15)
+        parser.add_argument('--delta', type=int, default=500, help='Profils modifiés depuis la construction')
+        parser.add_argument('--queries', type=int, default=50)
+        parser.add_argument('--top-k', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        n = options['candidates']
+        vocabulary_size = options['vocabulary']
+        per_row = options['terms_per_profile']
+
+        # Fréquences de termes de type Zipf (quelques termes très courants)
+        self.stdout.write(f"Génération de {n} profils synthétiques...")
+        started = time.perf_counter()
+        term_probabilities = 1.0 / np.arange(1, vocabulary_size + 1)
+        term_probabilities /= term_probabilities.sum()
+        indices = rng.choice(vocabulary_size, size=n * per_row, p=term_probabilities).astype(np.int32)
+        data = rng.integers(1, 4, size=n * per_row).astype(np.float32)
+        indptr = np.arange(0, n * per_row + 1, per_row, dtype=np.int64)
+        matrix = sparse.csr_matrix((data, indices, indptr), shape=(n, vocabulary_size))
+        matrix.sum_duplicates()
+        matrix.data = np.log1p(matrix.data)
+
+        document_frequency = np.bincount(matrix.indices, minlength=vocabulary_size)
+        idf = (np.log((1 + n) / (1 + document_frequency)) + 1).astype(np.float32)
+        terms = [f"t{column}" for column in range(vocabulary_size)]
+        index = MatchingIndex(
+            np.arange(1, n + 1, dtype=np.int64),
+            _apply_idf(matrix, idf),
+            {term: column for column, term in enumerate(terms)},
+            idf,
+        )
+        self.stdout.write(
+            f"Index : {n} lignes, {matrix.nnz} non-nuls, "
+            f"{(matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes) / 2**20:.0f} Mo "
+            f"({time.perf_counter() - started:.1f} s)"
+        )
+
+        if options['delta']:
+            changed = rng.choice(n, size=options['delta'], replace=False) + 1
+            index.apply_changes(
+                (int(profile_id), {terms[column]: 1.0 for column in rng.choice(vocabulary_size, per_row)}, True)
+                for profile_id in changed
+            )
+            self.stdout.write(f"Delta : {index.delta_size} ligne(s)")
+
+        queries = [
+            {terms[column]: float(rng.integers(1, 4)) for column in rng.choice(vocabulary_size, options['query_terms'], p=term_probabilities)}
+            for _ in range(options['queries'])
+        ]
+        index.top_k(queries[0], options['top_k'])  # Échauffement
+
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            index.top_k(query, options['top_k'])
+            timings.append((time.perf_counter() - started) * 1000)
+
+        timings = np.array(timings)
+        summary = (
+            f"Scoring top-{options['top_k']} : médiane {np.median(timings):.1f} ms, "
+            f"p95 {np.percentile(timings, 95):.1f} ms, max {timings.max():.1f} ms"
+        )
+        if np.percentile(timings, 95) < 100:
+            self.stdout.write(self.style.SUCCESS(summary))
+        else:
+            self.stdout.write(self.style.WARNING(summary + " (objectif : < 100 ms)"))
@@ -0,0 +1,62 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from matching.ann import IVFIndex, get_similarity_config
+from matching.embeddings import DIMENSIONS
+
+
+class Command(BaseCommand):
+    help = "Mesurer rappel et latence de l'index IVF selon nprobe (données synthétiques)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--candidates', type=int, default=200_000)
+        parser.add_argument('--clusters', type=int, default=300, help='Groupes de profils synthétiques')
+        parser.add_argument('--noise', type=float, default=1.5, help='Dispersion autour des groupes')
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--top-k', type=int, default=10)
+        parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        n, k = options['candidates'], options['top_k']
+        config = get_similarity_config()
+
+        # Profils regroupés autour de « filières » aléatoires, comme les embeddings réels
+        centers = rng.standard_normal((options['clusters'], DIMENSIONS)).astype(np.float32)
+        vectors = centers[rng.integers(0, options['clusters'], n)]
+        vectors += options['noise'] * rng.standard_normal((n, DIMENSIONS)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+        started = time.perf_counter()
+        index = IVFIndex.build(np.arange(n, dtype=np.int64), vectors, config=config)
+        self.stdout.write(
+            f"Index : {n} profils, {len(index.centroids)} listes ({time.perf_counter() - started:.1f} s)"
+        )
+
+        queries = vectors[rng.choice(n, options['queries'], replace=False)]
+        exact, brute_ms = [], []
+        for query in queries:
+            started = time.perf_counter()
+            ids, _ = index.brute_force(query, k)
+            brute_ms.append((time.perf_counter() - started) * 1000)
+            exact.append(set(ids.tolist()))
+        self.stdout.write(f"Force brute : {np.mean(brute_ms):.2f} ms / requête")
+
+        self.stdout.write(f"{'nprobe':>8} {'rappel@' + str(k):>10} {'moyenne':>10} {'p95':>10}")
+        for nprobe in options['nprobe']:
+            recalls, timings = [], []
+            for query, truth in zip(queries, exact):
+                started = time.perf_counter()
+                ids, _ = index.search(query, k, nprobe=nprobe)
+                timings.append((time.perf_counter() - started) * 1000)
+                recalls.append(len(truth & set(ids.tolist())) / k)
+            line = (
+                f"{nprobe:>8} {np.mean(recalls):>10.3f} "
+                f"{np.mean(timings):>8.2f}ms {np.percentile(timings, 95):>8.2f}ms"
+            )
+            if nprobe == config['nprobe']:
+                line += "  <- configuration actuelle"
+            self.stdout.write(line)
@@ -0,0 +1,18 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from matching.ann import get_similarity_config, rebuild_similarity_index
+
+
+class Command(BaseCommand):
+    help = "Reconstruire l'index des profils similaires (à planifier, ex. chaque nuit)"
+
+    def handle(self, *args, **options):
+        config = get_similarity_config()
+        started = time.perf_counter()
+        index = rebuild_similarity_index(config)
+        self.stdout.write(self.style.SUCCESS(
+            f"Index {index.version} : {len(index.ids)} profil(s), {len(index.centroids)} liste(s) "
+            f"dans {config['index_dir']} ({time.perf_counter() - started:.1f} s)"
+        ))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from matching.vectors import VECTOR_BATCH_SIZE, rebuild_term_vectors
+
+
+class Command(BaseCommand):
+    help = "Recalculer les vecteurs de termes de tous les profils candidats (matching)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=VECTOR_BATCH_SIZE,
+            help='Nombre de profils traités par transaction'
+        )
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_term_vectors(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"{rebuilt} vecteur(s) de termes recalculé(s)"))
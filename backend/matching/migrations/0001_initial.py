@@ -0,0 +1,80 @@
+# Generated by Django 5.0.8 on 2026-10-19 02:39
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_term_vectors(apps, schema_editor):
+    """Calculer les vecteurs des profils existants"""
+    from matching.vectors import candidate_terms
+
+    CandidateProfile = apps.get_model('candidate', 'CandidateProfile')
+    CandidateTermVector = apps.get_model('matching', 'CandidateTermVector')
+
+    vectors = []
+    for row in CandidateProfile.objects.values(
+        'pk', 'is_profile_public', 'major', 'education_level', 'university', 'location'
+    ).iterator(chunk_size=1000):
+        vectors.append(CandidateTermVector(
+            profile_id=row['pk'],
+            terms=candidate_terms(row),
+            is_active=row['is_profile_public'],
+        ))
+        if len(vectors) >= 1000:
+            CandidateTermVector.objects.bulk_create(vectors)
+            vectors = []
+    CandidateTermVector.objects.bulk_create(vectors)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('candidate', '0003_candidate_ranking'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateTermVector',
+            fields=[
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='term_vector', serialize=False, to='candidate.candidateprofile')),
+                ('terms', models.JSONField(default=dict)),
+                ('is_active', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Vecteur de termes candidat',
+                'verbose_name_plural': 'Vecteurs de termes candidats',
+            },
+        ),
+        migrations.CreateModel(
+            name='JobPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('company_name', models.CharField(blank=True, max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('contract_type', models.CharField(choices=[('cdi', 'CDI'), ('cdd', 'CDD'), ('internship', 'Stage'), ('freelance', 'Freelance')], default='cdi', max_length=20)),
+                ('required_major', models.CharField(blank=True, max_length=200)),
+                ('education_level', models.CharField(blank=True, max_length=100)),
+                ('location', models.CharField(blank=True, max_length=200)),
+                ('min_experience_years', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0)])),
+                ('keywords', models.CharField(blank=True, max_length=500)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('recruiter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_postings', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': "Offre d'emploi",
+                'verbose_name_plural': "Offres d'emploi",
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['recruiter', '-created_at'], name='matching_jo_recruit_84d7d3_idx'), models.Index(fields=['is_active', '-created_at'], name='matching_jo_is_acti_90a003_idx')],
+            },
+        ),
+        migrations.RunPython(populate_term_vectors, migrations.RunPython.noop),
+    ]
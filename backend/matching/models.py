@@ -0,0 +1,71 @@
+# backend/matching/models.py
+from django.db import models
+from django.contrib.auth.models import User
+from django.core.validators import MinValueValidator
+
+
+class JobPosting(models.Model):
+    """Offre d'emploi publiée par un recruteur"""
+    
+    CONTRACT_TYPES = [
+        ('cdi', 'CDI'),
+        ('cdd', 'CDD'),
+        ('internship', 'Stage'),
+        ('freelance', 'Freelance'),
+    ]
+    
+    recruiter = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_postings')
+    
+    # Description du poste
+    title = models.CharField(max_length=200)
+    company_name = models.CharField(max_length=200, blank=True)
+    description = models.TextField(blank=True)
+    contract_type = models.CharField(max_length=20, choices=CONTRACT_TYPES, default='cdi')
+    
+    # Profil recherché (mêmes champs que CandidateProfile)
+    required_major = models.CharField(max_length=200, blank=True)
+    education_level = models.CharField(max_length=100, blank=True)
+    location = models.CharField(max_length=200, blank=True)
+    min_experience_years = models.IntegerField(default=0, validators=[MinValueValidator(0)])
+    keywords = models.CharField(max_length=500, blank=True)  # Compétences séparées par des virgules
+    
+    # Métadonnées
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Offre d'emploi"
+        verbose_name_plural = "Offres d'emploi"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recruiter', '-created_at']),
+            models.Index(fields=['is_active', '-created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.title} - {self.company_name or self.recruiter.username}"
+
+
+class CandidateTermVector(models.Model):
+    """
+    Termes pondérés d'un profil candidat (fréquences brutes, avant IDF)
+    Tenu à jour par signaux, lu par delta (updated_at) par l'index en mémoire
+    """
+    
+    profile = models.OneToOneField(
+        'candidate.CandidateProfile',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='term_vector'
+    )
+    terms = models.JSONField(default=dict)  # {terme: poids}
+    is_active = models.BooleanField(default=True)  # Profil public
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    
+    class Meta:
+        verbose_name = 'Vecteur de termes candidat'
+        verbose_name_plural = 'Vecteurs de termes candidats'
+    
+    def __str__(self):
+        return f"Termes du profil {self.profile_id} ({len(self.terms)})"
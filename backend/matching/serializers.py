@@ -0,0 +1,23 @@
+# backend/matching/serializers.py
+from rest_framework import serializers
+
+from .models import JobPosting
+
+
+class JobPostingSerializer(serializers.ModelSerializer):
+    """Serializer pour les offres d'emploi"""
+    
+    recruiter_name = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = JobPosting
+        fields = [
+            'id', 'recruiter', 'recruiter_name', 'title', 'company_name',
+            'description', 'contract_type', 'required_major', 'education_level',
+            'location', 'min_experience_years', 'keywords', 'is_active',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = ['created_at', 'updated_at']
+    
+    def get_recruiter_name(self, obj):
+        return obj.recruiter.get_full_name() or obj.recruiter.username
@@ -0,0 +1,33 @@
+# backend/matching/signals.py
+"""
+Signaux de l'app matching
+Recalculent le vecteur de termes d'un profil quand un champ indexé change
+"""
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from candidate.models import CandidateProfile
+from candidate.signals import profiles_changed
+from .vectors import CANDIDATE_TERM_FIELDS, update_term_vectors
+
+
+INDEXED_PROFILE_FIELDS = set(CANDIDATE_TERM_FIELDS) - {'pk'}
+
+
+@receiver(post_save, sender=CandidateProfile)
+def update_profile_term_vector(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Profil créé ou modifié : vecteur recalculé après le commit"""
+    if raw:
+        return
+    if update_fields and not INDEXED_PROFILE_FIELDS & set(update_fields):
+        return
+    transaction.on_commit(partial(update_term_vectors, [instance.pk]))
+
+
+@receiver(profiles_changed, sender=CandidateProfile)
+def update_changed_term_vectors(sender, profile_ids, **kwargs):
+    """Profils modifiés par update() (approbation, complétude) : vecteurs recalculés après le commit"""
+    transaction.on_commit(partial(update_term_vectors, profile_ids))
@@ -0,0 +1,188 @@
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.signals import request_started
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from candidate.models import CandidateProfile, CandidateSearchDocument
+from candidate.search_documents import refresh_document_fields, sync_search_documents
+from candidate.signals import notify_profiles_changed
+from . import ann, autocomplete, index as matching_index
+from .apps import warm_indexes
+from .models import CandidateTermVector, JobPosting
+
+
+class MatchingIndexTests(TestCase):
+    def setUp(self):
+        matching_index.reset_index()
+        self.addCleanup(matching_index.reset_index)
+        recruiter = User.objects.create(username='recruteur')
+        self.job = JobPosting.objects.create(recruiter=recruiter, title='Développeur Python', keywords='python')
+        # Rendu des JSON en arrière-plan désactivé
+        patcher = mock.patch('candidate.payloads.run_after_commit')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        user = User.objects.create(username='candidat', email='candidat@example.com')
+        with self.captureOnCommitCallbacks(execute=True):
+            CandidateProfile.objects.create(user=user, first_name='Salma', last_name='Idrissi', major='python')
+
+    @mock.patch('matching.index.run_once_in_background')
+    def test_first_build_runs_off_request(self, run_once_in_background):
+        with mock.patch.object(matching_index.MatchingIndex, 'from_database') as from_database:
+            self.assertIsNone(matching_index.match_job(self.job))
+            from_database.assert_not_called()
+        run_once_in_background.assert_called_once_with(
+            'matching-index:build', matching_index._build_index, mock.ANY
+        )
+
+        # Tâche d'arrière-plan exécutée : l'index construit est servi
+        _, task, config = run_once_in_background.call_args.args
+        built = task(config)
+        self.assertIs(matching_index.get_index(), built)
+        self.assertEqual([document.profile_id for document, _ in matching_index.match_job(self.job)],
+                         list(CandidateProfile.objects.values_list('pk', flat=True)))
+
+    @mock.patch('matching.index.run_once_in_background')
+    def test_pending_while_first_build_runs(self, run_once_in_background):
+        response = self.client.get(f'/api/matching/jobs/{self.job.pk}/matches/')
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(response.json()['pending'])
+
+        response = self.client.post(f'/api/matching/jobs/{self.job.pk}/notify_matches/')
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response)
+
+    def test_term_vectors_follow_update_paths(self):
+        profile = CandidateProfile.objects.get()
+        CandidateProfile.objects.filter(pk=profile.pk).update(is_profile_public=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            notify_profiles_changed([profile.pk])
+        self.assertFalse(CandidateTermVector.objects.get(profile=profile).is_active)
+
+        # Approbation par update() (admin approve_profiles)
+        CandidateProfile.objects.filter(pk=profile.pk).update(is_profile_public=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            notify_profiles_changed([profile.pk])
+        self.assertTrue(CandidateTermVector.objects.get(profile=profile).is_active)
+
+    @mock.patch('matching.autocomplete.warm_autocomplete_index')
+    @mock.patch('matching.index.warm_index')
+    def test_indexes_warmed_on_first_server_request(self, warm_index, warm_autocomplete_index):
+        self.addCleanup(request_started.connect, warm_indexes)
+        self.client.get(f'/api/matching/jobs/{self.job.pk}/')
+        warm_index.assert_not_called()
+
+        request_started.send(sender=WSGIHandler, environ={})
+        request_started.send(sender=WSGIHandler, environ={})
+        warm_index.assert_called_once_with()
+        warm_autocomplete_index.assert_called_once_with()
+
+
+class SimilarityIndexTests(TestCase):
+    def setUp(self):
+        ann._index = None
+        self.addCleanup(setattr, ann, '_index', None)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(CANDIDATE_SIMILARITY={'index_dir': directory.name})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        patcher = mock.patch('candidate.payloads.run_after_commit')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.profiles = []
+        for position, major in enumerate(['informatique', 'finance']):
+            user = User.objects.create(username=f'candidat-{position}', email=f'candidat-{position}@example.com')
+            with self.captureOnCommitCallbacks(execute=True):
+                self.profiles.append(CandidateProfile.objects.create(
+                    user=user, first_name='Candidat', last_name=str(position), major=major
+                ))
+
+    @mock.patch('matching.ann.run_once_in_background')
+    def test_no_rebuild_during_request(self, run_once_in_background):
+        with mock.patch('matching.ann.rebuild_similarity_index') as rebuild:
+            self.assertIsNone(ann.get_similarity_index())
+            rebuild.assert_not_called()
+        run_once_in_background.assert_called_once_with(
+            'similarity-index:rebuild', ann._rebuild_in_background, mock.ANY
+        )
+
+    def test_sync_follows_document_writes_and_removals(self):
+        index = ann.IVFIndex.from_database()
+        # Documents écrits bien avant la construction
+        now = timezone.now()
+        CandidateSearchDocument.objects.update(updated_at=now - timedelta(days=2), indexed_at=now - timedelta(days=2))
+        index.watermark = now - timedelta(days=1)
+        kept, removed = self.profiles
+
+        # Écriture du document sans changement de updated_at (colonne recopiée) ; dérive du score ignorée
+        refresh_document_fields([kept.pk], ['status'])
+        refresh_document_fields([removed.pk], ['rank_score'], log_changes=False)
+        CandidateProfile.objects.filter(pk=removed.pk).update(is_profile_public=False)
+        sync_search_documents([removed.pk])
+        index.sync()
+
+        tombstones, delta_ids, _ = index._delta
+        self.assertEqual(delta_ids.tolist(), [kept.pk])
+        self.assertCountEqual(tombstones.tolist(), [kept.pk, removed.pk])
+        ids, _ = index.search(index.vectors[0], k=10)
+        self.assertNotIn(removed.pk, ids.tolist())
+
+
+class AutocompleteIndexTests(TestCase):
+    def setUp(self):
+        autocomplete.reset_autocomplete_index()
+        self.addCleanup(autocomplete.reset_autocomplete_index)
+        patcher = mock.patch('candidate.payloads.run_after_commit')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        user = User.objects.create(username='candidat', email='candidat@example.com')
+        with self.captureOnCommitCallbacks(execute=True):
+            CandidateProfile.objects.create(
+                user=user, first_name='Salma', last_name='Idrissi', university='Université Mohammed V'
+            )
+
+    @mock.patch('matching.autocomplete.run_once_in_background')
+    def test_build_runs_off_request(self, run_once_in_background):
+        with mock.patch.object(autocomplete.AutocompleteIndex, 'from_database') as from_database:
+            self.assertEqual(autocomplete.autocomplete('moh'), [])
+            from_database.assert_not_called()
+        _, task, config = run_once_in_background.call_args.args
+        self.assertIs(task, autocomplete._build_index)
+
+        # Tâche d'arrière-plan exécutée, puis resynchronisation lancée elle aussi en arrière-plan
+        index = task(config)
+        self.assertEqual(
+            [suggestion['value'] for suggestion in autocomplete.autocomplete('moh')], ['Université Mohammed V']
+        )
+        index.synced_at -= config['sync_interval_seconds']
+        run_once_in_background.reset_mock()
+        with mock.patch.object(index, 'sync') as sync:
+            self.assertIs(autocomplete.get_autocomplete_index(), index)
+            sync.assert_not_called()
+        run_once_in_background.assert_called_once_with('autocomplete-index:sync', mock.ANY, config)
+
+    def test_sync_follows_update_paths(self):
+        profile = CandidateProfile.objects.get()
+        CandidateProfile.objects.filter(pk=profile.pk).update(is_profile_public=False)
+        sync_search_documents([profile.pk])
+        index = autocomplete.AutocompleteIndex.from_database()
+        self.assertEqual(index.suggest('moh'), [])
+
+        # Approbation par update() (admin approve_profiles) : updated_at du profil inchangé
+        CandidateProfile.objects.filter(pk=profile.pk).update(
+            is_profile_public=True, updated_at=timezone.now() - timedelta(days=1)
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            notify_profiles_changed([profile.pk])
+        index.sync()
+        self.assertEqual([suggestion['value'] for suggestion in index.suggest('moh')], ['Université Mohammed V'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.delete()
+        index.sync()
+        self.assertEqual(index.suggest('moh'), [])
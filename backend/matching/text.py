@@ -0,0 +1,44 @@
+# backend/matching/text.py
+"""
+Normalisation et tokenisation des textes (profils, offres, CV)
+"""
+import re
+import unicodedata
+from collections import Counter
+
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Mots vides français et anglais les plus fréquents dans les offres et les CV
+STOPWORDS = frozenset("""
+    a au aux avec ce ces dans de des du en et est il elle ils la le les leur mais
+    nous ou par pas pour qui que sa se ses son sur un une vous votre vos nos notre
+    the and for with from this that are was were will you your our of to in on at
+    an as be by or is it its
+""".split())
+
+
+def fold(text):
+    """Minuscules et suppression des accents"""
+    normalized = unicodedata.normalize('NFKD', text or '')
+    return ''.join(char for char in normalized if not unicodedata.combining(char)).lower()
+
+
+def tokenize(text):
+    """Liste des tokens significatifs d'un texte"""
+    return [
+        token for token in TOKEN_RE.findall(fold(text))
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def weighted_terms(fields):
+    """
+    Fréquences de termes pondérées par champ
+    `fields` : itérable de (texte, poids)
+    """
+    counts = Counter()
+    for text, weight in fields:
+        for token in tokenize(text):
+            counts[token] += weight
+    return dict(counts)
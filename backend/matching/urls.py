@@ -0,0 +1,12 @@
+# backend/matching/urls.py
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from . import views
+
+# Router pour les ViewSets
+router = DefaultRouter()
+router.register(r'jobs', views.JobPostingViewSet, basename='job-posting')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
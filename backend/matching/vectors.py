@@ -0,0 +1,112 @@
+# backend/matching/vectors.py
+"""
+Construction et maintenance des vecteurs de termes (CandidateTermVector)
+"""
+from django.db import transaction
+
+from .text import weighted_terms
+
+
+VECTOR_BATCH_SIZE = 1000
+
+# Poids des champs du profil candidat
+CANDIDATE_FIELD_BOOSTS = {
+    'major': 3.0,
+    'education_level': 2.0,
+    'university': 1.5,
+    'location': 1.0,
+    'cv_skills': 2.0,
+    'cv_text': 0.5,
+}
+
+# Termes conservés par profil (le texte du CV en apporterait des centaines)
+MAX_CANDIDATE_TERMS = 64
+
+# Poids des champs de l'offre (mêmes termes que les profils)
+JOB_FIELD_BOOSTS = {
+    'required_major': 3.0,
+    'title': 2.0,
+    'keywords': 2.0,
+    'education_level': 2.0,
+    'location': 1.0,
+    'description': 1.0,
+}
+
+CANDIDATE_TERM_FIELDS = ['pk', 'is_profile_public', *CANDIDATE_FIELD_BOOSTS]
+
+
+def _field_text(value):
+    if isinstance(value, (list, tuple)):
+        return ' '.join(value)
+    return value or ''
+
+
+def candidate_terms(values):
+    """
+    Termes pondérés d'un profil (dict des champs de CANDIDATE_FIELD_BOOSTS)
+    Les champs absents sont ignorés ; seuls les MAX_CANDIDATE_TERMS plus lourds sont gardés
+    """
+    terms = weighted_terms(
+        (_field_text(values.get(field)), boost) for field, boost in CANDIDATE_FIELD_BOOSTS.items()
+    )
+    if len(terms) > MAX_CANDIDATE_TERMS:
+        terms = dict(sorted(terms.items(), key=lambda item: (-item[1], item[0]))[:MAX_CANDIDATE_TERMS])
+    return terms
+
+
+def job_terms(job):
+    """Termes pondérés d'une offre d'emploi"""
+    return weighted_terms(
+        (getattr(job, field) or '', boost) for field, boost in JOB_FIELD_BOOSTS.items()
+    )
+
+
+def update_term_vectors(profile_ids):
+    """Recalculer les vecteurs des profils donnés (upsert par lot)"""
+    from candidate.models import CandidateProfile
+    from .models import CandidateTermVector
+
+    profile_ids = list(set(profile_ids))
+    updated = 0
+    for start in range(0, len(profile_ids), VECTOR_BATCH_SIZE):
+        rows = CandidateProfile.objects.filter(
+            pk__in=profile_ids[start:start + VECTOR_BATCH_SIZE]
+        ).values(*CANDIDATE_TERM_FIELDS)
+        vectors = [
+            CandidateTermVector(
+                profile_id=row['pk'],
+                terms=candidate_terms(row),
+                is_active=row['is_profile_public'],
+            )
+            for row in rows
+        ]
+        if vectors:
+            # updated_at (auto_now) est renseigné à l'insertion et recopié en cas de conflit
+            CandidateTermVector.objects.bulk_create(
+                vectors,
+                update_conflicts=True,
+                unique_fields=['profile'],
+                update_fields=['terms', 'is_active', 'updated_at'],
+            )
+        updated += len(vectors)
+    return updated
+
+
+def rebuild_term_vectors(batch_size=VECTOR_BATCH_SIZE):
+    """Recalculer tous les vecteurs par lots de clés primaires"""
+    from candidate.models import CandidateProfile
+
+    rebuilt = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            CandidateProfile.objects.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not batch:
+            break
+        with transaction.atomic():
+            rebuilt += update_term_vectors(batch)
+        last_pk = batch[-1]
+    return rebuilt
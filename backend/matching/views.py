@@ -0,0 +1,105 @@
+# backend/matching/views.py
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from candidate.serializers import CandidateSearchDocumentSerializer
+from notifications.models import create_job_match_notifications
+from .index import match_job
+from .models import JobPosting
+from .serializers import JobPostingSerializer
+
+
+MAX_MATCH_LIMIT = 100
+MAX_NOTIFY_LIMIT = 500
+# Délai suggéré au client pendant la première construction de l'index (secondes)
+INDEX_PENDING_RETRY_AFTER = 5
+
+
+def _bounded_int(value, default, maximum):
+    try:
+        return max(1, min(int(value), maximum))
+    except (TypeError, ValueError):
+        return default
+
+
+class JobPostingViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet pour les offres d'emploi et le matching automatique des candidats
+    """
+    serializer_class = JobPostingSerializer
+    permission_classes = [permissions.AllowAny]  # À remplacer par une authentification recruteur
+    
+    def get_queryset(self):
+        queryset = JobPosting.objects.select_related('recruiter')
+        
+        recruiter_id = self.request.query_params.get('recruiter')
+        if recruiter_id:
+            queryset = queryset.filter(recruiter_id=recruiter_id)
+        
+        is_active = self.request.query_params.get('is_active')
+        if is_active is not None:
+            queryset = queryset.filter(is_active=is_active.lower() == 'true')
+        
+        return queryset
+    
+    @action(detail=True, methods=['get'])
+    def matches(self, request, pk=None):
+        """
+        Candidats les plus proches de l'offre (similarité cosinus TF-IDF)
+        202 avec une liste vide tant que l'index est en construction
+        """
+        job_posting = self.get_object()
+        limit = _bounded_int(request.query_params.get('limit'), 20, MAX_MATCH_LIMIT)
+        
+        matches = match_job(job_posting, limit)
+        if matches is None:
+            return Response(
+                {'job_id': job_posting.id, 'count': 0, 'results': [], 'pending': True},
+                status=status.HTTP_202_ACCEPTED
+            )
+        results = CandidateSearchDocumentSerializer([document for document, _ in matches], many=True).data
+        for data, (_, score) in zip(results, matches):
+            data['match_score'] = round(score, 4)
+        
+        return Response({
+            'job_id': job_posting.id,
+            'count': len(results),
+            'results': results,
+            'pending': False
+        })
+    
+    @action(detail=True, methods=['post'])
+    def notify_matches(self, request, pk=None):
+        """
+        Envoyer une notification job_match aux meilleurs candidats de l'offre
+        503 (Retry-After) tant que l'index est en construction : rien n'est envoyé
+        """
+        job_posting = self.get_object()
+        if not job_posting.is_active:
+            return Response(
+                {'error': "L'offre n'est plus active"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        limit = _bounded_int(request.data.get('limit'), 50, MAX_NOTIFY_LIMIT)
+        try:
+            min_score = float(request.data.get('min_score', 0.1))
+        except (TypeError, ValueError):
+            min_score = 0.1
+        
+        matches = match_job(job_posting, limit)
+        if matches is None:
+            return Response(
+                {'error': "Index de matching en construction, réessayer", 'pending': True},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(INDEX_PENDING_RETRY_AFTER)}
+            )
+        matches = [(document, score) for document, score in matches if score >= min_score]
+        notifications = create_job_match_notifications(job_posting, matches)
+        
+        return Response({
+            'job_id': job_posting.id,
+            'matched': len(matches),
+            'notified': len(notifications)
+        })
@@ -2,11 +2,17 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.db.models import Count
+from video_studio.pagination import ApproximateCountPaginator
 from .models import Notification, NotificationPreference, NotificationTemplate
+from .stats import invalidate_notification_stats
 
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
+    # Table volumineuse : total estimé au-delà du seuil
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+    
     list_display = [
         'title_truncated',
         'recipient_name',
@@ -145,10 +151,18 @@ class NotificationAdmin(admin.ModelAdmin):
     
     actions = ['mark_as_read', 'mark_as_unread', 'archive_notifications']
     
+    def _update(self, queryset, **values):
+        """update() sans post_save : statistiques des destinataires invalidées ici"""
+        recipient_ids = set(queryset.order_by().values_list('recipient_id', flat=True).distinct())
+        updated = queryset.update(**values)
+        invalidate_notification_stats(*recipient_ids)
+        return updated
+    
     def mark_as_read(self, request, queryset):
         """Marquer comme lues"""
         from django.utils import timezone
-        updated = queryset.filter(is_read=False).update(
+        updated = self._update(
+            queryset.filter(is_read=False),
             is_read=True,
             read_at=timezone.now()
         )
@@ -160,7 +174,8 @@ class NotificationAdmin(admin.ModelAdmin):
     
     def mark_as_unread(self, request, queryset):
         """Marquer comme non lues"""
-        updated = queryset.filter(is_read=True).update(
+        updated = self._update(
+            queryset.filter(is_read=True),
             is_read=False,
             read_at=None
         )
@@ -172,7 +187,7 @@ class NotificationAdmin(admin.ModelAdmin):
     
     def archive_notifications(self, request, queryset):
         """Archiver les notifications"""
-        updated = queryset.update(is_archived=True)
+        updated = self._update(queryset, is_archived=True)
         self.message_user(
             request,
             f"{updated} notification(s) archivée(s)."
@@ -3,6 +3,8 @@ from django.contrib.auth.models import User
 from django.utils import timezone
 import json
 
+from .stats import invalidate_notification_stats
+
 
 class NotificationManager(models.Manager):
     """Manager pour les notifications avec méthodes utiles"""
@@ -336,4 +338,78 @@ def create_sync_needed_notification(candidate_profile):
             'cv_updated_at': candidate_profile.cv_last_updated.isoformat() if candidate_profile.cv_last_updated else None,
             'video_updated_at': candidate_profile.video_last_updated.isoformat() if candidate_profile.video_last_updated else None
         }
-    )
\ No newline at end of file
+    )
+
+
+def create_job_match_notifications(job_posting, matches):
+    """
+    Notifier les candidats correspondant à une offre (un seul INSERT)
+    `matches` : liste de (candidat, score), profil ou document de recherche. Les candidats déjà notifiés pour cette offre sont ignorés
+    """
+    already_notified = set(Notification.objects.filter(
+        notification_type='job_match',
+        related_object_type='job_posting',
+        related_object_id=job_posting.id,
+        recipient_id__in=[candidate.user_id for candidate, _ in matches]
+    ).values_list('recipient_id', flat=True))
+    
+    notifications = [
+        Notification(
+            recipient_id=candidate.user_id,
+            sender=job_posting.recruiter,
+            notification_type='job_match',
+            title='Nouvelle offre correspondante',
+            message=f'L\'offre "{job_posting.title}" correspond à votre profil',
+            related_object_type='job_posting',
+            related_object_id=job_posting.id,
+            extra_data={
+                'job_id': job_posting.id,
+                'job_title': job_posting.title,
+                'company_name': job_posting.company_name,
+                'match_score': round(score, 4)
+            }
+        )
+        for candidate, score in matches
+        if candidate.user_id not in already_notified
+    ]
+    created = Notification.objects.bulk_create(notifications)
+    # bulk_create n'envoie pas post_save
+    invalidate_notification_stats(*(notification.recipient_id for notification in created))
+    return created
+
+
+def create_saved_search_notifications(alerts, sample_size=20):
+    """
+    Une notification par recruteur pour les nouveaux profils de ses recherches enregistrées
+    `alerts` : {recruiter_id: [(recherche enregistrée, ids des nouveaux candidats)]}
+    """
+    notifications = []
+    for recruiter_id, searches in alerts.items():
+        total = sum(len(candidate_ids) for _, candidate_ids in searches)
+        if len(searches) == 1:
+            message = f'{total} nouveau(x) profil(s) pour votre recherche "{searches[0][0].name}"'
+        else:
+            message = f'{total} nouveau(x) profil(s) pour {len(searches)} de vos recherches enregistrées'
+        notifications.append(Notification(
+            recipient_id=recruiter_id,
+            notification_type='job_match',
+            title='Nouveaux candidats correspondants',
+            message=message,
+            related_object_type='saved_search',
+            related_object_id=searches[0][0].id if len(searches) == 1 else None,
+            extra_data={
+                'total': total,
+                'searches': [
+                    {
+                        'saved_search_id': saved_search.id,
+                        'name': saved_search.name,
+                        'new_count': len(candidate_ids),
+                        'candidate_ids': candidate_ids[:sample_size],
+                    }
+                    for saved_search, candidate_ids in searches
+                ],
+            }
+        ))
+    created = Notification.objects.bulk_create(notifications)
+    invalidate_notification_stats(*alerts)
+    return created
@@ -0,0 +1,18 @@
+# backend/notifications/signals.py
+"""
+Signaux de l'app notifications
+Invalident les statistiques en cache du destinataire
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Notification
+from .stats import invalidate_notification_stats
+
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def invalidate_recipient_stats(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate_notification_stats(instance.recipient_id)
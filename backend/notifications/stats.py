@@ -0,0 +1,87 @@
+# backend/notifications/stats.py
+"""
+Statistiques de notifications par utilisateur
+
+Servies depuis le cache (video_studio.single_flight) : calcul unique pour
+les requêtes concurrentes, valeur expirée servie pendant son recalcul.
+Toute écriture d'une notification du destinataire supprime la valeur
+(notifications.signals, mark_all_as_read, actions de l'admin, créations
+groupées par bulk_create) : le compteur de non lues ne reste pas périmé
+après une lecture.
+Réglages dans settings.NOTIFICATION_STATS_CACHE.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from video_studio.single_flight import get_entry, invalidate
+
+
+DEFAULT_STATS_CACHE_CONFIG = {
+    'timeout': 30,
+    'stale_timeout': 300,
+}
+
+
+def get_stats_cache_config():
+    """Configuration par défaut surchargée par settings.NOTIFICATION_STATS_CACHE"""
+    return {**DEFAULT_STATS_CACHE_CONFIG, **getattr(settings, 'NOTIFICATION_STATS_CACHE', {})}
+
+
+def _cache_key(user_id):
+    return f'notification_stats:{user_id}'
+
+
+def compute_notification_stats(user):
+    from .models import Notification
+
+    # Statistiques de base
+    total = Notification.objects.filter(recipient=user).count()
+    unread = Notification.objects.unread_for_user(user).count()
+    today = Notification.objects.filter(
+        recipient=user,
+        created_at__date=timezone.now().date()
+    ).count()
+    this_week = Notification.objects.recent_for_user(user, days=7).count()
+
+    # Notifications récentes par type
+    recent_by_type = Notification.objects.recent_for_user(user, days=30).values(
+        'notification_type'
+    ).annotate(count=Count('id')).order_by('-count')[:5]
+
+    # Notifications non lues par priorité
+    unread_by_priority = Notification.objects.unread_for_user(user).values(
+        'priority'
+    ).annotate(count=Count('id'))
+
+    return {
+        'stats': {
+            'total': total,
+            'unread': unread,
+            'today': today,
+            'this_week': this_week
+        },
+        'recent_by_type': list(recent_by_type),
+        'unread_by_priority': list(unread_by_priority),
+    }
+
+
+def get_notification_stats(user):
+    """Entrée en cache {'value', 'computed_at', ...} des statistiques de l'utilisateur"""
+    config = get_stats_cache_config()
+    return get_entry(
+        _cache_key(user.pk), lambda: compute_notification_stats(user), config['timeout'], config['stale_timeout']
+    )
+
+
+def invalidate_notification_stats(*user_ids):
+    """Après le commit : une lecture concurrente recalculerait sinon les anciennes données"""
+    keys = {_cache_key(user_id) for user_id in user_ids}
+
+    def invalidate_all():
+        for key in keys:
+            invalidate(key)
+
+    if keys:
+        transaction.on_commit(invalidate_all)
@@ -0,0 +1,55 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from candidate.models import CandidateProfile
+from matching.models import JobPosting
+from recruiter.models import SavedSearch
+from .models import Notification, create_job_match_notifications, create_saved_search_notifications
+from .stats import get_notification_stats
+
+
+class NotificationStatsInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.recruiter = User.objects.create(username='recruteur')
+        self.job = JobPosting.objects.create(recruiter=self.recruiter, title='Développeur Python')
+        self.candidate = User.objects.create(username='candidat', email='candidat@example.com')
+        self.profile = CandidateProfile.objects.create(user=self.candidate, first_name='Salma', last_name='Idrissi')
+
+    def unread(self):
+        return get_notification_stats(self.candidate)['value']['stats']['unread']
+
+    def test_job_match_bulk_create(self):
+        self.assertEqual(self.unread(), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            create_job_match_notifications(self.job, [(self.profile, 0.8)])
+        self.assertEqual(self.unread(), 1)
+
+    def test_saved_search_bulk_create(self):
+        saved_search = SavedSearch.objects.create(
+            recruiter=self.recruiter, name='Python', signature='python', last_evaluated_at=timezone.now()
+        )
+        stats = get_notification_stats(self.recruiter)['value']['stats']
+        self.assertEqual(stats['unread'], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            create_saved_search_notifications({self.recruiter.pk: [(saved_search, [self.profile.pk])]})
+        self.assertEqual(get_notification_stats(self.recruiter)['value']['stats']['unread'], 1)
+
+    def test_admin_mark_as_read(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            notification = Notification.objects.create(
+                recipient=self.candidate, title='Bienvenue', message='Bienvenue', notification_type='welcome'
+            )
+        self.assertEqual(self.unread(), 1)
+
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'secret')
+        self.client.force_login(admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/admin/notifications/notification/', {
+                'action': 'mark_as_read', '_selected_action': [notification.pk],
+            })
+
+        self.assertEqual(self.unread(), 0)
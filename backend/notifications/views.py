@@ -9,6 +9,7 @@ from django.views.decorators.csrf import csrf_exempt
 import json
 
 from .models import Notification, NotificationPreference, NotificationTemplate
+from .stats import get_notification_stats, invalidate_notification_stats
 from .serializers import (
     NotificationSerializer, NotificationPreferenceSerializer,
     NotificationTemplateSerializer
@@ -97,6 +98,8 @@ class NotificationViewSet(viewsets.ModelViewSet):
             
             count = notifications.count()
             notifications.update(is_read=True, read_at=timezone.now())
+            # update() sans signal
+            invalidate_notification_stats(user.pk)
             
             return Response({
                 'message': f'{count} notifications marquées comme lues',
@@ -299,40 +302,16 @@ def bulk_create_notifications(request):
 def notification_stats(request, user_id):
     """
     Obtenir les statistiques de notifications pour un utilisateur
+    Servies depuis le cache (voir notifications/stats.py)
     """
     try:
         user = User.objects.get(id=user_id)
-        
-        # Statistiques de base
-        total = Notification.objects.filter(recipient=user).count()
-        unread = Notification.objects.unread_for_user(user).count()
-        today = Notification.objects.filter(
-            recipient=user,
-            created_at__date=timezone.now().date()
-        ).count()
-        this_week = Notification.objects.recent_for_user(user, days=7).count()
-        
-        # Notifications récentes par type
-        recent_by_type = Notification.objects.recent_for_user(user, days=30).values(
-            'notification_type'
-        ).annotate(count=Count('id')).order_by('-count')[:5]
-        
-        # Notifications non lues par priorité
-        unread_by_priority = Notification.objects.unread_for_user(user).values(
-            'priority'
-        ).annotate(count=Count('id'))
+        entry = get_notification_stats(user)
         
         return JsonResponse({
             'user_id': user_id,
-            'stats': {
-                'total': total,
-                'unread': unread,
-                'today': today,
-                'this_week': this_week
-            },
-            'recent_by_type': list(recent_by_type),
-            'unread_by_priority': list(unread_by_priority),
-            'last_updated': timezone.now().isoformat()
+            **entry['value'],
+            'last_updated': entry['computed_at'].isoformat()
         })
         
     except User.DoesNotExist:
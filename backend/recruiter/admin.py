@@ -2,12 +2,14 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.db.models import Count
-from django.http import HttpResponse
 from django.contrib import messages
-from django.utils import timezone
+from django.core.exceptions import ImproperlyConfigured
 from datetime import timedelta
-import csv
 
+from video_studio.pagination import ApproximateCountPaginator
+from .dashboard import recruiter_activity_stats
+from .exports import export_response
+from .rollups import local_today, recruiter_activity
 from .models import (
     RecruiterProfile, ProfileViewLog, CandidateInteraction, 
     RecruiterFavorite, RecruiterSearchHistory
@@ -79,6 +81,10 @@ class RecruiterProfileAdmin(admin.ModelAdmin):
 
 @admin.register(ProfileViewLog)
 class ProfileViewLogAdmin(admin.ModelAdmin):
+    # Tables volumineuses : total estimé au-delà du seuil
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+    
     list_display = [
         'candidate_name',
         'recruiter_name',
@@ -177,6 +183,10 @@ class ProfileViewLogAdmin(admin.ModelAdmin):
 
 @admin.register(CandidateInteraction)
 class CandidateInteractionAdmin(admin.ModelAdmin):
+    # Tables volumineuses : total estimé au-delà du seuil
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+    
     list_display = [
         'candidate_name',
         'recruiter_name',
@@ -378,77 +388,88 @@ class RecruiterSearchHistoryAdmin(admin.ModelAdmin):
 
 
 # Actions personnalisées pour l'admin
+def _selected_recruiters(queryset):
+    """Profils recruteurs de la sélection (les exports sont aussi proposés sur les interactions)"""
+    if queryset.model is not RecruiterProfile:
+        queryset = RecruiterProfile.objects.filter(user__in=queryset.values('recruiter'))
+    return queryset
+
+
+def _favorite_counts(user_ids):
+    return dict(
+        RecruiterFavorite.objects.filter(recruiter_id__in=user_ids).order_by().values_list(
+            'recruiter_id'
+        ).annotate(count=Count('pk'))
+    )
+
+
+def _export(request, queryset, export_format, compress=False):
+    """Export diffusé (voir recruiter/exports.py)"""
+    try:
+        return export_response(_selected_recruiters(queryset), export_format, compress)
+    except ImproperlyConfigured as e:
+        messages.error(request, str(e))
+
+
 def export_recruiter_activity(modeladmin, request, queryset):
-    """Exporter l'activité des recruteurs sélectionnés"""
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="recruiter_activity_{timezone.now().strftime("%Y%m%d")}.csv"'
-    
-    writer = csv.writer(response)
-    writer.writerow(['Recruteur', 'Entreprise', 'Email', 'Profils vus', 'Vidéos vues', 'CV téléchargés', 'Favoris'])
-    
-    for recruiter in queryset:
-        profile_views = ProfileViewLog.objects.filter(recruiter=recruiter.user).count()
-        video_views = CandidateInteraction.objects.filter(
-            recruiter=recruiter.user, 
-            interaction_type='video_view'
-        ).count()
-        cv_downloads = CandidateInteraction.objects.filter(
-            recruiter=recruiter.user,
-            interaction_type='cv_download'
-        ).count()
-        favorites = RecruiterFavorite.objects.filter(recruiter=recruiter.user).count()
-        
-        writer.writerow([
-            recruiter.user.get_full_name() or recruiter.user.username,
-            recruiter.company_name,
-            recruiter.user.email,
-            profile_views,
-            video_views,
-            cv_downloads,
-            favorites
-        ])
-    
-    return response
+    """Exporter l'activité des recruteurs sélectionnés (CSV)"""
+    return _export(request, queryset, 'csv')
 
 export_recruiter_activity.short_description = "Exporter l'activité des recruteurs sélectionnés"
 
 
+def export_recruiter_activity_gzip(modeladmin, request, queryset):
+    return _export(request, queryset, 'csv', compress=True)
+
+export_recruiter_activity_gzip.short_description = "Exporter l'activité des recruteurs sélectionnés (CSV gzip)"
+
+
+def export_recruiter_activity_jsonl(modeladmin, request, queryset):
+    return _export(request, queryset, 'jsonl', compress=True)
+
+export_recruiter_activity_jsonl.short_description = "Exporter l'activité des recruteurs sélectionnés (JSON Lines gzip)"
+
+
+def export_recruiter_activity_parquet(modeladmin, request, queryset):
+    return _export(request, queryset, 'parquet')
+
+export_recruiter_activity_parquet.short_description = "Exporter l'activité des recruteurs sélectionnés (Parquet)"
+
+
 def generate_recruiter_report(modeladmin, request, queryset):
     """Générer un rapport d'activité détaillé"""
+    recruiters = list(_selected_recruiters(queryset).select_related('user'))
+    user_ids = [recruiter.user_id for recruiter in recruiters]
+    
+    # Statistiques des 30 derniers jours
+    recent_activity = recruiter_activity(user_ids, since_day=local_today() - timedelta(days=30))
+    favorites = _favorite_counts(user_ids)
+    
+    # Candidats les plus consultés : une requête groupée pour toute la sélection
+    top_candidates = {user_id: [] for user_id in user_ids}
+    interactions = CandidateInteraction.objects.filter(
+        recruiter_id__in=user_ids
+    ).order_by().values(
+        'recruiter_id',
+        'candidate__first_name', 
+        'candidate__last_name'
+    ).annotate(
+        interaction_count=Count('id')
+    ).order_by('recruiter_id', '-interaction_count')
+    for row in interactions:
+        candidates = top_candidates[row.pop('recruiter_id')]
+        if len(candidates) < 5:
+            candidates.append(row)
+    
     reports = []
-    for recruiter in queryset:
-        # Statistiques des 30 derniers jours
-        last_30_days = timezone.now() - timedelta(days=30)
-        
-        recent_profile_views = ProfileViewLog.objects.filter(
-            recruiter=recruiter.user,
-            viewed_at__gte=last_30_days
-        ).count()
-        
-        recent_video_views = CandidateInteraction.objects.filter(
-            recruiter=recruiter.user,
-            interaction_type='video_view',
-            interaction_date__gte=last_30_days
-        ).count()
-        
-        total_favorites = RecruiterFavorite.objects.filter(recruiter=recruiter.user).count()
-        
-        # Candidats les plus consultés
-        top_candidates = CandidateInteraction.objects.filter(
-            recruiter=recruiter.user
-        ).values(
-            'candidate__first_name', 
-            'candidate__last_name'
-        ).annotate(
-            interaction_count=Count('id')
-        ).order_by('-interaction_count')[:5]
-        
+    for recruiter in recruiters:
+        activity = recent_activity[recruiter.user_id]
         reports.append({
             'recruiter': recruiter,
-            'recent_profile_views': recent_profile_views,
-            'recent_video_views': recent_video_views,
-            'total_favorites': total_favorites,
-            'top_candidates': top_candidates
+            'recent_profile_views': activity['profile_views'],
+            'recent_video_views': activity['interaction_video_view'],
+            'total_favorites': favorites.get(recruiter.user_id, 0),
+            'top_candidates': top_candidates[recruiter.user_id]
         })
     
     # Message de confirmation
@@ -458,40 +479,20 @@ generate_recruiter_report.short_description = "Générer un rapport d'activité
 
 
 # Ajouter les actions aux admins appropriés
-RecruiterProfileAdmin.actions = [export_recruiter_activity, generate_recruiter_report]
-CandidateInteractionAdmin.actions = [export_recruiter_activity]
+EXPORT_ACTIONS = [
+    export_recruiter_activity,
+    export_recruiter_activity_gzip,
+    export_recruiter_activity_jsonl,
+    export_recruiter_activity_parquet,
+]
+RecruiterProfileAdmin.actions = [*EXPORT_ACTIONS, generate_recruiter_report]
+CandidateInteractionAdmin.actions = EXPORT_ACTIONS
 
 
 # Statistiques personnalisées pour l'admin
 def get_recruiter_stats():
-    """Obtenir des statistiques pour l'interface admin"""
-    today = timezone.now().date()
-    last_week = today - timedelta(days=7)
-    
-    stats = {
-        'total_recruiters': RecruiterProfile.objects.filter(is_active=True).count(),
-        'active_recruiters_week': ProfileViewLog.objects.filter(
-            viewed_at__date__gte=last_week
-        ).values('recruiter').distinct().count(),
-        'total_profile_views': ProfileViewLog.objects.count(),
-        'profile_views_week': ProfileViewLog.objects.filter(
-            viewed_at__date__gte=last_week
-        ).count(),
-        'total_video_views': CandidateInteraction.objects.filter(
-            interaction_type='video_view'
-        ).count(),
-        'video_views_week': CandidateInteraction.objects.filter(
-            interaction_type='video_view',
-            interaction_date__date__gte=last_week
-        ).count(),
-        'total_favorites': RecruiterFavorite.objects.count(),
-        'cv_downloads_week': CandidateInteraction.objects.filter(
-            interaction_type='cv_download',
-            interaction_date__date__gte=last_week
-        ).count()
-    }
-    
-    return stats
+    """Obtenir des statistiques pour l'interface admin (deux requêtes, voir recruiter/dashboard.py)"""
+    return recruiter_activity_stats()
 
 
 # Widget personnalisé pour l'affichage des statistiques dans l'admin
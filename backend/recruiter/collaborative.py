@@ -0,0 +1,400 @@
+# backend/recruiter/collaborative.py
+"""
+Filtrage collaboratif implicite sur CandidateInteraction
+
+Matrice recruteurs × candidats pondérée par type d'interaction, lue par
+lots (pagination sur la clé primaire) puis factorisée par ALS implicite
+(Hu, Koren, Volinsky) : confiance c = 1 + α·log(1 + w), préférence p = 1.
+
+Chaque demi-itération met à jour les facteurs par quelques pas de gradient
+conjugué (coût O(entrées · f)), par blocs de lignes répartis sur un pool de
+processus qui partagent les facteurs via des fichiers mmap.
+
+Les facteurs sont enregistrés comme artefacts versionnés et ouverts en mmap
+par les workers web.
+"""
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from django.conf import settings
+from django.utils.functional import cached_property
+from scipy import sparse
+
+from video_studio.artifacts import current_version, load_version, prune_versions, save_version
+
+
+DEFAULT_RECOMMENDER_CONFIG = {
+    'artifacts_dir': os.path.join(settings.BASE_DIR, 'var', 'recommender'),
+    'factors': 32,
+    'iterations': 10,
+    'regularization': 0.1,
+    'alpha': 10.0,
+    'chunk_size': 200_000,
+    # Entrées par bloc de résolution (mémoire ≈ entrées · f · 4 octets)
+    'block_entries': 262144,
+    'cg_steps': 3,
+    'workers': os.cpu_count() or 1,
+    'kept_versions': 2,
+    'interaction_weights': {
+        'profile_view': 1.0,
+        'video_view': 1.5,
+        'cv_download': 3.0,
+        'message_sent': 4.0,
+        'favorite_added': 5.0,
+        'interview_request': 6.0,
+        'offer_sent': 6.0,
+        'favorite_removed': 0.0,
+    },
+}
+
+ARRAY_NAMES = ('recruiter_ids', 'candidate_ids', 'recruiter_factors', 'candidate_factors')
+
+
+def get_recommender_config():
+    """Configuration par défaut surchargée par settings.CANDIDATE_RECOMMENDER"""
+    overrides = getattr(settings, 'CANDIDATE_RECOMMENDER', {})
+    config = {**DEFAULT_RECOMMENDER_CONFIG, **overrides}
+    config['interaction_weights'] = {
+        **DEFAULT_RECOMMENDER_CONFIG['interaction_weights'],
+        **overrides.get('interaction_weights', {}),
+    }
+    return config
+
+
+# Construction de la matrice
+
+def stream_interactions(chunk_size):
+    """Lots de (recruiter_ids, candidate_ids, types) lus par clé primaire croissante"""
+    from .models import CandidateInteraction
+
+    last_pk = 0
+    while True:
+        rows = list(
+            CandidateInteraction.objects.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list('pk', 'recruiter_id', 'candidate_id', 'interaction_type')[:chunk_size]
+        )
+        if not rows:
+            return
+        last_pk = rows[-1][0]
+        _, recruiter_ids, candidate_ids, types = zip(*rows)
+        yield (
+            np.array(recruiter_ids, dtype=np.int64),
+            np.array(candidate_ids, dtype=np.int64),
+            np.array(types, dtype=object),
+        )
+
+
+def build_interaction_matrix(chunks, interaction_weights):
+    """
+    Matrice CSR recruteurs × candidats des poids cumulés
+    Retourne (recruiter_ids, candidate_ids, matrice) ; ids triés, ligne i = recruiter_ids[i]
+    """
+    rows, columns, weights = [], [], []
+    for recruiter_ids, candidate_ids, types in chunks:
+        chunk_weights = np.array(
+            [interaction_weights.get(interaction_type, 0.0) for interaction_type in types],
+            dtype=np.float32,
+        )
+        kept = chunk_weights > 0
+        rows.append(recruiter_ids[kept])
+        columns.append(candidate_ids[kept])
+        weights.append(chunk_weights[kept])
+
+    if not rows:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, sparse.csr_matrix((0, 0), dtype=np.float32)
+
+    rows, columns, weights = np.concatenate(rows), np.concatenate(columns), np.concatenate(weights)
+    recruiter_ids, row_index = np.unique(rows, return_inverse=True)
+    candidate_ids, column_index = np.unique(columns, return_inverse=True)
+    matrix = sparse.csr_matrix(
+        (weights, (row_index, column_index)),
+        shape=(len(recruiter_ids), len(candidate_ids)),
+        dtype=np.float32,
+    )
+    matrix.sum_duplicates()
+    return recruiter_ids, candidate_ids, matrix
+
+
+# ALS implicite
+
+def _row_blocks(indptr, max_entries):
+    """Découper les lignes en blocs contigus d'au plus max_entries entrées (une ligne longue forme son bloc)"""
+    blocks = []
+    start, rows = 0, len(indptr) - 1
+    while start < rows:
+        end = int(np.searchsorted(indptr, indptr[start] + max_entries, side='right')) - 1
+        end = min(max(end, start + 1), rows)
+        blocks.append((start, end))
+        start = end
+    return blocks
+
+
+def _solve_block(confidence, fixed, gram, regularization, start, end, out, cg_steps):
+    """
+    Mettre à jour les lignes [start, end) de `out` par gradient conjugué (départ à chaud)
+    A_u·x = (YᵀY + λI)·x + Σ_j (c_uj − 1)(y_j·x) y_j ; b_u = Σ_j c_uj y_j
+    Coût O(entrées · f) par pas, sans matrice f×f par ligne
+    """
+    indptr = confidence.indptr[start:end + 1]
+    lengths = np.diff(indptr)
+    rows = end - start
+    segment = slice(indptr[0], indptr[-1])
+    columns = confidence.indices[segment]
+    values = confidence.data[segment]
+    local_indptr = indptr - indptr[0]
+    if not len(columns):
+        out[start:end] = 0
+        return
+
+    vectors = fixed[columns]
+    row_of = np.repeat(np.arange(rows), lengths)
+
+    def weighted_sum(weights):
+        return sparse.csr_matrix(
+            (weights, columns, local_indptr), shape=(rows, fixed.shape[0])
+        ) @ fixed
+
+    def apply(x):
+        dots = np.einsum('nf,nf->n', vectors, x[row_of])
+        return x @ gram + regularization * x + weighted_sum((values - 1) * dots)
+
+    x = np.array(out[start:end], dtype=np.float32)
+    residual = weighted_sum(values) - apply(x)
+    direction = residual.copy()
+    residual_norm = np.einsum('nf,nf->n', residual, residual)
+    for _ in range(cg_steps):
+        applied = apply(direction)
+        curvature = np.einsum('nf,nf->n', direction, applied)
+        step = np.divide(residual_norm, curvature, out=np.zeros_like(residual_norm), where=curvature > 1e-12)
+        x += step[:, None] * direction
+        residual -= step[:, None] * applied
+        new_norm = np.einsum('nf,nf->n', residual, residual)
+        ratio = np.divide(new_norm, residual_norm, out=np.zeros_like(new_norm), where=residual_norm > 1e-12)
+        direction = residual + ratio[:, None] * direction
+        residual_norm = new_norm
+
+    # Ligne sans interaction : facteur nul
+    x[lengths == 0] = 0
+    out[start:end] = x
+
+
+# État des processus d'entraînement : matrices héritées, facteurs partagés par fichiers mmap
+_worker_state = {}
+
+
+def _init_worker(matrices, factor_files):
+    _worker_state['matrices'] = matrices
+    _worker_state['factors'] = {
+        side: np.load(path, mmap_mode='r+') for side, path in factor_files.items()
+    }
+
+
+def _solve_task(side, start, end, gram, regularization, cg_steps):
+    other = 'candidates' if side == 'recruiters' else 'recruiters'
+    factors = _worker_state['factors']
+    _solve_block(
+        _worker_state['matrices'][side], factors[other], gram, regularization,
+        start, end, factors[side], cg_steps
+    )
+
+
+def train_als(matrix, factors=32, iterations=10, regularization=0.1, alpha=10.0,
+              block_entries=262144, cg_steps=3, workers=1, seed=0, log=None):
+    """
+    Factorisation ALS implicite : (facteurs recruteurs, facteurs candidats)
+    Avec workers > 1, les blocs sont répartis sur un pool de processus qui
+    écrivent directement dans des fichiers .npy ouverts en mmap
+    """
+    rng = np.random.default_rng(seed)
+    confidence = matrix.tocsr().astype(np.float32)
+    confidence.data = 1 + alpha * np.log1p(confidence.data)
+    matrices = {'recruiters': confidence, 'candidates': confidence.T.tocsr()}
+    blocks = {side: _row_blocks(matrices[side].indptr, block_entries) for side in matrices}
+
+    with tempfile.TemporaryDirectory(prefix='als-') as directory:
+        factor_files = {}
+        for side, size in (('recruiters', matrix.shape[0]), ('candidates', matrix.shape[1])):
+            path = factor_files[side] = os.path.join(directory, f'{side}.npy')
+            initial = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(size, factors))
+            initial[:] = rng.standard_normal((size, factors)) * 0.01
+            initial.flush()
+            del initial
+
+        _init_worker(matrices, factor_files)
+        shared = _worker_state['factors']
+        executor = None
+        if workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(matrices, factor_files)
+            )
+        try:
+            for iteration in range(iterations):
+                started = time.perf_counter()
+                for side, other in (('recruiters', 'candidates'), ('candidates', 'recruiters')):
+                    gram = np.asarray(shared[other].T @ shared[other], dtype=np.float32)
+                    tasks = [(side, start, end, gram, regularization, cg_steps) for start, end in blocks[side]]
+                    if executor is None:
+                        for task in tasks:
+                            _solve_task(*task)
+                    else:
+                        for future in [executor.submit(_solve_task, *task) for task in tasks]:
+                            future.result()
+                if log:
+                    log(iteration + 1, time.perf_counter() - started)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        result = tuple(np.array(shared[side]) for side in ('recruiters', 'candidates'))
+        _worker_state.clear()
+    return result
+
+
+def train_recommender(config=None, log=None):
+    """Lire les interactions, factoriser et publier une nouvelle version des artefacts"""
+    config = config or get_recommender_config()
+    recruiter_ids, candidate_ids, matrix = build_interaction_matrix(
+        stream_interactions(config['chunk_size']), config['interaction_weights']
+    )
+    recruiter_factors, candidate_factors = train_als(
+        matrix,
+        factors=config['factors'],
+        iterations=config['iterations'],
+        regularization=config['regularization'],
+        alpha=config['alpha'],
+        block_entries=config['block_entries'],
+        cg_steps=config['cg_steps'],
+        workers=config['workers'],
+        log=log,
+    )
+
+    directory = config['artifacts_dir']
+    version = save_version(
+        directory,
+        {
+            'recruiter_ids': recruiter_ids,
+            'candidate_ids': candidate_ids,
+            'recruiter_factors': recruiter_factors,
+            'candidate_factors': candidate_factors,
+        },
+        {'interactions': int(matrix.nnz), 'factors': config['factors']},
+    )
+    prune_versions(directory, config['kept_versions'])
+    return version, matrix.nnz
+
+
+# Service
+
+class RecommenderModel:
+    """Facteurs ALS ouverts en mmap (ids triés : recherche par searchsorted)"""
+
+    def __init__(self, recruiter_ids, candidate_ids, recruiter_factors, candidate_factors, version=None):
+        self.recruiter_ids = recruiter_ids
+        self.candidate_ids = candidate_ids
+        self.recruiter_factors = recruiter_factors
+        self.candidate_factors = candidate_factors
+        self.version = version
+
+    @classmethod
+    def load(cls, directory):
+        loaded = load_version(directory, ARRAY_NAMES)
+        if loaded is None:
+            return None
+        version, arrays, _ = loaded
+        return cls(version=version, **arrays)
+
+    @staticmethod
+    def _row(ids, value):
+        position = np.searchsorted(ids, value)
+        if position < len(ids) and ids[position] == value:
+            return int(position)
+        return None
+
+    def _top(self, scores, k, exclude):
+        exclude = np.unique(np.asarray(list(exclude), dtype=np.int64))
+        if len(exclude):
+            positions = np.searchsorted(self.candidate_ids, exclude)
+            found = positions < len(self.candidate_ids)
+            positions, exclude = positions[found], exclude[found]
+            scores[positions[self.candidate_ids[positions] == exclude]] = -np.inf
+
+        k = min(k, len(scores))
+        if not k:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        best = best[np.isfinite(scores[best])]
+        return list(zip(self.candidate_ids[best].tolist(), scores[best].tolist()))
+
+    @cached_property
+    def candidate_norms(self):
+        norms = np.linalg.norm(self.candidate_factors, axis=1)
+        norms[norms == 0] = 1
+        return norms
+
+    def recommend_for_recruiter(self, recruiter_id, k=20, exclude=()):
+        """Candidats retenus par les recruteurs au comportement proche"""
+        row = self._row(self.recruiter_ids, recruiter_id)
+        if row is None:
+            return []
+        scores = self.candidate_factors @ self.recruiter_factors[row]
+        return self._top(scores, k, exclude)
+
+    def similar_candidates(self, candidate_id, k=20, exclude=()):
+        """Candidats retenus par les recruteurs ayant retenu ce candidat (cosinus des facteurs)"""
+        row = self._row(self.candidate_ids, candidate_id)
+        if row is None:
+            return []
+        norms = self.candidate_norms
+        scores = (self.candidate_factors @ self.candidate_factors[row]) / (norms * norms[row])
+        return self._top(scores, k, {candidate_id, *exclude})
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_recommender_model():
+    """Modèle du processus, rechargé quand une nouvelle version est publiée"""
+    global _model
+    directory = get_recommender_config()['artifacts_dir']
+    with _model_lock:
+        version = current_version(directory)
+        if version is not None and (_model is None or _model.version != version):
+            _model = RecommenderModel.load(directory) or _model
+        return _model
+
+
+def also_shortlisted(recruiter_id, candidate_id=None, limit=20):
+    """
+    « Les recruteurs comme vous ont aussi retenu » : liste de (CandidateSearchDocument, score)
+    Avec candidate_id : candidats retenus par les recruteurs ayant retenu ce candidat
+    Les candidats déjà vus ou favoris du recruteur sont exclus
+    """
+    from candidate.models import CandidateSearchDocument
+    from .models import CandidateInteraction, RecruiterFavorite
+
+    model = get_recommender_model()
+    if model is None:
+        return []
+
+    seen = set(
+        CandidateInteraction.objects.filter(recruiter_id=recruiter_id)
+        .values_list('candidate_id', flat=True).distinct()
+    )
+    seen.update(RecruiterFavorite.objects.filter(recruiter_id=recruiter_id).values_list('candidate_id', flat=True))
+
+    # Marge pour les profils devenus privés depuis l'entraînement
+    if candidate_id is not None:
+        scored = model.similar_candidates(candidate_id, limit * 2, exclude=seen)
+    else:
+        scored = model.recommend_for_recruiter(recruiter_id, limit * 2, exclude=seen)
+
+    documents = CandidateSearchDocument.objects.in_bulk([pk for pk, _ in scored])
+    return [(documents[pk], score) for pk, score in scored if pk in documents][:limit]
@@ -0,0 +1,151 @@
+# backend/recruiter/dashboard.py
+"""
+Statistiques des dashboards recruteur
+
+Service partagé par les deux endpoints de dashboard et l'admin : tous les
+compteurs d'une table en une seule passe (agrégation conditionnelle,
+compteurs des autres tables en sous-requêtes scalaires), les répartitions
+en une seule requête groupée. Deux requêtes par calcul, quel que soit le
+nombre de statistiques. Les compteurs de consultations et d'interactions
+viennent de l'activité journalière (recruiter.rollups), pas des logs.
+
+Agrégats coûteux servis depuis le cache (video_studio.single_flight) :
+calcul unique pour les requêtes concurrentes, valeur expirée encore servie
+pendant son recalcul en arrière-plan. Les profils changent en continu :
+les statistiques ne sont pas invalidées à chaque écriture, elles ont au
+plus 'timeout' secondes de retard (stale_timeout en cas de recalcul lent).
+Réglages dans settings.RECRUITER_DASHBOARD.
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Avg, Count, Q
+
+from video_studio.expressions import count_of
+from video_studio.single_flight import get_entry
+from .rollups import active_recruiter_count, activity_total, local_today
+
+
+# Répartitions calculées par la requête groupée
+DISTRIBUTION_FIELDS = ('education_level', 'status', 'university')
+
+DEFAULT_DASHBOARD_CONFIG = {
+    'timeout': 60,
+    'stale_timeout': 600,
+}
+
+
+def get_dashboard_config():
+    """Configuration par défaut surchargée par settings.RECRUITER_DASHBOARD"""
+    return {**DEFAULT_DASHBOARD_CONFIG, **getattr(settings, 'RECRUITER_DASHBOARD', {})}
+
+
+def _cached(key, compute):
+    config = get_dashboard_config()
+    return get_entry(f'recruiter_dashboard:{key}', compute, config['timeout'], config['stale_timeout'])
+
+
+def _public_profiles():
+    from candidate.models import CandidateProfile
+
+    return CandidateProfile.objects.filter(is_profile_public=True)
+
+
+def candidate_pool_counters(recruiter_id, recent_days):
+    """
+    Compteurs des profils publics en une requête (agrégation conditionnelle) :
+    total, actifs, avec vidéo approuvée, score vidéo moyen, vues vidéo du recruteur
+    sur les recent_days derniers jours (activité journalière)
+    """
+    return _public_profiles().aggregate(
+        total_candidates=Count('pk'),
+        active_candidates=Count('pk', filter=Q(status='active')),
+        candidates_with_video=Count('pk', filter=Q(presentation_video__is_approved=True)),
+        avg_video_quality=Avg('video_quality_score', filter=Q(presentation_video__isnull=False)),
+        recent_views=activity_total(
+            'video_views', since_day=local_today() - timedelta(days=recent_days), recruiter_id=recruiter_id
+        ),
+    )
+
+
+def candidate_pool_distributions(fields=DISTRIBUTION_FIELDS):
+    """
+    Répartitions des profils publics en une requête groupée sur tous les champs à la fois
+    {champ: [(valeur, nombre)]}, par nombre décroissant
+    """
+    distributions = {field: Counter() for field in fields}
+    for row in _public_profiles().order_by().values(*fields).annotate(count=Count('pk')):
+        for field in fields:
+            distributions[field][row[field]] += row['count']
+    return {field: counter.most_common() for field, counter in distributions.items()}
+
+
+def compute_dashboard_stats(recruiter_id):
+    """Statistiques générales (RecruiterViewSet.dashboard_stats), vues des 30 derniers jours : deux requêtes"""
+    counters = candidate_pool_counters(recruiter_id, recent_days=30)
+    distributions = candidate_pool_distributions()
+    total_candidates = counters['total_candidates']
+    candidates_with_video = counters['candidates_with_video']
+
+    return {
+        'total_candidates': total_candidates,
+        'candidates_with_video': candidates_with_video,
+        'active_candidates': counters['active_candidates'],
+        'recent_views': counters['recent_views'],
+        # Candidats par niveau d'études
+        'education_stats': [
+            {'education_level': education_level, 'count': count}
+            for education_level, count in distributions['education_level'][:5]
+        ],
+        'avg_video_quality': round(counters['avg_video_quality'] or 0, 1),
+        'video_percentage': round((candidates_with_video / total_candidates * 100), 1) if total_candidates > 0 else 0
+    }
+
+
+def compute_recruiter_dashboard(recruiter_id):
+    """Dashboard recruteur (recruiter_dashboard_stats), vues des 7 derniers jours : deux requêtes"""
+    counters = candidate_pool_counters(recruiter_id, recent_days=7)
+    distributions = candidate_pool_distributions()
+
+    return {
+        'total_candidates': counters['total_candidates'],
+        'active_candidates': counters['active_candidates'],
+        'candidates_with_video': counters['candidates_with_video'],
+        'my_recent_views': counters['recent_views'],
+        # Répartition par statut
+        'status_distribution': dict(distributions['status']),
+        # Top universités
+        'top_universities': [
+            {'university': university, 'count': count}
+            for university, count in distributions['university'] if university != ''
+        ][:5],
+    }
+
+
+def recruiter_activity_stats():
+    """Activité des recruteurs (admin) depuis l'activité journalière : deux requêtes"""
+    from .models import RecruiterFavorite, RecruiterProfile
+
+    last_week = local_today() - timedelta(days=7)
+    stats = RecruiterProfile.objects.filter(is_active=True).aggregate(
+        total_recruiters=Count('pk'),
+        total_profile_views=activity_total('profile_views'),
+        profile_views_week=activity_total('profile_views', since_day=last_week),
+        total_video_views=activity_total('interaction_video_view'),
+        video_views_week=activity_total('interaction_video_view', since_day=last_week),
+        total_favorites=count_of(RecruiterFavorite.objects.all()),
+        cv_downloads_week=activity_total('interaction_cv_download', since_day=last_week),
+    )
+    stats['active_recruiters_week'] = active_recruiter_count(last_week)
+    return stats
+
+
+def get_dashboard_stats(recruiter_id):
+    """Entrée en cache {'value', 'computed_at', ...} des statistiques générales"""
+    return _cached(f'stats:{recruiter_id}', lambda: compute_dashboard_stats(recruiter_id))
+
+
+def get_recruiter_dashboard(recruiter_id):
+    """Entrée en cache {'value', 'computed_at', ...} du dashboard recruteur"""
+    return _cached(f'summary:{recruiter_id}', lambda: compute_recruiter_dashboard(recruiter_id))
@@ -0,0 +1,210 @@
+# backend/recruiter/exports.py
+"""
+Export de l'activité des recruteurs en flux
+
+Les recruteurs sont lus par lots avec un curseur côté serveur
+(iterator(chunk_size)). Chaque lot reçoit ses totaux de l'activité
+journalière (recruiter.rollups, requêtes groupées) et ses favoris (une
+requête groupée) : quelques requêtes par lot, aucune par recruteur. Les
+lignes partent au fil de l'eau, la mémoire ne dépend pas du nombre de
+recruteurs exportés.
+
+Formats : CSV (colonnes de l'export historique), JSON Lines, Parquet
+(pyarrow, dépendance optionnelle, un groupe de lignes par lot).
+Compression gzip optionnelle, en flux elle aussi.
+Réglages dans settings.RECRUITER_EXPORTS.
+"""
+import csv
+import io
+import json
+import zlib
+from itertools import islice
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Count
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .rollups import recruiter_activity
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    pyarrow = None
+
+
+DEFAULT_RECRUITER_EXPORT_CONFIG = {
+    # Recruteurs lus, agrégés et écrits par lot
+    'chunk_size': 2000,
+    'gzip_level': 6,
+}
+
+# Colonnes des formats JSON Lines et Parquet
+EXPORT_FIELDS = (
+    'recruiter_id', 'recruiter', 'company_name', 'email',
+    'profile_views', 'video_views', 'cv_downloads', 'favorites',
+)
+
+# Colonnes du CSV, identiques à l'export historique
+CSV_COLUMNS = (
+    ('recruiter', 'Recruteur'),
+    ('company_name', 'Entreprise'),
+    ('email', 'Email'),
+    ('profile_views', 'Profils vus'),
+    ('video_views', 'Vidéos vues'),
+    ('cv_downloads', 'CV téléchargés'),
+    ('favorites', 'Favoris'),
+)
+
+# format -> (type de contenu, extension)
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+
+def get_export_config():
+    """Configuration par défaut surchargée par settings.RECRUITER_EXPORTS"""
+    return {**DEFAULT_RECRUITER_EXPORT_CONFIG, **getattr(settings, 'RECRUITER_EXPORTS', {})}
+
+
+def recruiter_activity_batches(queryset, chunk_size):
+    """Lots de lignes {champ: valeur} pour les RecruiterProfile du queryset"""
+    from .models import RecruiterFavorite
+
+    recruiters = queryset.order_by('pk').values_list(
+        'user_id', 'company_name', 'user__username', 'user__first_name', 'user__last_name', 'user__email'
+    ).iterator(chunk_size)
+    while True:
+        batch = list(islice(recruiters, chunk_size))
+        if not batch:
+            return
+        user_ids = [row[0] for row in batch]
+        activity = recruiter_activity(user_ids)
+        favorites = dict(
+            RecruiterFavorite.objects.filter(recruiter_id__in=user_ids).order_by().values_list(
+                'recruiter_id'
+            ).annotate(count=Count('pk'))
+        )
+        rows = []
+        for user_id, company_name, username, first_name, last_name, email in batch:
+            totals = activity[user_id]
+            rows.append({
+                'recruiter_id': user_id,
+                # Même repli que User.get_full_name() or username
+                'recruiter': f'{first_name} {last_name}'.strip() or username,
+                'company_name': company_name,
+                'email': email,
+                'profile_views': totals['profile_views'],
+                'video_views': totals['interaction_video_view'],
+                'cv_downloads': totals['interaction_cv_download'],
+                'favorites': favorites.get(user_id, 0),
+            })
+        yield rows
+
+
+class _Echo:
+    """Pseudo-fichier pour csv.writer : write renvoie la ligne au lieu de la stocker"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(batches):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([header for _, header in CSV_COLUMNS]).encode()
+    for rows in batches:
+        yield ''.join(writer.writerow([row[field] for field, _ in CSV_COLUMNS]) for row in rows).encode()
+
+
+def stream_jsonl(batches):
+    for rows in batches:
+        yield ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows).encode()
+
+
+class _StreamSink(io.RawIOBase):
+    """Fichier en écriture seule vidé au fil de l'eau ; tell() reste la position absolue (pieds de page Parquet)"""
+
+    def __init__(self):
+        super().__init__()
+        self.position = 0
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _parquet_schema():
+    integer_fields = [field for field in EXPORT_FIELDS if field not in ('recruiter', 'company_name', 'email')]
+    return pyarrow.schema([
+        (field, pyarrow.int64() if field in integer_fields else pyarrow.string()) for field in EXPORT_FIELDS
+    ])
+
+
+def stream_parquet(batches):
+    schema = _parquet_schema()
+    sink = _StreamSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema)
+    try:
+        for rows in batches:
+            writer.write_table(pyarrow.Table.from_pylist(rows, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+EXPORT_STREAMS = {
+    'csv': stream_csv,
+    'jsonl': stream_jsonl,
+    'parquet': stream_parquet,
+}
+
+
+def gzip_stream(chunks, level):
+    """Compression gzip d'un flux d'octets, morceau par morceau"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(queryset, export_format='csv', compress=False, config=None):
+    """Flux d'octets de l'export ; ImproperlyConfigured si le format demande une dépendance absente"""
+    config = config or get_export_config()
+    if export_format == 'parquet' and pyarrow is None:
+        raise ImproperlyConfigured("L'export Parquet nécessite pyarrow")
+    stream = EXPORT_STREAMS[export_format](recruiter_activity_batches(queryset, config['chunk_size']))
+    return gzip_stream(stream, config['gzip_level']) if compress else stream
+
+
+def export_filename(export_format='csv', compress=False):
+    extension = EXPORT_FORMATS[export_format][1]
+    return f"recruiter_activity_{timezone.now().strftime('%Y%m%d')}.{extension}{'.gz' if compress else ''}"
+
+
+def export_response(queryset, export_format='csv', compress=False):
+    """Réponse diffusée en pièce jointe (la compression des réponses ne s'applique pas aux flux)"""
+    stream = export_stream(queryset, export_format, compress)
+    content_type = 'application/gzip' if compress else EXPORT_FORMATS[export_format][0]
+    response = StreamingHttpResponse(stream, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{export_filename(export_format, compress)}"'
+    return response
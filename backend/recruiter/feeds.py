@@ -0,0 +1,341 @@
+# backend/recruiter/feeds.py
+"""
+Flux de candidats recommandés par recruteur (RecruiterFeed)
+
+Le score d'un candidat combine les préférences du RecruiterProfile
+(niveaux d'études, expérience, universités), les affinités tirées des favoris
+et interactions récentes (filières, villes) et le score de classement.
+Il est calculé en SQL : un ORDER BY … LIMIT par flux reconstruit.
+
+Rafraîchissement incrémental :
+- préférences ou affinités modifiées (empreinte différente) : flux recalculé ;
+- sinon, seuls les documents candidats écrits depuis built_at (indexed_at)
+  sont re-notés puis fusionnés dans le flux existant.
+Premier accès d'un recruteur sans flux : construction en arrière-plan.
+"""
+import hashlib
+import json
+from array import array
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.utils import timezone
+
+from video_studio.background import run_once_in_background
+
+
+DEFAULT_FEED_CONFIG = {
+    'size': 200,
+    'weights': {
+        'education_level': 2.0,
+        'experience': 1.5,
+        'university': 1.0,
+        'major': 2.0,
+        'location': 1.0,
+        'rank': 1.0,
+    },
+    # Historique pris en compte pour les affinités
+    'history_days': 90,
+    'affinity_majors': 5,
+    'affinity_locations': 3,
+    # Au-delà, une reconstruction complète coûte moins qu'une fusion
+    'max_incremental_changes': 5000,
+    'sync_overlap_seconds': 60,
+    'cache_timeout': 3600,
+}
+
+INTERACTION_WEIGHTS = {
+    'favorite_added': 3,
+    'interview_request': 3,
+    'offer_sent': 3,
+    'message_sent': 2,
+    'cv_download': 2,
+    'video_view': 1,
+    'profile_view': 1,
+}
+
+
+def get_feed_config():
+    """Configuration par défaut surchargée par settings.RECRUITER_FEEDS"""
+    overrides = getattr(settings, 'RECRUITER_FEEDS', {})
+    config = {**DEFAULT_FEED_CONFIG, **overrides}
+    config['weights'] = {**DEFAULT_FEED_CONFIG['weights'], **overrides.get('weights', {})}
+    return config
+
+
+def pack_entries(entries):
+    """[(candidate_id, score)] -> (bytes ids, bytes scores)"""
+    return (
+        array('q', [candidate_id for candidate_id, _ in entries]).tobytes(),
+        array('f', [score for _, score in entries]).tobytes(),
+    )
+
+
+def unpack_entries(packed_ids, packed_scores):
+    ids, scores = array('q'), array('f')
+    ids.frombytes(bytes(packed_ids))
+    scores.frombytes(bytes(packed_scores))
+    return list(zip(ids, scores))
+
+
+def collect_inputs(recruiter_ids, config=None):
+    """
+    Préférences et affinités des recruteurs (requêtes groupées, pas de N+1)
+    Retourne {recruiter_id: inputs}
+    """
+    from .models import CandidateInteraction, RecruiterFavorite, RecruiterProfile
+
+    config = config or get_feed_config()
+    recruiter_ids = list(recruiter_ids)
+    inputs = {
+        profile['user_id']: {
+            'education_levels': sorted(profile['preferred_education_levels'] or []),
+            'experience_range': profile['preferred_experience_range'] or {},
+            'universities': sorted(profile['preferred_universities'] or []),
+            'favorites': [],
+        }
+        for profile in RecruiterProfile.objects.filter(user_id__in=recruiter_ids).values(
+            'user_id', 'preferred_education_levels', 'preferred_experience_range', 'preferred_universities'
+        )
+    }
+
+    majors = defaultdict(Counter)
+    locations = defaultdict(Counter)
+
+    for favorite in RecruiterFavorite.objects.filter(recruiter_id__in=recruiter_ids).values(
+        'recruiter_id', 'candidate_id', 'priority', 'candidate__major', 'candidate__location'
+    ):
+        recruiter_inputs = inputs.get(favorite['recruiter_id'])
+        if recruiter_inputs is None:
+            continue
+        recruiter_inputs['favorites'].append(favorite['candidate_id'])
+        weight = INTERACTION_WEIGHTS['favorite_added'] + favorite['priority']
+        majors[favorite['recruiter_id']][favorite['candidate__major']] += weight
+        locations[favorite['recruiter_id']][favorite['candidate__location']] += weight
+
+    since = timezone.now() - timedelta(days=config['history_days'])
+    interactions = CandidateInteraction.objects.filter(
+        recruiter_id__in=recruiter_ids,
+        interaction_date__gte=since,
+        interaction_type__in=list(INTERACTION_WEIGHTS),
+    ).values_list('recruiter_id', 'interaction_type', 'candidate__major', 'candidate__location')
+    for recruiter_id, interaction_type, major, location in interactions.iterator(chunk_size=5000):
+        weight = INTERACTION_WEIGHTS[interaction_type]
+        majors[recruiter_id][major] += weight
+        locations[recruiter_id][location] += weight
+
+    for recruiter_id, recruiter_inputs in inputs.items():
+        # Seuls les premiers rangs entrent dans l'empreinte : une vue de plus ne déclenche rien
+        recruiter_inputs['majors'] = sorted(
+            major for major, _ in majors[recruiter_id].most_common(config['affinity_majors']) if major
+        )
+        recruiter_inputs['locations'] = sorted(
+            location for location, _ in locations[recruiter_id].most_common(config['affinity_locations']) if location
+        )
+        recruiter_inputs['favorites'].sort()
+    return inputs
+
+
+def inputs_signature(inputs):
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def feed_score_expression(inputs, config=None):
+    """Score d'un CandidateSearchDocument pour un recruteur (expression SQL)"""
+    config = config or get_feed_config()
+    weights = config['weights']
+
+    def bonus(condition, weight):
+        return Case(When(condition, then=Value(weight)), default=Value(0.0), output_field=FloatField())
+
+    score = F('rank_score') / 100 * weights['rank']
+    if inputs['education_levels']:
+        score += bonus(Q(education_level__in=inputs['education_levels']), weights['education_level'])
+    if inputs['universities']:
+        score += bonus(Q(university__in=inputs['universities']), weights['university'])
+    if inputs['majors']:
+        score += bonus(Q(major__in=inputs['majors']), weights['major'])
+    if inputs['locations']:
+        score += bonus(Q(location__in=inputs['locations']), weights['location'])
+
+    experience = inputs['experience_range']
+    experience_filter = Q()
+    if experience.get('min') is not None:
+        experience_filter &= Q(experience_years__gte=experience['min'])
+    if experience.get('max') is not None:
+        experience_filter &= Q(experience_years__lte=experience['max'])
+    if experience_filter:
+        score += bonus(experience_filter, weights['experience'])
+
+    return score
+
+
+def score_candidates(inputs, queryset, limit, config=None):
+    """[(candidate_id, score)] des meilleurs documents du queryset"""
+    return list(
+        queryset.exclude(pk__in=inputs['favorites'])
+        .annotate(feed_score=feed_score_expression(inputs, config))
+        .order_by('-feed_score', '-rank_score', 'pk')
+        .values_list('pk', 'feed_score')[:limit]
+    )
+
+
+def merge_entries(entries, rescored, changed_ids, size):
+    """Remplacer les candidats re-notés dans un flux existant"""
+    changed_ids = set(changed_ids)
+    merged = [entry for entry in entries if entry[0] not in changed_ids]
+    merged.extend(rescored)
+    merged.sort(key=lambda entry: (-entry[1], entry[0]))
+    return merged[:size]
+
+
+def feed_version_key(recruiter_id):
+    return f'recruiter_feed_version:{recruiter_id}'
+
+
+def refresh_feeds(recruiter_ids=None, full=False):
+    """
+    Rafraîchir les flux des recruteurs actifs
+    Retourne un dict de compteurs (rebuilt, merged, unchanged, removed)
+    """
+    from candidate.models import CandidateSearchDocument
+    from .models import RecruiterFeed, RecruiterProfile
+
+    config = get_feed_config()
+    size = config['size']
+    overlap = timedelta(seconds=config['sync_overlap_seconds'])
+    started_at = timezone.now()
+    stats = Counter(rebuilt=0, merged=0, unchanged=0, removed=0)
+
+    active = RecruiterProfile.objects.filter(is_active=True)
+    if recruiter_ids is not None:
+        active = active.filter(user_id__in=recruiter_ids)
+    inputs_by_recruiter = collect_inputs(active.values_list('user_id', flat=True), config)
+
+    # Flux des recruteurs désactivés
+    stale_feeds = RecruiterFeed.objects.exclude(recruiter_id__in=list(inputs_by_recruiter))
+    if recruiter_ids is not None:
+        stale_feeds = stale_feeds.filter(recruiter_id__in=recruiter_ids)
+    stats['removed'], _ = stale_feeds.delete()
+
+    feeds = RecruiterFeed.objects.in_bulk(list(inputs_by_recruiter))
+
+    # Documents modifiés depuis le plus ancien flux à fusionner (une seule lecture)
+    changed_documents = []
+    if feeds and not full:
+        since = min(feed.built_at for feed in feeds.values()) - overlap
+        # indexed_at : toute écriture du document hors dérive du score de classement (--full)
+        changed_documents = list(
+            CandidateSearchDocument.objects.filter(indexed_at__gte=since)
+            .values_list('pk', 'indexed_at')[:config['max_incremental_changes'] + 1]
+        )
+    too_many_changes = len(changed_documents) > config['max_incremental_changes']
+
+    refreshed = []
+    for recruiter_id, inputs in inputs_by_recruiter.items():
+        signature = inputs_signature(inputs)
+        feed = feeds.get(recruiter_id)
+
+        if full or too_many_changes or feed is None or feed.inputs_signature != signature:
+            entries = score_candidates(inputs, CandidateSearchDocument.objects.all(), size, config)
+            stats['rebuilt'] += 1
+        else:
+            changed_ids = [
+                pk for pk, indexed_at in changed_documents
+                if indexed_at >= feed.built_at - overlap
+            ]
+            if not changed_ids:
+                stats['unchanged'] += 1
+                continue
+            rescored = score_candidates(
+                inputs, CandidateSearchDocument.objects.filter(pk__in=changed_ids), len(changed_ids), config
+            )
+            entries = merge_entries(feed.entries(), rescored, changed_ids, size)
+            stats['merged'] += 1
+
+        candidate_ids, scores = pack_entries(entries)
+        refreshed.append(RecruiterFeed(
+            recruiter_id=recruiter_id,
+            candidate_ids=candidate_ids,
+            scores=scores,
+            size=len(entries),
+            inputs_signature=signature,
+            built_at=started_at,
+        ))
+
+    if refreshed:
+        RecruiterFeed.objects.bulk_create(
+            refreshed,
+            update_conflicts=True,
+            unique_fields=['recruiter'],
+            update_fields=['candidate_ids', 'scores', 'size', 'inputs_signature', 'built_at', 'updated_at'],
+        )
+        # Nouvelle version : les réponses en cache de ces recruteurs deviennent inaccessibles
+        cache.set_many(
+            {feed_version_key(feed.recruiter_id): feed.updated_at.timestamp() for feed in refreshed},
+            timeout=None
+        )
+
+    # Les flux inchangés restent valides jusqu'au prochain passage
+    refreshed_ids = {feed.recruiter_id for feed in refreshed}
+    RecruiterFeed.objects.filter(
+        recruiter_id__in=[recruiter_id for recruiter_id in feeds if recruiter_id not in refreshed_ids]
+    ).update(built_at=started_at)
+    return dict(stats)
+
+
+def get_feed_page(recruiter_id, offset=0, limit=20):
+    """
+    Page du flux d'un recruteur, servie depuis le cache
+    Clé versionnée par la date de dernière mise à jour du flux : aucune invalidation explicite
+    Retourne None si le recruteur n'a pas de profil actif ; premier accès : construction
+    lancée en arrière-plan et page vide marquée pending
+    """
+    from candidate.models import CandidateSearchDocument
+    from candidate.serializers import CandidateSearchDocumentSerializer
+    from .models import RecruiterFeed, RecruiterProfile
+
+    version = cache.get(feed_version_key(recruiter_id))
+    if version is not None:
+        page = cache.get(f'recruiter_feed:{recruiter_id}:{version}:{offset}:{limit}')
+        if page is not None:
+            return page
+
+    feed = RecruiterFeed.objects.filter(pk=recruiter_id).first()
+    if feed is None:
+        if not RecruiterProfile.objects.filter(user_id=recruiter_id, is_active=True).exists():
+            return None
+        # Premier accès : flux construit hors de la requête
+        run_once_in_background(f'recruiter-feed:{recruiter_id}', refresh_feeds, [recruiter_id])
+        return {'count': 0, 'offset': offset, 'generated_at': None, 'pending': True, 'results': []}
+    version = feed.updated_at.timestamp()
+    cache.set(feed_version_key(recruiter_id), version, timeout=None)
+
+    entries = feed.entries()
+    # Marge pour les profils devenus privés depuis le dernier rafraîchissement
+    window = entries[offset:offset + limit * 2]
+    documents = CandidateSearchDocument.objects.in_bulk([candidate_id for candidate_id, _ in window])
+    selected = [
+        (documents[candidate_id], score)
+        for candidate_id, score in window if candidate_id in documents
+    ][:limit]
+
+    results = CandidateSearchDocumentSerializer([document for document, _ in selected], many=True).data
+    for data, (_, score) in zip(results, selected):
+        data['feed_score'] = round(score, 4)
+
+    page = {
+        'count': feed.size,
+        'offset': offset,
+        'generated_at': feed.updated_at.isoformat(),
+        'pending': False,
+        'results': results,
+    }
+    cache.set(
+        f'recruiter_feed:{recruiter_id}:{version}:{offset}:{limit}', page,
+        timeout=get_feed_config()['cache_timeout']
+    )
+    return page
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from recruiter.search import aggregate_popular_searches, warm_search_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalculer les recherches les plus fréquentes depuis l'historique (à planifier, ex. chaque nuit) "
+        "puis préchauffer le cache des résultats"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help="Période d'historique prise en compte")
+        parser.add_argument('--size', type=int, help='Nombre de combinaisons conservées')
+        parser.add_argument(
+            '--no-warm',
+            action='store_true',
+            help='Ne pas préchauffer le cache des résultats'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        aggregated = aggregate_popular_searches(options['days'], options['size'])
+        warmed = 0 if options['no_warm'] else warm_search_cache()
+        self.stdout.write(self.style.SUCCESS(
+            f"{aggregated} recherche(s) populaire(s), {warmed} préchauffée(s) "
+            f"({time.perf_counter() - started:.1f} s)"
+        ))
@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from recruiter.models import CandidateInteraction, CandidateTrend
+from recruiter.trending import combine_keys, get_trending_config, interaction_key, merge_keys
+
+
+class Command(BaseCommand):
+    help = (
+        "Rejouer les interactions historiques dans les compteurs de tendance, "
+        "par ordre chronologique et par lots"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help="Nombre d'interactions lues par lot"
+        )
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Vider les compteurs avant le rejeu (évite de compter deux fois)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        config = get_trending_config()
+
+        if options['reset']:
+            CandidateTrend.objects.all().delete()
+
+        # Les vues profil et vidéo créent elles-mêmes une CandidateInteraction :
+        # rejouer cette seule table couvre les trois sources sans doublon
+        interactions = CandidateInteraction.objects.order_by('interaction_date', 'id').values_list(
+            'id', 'candidate_id', 'interaction_type', 'interaction_date'
+        )
+
+        replayed = 0
+        cursor = None
+        while True:
+            batch_qs = interactions
+            if cursor is not None:
+                last_date, last_id = cursor
+                batch_qs = batch_qs.filter(
+                    Q(interaction_date__gt=last_date) |
+                    Q(interaction_date=last_date, id__gt=last_id)
+                )
+            batch = list(batch_qs[:batch_size])
+            if not batch:
+                break
+
+            keys, last_seen = {}, {}
+            for _, candidate_id, interaction_type, interaction_date in batch:
+                key = interaction_key(interaction_type, interaction_date, config)
+                if key is None:
+                    continue
+                keys[candidate_id] = combine_keys(keys.get(candidate_id), key)
+                last_seen[candidate_id] = interaction_date
+
+            if keys:
+                merge_keys(keys, last_seen)
+
+            replayed += len(batch)
+            cursor = (batch[-1][3], batch[-1][0])
+            if options['verbosity'] > 1:
+                self.stdout.write(f"  … {replayed} interaction(s) rejouée(s)")
+
+        self.stdout.write(self.style.SUCCESS(f"{replayed} interaction(s) rejouée(s)"))
@@ -0,0 +1,93 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from recruiter.dashboard import compute_recruiter_dashboard, get_recruiter_dashboard
+from video_studio.single_flight import expire
+
+
+class Command(BaseCommand):
+    help = (
+        "Rafale de requêtes concurrentes sur le dashboard recruteur (base courante) : requêtes SQL "
+        "sans cache, avec calcul unique à froid et avec valeur expirée (échec si le nombre de requêtes "
+        "croît avec la rafale)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=32, help='Requêtes simultanées')
+        parser.add_argument('--recruiter-id', type=int, default=1)
+
+    def handle(self, *args, **options):
+        concurrency = options['concurrency']
+        recruiter_id = options['recruiter_id']
+        key = f'recruiter_dashboard:summary:{recruiter_id}'
+
+        scenarios = [
+            ('sans cache', None, lambda: compute_recruiter_dashboard(recruiter_id)),
+            ('cache froid, calcul unique', lambda: cache.delete(key), lambda: get_recruiter_dashboard(recruiter_id)),
+            ('valeur expirée, recalcul en arrière-plan', lambda: expire(key), lambda: get_recruiter_dashboard(recruiter_id)),
+        ]
+        results = {}
+        for name, prepare, call in scenarios:
+            if prepare:
+                prepare()
+            before = cache.get(key)
+            queries, elapsed = self._burst(call, concurrency)
+            results[name] = queries
+            self.stdout.write(
+                f"{name:<42} {concurrency} requêtes : {queries:>4} requête(s) SQL, "
+                f"p100 {max(elapsed):.1f} ms"
+            )
+            if before is not None:
+                self._wait_refresh(key, before)
+
+        single = results['sans cache'] // concurrency
+        if results['cache froid, calcul unique'] > single or results['valeur expirée, recalcul en arrière-plan']:
+            raise CommandError(f"Requêtes SQL dépendantes de la rafale (un calcul : {single} requête(s))")
+        self.stdout.write(self.style.SUCCESS(
+            f"Requêtes SQL constantes : un seul calcul ({single} requête(s)) pour {concurrency} requêtes simultanées"
+        ))
+
+    def _burst(self, call, concurrency):
+        """Lancer call dans concurrency threads en même temps : (requêtes SQL des threads, durées en ms)"""
+        barrier = threading.Barrier(concurrency)
+        lock = threading.Lock()
+        counter = {'queries': 0}
+        elapsed = []
+
+        def count(execute, sql, params, many, context):
+            with lock:
+                counter['queries'] += 1
+            return execute(sql, params, many, context)
+
+        def worker():
+            try:
+                with connection.execute_wrapper(count):
+                    barrier.wait()
+                    started = time.perf_counter()
+                    call()
+                    with lock:
+                        elapsed.append((time.perf_counter() - started) * 1000)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return counter['queries'], elapsed
+
+    def _wait_refresh(self, key, before, timeout=30):
+        """Attendre le recalcul en arrière-plan (nouvelle date de calcul)"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            entry = cache.get(key)
+            if entry is not None and entry['computed_at'] != before['computed_at']:
+                self.stdout.write(f"  recalcul en arrière-plan terminé ({entry['computed_at']:%H:%M:%S})")
+                return
+            time.sleep(0.05)
+        raise CommandError("Recalcul en arrière-plan non terminé")
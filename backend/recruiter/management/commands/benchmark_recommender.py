@@ -0,0 +1,58 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from scipy import sparse
+
+from recruiter.collaborative import get_recommender_config, train_als
+
+
+class Command(BaseCommand):
+    help = "Mesurer l'entraînement ALS sur des interactions synthétiques (aucun accès base)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interactions', type=int, default=10_000_000)
+        parser.add_argument('--recruiters', type=int, default=20_000)
+        parser.add_argument('--candidates', type=int, default=500_000)
+        parser.add_argument('--iterations', type=int, default=3)
+        parser.add_argument('--workers', type=int, nargs='+', help='Nombres de processus à comparer')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        config = get_recommender_config()
+        rng = np.random.default_rng(options['seed'])
+        n = options['interactions']
+
+        # Popularité de type Zipf côté candidats, activité inégale côté recruteurs
+        started = time.perf_counter()
+        rows = np.minimum(rng.zipf(1.3, n) - 1, options['recruiters'] - 1)
+        columns = rng.integers(0, options['candidates'], n)
+        columns = (columns * columns // options['candidates']).astype(np.int64)
+        weights = rng.choice(np.array([1.0, 1.5, 3.0, 5.0], dtype=np.float32), n, p=[0.6, 0.25, 0.1, 0.05])
+        matrix = sparse.csr_matrix(
+            (weights, (rows, columns)), shape=(options['recruiters'], options['candidates'])
+        )
+        matrix.sum_duplicates()
+        self.stdout.write(
+            f"Matrice {matrix.shape[0]}×{matrix.shape[1]}, {matrix.nnz} couples "
+            f"({time.perf_counter() - started:.1f} s)"
+        )
+
+        for workers in options['workers'] or [config['workers']]:
+            timings = []
+            started = time.perf_counter()
+            train_als(
+                matrix,
+                factors=config['factors'],
+                iterations=options['iterations'],
+                regularization=config['regularization'],
+                alpha=config['alpha'],
+                block_entries=config['block_entries'],
+                cg_steps=config['cg_steps'],
+                workers=workers,
+                log=lambda iteration, seconds: timings.append(seconds),
+            )
+            self.stdout.write(
+                f"{workers} processus : {np.mean(timings):.1f} s / itération, "
+                f"total {time.perf_counter() - started:.1f} s"
+            )
@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from recruiter.saved_searches import evaluate_saved_searches
+
+
+class Command(BaseCommand):
+    help = (
+        "Signaler les nouveaux profils correspondant aux recherches enregistrées "
+        "(à planifier, ex. toutes les 15 minutes). Seuls les profils modifiés depuis le dernier passage sont lus"
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        stats = evaluate_saved_searches()
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats['searches']} recherche(s), {stats['changed_profiles']} profil(s) modifié(s), "
+            f"{stats['new_matches']} nouvelle(s) correspondance(s), {stats['notifications']} notification(s) "
+            f"({time.perf_counter() - started:.1f} s)"
+        ))
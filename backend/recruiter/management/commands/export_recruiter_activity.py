@@ -0,0 +1,53 @@
+import sys
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from recruiter.exports import EXPORT_FORMATS, export_stream, get_export_config
+from recruiter.models import RecruiterProfile
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporter l'activité de tous les recruteurs en flux (CSV, JSON Lines ou Parquet, gzip optionnel), "
+        "vers un fichier ou la sortie standard"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), default='csv', dest='export_format')
+        parser.add_argument('--gzip', action='store_true', help='Compresser la sortie')
+        parser.add_argument('--output', help='Fichier de sortie (sortie standard par défaut)')
+        parser.add_argument('--active-only', action='store_true', help='Recruteurs actifs uniquement')
+        parser.add_argument('--chunk-size', type=int, help='Recruteurs par lot')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        recruiters = RecruiterProfile.objects.all()
+        if options['active_only']:
+            recruiters = recruiters.filter(is_active=True)
+        config = get_export_config()
+        if options['chunk_size']:
+            config['chunk_size'] = options['chunk_size']
+
+        try:
+            stream = export_stream(recruiters, options['export_format'], options['gzip'], config)
+        except ImproperlyConfigured as e:
+            raise CommandError(str(e))
+
+        output = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        written = 0
+        try:
+            for chunk in stream:
+                output.write(chunk)
+                written += len(chunk)
+        finally:
+            if options['output']:
+                output.close()
+            else:
+                output.flush()
+
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(
+                f"{written} octet(s) écrit(s) dans {options['output']} ({time.perf_counter() - started:.1f} s)"
+            ))
@@ -0,0 +1,54 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recruiter.rollups import local_today, rebuild_activity_rollups, refresh_activity_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Intégrer les nouveaux logs de consultation et d'interaction à l'activité journalière "
+        "(à planifier, ex. toutes les minutes), ou reconstruire une plage de jours"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild-from',
+            type=date.fromisoformat,
+            help='Reconstruire les jours à partir de cette date (AAAA-MM-JJ) au lieu du passage incrémental'
+        )
+        parser.add_argument(
+            '--rebuild-to',
+            type=date.fromisoformat,
+            help="Dernier jour reconstruit (par défaut aujourd'hui)"
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        start_day = options['rebuild_from']
+        if start_day is not None:
+            end_day = options['rebuild_to'] or local_today()
+            if end_day < start_day:
+                raise CommandError("--rebuild-to est antérieur à --rebuild-from")
+            rows = rebuild_activity_rollups(start_day, end_day)
+            self.stdout.write(self.style.SUCCESS(
+                f"{(end_day - start_day).days + 1} jour(s) reconstruit(s), {rows} ligne(s) "
+                f"({time.perf_counter() - started:.1f} s)"
+            ))
+            return
+
+        # Passages successifs jusqu'au rattrapage des filigranes
+        total_events = total_rows = 0
+        while True:
+            events, rows = refresh_activity_rollups()
+            total_events += events
+            total_rows += rows
+            if options['verbosity'] > 1 and events:
+                self.stdout.write(f"  … {total_events} log(s) intégré(s)")
+            if not events:
+                break
+        self.stdout.write(self.style.SUCCESS(
+            f"{total_events} log(s) intégré(s), {total_rows} ligne(s) recalculée(s) "
+            f"({time.perf_counter() - started:.1f} s)"
+        ))
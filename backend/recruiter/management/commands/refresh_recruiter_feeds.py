@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from recruiter.feeds import refresh_feeds
+
+
+class Command(BaseCommand):
+    help = (
+        "Rafraîchir les flux de candidats recommandés (à planifier, ex. toutes les 5 minutes). "
+        "Seuls les recruteurs dont les entrées ou le vivier ont changé sont recalculés"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Recalculer tous les flux (dérive des scores de classement)'
+        )
+        parser.add_argument(
+            '--recruiter',
+            type=int,
+            action='append',
+            dest='recruiters',
+            help='Limiter à un recruteur (option répétable)'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        stats = refresh_feeds(options['recruiters'], full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Flux : {stats['rebuilt']} recalculé(s), {stats['merged']} fusionné(s), "
+            f"{stats['unchanged']} inchangé(s), {stats['removed']} supprimé(s) "
+            f"({time.perf_counter() - started:.1f} s)"
+        ))
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from recruiter.collaborative import get_recommender_config, train_recommender
+
+
+class Command(BaseCommand):
+    help = "Entraîner le modèle ALS sur CandidateInteraction et publier les artefacts (à planifier, ex. chaque nuit)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--factors', type=int, help='Dimension des facteurs latents')
+        parser.add_argument('--iterations', type=int, help="Nombre d'itérations ALS")
+        parser.add_argument('--workers', type=int, help='Processus de calcul (défaut : nombre de cœurs)')
+
+    def handle(self, *args, **options):
+        config = get_recommender_config()
+        for key in ('factors', 'iterations', 'workers'):
+            if options[key]:
+                config[key] = options[key]
+
+        started = time.perf_counter()
+        version, interactions = train_recommender(
+            config,
+            log=lambda iteration, seconds: self.stdout.write(f"Itération {iteration} : {seconds:.1f} s")
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Modèle {version} : {interactions} couple(s) recruteur×candidat, "
+            f"{config['workers']} processus ({time.perf_counter() - started:.1f} s)"
+        ))
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from recruiter.search import warm_search_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Préchauffer le cache des résultats pour les recherches les plus fréquentes "
+        "(après un déploiement ou une reconstruction des documents de recherche)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, help='Nombre de recherches préchauffées')
+        parser.add_argument(
+            '--invalidate',
+            action='store_true',
+            help='Invalider les résultats en cache avant de préchauffer'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        warmed = warm_search_cache(options['top'], invalidate=options['invalidate'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{warmed} recherche(s) préchauffée(s) ({time.perf_counter() - started:.1f} s)"
+        ))
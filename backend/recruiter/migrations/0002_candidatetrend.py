@@ -0,0 +1,28 @@
+# Generated by Django 5.0.8 on 2026-10-19 02:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate', '0003_candidate_ranking'),
+        ('recruiter', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateTrend',
+            fields=[
+                ('candidate', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trend', serialize=False, to='candidate.candidateprofile')),
+                ('decay_key', models.FloatField(db_index=True)),
+                ('last_interaction_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Tendance candidat',
+                'verbose_name_plural': 'Tendances candidats',
+                'ordering': ['-decay_key'],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.8 on 2026-10-19 02:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('recruiter', '0002_candidatetrend'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecruiterFeed',
+            fields=[
+                ('recruiter', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='candidate_feed', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('candidate_ids', models.BinaryField(default=bytes)),
+                ('scores', models.BinaryField(default=bytes)),
+                ('size', models.IntegerField(default=0)),
+                ('inputs_signature', models.CharField(max_length=64)),
+                ('built_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Flux recommandé',
+                'verbose_name_plural': 'Flux recommandés',
+            },
+        ),
+    ]
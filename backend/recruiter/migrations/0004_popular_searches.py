@@ -0,0 +1,43 @@
+# Generated by Django 5.0.8 on 2026-10-19 02:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruiter', '0003_recruiterfeed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PopularSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('signature', models.CharField(max_length=40, unique=True)),
+                ('search_query', models.CharField(blank=True, max_length=500)),
+                ('search_filters', models.JSONField(default=dict)),
+                ('search_count', models.IntegerField(default=0)),
+                ('recruiter_count', models.IntegerField(default=0)),
+                ('avg_results_count', models.FloatField(default=0)),
+                ('last_searched_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Recherche populaire',
+                'verbose_name_plural': 'Recherches populaires',
+                'ordering': ['-search_count'],
+            },
+        ),
+        migrations.AddField(
+            model_name='recruitersearchhistory',
+            name='signature',
+            field=models.CharField(blank=True, max_length=40),
+        ),
+        migrations.AddIndex(
+            model_name='recruitersearchhistory',
+            index=models.Index(fields=['search_date'], name='recruiter_r_search__eb15f0_idx'),
+        ),
+    ]
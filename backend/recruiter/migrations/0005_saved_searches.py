@@ -0,0 +1,55 @@
+# Generated by Django 5.0.8 on 2026-10-19 02:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate', '0005_profile_updated_at_index'),
+        ('recruiter', '0004_popular_searches'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('search_query', models.CharField(blank=True, max_length=500)),
+                ('search_filters', models.JSONField(blank=True, default=dict)),
+                ('signature', models.CharField(max_length=40)),
+                ('alerts_enabled', models.BooleanField(default=True)),
+                ('last_evaluated_at', models.DateTimeField(db_index=True)),
+                ('last_alerted_at', models.DateTimeField(blank=True, null=True)),
+                ('matches_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('recruiter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Recherche enregistrée',
+                'verbose_name_plural': 'Recherches enregistrées',
+                'ordering': ['-created_at'],
+                'unique_together': {('recruiter', 'signature')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SavedSearchMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('matched_at', models.DateTimeField(auto_now_add=True)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='candidate.candidateprofile')),
+                ('saved_search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='recruiter.savedsearch')),
+            ],
+            options={
+                'verbose_name': 'Correspondance de recherche enregistrée',
+                'verbose_name_plural': 'Correspondances de recherches enregistrées',
+                'ordering': ['-matched_at'],
+                'unique_together': {('saved_search', 'candidate')},
+            },
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 5.0.8 on 2026-10-19 03:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate', '0007_candidate_payloads'),
+        ('recruiter', '0005_saved_searches'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityRollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=20, unique=True)),
+                ('last_event_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': "Filigrane d'agrégation",
+                'verbose_name_plural': "Filigranes d'agrégation",
+            },
+        ),
+        migrations.CreateModel(
+            name='CandidateDailyActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('profile_views', models.IntegerField(default=0)),
+                ('profile_view_duration', models.BigIntegerField(default=0)),
+                ('interest_sum', models.IntegerField(default=0)),
+                ('interest_count', models.IntegerField(default=0)),
+                ('video_views', models.IntegerField(default=0)),
+                ('video_view_duration', models.BigIntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('rating_count', models.IntegerField(default=0)),
+                ('interaction_profile_view', models.IntegerField(default=0)),
+                ('interaction_video_view', models.IntegerField(default=0)),
+                ('interaction_cv_download', models.IntegerField(default=0)),
+                ('interaction_message_sent', models.IntegerField(default=0)),
+                ('interaction_interview_request', models.IntegerField(default=0)),
+                ('interaction_offer_sent', models.IntegerField(default=0)),
+                ('interaction_favorite_added', models.IntegerField(default=0)),
+                ('interaction_favorite_removed', models.IntegerField(default=0)),
+                ('unique_recruiters', models.IntegerField(default=0)),
+                ('video_viewer_ids', models.JSONField(default=list)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_activity', to='candidate.candidateprofile')),
+            ],
+            options={
+                'verbose_name': 'Activité journalière candidat',
+                'verbose_name_plural': 'Activités journalières candidats',
+                'indexes': [models.Index(fields=['day'], name='recruiter_c_day_a1d4ba_idx')],
+                'unique_together': {('candidate', 'day')},
+            },
+        ),
+        migrations.CreateModel(
+            name='RecruiterDailyActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('profile_views', models.IntegerField(default=0)),
+                ('profile_view_duration', models.BigIntegerField(default=0)),
+                ('interest_sum', models.IntegerField(default=0)),
+                ('interest_count', models.IntegerField(default=0)),
+                ('video_views', models.IntegerField(default=0)),
+                ('video_view_duration', models.BigIntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('rating_count', models.IntegerField(default=0)),
+                ('interaction_profile_view', models.IntegerField(default=0)),
+                ('interaction_video_view', models.IntegerField(default=0)),
+                ('interaction_cv_download', models.IntegerField(default=0)),
+                ('interaction_message_sent', models.IntegerField(default=0)),
+                ('interaction_interview_request', models.IntegerField(default=0)),
+                ('interaction_offer_sent', models.IntegerField(default=0)),
+                ('interaction_favorite_added', models.IntegerField(default=0)),
+                ('interaction_favorite_removed', models.IntegerField(default=0)),
+                ('unique_candidates', models.IntegerField(default=0)),
+                ('recruiter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_activity', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Activité journalière recruteur',
+                'verbose_name_plural': 'Activités journalières recruteurs',
+                'indexes': [models.Index(fields=['day'], name='recruiter_r_day_73f95f_idx')],
+                'unique_together': {('recruiter', 'day')},
+            },
+        ),
+    ]
@@ -153,20 +153,259 @@ class RecruiterSearchHistory(models.Model):
     search_filters = models.JSONField(default=dict)
     results_count = models.IntegerField(default=0)
     search_date = models.DateTimeField(auto_now_add=True)
+    # Empreinte de la requête et des filtres normalisés (voir recruiter.search)
+    signature = models.CharField(max_length=40, blank=True)
     
     class Meta:
         verbose_name = 'Historique de recherche'
         verbose_name_plural = 'Historiques de recherches'
         ordering = ['-search_date']
+        indexes = [
+            models.Index(fields=['search_date']),
+        ]
     
     def __str__(self):
         return f"{self.recruiter.username} - \"{self.search_query}\" ({self.results_count} résultats)"
 
 
+class CandidateTrend(models.Model):
+    """
+    Compteur d'attention décroissant par candidat (voir recruiter.trending)
+    decay_key = ln(score) + λ·(t − EPOCH) : trier sur la clé = trier sur le score courant
+    """
+    
+    candidate = models.OneToOneField(
+        'candidate.CandidateProfile',
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='trend'
+    )
+    decay_key = models.FloatField(db_index=True)
+    last_interaction_at = models.DateTimeField()
+    
+    class Meta:
+        verbose_name = 'Tendance candidat'
+        verbose_name_plural = 'Tendances candidats'
+        ordering = ['-decay_key']
+    
+    def __str__(self):
+        return f"Tendance - {self.candidate_id} ({self.current_score:.2f})"
+    
+    @property
+    def current_score(self):
+        from .trending import current_score
+        return current_score(self.decay_key)
+
+
+class RecruiterFeed(models.Model):
+    """
+    Flux de candidats recommandés, matérialisé par recruiter.feeds
+    Ids et scores stockés sous forme de tableaux binaires compacts
+    """
+    
+    recruiter = models.OneToOneField(
+        User,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='candidate_feed'
+    )
+    candidate_ids = models.BinaryField(default=bytes)  # int64 petit-boutiste
+    scores = models.BinaryField(default=bytes)  # float32, même ordre
+    size = models.IntegerField(default=0)
+    
+    # Empreinte des préférences et de l'historique ayant produit le flux
+    inputs_signature = models.CharField(max_length=64)
+    # Documents candidats modifiés après cet instant non encore pris en compte
+    built_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Flux recommandé'
+        verbose_name_plural = 'Flux recommandés'
+    
+    def __str__(self):
+        return f"Flux de {self.recruiter.username} ({self.size} candidats)"
+    
+    def entries(self):
+        """Liste de (candidate_id, score) par score décroissant"""
+        from .feeds import unpack_entries
+        return unpack_entries(self.candidate_ids, self.scores)
+
+
+class PopularSearch(models.Model):
+    """
+    Combinaison requête/filtres parmi les plus fréquentes de l'historique
+    Recalculée par aggregate_popular_searches (voir recruiter.search)
+    """
+    
+    signature = models.CharField(max_length=40, unique=True)
+    search_query = models.CharField(max_length=500, blank=True)
+    search_filters = models.JSONField(default=dict)
+    search_count = models.IntegerField(default=0)
+    recruiter_count = models.IntegerField(default=0)
+    avg_results_count = models.FloatField(default=0)
+    last_searched_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Recherche populaire'
+        verbose_name_plural = 'Recherches populaires'
+        ordering = ['-search_count']
+    
+    def __str__(self):
+        return f"\"{self.search_query}\" ({self.search_count} recherches)"
+
+
+class SavedSearch(models.Model):
+    """
+    Recherche enregistrée par un recruteur, évaluée périodiquement (voir recruiter.saved_searches)
+    Seuls les profils modifiés depuis last_evaluated_at sont examinés
+    """
+    
+    recruiter = models.ForeignKey(User, on_delete=models.CASCADE, related_name='saved_searches')
+    name = models.CharField(max_length=200)
+    # Filtres normalisés, même format que RecruiterSearchHistory
+    search_query = models.CharField(max_length=500, blank=True)
+    search_filters = models.JSONField(default=dict, blank=True)
+    signature = models.CharField(max_length=40)
+    
+    alerts_enabled = models.BooleanField(default=True)
+    last_evaluated_at = models.DateTimeField(db_index=True)
+    last_alerted_at = models.DateTimeField(null=True, blank=True)
+    matches_count = models.IntegerField(default=0)  # Profils signalés depuis la création
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Recherche enregistrée'
+        verbose_name_plural = 'Recherches enregistrées'
+        ordering = ['-created_at']
+        unique_together = ['recruiter', 'signature']
+    
+    def __str__(self):
+        return f"{self.recruiter.username} - {self.name}"
+    
+    @property
+    def filters(self):
+        """Filtres normalisés complets (requête comprise)"""
+        filters = dict(self.search_filters)
+        if self.search_query:
+            filters['q'] = self.search_query
+        return dict(sorted(filters.items()))
+
+
+class SavedSearchMatch(models.Model):
+    """Profil déjà signalé pour une recherche enregistrée (chaque profil au plus une fois)"""
+    
+    saved_search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='matches')
+    candidate = models.ForeignKey('candidate.CandidateProfile', on_delete=models.CASCADE)
+    matched_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Correspondance de recherche enregistrée'
+        verbose_name_plural = 'Correspondances de recherches enregistrées'
+        ordering = ['-matched_at']
+        unique_together = ['saved_search', 'candidate']
+
+
+class DailyActivity(models.Model):
+    """
+    Compteurs d'activité d'une journée (fuseau de settings.ACTIVITY_ROLLUPS)
+    Maintenus à partir des logs par recruiter.rollups
+    """
+    
+    day = models.DateField()
+    
+    # ProfileViewLog
+    profile_views = models.IntegerField(default=0)
+    profile_view_duration = models.BigIntegerField(default=0)  # en secondes
+    interest_sum = models.IntegerField(default=0)
+    interest_count = models.IntegerField(default=0)  # Consultations avec un niveau d'intérêt
+    
+    # VideoViewLog
+    video_views = models.IntegerField(default=0)
+    video_view_duration = models.BigIntegerField(default=0)  # en secondes
+    rating_sum = models.IntegerField(default=0)
+    rating_count = models.IntegerField(default=0)  # Consultations notées
+    
+    # CandidateInteraction, une colonne par type
+    interaction_profile_view = models.IntegerField(default=0)
+    interaction_video_view = models.IntegerField(default=0)
+    interaction_cv_download = models.IntegerField(default=0)
+    interaction_message_sent = models.IntegerField(default=0)
+    interaction_interview_request = models.IntegerField(default=0)
+    interaction_offer_sent = models.IntegerField(default=0)
+    interaction_favorite_added = models.IntegerField(default=0)
+    interaction_favorite_removed = models.IntegerField(default=0)
+    
+    class Meta:
+        abstract = True
+
+
+class RecruiterDailyActivity(DailyActivity):
+    """Activité d'un recruteur sur une journée"""
+    
+    recruiter = models.ForeignKey(User, on_delete=models.CASCADE, related_name='daily_activity')
+    unique_candidates = models.IntegerField(default=0)  # Candidats distincts, toutes sources
+    
+    class Meta:
+        verbose_name = 'Activité journalière recruteur'
+        verbose_name_plural = 'Activités journalières recruteurs'
+        unique_together = ['recruiter', 'day']
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+    
+    def __str__(self):
+        return f"{self.recruiter_id} - {self.day}"
+
+
+class CandidateDailyActivity(DailyActivity):
+    """Activité des recruteurs autour d'un candidat sur une journée"""
+    
+    candidate = models.ForeignKey(
+        'candidate.CandidateProfile',
+        on_delete=models.CASCADE,
+        related_name='daily_activity'
+    )
+    unique_recruiters = models.IntegerField(default=0)  # Recruteurs distincts, toutes sources
+    # Spectateurs distincts de la vidéo ce jour-là (union sur une période)
+    video_viewer_ids = models.JSONField(default=list)
+    
+    class Meta:
+        verbose_name = 'Activité journalière candidat'
+        verbose_name_plural = 'Activités journalières candidats'
+        unique_together = ['candidate', 'day']
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+    
+    def __str__(self):
+        return f"{self.candidate_id} - {self.day}"
+
+
+class ActivityRollupWatermark(models.Model):
+    """Filigrane des activités journalières : dernier id de log intégré, par source (voir recruiter.rollups)"""
+    
+    source = models.CharField(max_length=20, unique=True)
+    last_event_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Filigrane d'agrégation"
+        verbose_name_plural = "Filigranes d'agrégation"
+    
+    def __str__(self):
+        return f"{self.source} : {self.last_event_id}"
+
+
 # Signaux pour créer automatiquement les interactions
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from candidate.models import VideoViewLog
+from candidate.ranking import record_engagement
+from .trending import record_interaction
 
 @receiver(post_save, sender=VideoViewLog)
 def create_video_interaction(sender, instance, created, **kwargs):
@@ -200,4 +439,16 @@ def create_profile_interaction(sender, instance, created, **kwargs):
                 'interest_level': instance.interest_level
             },
             notes=instance.notes
-        )
\ No newline at end of file
+        )
+
+@receiver(post_save, sender=RecruiterFavorite)
+def record_favorite_engagement(sender, instance, created, **kwargs):
+    """Ajout aux favoris : engagement du candidat (score de classement)"""
+    if created:
+        record_engagement(instance.candidate_id, 'favorite_added', at=instance.added_at)
+
+@receiver(post_save, sender=CandidateInteraction)
+def update_candidate_trend(sender, instance, created, raw=False, **kwargs):
+    """Alimenter le compteur de tendance (vues profil et vidéo passent aussi par ici)"""
+    if created and not raw:
+        record_interaction(instance.candidate_id, instance.interaction_type, at=instance.interaction_date)
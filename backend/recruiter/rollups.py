@@ -0,0 +1,423 @@
+# backend/recruiter/rollups.py
+"""
+Activité journalière par recruteur et par candidat
+
+RecruiterDailyActivity (jour, recruteur) et CandidateDailyActivity (jour,
+candidat) résument ProfileViewLog, VideoViewLog et CandidateInteraction :
+nombre de logs par type, durées de visionnage et notes cumulées,
+contreparties distinctes. Le jour est celui du fuseau configuré
+(Africa/Casablanca).
+
+Maintenance incrémentale (commande refresh_activity_rollups, à planifier
+toutes les minutes) :
+un filigrane par source, le dernier id intégré. Les logs suivants désignent
+les lignes (jour, clé) touchées, recalculées entièrement depuis les logs
+jusqu'au nouveau filigrane : recalculer une ligne est idempotent. Le
+filigrane s'arrête avant le premier log de moins de settle_seconds
+secondes, pour ne pas sauter un id plus petit encore en cours de
+transaction.
+
+Lecture : lignes agrégées + logs au-delà du filigrane (la traîne, quelques
+minutes d'activité, agrégée en SQL), les totaux restent exacts entre deux
+passages. Une traîne de plus de max_tail_events logs (passage non planifié
+ou en retard) lance le rattrapage en arrière-plan, un seul par processus. Les
+logs supprimés ou dont la date change après coup ne sont pris en compte
+qu'après reconstruction des jours concernés (rebuild_activity_rollups).
+Réglages dans settings.ACTIVITY_ROLLUPS.
+"""
+from collections import Counter, defaultdict, namedtuple
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from video_studio.background import run_once_in_background
+from video_studio.expressions import count_of, sum_of
+
+
+DEFAULT_ACTIVITY_ROLLUPS_CONFIG = {
+    'timezone': 'Africa/Casablanca',
+    # Âge minimal d'un log pour que le filigrane le dépasse
+    'settle_seconds': 60,
+    # Logs intégrés par source et par passage
+    'batch_size': 10000,
+    'chunk_size': 2000,
+    # Logs de la traîne au-delà desquels une lecture lance le rattrapage
+    'max_tail_events': 50000,
+}
+
+SUM_FIELDS = (
+    'profile_views', 'profile_view_duration', 'interest_sum', 'interest_count',
+    'video_views', 'video_view_duration', 'rating_sum', 'rating_count',
+    'interaction_profile_view', 'interaction_video_view', 'interaction_cv_download',
+    'interaction_message_sent', 'interaction_interview_request', 'interaction_offer_sent',
+    'interaction_favorite_added', 'interaction_favorite_removed',
+)
+
+# Logs résumés : modèle, colonnes recruteur / candidat / date, colonnes agrégées
+Source = namedtuple('Source', 'model recruiter candidate timestamp columns')
+
+# Logs de consultation : colonnes (vues, durée, somme des notes, nombre de notes)
+VIEW_FIELDS = {
+    'profile_view': ('profile_views', 'profile_view_duration', 'interest_sum', 'interest_count'),
+    'video_view': ('video_views', 'video_view_duration', 'rating_sum', 'rating_count'),
+}
+
+
+def get_activity_rollups_config():
+    """Configuration par défaut surchargée par settings.ACTIVITY_ROLLUPS"""
+    return {**DEFAULT_ACTIVITY_ROLLUPS_CONFIG, **getattr(settings, 'ACTIVITY_ROLLUPS', {})}
+
+
+def _sources():
+    from candidate.models import VideoViewLog
+    from .models import CandidateInteraction, ProfileViewLog
+
+    return {
+        'profile_view': Source(
+            ProfileViewLog, 'recruiter_id', 'candidate_profile_id', 'viewed_at', ('view_duration', 'interest_level')
+        ),
+        'video_view': Source(
+            VideoViewLog, 'viewer_id', 'candidate_profile_id', 'viewed_at', ('view_duration', 'rating')
+        ),
+        'interaction': Source(
+            CandidateInteraction, 'recruiter_id', 'candidate_id', 'interaction_date', ('interaction_type',)
+        ),
+    }
+
+
+def _timezone(config):
+    return ZoneInfo(config['timezone'])
+
+
+def local_today(config=None):
+    """Jour courant dans le fuseau des activités journalières"""
+    config = config or get_activity_rollups_config()
+    return timezone.localtime(timezone.now(), _timezone(config)).date()
+
+
+def day_start(day, config=None):
+    """Premier instant du jour dans le fuseau des activités journalières"""
+    config = config or get_activity_rollups_config()
+    return datetime.combine(day, time.min, tzinfo=_timezone(config))
+
+
+def _event_counts(source, values):
+    """Colonnes incrémentées par un log"""
+    if source == 'interaction':
+        field = f'interaction_{values[0]}'
+        return {field: 1} if field in SUM_FIELDS else {}
+    duration, score = values
+    if source == 'profile_view':
+        counts = {'profile_views': 1, 'profile_view_duration': duration or 0}
+        if score is not None:
+            counts.update(interest_sum=score, interest_count=1)
+    else:
+        counts = {'video_views': 1, 'video_view_duration': duration or 0}
+        if score is not None:
+            counts.update(rating_sum=score, rating_count=1)
+    return counts
+
+
+def _new_row():
+    return {'counts': Counter(), 'counterparts': set(), 'video_viewers': set()}
+
+
+class _Activity:
+    """Lignes en construction {(jour, clé): ligne}, côté recruteurs et côté candidats"""
+
+    def __init__(self, config):
+        self.timezone = _timezone(config)
+        self.chunk_size = config['chunk_size']
+        self.recruiters = defaultdict(_new_row)
+        self.candidates = defaultdict(_new_row)
+
+    def add_events(self, name, source, queryset):
+        fields = (source.recruiter, source.candidate, source.timestamp, *source.columns)
+        rows = queryset.order_by().values_list(*fields).iterator(self.chunk_size)
+        for recruiter_id, candidate_id, at, *values in rows:
+            day = at.astimezone(self.timezone).date()
+            counts = _event_counts(name, values)
+            recruiter_row = self.recruiters[day, recruiter_id]
+            recruiter_row['counts'].update(counts)
+            recruiter_row['counterparts'].add(candidate_id)
+            candidate_row = self.candidates[day, candidate_id]
+            candidate_row['counts'].update(counts)
+            candidate_row['counterparts'].add(recruiter_id)
+            if name == 'video_view':
+                candidate_row['video_viewers'].add(recruiter_id)
+
+
+# Maintenance
+
+
+def _lock_watermarks(sources):
+    """Filigranes {source: ActivityRollupWatermark}, verrouillés jusqu'à la fin de la transaction"""
+    from .models import ActivityRollupWatermark
+
+    ActivityRollupWatermark.objects.bulk_create(
+        [ActivityRollupWatermark(source=name) for name in sources], ignore_conflicts=True
+    )
+    return {
+        watermark.source: watermark
+        for watermark in ActivityRollupWatermark.objects.select_for_update().filter(source__in=list(sources))
+    }
+
+
+def _recompute_day(day, caps, config, recruiter_ids=None, candidate_ids=None):
+    """
+    Recalculer les lignes d'un jour depuis les logs d'id <= caps[source]
+    recruiter_ids / candidate_ids : lignes à recalculer, None pour toutes les lignes du jour
+    """
+    from .models import CandidateDailyActivity, RecruiterDailyActivity
+
+    start, end = day_start(day, config), day_start(day + timedelta(days=1), config)
+    activity = _Activity(config)
+    for name, source in _sources().items():
+        events = source.model.objects.filter(**{
+            'pk__lte': caps[name], f'{source.timestamp}__gte': start, f'{source.timestamp}__lt': end,
+        })
+        if recruiter_ids is not None:
+            events = events.filter(
+                Q(**{f'{source.recruiter}__in': recruiter_ids}) | Q(**{f'{source.candidate}__in': candidate_ids})
+            )
+        activity.add_events(name, source, events)
+
+    recruiter_rows = RecruiterDailyActivity.objects.filter(day=day)
+    candidate_rows = CandidateDailyActivity.objects.filter(day=day)
+    if recruiter_ids is not None:
+        recruiter_rows = recruiter_rows.filter(recruiter_id__in=recruiter_ids)
+        candidate_rows = candidate_rows.filter(candidate_id__in=candidate_ids)
+    recruiter_rows.delete()
+    candidate_rows.delete()
+
+    # Les logs lus pour un candidat touché concernent aussi des recruteurs non touchés
+    # (et inversement) : ces lignes partielles sont écartées
+    RecruiterDailyActivity.objects.bulk_create(
+        RecruiterDailyActivity(
+            day=day, recruiter_id=recruiter_id, unique_candidates=len(row['counterparts']), **row['counts']
+        )
+        for (_, recruiter_id), row in activity.recruiters.items()
+        if recruiter_ids is None or recruiter_id in recruiter_ids
+    )
+    CandidateDailyActivity.objects.bulk_create(
+        CandidateDailyActivity(
+            day=day, candidate_id=candidate_id, unique_recruiters=len(row['counterparts']),
+            video_viewer_ids=sorted(row['video_viewers']), **row['counts']
+        )
+        for (_, candidate_id), row in activity.candidates.items()
+        if candidate_ids is None or candidate_id in candidate_ids
+    )
+    return len(activity.recruiters) + len(activity.candidates)
+
+
+def refresh_activity_rollups(config=None):
+    """
+    Intégrer les logs postérieurs aux filigranes (au plus batch_size par source)
+    Retourne (logs intégrés, lignes recalculées)
+    """
+    config = config or get_activity_rollups_config()
+    tz = _timezone(config)
+    settled_before = timezone.now() - timedelta(seconds=config['settle_seconds'])
+    sources = _sources()
+    touched_recruiters, touched_candidates = defaultdict(set), defaultdict(set)
+    integrated = rows = 0
+
+    with transaction.atomic():
+        watermarks = _lock_watermarks(sources)
+        caps = {}
+        for name, source in sources.items():
+            cap = watermarks[name].last_event_id
+            events = source.model.objects.filter(pk__gt=cap).order_by('pk').values_list(
+                'pk', source.recruiter, source.candidate, source.timestamp
+            )[:config['batch_size']]
+            for pk, recruiter_id, candidate_id, at in events:
+                if at > settled_before:
+                    break
+                cap = pk
+                integrated += 1
+                day = at.astimezone(tz).date()
+                touched_recruiters[day].add(recruiter_id)
+                touched_candidates[day].add(candidate_id)
+            caps[name] = cap
+
+        for day in sorted(touched_recruiters):
+            rows += _recompute_day(day, caps, config, touched_recruiters[day], touched_candidates[day])
+
+        for name, watermark in watermarks.items():
+            if watermark.last_event_id != caps[name]:
+                watermark.last_event_id = caps[name]
+                watermark.save(update_fields=['last_event_id', 'updated_at'])
+    return integrated, rows
+
+
+def rebuild_activity_rollups(start_day, end_day, config=None):
+    """Recalculer toutes les lignes des jours [start_day, end_day] jusqu'aux filigranes actuels"""
+    config = config or get_activity_rollups_config()
+    rows = 0
+    day = start_day
+    while day <= end_day:
+        with transaction.atomic():
+            caps = {name: watermark.last_event_id for name, watermark in _lock_watermarks(_sources()).items()}
+            rows += _recompute_day(day, caps, config)
+        day += timedelta(days=1)
+    return rows
+
+
+def catch_up_activity_rollups(config=None):
+    """Passages successifs jusqu'au rattrapage des filigranes ; retourne (logs intégrés, lignes recalculées)"""
+    total_events = total_rows = 0
+    while True:
+        events, rows = refresh_activity_rollups(config)
+        total_events += events
+        total_rows += rows
+        if not events:
+            return total_events, total_rows
+
+
+# Lecture
+
+
+def _watermark(name):
+    from .models import ActivityRollupWatermark
+
+    return Coalesce(
+        Subquery(ActivityRollupWatermark.objects.filter(source=name).values('last_event_id')[:1]),
+        Value(0),
+        output_field=models.BigIntegerField()
+    )
+
+
+def _tail(name, source, since_day=None, config=None):
+    """Logs d'une source au-delà de son filigrane"""
+    events = source.model.objects.filter(pk__gt=_watermark(name))
+    if since_day is not None:
+        events = events.filter(**{f'{source.timestamp}__gte': day_start(since_day, config)})
+    return events
+
+
+def _tail_totals(name, source, column, ids, since_day, config):
+    """Totaux de la traîne {clé: {colonne: total}} d'une source, agrégés en SQL ; et nombre de logs lus"""
+    tail = _tail(name, source, since_day, config).filter(**{f'{column}__in': ids}).order_by()
+    totals = defaultdict(Counter)
+    events = 0
+    if name == 'interaction':
+        for pk, interaction_type, count in tail.values_list(column, 'interaction_type').annotate(count=Count('pk')):
+            events += count
+            field = f'interaction_{interaction_type}'
+            if field in SUM_FIELDS:
+                totals[pk][field] += count
+        return totals, events
+
+    duration, score = source.columns
+    views, duration_field, score_sum, score_count = VIEW_FIELDS[name]
+    rows = tail.values_list(column).annotate(
+        views=Count('pk'), duration=Sum(duration), score_sum=Sum(score), score_count=Count(score)
+    )
+    for pk, count, duration_total, score_total, scored in rows:
+        events += count
+        totals[pk].update({
+            views: count, duration_field: duration_total or 0, score_sum: score_total or 0, score_count: scored,
+        })
+    return totals, events
+
+
+def _activity(side, ids, since_day=None):
+    from .models import CandidateDailyActivity, RecruiterDailyActivity
+
+    config = get_activity_rollups_config()
+    ids = list(ids)
+    model, key = (RecruiterDailyActivity, 'recruiter_id') if side == 'recruiter' else (CandidateDailyActivity, 'candidate_id')
+    totals = {pk: dict.fromkeys(SUM_FIELDS, 0) for pk in ids}
+    if side == 'candidate':
+        for pk in ids:
+            totals[pk]['video_viewer_ids'] = set()
+
+    rows = model.objects.filter(**{f'{key}__in': ids})
+    if since_day is not None:
+        rows = rows.filter(day__gte=since_day)
+    for row in rows.order_by().values(key).annotate(**{field: Sum(field) for field in SUM_FIELDS}):
+        totals[row[key]].update({field: row[field] or 0 for field in SUM_FIELDS})
+    if side == 'candidate':
+        for pk, viewer_ids in rows.values_list(key, 'video_viewer_ids'):
+            totals[pk]['video_viewer_ids'].update(viewer_ids)
+
+    sources = _sources()
+    tail_events = 0
+    for name, source in sources.items():
+        column = source.recruiter if side == 'recruiter' else source.candidate
+        tail, events = _tail_totals(name, source, column, ids, since_day, config)
+        tail_events += events
+        for pk, counts in tail.items():
+            for field, value in counts.items():
+                totals[pk][field] += value
+    if side == 'candidate':
+        video = sources['video_view']
+        viewers = _tail('video_view', video, since_day, config).filter(
+            **{f'{video.candidate}__in': ids}
+        ).order_by().values_list(video.candidate, video.recruiter).distinct()
+        for pk, viewer_id in viewers:
+            totals[pk]['video_viewer_ids'].add(viewer_id)
+
+    if tail_events > config['max_tail_events']:
+        # Filigranes en retard : rattrapage hors requête, les lectures suivantes redeviennent courtes
+        run_once_in_background('activity-rollups:refresh', catch_up_activity_rollups)
+    return totals
+
+
+def recruiter_activity(recruiter_ids, since_day=None):
+    """
+    Totaux {recruiter_id: {colonne: total}} sur les jours >= since_day (tout l'historique par défaut)
+    Lignes agrégées + traîne agrégée en SQL : quatre requêtes quel que soit le nombre de recruteurs
+    """
+    return _activity('recruiter', recruiter_ids, since_day)
+
+
+def candidate_activity(candidate_ids, since_day=None):
+    """Totaux {candidate_id: {colonne: total, 'video_viewer_ids': set}}, voir recruiter_activity"""
+    return _activity('candidate', candidate_ids, since_day)
+
+
+# Colonnes de comptage : source et filtre des logs de la traîne
+_COUNT_SOURCES = {
+    'profile_views': ('profile_view', {}),
+    'video_views': ('video_view', {}),
+    **{field: ('interaction', {'interaction_type': field[len('interaction_'):]})
+       for field in SUM_FIELDS if field.startswith('interaction_')},
+}
+
+
+def activity_total(field, since_day=None, recruiter_id=None):
+    """
+    Expression scalaire utilisable dans aggregate() : total d'une colonne de comptage
+    (profile_views, video_views, interaction_<type>) pour tous les recruteurs ou l'un d'eux
+    """
+    from .models import RecruiterDailyActivity
+
+    name, filters = _COUNT_SOURCES[field]
+    source = _sources()[name]
+    rows = RecruiterDailyActivity.objects.all()
+    tail = _tail(name, source, since_day).filter(**filters)
+    if since_day is not None:
+        rows = rows.filter(day__gte=since_day)
+    if recruiter_id is not None:
+        rows = rows.filter(recruiter_id=recruiter_id)
+        tail = tail.filter(**{source.recruiter: recruiter_id})
+    return Coalesce(sum_of(rows, field), Value(0)) + count_of(tail)
+
+
+def active_recruiter_count(since_day, field='profile_views'):
+    """Recruteurs distincts ayant au moins un log de la colonne field depuis since_day (une requête)"""
+    from .models import RecruiterDailyActivity
+
+    name, filters = _COUNT_SOURCES[field]
+    source = _sources()[name]
+    rows = RecruiterDailyActivity.objects.filter(day__gte=since_day, **{f'{field}__gt': 0})
+    tail = _tail(name, source, since_day).filter(**filters)
+    return rows.order_by().values_list('recruiter_id').union(
+        tail.order_by().values_list(source.recruiter)
+    ).count()
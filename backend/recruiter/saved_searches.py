@@ -0,0 +1,137 @@
+# backend/recruiter/saved_searches.py
+"""
+Évaluation incrémentale des recherches enregistrées
+
+Un passage lit une seule fois les documents de recherche écrits depuis le
+plus ancien filigrane (index sur indexed_at : toute resynchronisation du
+document, y compris approbation par update(), vidéo ou utilisateur modifiés,
+que updated_at du profil ne suit pas), puis les confronte en mémoire
+aux recherches actives, regroupées par empreinte de filtres : le coût suit le
+nombre de profils modifiés, pas le nombre de recherches × profils.
+
+Un profil est signalé au plus une fois par recherche (SavedSearchMatch) ; les
+nouveaux profils de toutes les recherches d'un recruteur sont regroupés dans
+une seule notification.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .search import MATCH_FIELDS, document_matches
+
+
+DEFAULT_SAVED_SEARCH_CONFIG = {
+    # Recouvrement de la fenêtre (transactions validées en retard), sans doublon grâce à SavedSearchMatch
+    'overlap_seconds': 60,
+    'chunk_size': 2000,
+    # Identifiants de candidats joints à la notification, par recherche
+    'notification_sample_size': 20,
+}
+
+
+def get_saved_search_config():
+    """Configuration par défaut surchargée par settings.SAVED_SEARCHES"""
+    return {**DEFAULT_SAVED_SEARCH_CONFIG, **getattr(settings, 'SAVED_SEARCHES', {})}
+
+
+def _changed_documents(since, with_text, chunk_size):
+    from candidate.models import CandidateSearchDocument
+
+    fields = MATCH_FIELDS + ['cv_text'] if with_text else MATCH_FIELDS
+    return (
+        CandidateSearchDocument.objects.filter(indexed_at__gt=since)
+        .order_by()
+        .values(*fields)
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def evaluate_saved_searches():
+    """
+    Confronter les profils modifiés aux recherches enregistrées actives
+    Retourne un dict de compteurs
+    """
+    from notifications.models import create_saved_search_notifications
+    from .models import SavedSearch, SavedSearchMatch
+
+    config = get_saved_search_config()
+    started_at = timezone.now()
+    searches = list(SavedSearch.objects.filter(alerts_enabled=True).only(
+        'id', 'recruiter_id', 'name', 'search_query', 'search_filters', 'signature', 'last_evaluated_at'
+    ))
+    stats = {'searches': len(searches), 'changed_profiles': 0, 'new_matches': 0, 'notifications': 0}
+    if not searches:
+        return stats
+
+    # Recherches de filtres identiques évaluées une seule fois par document
+    groups = defaultdict(list)
+    for saved_search in searches:
+        groups[saved_search.signature].append(saved_search)
+    group_filters = {signature: members[0].filters for signature, members in groups.items()}
+    overlap = timedelta(seconds=config['overlap_seconds'])
+    group_since = {
+        signature: min(member.last_evaluated_at for member in members) - overlap
+        for signature, members in groups.items()
+    }
+
+    since = min(group_since.values())
+    with_text = any('q' in filters for filters in group_filters.values())
+    matched = defaultdict(list)
+    for values in _changed_documents(since, with_text, config['chunk_size']):
+        stats['changed_profiles'] += 1
+        for signature, filters in group_filters.items():
+            if values['indexed_at'] > group_since[signature] and document_matches(filters, values):
+                matched[signature].append(values['profile_id'])
+
+    # Profils déjà signalés pour chaque recherche
+    candidates_by_search = {
+        member.pk: (member, candidate_ids)
+        for signature, candidate_ids in matched.items()
+        for member in groups[signature]
+    }
+    already = defaultdict(set)
+    all_candidates = sorted({
+        candidate_id for _, candidate_ids in candidates_by_search.values() for candidate_id in candidate_ids
+    })
+    for start in range(0, len(all_candidates), config['chunk_size']):
+        already_matched = SavedSearchMatch.objects.filter(
+            saved_search_id__in=list(candidates_by_search),
+            candidate_id__in=all_candidates[start:start + config['chunk_size']],
+        ).values_list('saved_search_id', 'candidate_id')
+        for saved_search_id, candidate_id in already_matched:
+            already[saved_search_id].add(candidate_id)
+
+    new_matches = []
+    alerts = defaultdict(list)
+    for saved_search_id, (saved_search, candidate_ids) in candidates_by_search.items():
+        fresh = [candidate_id for candidate_id in candidate_ids if candidate_id not in already[saved_search_id]]
+        if not fresh:
+            continue
+        new_matches.extend(
+            SavedSearchMatch(saved_search_id=saved_search_id, candidate_id=candidate_id)
+            for candidate_id in fresh
+        )
+        alerts[saved_search.recruiter_id].append((saved_search, fresh))
+
+    with transaction.atomic():
+        SavedSearchMatch.objects.bulk_create(new_matches, ignore_conflicts=True)
+        for recruiter_alerts in alerts.values():
+            for saved_search, fresh in recruiter_alerts:
+                SavedSearch.objects.filter(pk=saved_search.pk).update(
+                    matches_count=F('matches_count') + len(fresh),
+                    last_alerted_at=started_at,
+                )
+        notifications = create_saved_search_notifications(
+            alerts, sample_size=config['notification_sample_size']
+        )
+        SavedSearch.objects.filter(pk__in=[saved_search.pk for saved_search in searches]).update(
+            last_evaluated_at=started_at
+        )
+
+    stats['new_matches'] = len(new_matches)
+    stats['notifications'] = len(notifications)
+    return stats
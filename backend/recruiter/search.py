@@ -0,0 +1,481 @@
+# backend/recruiter/search.py
+"""
+Recherche de candidats côté recruteur
+
+- Filtres normalisés (casse, espaces, valeurs invalides écartées) : deux
+  saisies équivalentes partagent la même empreinte, donc la même entrée de cache
+- Résultats en cache, clés versionnées par une génération propre à la
+  recherche (invalidation globale) et par celle de l'ensemble des profils
+  (PUBLIC_POOL, changée par les signaux de candidate) : un profil rendu privé,
+  supprimé ou modifié sort des résultats en cache dès le commit
+- Historique des recherches écrit par lots, hors du chemin de la requête
+- Recherches populaires agrégées depuis l'historique : préchauffage du cache
+  et suggestions de requêtes
+"""
+import atexit
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Q
+from django.utils import timezone
+
+from candidate.cv_extraction import normalize_text
+from matching.text import fold
+from video_studio.background import run_in_background
+from video_studio.response_cache import PUBLIC_POOL, get_generations
+
+
+logger = logging.getLogger('django')
+
+DEFAULT_SEARCH_CONFIG = {
+    # Durée de vie des résultats en cache (les profils changent en continu)
+    'cache_timeout': 300,
+    # Historique : écriture groupée
+    'history_batch_size': 100,
+    'history_flush_seconds': 5,
+    # Recherches populaires
+    'popular_window_days': 30,
+    'popular_size': 500,
+    'warm_top': 100,
+    # Réponse non paginée (?paginate=false) : nombre maximal de résultats, jamais mise en cache
+    'max_unpaginated_results': 1000,
+    # Une requête n'est suggérée qu'après avoir été faite par plusieurs recruteurs
+    'suggestion_min_recruiters': 2,
+}
+
+SEARCH_PARAMS = [
+    'q', 'has_video', 'status', 'min_video_score', 'min_completeness',
+    'education_level', 'university', 'skill', 'experience_min', 'experience_max', 'order_by',
+]
+TEXT_PARAMS = {'q', 'education_level', 'university', 'skill'}
+INTEGER_PARAMS = {'min_video_score', 'min_completeness', 'experience_min', 'experience_max'}
+
+DEFAULT_ORDER = '-rank'
+VALID_ORDERS = [
+    'created_at', '-created_at', 'updated_at', '-updated_at',
+    'profile_completeness', '-profile_completeness',
+    'video_quality_score', '-video_quality_score',
+    'first_name', '-first_name', 'last_name', '-last_name',
+    'rank', '-rank'
+]
+
+GENERATION_KEY = 'candidate_search_generation'
+POPULAR_SEARCHES_KEY = 'popular_searches'
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def get_search_config():
+    """Configuration par défaut surchargée par settings.CANDIDATE_SEARCH"""
+    return {**DEFAULT_SEARCH_CONFIG, **getattr(settings, 'CANDIDATE_SEARCH', {})}
+
+
+# Filtres
+
+def normalize_search_params(params, allowed=SEARCH_PARAMS):
+    """
+    Filtres normalisés d'une recherche (dict trié, valeurs vides omises)
+    Les valeurs sans effet sur la requête (entier invalide, tri inconnu) sont écartées
+    """
+    filters = {}
+    for name in allowed:
+        value = WHITESPACE_RE.sub(' ', params.get(name) or '').strip()
+        if name == 'order_by':
+            value = value or DEFAULT_ORDER
+            if value not in VALID_ORDERS:
+                continue
+        elif name in TEXT_PARAMS:
+            value = value.lower()
+        elif name in INTEGER_PARAMS:
+            try:
+                value = str(int(value)) if value else ''
+            except ValueError:
+                continue
+        elif name == 'has_video' and value not in ('true', 'false'):
+            continue
+        if value:
+            filters[name] = value
+    return dict(sorted(filters.items()))
+
+
+def search_signature(filters):
+    """Empreinte stable de filtres normalisés"""
+    return hashlib.sha1(
+        json.dumps(filters, sort_keys=True, ensure_ascii=False).encode()
+    ).hexdigest()
+
+
+def filter_documents(filters):
+    """Queryset des documents de recherche correspondant à des filtres normalisés"""
+    from candidate.models import CandidateSearchDocument
+
+    queryset = CandidateSearchDocument.objects.all()
+
+    # Recherche textuelle (texte du CV normalisé sans accents)
+    if 'q' in filters:
+        search_query = filters['q']
+        text_filter = (
+            Q(first_name__icontains=search_query) |
+            Q(last_name__icontains=search_query) |
+            Q(university__icontains=search_query) |
+            Q(major__icontains=search_query) |
+            Q(email__icontains=search_query)
+        )
+        # Requête vide une fois normalisée : le LIKE '%%' correspondrait à tous les documents
+        cv_query = normalize_text(search_query)
+        if cv_query:
+            text_filter |= Q(cv_text__contains=cv_query)
+        queryset = queryset.filter(text_filter)
+
+    # Compétence extraite du CV
+    if 'skill' in filters:
+        queryset = queryset.filter(cv_skills__contains=[normalize_text(filters['skill'])])
+
+    if filters.get('has_video') == 'true':
+        queryset = queryset.filter(has_presentation_video=True)
+    elif filters.get('has_video') == 'false':
+        queryset = queryset.filter(presentation_video__isnull=True)
+
+    if 'status' in filters:
+        queryset = queryset.filter(status=filters['status'])
+    if 'education_level' in filters:
+        queryset = queryset.filter(education_level__icontains=filters['education_level'])
+    if 'university' in filters:
+        queryset = queryset.filter(university__icontains=filters['university'])
+    if 'experience_min' in filters:
+        queryset = queryset.filter(experience_years__gte=int(filters['experience_min']))
+    if 'experience_max' in filters:
+        queryset = queryset.filter(experience_years__lte=int(filters['experience_max']))
+    if 'min_video_score' in filters:
+        queryset = queryset.filter(video_quality_score__gte=int(filters['min_video_score']))
+    if 'min_completeness' in filters:
+        queryset = queryset.filter(profile_completeness__gte=int(filters['min_completeness']))
+
+    # Tri (rank = score composite, voir candidate.ranking)
+    if 'order_by' in filters:
+        queryset = queryset.order_by(filters['order_by'].replace('rank', 'rank_score'))
+    return queryset
+
+
+# Colonnes des documents lues par document_matches
+MATCH_FIELDS = [
+    'profile_id', 'first_name', 'last_name', 'university', 'major', 'email', 'cv_skills',
+    'has_presentation_video', 'presentation_video_id', 'status', 'education_level',
+    'experience_years', 'video_quality_score', 'profile_completeness', 'indexed_at',
+]
+
+
+def _icontains(value, needle):
+    return needle in (value or '').lower()
+
+
+def document_matches(filters, values):
+    """
+    Équivalent en mémoire de filter_documents pour un document (dict de MATCH_FIELDS,
+    plus 'cv_text' si la recherche a une requête). Les deux doivent rester alignés
+    """
+    if 'status' in filters and values['status'] != filters['status']:
+        return False
+    if filters.get('has_video') == 'true' and not values['has_presentation_video']:
+        return False
+    if filters.get('has_video') == 'false' and values['presentation_video_id'] is not None:
+        return False
+    if 'experience_min' in filters and values['experience_years'] < int(filters['experience_min']):
+        return False
+    if 'experience_max' in filters and values['experience_years'] > int(filters['experience_max']):
+        return False
+    if 'min_video_score' in filters and values['video_quality_score'] < int(filters['min_video_score']):
+        return False
+    if 'min_completeness' in filters and values['profile_completeness'] < int(filters['min_completeness']):
+        return False
+    if 'education_level' in filters and not _icontains(values['education_level'], filters['education_level']):
+        return False
+    if 'university' in filters and not _icontains(values['university'], filters['university']):
+        return False
+    if 'skill' in filters and normalize_text(filters['skill']) not in (values['cv_skills'] or []):
+        return False
+    if 'q' in filters:
+        search_query = filters['q']
+        cv_query = normalize_text(search_query)
+        return (
+            any(
+                _icontains(values[field], search_query)
+                for field in ('first_name', 'last_name', 'university', 'major', 'email')
+            )
+            or bool(cv_query) and cv_query in (values.get('cv_text') or '')
+        )
+    return True
+
+
+# Cache des résultats
+
+def search_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        generation = time.time()
+        cache.set(GENERATION_KEY, generation, timeout=None)
+    return generation
+
+
+def bump_search_generation():
+    """Rendre inaccessibles toutes les réponses en cache (après un changement de données massif)"""
+    cache.set(GENERATION_KEY, time.time(), timeout=None)
+
+
+def _cache_key(kind, filters, *parts):
+    suffix = ':'.join(str(part) for part in parts)
+    pool = get_generations([PUBLIC_POOL])[PUBLIC_POOL]
+    return f'candidate_search:{search_generation()}:{pool}:{kind}:{search_signature(filters)}:{suffix}'
+
+
+def result_cards(queryset):
+    """
+    Cartes des documents du queryset, dans son ordre
+    JSON pré-rendus (RawJSON) ; documents sérialisés pour les profils pas encore rendus
+    """
+    from candidate.models import CandidateSearchDocument
+    from candidate.payloads import get_payloads
+    from candidate.serializers import CandidateSearchDocumentSerializer
+
+    profile_ids = list(queryset.values_list('profile_id', flat=True))
+    cards = get_payloads(profile_ids, 'card')
+    missing = CandidateSearchDocument.objects.in_bulk(
+        [profile_id for profile_id in profile_ids if profile_id not in cards]
+    )
+    serialized = dict(zip(missing, CandidateSearchDocumentSerializer(list(missing.values()), many=True).data))
+    return [
+        cards.get(profile_id) or serialized[profile_id]
+        for profile_id in profile_ids if profile_id in cards or profile_id in serialized
+    ]
+
+
+def get_search_page(filters, page_number=1, page_size=None, refresh=False):
+    """
+    Page de résultats : {'count', 'count_is_exact', 'results'}
+    Lève django.core.paginator.InvalidPage pour une page hors limites
+    """
+    from rest_framework.settings import api_settings
+    from video_studio.pagination import ApproximateCountPaginator
+
+    page_size = page_size or api_settings.PAGE_SIZE
+    key = _cache_key('page', filters, page_number, page_size)
+    if not refresh:
+        page = cache.get(key)
+        if page is not None:
+            return page
+
+    paginator = ApproximateCountPaginator(filter_documents(filters), page_size)
+    django_page = paginator.page(page_number)
+    page = {
+        'count': paginator.count,
+        'count_is_exact': paginator.count_is_exact,
+        'results': result_cards(django_page.object_list),
+    }
+    cache.set(key, page, timeout=get_search_config()['cache_timeout'])
+    return page
+
+
+def get_search_results(filters, limit=50, refresh=False):
+    """
+    Premiers résultats sans pagination : {'count', 'results'}
+    limit=None : jusqu'à max_unpaginated_results résultats, jamais mis en cache,
+    avec 'truncated' ; count est alors le total (approximatif au-delà du seuil)
+    """
+    if limit is None:
+        from video_studio.pagination import approximate_count
+
+        queryset = filter_documents(filters)
+        max_results = get_search_config()['max_unpaginated_results']
+        results = result_cards(queryset[:max_results + 1])
+        truncated = len(results) > max_results
+        return {
+            'results': results[:max_results],
+            'count': approximate_count(queryset)[0] if truncated else len(results),
+            'truncated': truncated,
+        }
+
+    key = _cache_key('list', filters, limit)
+    if not refresh:
+        response = cache.get(key)
+        if response is not None:
+            return response
+
+    results = result_cards(filter_documents(filters)[:limit])
+    response = {'results': results, 'count': len(results)}
+    cache.set(key, response, timeout=get_search_config()['cache_timeout'])
+    return response
+
+
+# Historique
+
+_history_buffer = []
+_history_lock = threading.Lock()
+
+
+def record_search(recruiter_id, filters, results_count):
+    """
+    Mémoriser une recherche (aucune requête SQL dans la requête HTTP)
+    Les entrées sont écrites par lots en arrière-plan
+    """
+    from .models import RecruiterSearchHistory
+
+    if not recruiter_id:
+        return
+    config = get_search_config()
+    entry = RecruiterSearchHistory(
+        recruiter_id=recruiter_id,
+        search_query=filters.get('q', ''),
+        search_filters={name: value for name, value in filters.items() if name != 'q'},
+        results_count=results_count,
+        signature=search_signature(filters),
+    )
+    with _history_lock:
+        _history_buffer.append(entry)
+        size = len(_history_buffer)
+    if size >= config['history_batch_size']:
+        run_in_background(flush_search_history)
+    elif size == 1:
+        # Premier élément du lot : écriture au plus tard dans history_flush_seconds
+        timer = threading.Timer(
+            config['history_flush_seconds'], run_in_background, args=[flush_search_history]
+        )
+        timer.daemon = True
+        timer.start()
+
+
+def flush_search_history():
+    """Écrire les recherches en attente, retourne le nombre de lignes insérées"""
+    from django.contrib.auth.models import User
+    from .models import RecruiterSearchHistory
+
+    global _history_buffer
+    with _history_lock:
+        entries, _history_buffer = _history_buffer, []
+    if not entries:
+        return 0
+
+    # recruiter_id vient de la requête : ignorer les utilisateurs inexistants
+    known = set(User.objects.filter(
+        pk__in={entry.recruiter_id for entry in entries}
+    ).values_list('pk', flat=True))
+    entries = [entry for entry in entries if entry.recruiter_id in known]
+    RecruiterSearchHistory.objects.bulk_create(entries)
+    return len(entries)
+
+
+atexit.register(flush_search_history)
+
+
+# Recherches populaires
+
+def aggregate_popular_searches(days=None, size=None):
+    """
+    Recalculer les combinaisons requête/filtres les plus fréquentes sur la période
+    Un GROUP BY sur l'empreinte, puis remplacement de la table PopularSearch
+    """
+    from .models import PopularSearch, RecruiterSearchHistory
+
+    config = get_search_config()
+    days = days or config['popular_window_days']
+    size = size or config['popular_size']
+
+    groups = list(
+        RecruiterSearchHistory.objects.filter(
+            search_date__gte=timezone.now() - timedelta(days=days)
+        ).exclude(signature='')
+        .values('signature')
+        .annotate(
+            search_count=Count('id'),
+            recruiter_count=Count('recruiter', distinct=True),
+            avg_results_count=Avg('results_count'),
+            last_searched_at=Max('search_date'),
+            sample_id=Max('id'),
+        )
+        .order_by('-search_count', '-last_searched_at')[:size]
+    )
+    samples = RecruiterSearchHistory.objects.in_bulk([group['sample_id'] for group in groups])
+
+    popular = [
+        PopularSearch(
+            signature=group['signature'],
+            search_query=samples[group['sample_id']].search_query,
+            search_filters=samples[group['sample_id']].search_filters,
+            search_count=group['search_count'],
+            recruiter_count=group['recruiter_count'],
+            avg_results_count=group['avg_results_count'] or 0,
+            last_searched_at=group['last_searched_at'],
+        )
+        for group in groups
+    ]
+    with transaction.atomic():
+        PopularSearch.objects.all().delete()
+        PopularSearch.objects.bulk_create(popular)
+    cache.delete(POPULAR_SEARCHES_KEY)
+    return len(popular)
+
+
+def get_popular_searches():
+    """Recherches populaires (liste de dicts par fréquence décroissante), depuis le cache"""
+    from .models import PopularSearch
+
+    popular = cache.get(POPULAR_SEARCHES_KEY)
+    if popular is None:
+        popular = list(PopularSearch.objects.values(
+            'search_query', 'search_filters', 'search_count', 'recruiter_count', 'avg_results_count'
+        ))
+        for entry in popular:
+            entry['folded_query'] = fold(entry['search_query'])
+        cache.set(POPULAR_SEARCHES_KEY, popular, timeout=None)
+    return popular
+
+
+def suggest_searches(prefix, limit=10):
+    """Recherches populaires dont la requête commence par `prefix`"""
+    config = get_search_config()
+    prefix = WHITESPACE_RE.sub(' ', fold(prefix)).strip()
+    suggestions = []
+    for entry in get_popular_searches():
+        if (
+            entry['folded_query']
+            and entry['folded_query'].startswith(prefix)
+            and entry['recruiter_count'] >= config['suggestion_min_recruiters']
+        ):
+            suggestions.append({
+                'query': entry['search_query'],
+                'filters': entry['search_filters'],
+                'search_count': entry['search_count'],
+                'avg_results_count': round(entry['avg_results_count']),
+            })
+            if len(suggestions) >= limit:
+                break
+    return suggestions
+
+
+def warm_search_cache(top=None, invalidate=False):
+    """
+    Précalculer les premiers résultats des recherches les plus fréquentes
+    invalidate : nouvelle génération (après un déploiement ou une reconstruction des documents)
+    N'a d'effet sur les workers web qu'avec un cache partagé (REDIS_URL)
+    """
+    top = top or get_search_config()['warm_top']
+    if invalidate:
+        bump_search_generation()
+
+    warmed = 0
+    for entry in get_popular_searches()[:top]:
+        filters = dict(entry['search_filters'])
+        if entry['search_query']:
+            filters['q'] = entry['search_query']
+        filters = dict(sorted(filters.items()))
+        get_search_page(filters, refresh=True)
+        get_search_results(filters, refresh=True)
+        warmed += 1
+    return warmed
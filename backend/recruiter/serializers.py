@@ -0,0 +1,66 @@
+# backend/recruiter/serializers.py
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import RecruiterSearchHistory, SavedSearch
+from .search import normalize_search_params, search_signature
+
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    """
+    Serializer pour les recherches enregistrées
+    Les filtres sont normalisés comme ceux de candidate_search ; `history_id`
+    reprend la requête et les filtres d'une entrée de l'historique
+    """
+    
+    history_id = serializers.IntegerField(write_only=True, required=False)
+    
+    class Meta:
+        model = SavedSearch
+        fields = [
+            'id', 'recruiter', 'name', 'search_query', 'search_filters', 'history_id',
+            'alerts_enabled', 'last_evaluated_at', 'last_alerted_at', 'matches_count',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = [
+            'last_evaluated_at', 'last_alerted_at', 'matches_count', 'created_at', 'updated_at'
+        ]
+    
+    def validate(self, attrs):
+        recruiter = attrs.get('recruiter') or getattr(self.instance, 'recruiter', None)
+        history_id = attrs.pop('history_id', None)
+        if history_id is not None:
+            try:
+                history = RecruiterSearchHistory.objects.get(pk=history_id, recruiter=recruiter)
+            except RecruiterSearchHistory.DoesNotExist:
+                raise serializers.ValidationError({'history_id': 'Recherche introuvable dans votre historique'})
+            attrs['search_query'] = history.search_query
+            attrs['search_filters'] = history.search_filters
+        
+        if 'search_query' in attrs or 'search_filters' in attrs:
+            raw = dict(attrs.get('search_filters', getattr(self.instance, 'search_filters', {})))
+            raw['q'] = attrs.get('search_query', getattr(self.instance, 'search_query', ''))
+            filters = normalize_search_params({key: str(value) for key, value in raw.items()})
+            attrs['signature'] = search_signature(filters)
+            attrs['search_query'] = filters.pop('q', '')
+            attrs['search_filters'] = filters
+            
+            duplicates = SavedSearch.objects.filter(recruiter=recruiter, signature=attrs['signature'])
+            if self.instance is not None:
+                duplicates = duplicates.exclude(pk=self.instance.pk)
+            if duplicates.exists():
+                raise serializers.ValidationError('Cette recherche est déjà enregistrée')
+        elif self.instance is None:
+            raise serializers.ValidationError('Indiquer une requête, des filtres ou history_id')
+        return attrs
+    
+    def create(self, validated_data):
+        # Seuls les profils modifiés après l'enregistrement seront signalés
+        validated_data['last_evaluated_at'] = timezone.now()
+        return super().create(validated_data)
+    
+    def update(self, instance, validated_data):
+        if validated_data.get('signature', instance.signature) != instance.signature:
+            # Nouveaux filtres : repartir de maintenant
+            validated_data['last_evaluated_at'] = timezone.now()
+        return super().update(instance, validated_data)
@@ -0,0 +1,470 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Avg, Count
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from candidate.models import CandidateProfile, CandidateSearchDocument, VideoViewLog
+from candidate.payloads import render_candidate_payloads
+from candidate.search_documents import refresh_document_fields
+from candidate.signals import notify_profiles_changed
+from .dashboard import compute_dashboard_stats, compute_recruiter_dashboard, recruiter_activity_stats
+from .feeds import refresh_feeds
+from videos.models import QualityCheck, RecordingSession, Video, VideoAnalytics
+from .models import (
+    CandidateInteraction, ProfileViewLog, RecruiterDailyActivity, RecruiterFavorite, RecruiterFeed, RecruiterProfile,
+    SavedSearch,
+)
+from .saved_searches import evaluate_saved_searches
+from .search import search_signature
+from .rollups import (
+    candidate_activity, catch_up_activity_rollups, day_start, get_activity_rollups_config, local_today,
+    recruiter_activity, refresh_activity_rollups,
+)
+from .views import CANDIDATE_BATCH_MAX_IDS
+
+
+class RecruiterTestCase(TestCase):
+    """Recruteur et profils candidats publics avec leurs documents de recherche"""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        # Rendu des JSON en arrière-plan désactivé
+        patcher = mock.patch('candidate.payloads.run_after_commit')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.recruiter = User.objects.create(username='recruteur', email='recruteur@example.com')
+        RecruiterProfile.objects.create(
+            user=self.recruiter, company_name='Atlas', position='RH', preferred_education_levels=['Bac+5']
+        )
+        self.profiles = []
+        with self.captureOnCommitCallbacks(execute=True):
+            for position in range(3):
+                user = User.objects.create(username=f'candidat-{position}', email=f'candidat-{position}@example.com')
+                self.profiles.append(CandidateProfile.objects.create(
+                    user=user, first_name='Candidat', last_name=str(position),
+                    education_level=('Bac+5', 'Bac+3', 'Bac+5')[position],
+                ))
+
+
+class RecruiterFeedTests(RecruiterTestCase):
+    def feed(self):
+        return self.client.get('/api/recruiter/recruiter/feed/', {'recruiter_id': self.recruiter.pk})
+
+    @mock.patch('recruiter.feeds.run_once_in_background')
+    def test_first_feed_is_built_off_request(self, run_once_in_background):
+        response = self.feed()
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['results'], [])
+        self.assertFalse(RecruiterFeed.objects.exists())
+        run_once_in_background.assert_called_once_with(
+            f'recruiter-feed:{self.recruiter.pk}', refresh_feeds, [self.recruiter.pk]
+        )
+
+        # Tâche d'arrière-plan exécutée
+        refresh_feeds([self.recruiter.pk])
+        response = self.feed()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 3)
+
+    def test_document_writes_are_merged(self):
+        refresh_feeds([self.recruiter.pk])
+        long_ago = timezone.now() - timedelta(days=2)
+        CandidateSearchDocument.objects.update(updated_at=long_ago, indexed_at=long_ago)
+        RecruiterFeed.objects.update(built_at=timezone.now() - timedelta(days=1))
+        self.assertEqual(refresh_feeds([self.recruiter.pk])['unchanged'], 1)
+
+        # Dérive du score seule : reprise par refresh_feeds(full=True)
+        CandidateProfile.objects.filter(pk=self.profiles[1].pk).update(rank_score=99)
+        refresh_document_fields([self.profiles[1].pk], ['rank_score'], log_changes=False)
+        self.assertEqual(refresh_feeds([self.recruiter.pk])['unchanged'], 1)
+
+        # Colonne recopiée dans le document, updated_at inchangé
+        refresh_document_fields([self.profiles[1].pk], ['rank_score'])
+        RecruiterFeed.objects.update(built_at=timezone.now() - timedelta(days=1))
+        self.assertEqual(refresh_feeds([self.recruiter.pk])['merged'], 1)
+        self.assertAlmostEqual(dict(RecruiterFeed.objects.get().entries())[self.profiles[1].pk], 0.99, places=4)
+
+
+@override_settings(CANDIDATE_CHANGE_LOG={'visibility_lag_seconds': 0})
+class ChangesEndpointTests(RecruiterTestCase):
+    def changes(self, **params):
+        return self.client.get('/api/recruiter/recruiter/changes/', params)
+
+    def test_default_page_without_limit(self):
+        response = self.changes()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['upserts']), 3)
+        self.assertFalse(response.json()['has_more'])
+
+    def test_explicit_limit(self):
+        response = self.changes(limit=2)
+        self.assertEqual(len(response.json()['upserts']), 2)
+        self.assertTrue(response.json()['has_more'])
+        self.assertEqual(len(self.changes(limit=0).json()['upserts']), 1)
+
+    def test_invalid_limit(self):
+        self.assertEqual(self.changes(limit='abc').status_code, 400)
+
+
+class SearchCacheTests(RecruiterTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch('candidate.payloads.run_in_background')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def candidate_ids(self, url):
+        response = self.client.get(url)
+        results = response.json()['results']
+        return sorted(result['id'] for result in results)
+
+    def test_private_profile_leaves_cached_results(self):
+        public_ids = sorted(profile.pk for profile in self.profiles)
+        for url in ('/api/recruiter/recruiter/candidate_search/', '/api/recruiter/candidates/'):
+            self.assertEqual(self.candidate_ids(url), public_ids)
+
+        profile = self.profiles[0]
+        profile.is_profile_public = False
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.save()
+
+        for url in ('/api/recruiter/recruiter/candidate_search/', '/api/recruiter/candidates/'):
+            with self.subTest(url=url):
+                self.assertEqual(self.candidate_ids(url), public_ids[1:])
+
+    @override_settings(CANDIDATE_SEARCH={'max_unpaginated_results': 2})
+    def test_unpaginated_results_capped_and_not_cached(self):
+        url = '/api/recruiter/recruiter/candidate_search/?paginate=false'
+        with mock.patch('recruiter.search.cache') as search_cache:
+            response = self.client.get(url).json()
+        search_cache.set.assert_not_called()
+        self.assertEqual(len(response['results']), 2)
+        self.assertEqual(response['count'], 3)
+        self.assertTrue(response['truncated'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profiles[0].delete()
+        response = self.client.get(url).json()
+        self.assertEqual((len(response['results']), response['count'], response['truncated']), (2, 2, False))
+
+class SavedSearchAlertTests(RecruiterTestCase):
+    def test_profile_approved_by_update_is_alerted(self):
+        profile = self.profiles[0]
+        CandidateProfile.objects.filter(pk=profile.pk).update(is_profile_public=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            notify_profiles_changed([profile.pk])
+        # Profils modifiés et documents écrits avant la fenêtre de la recherche
+        long_ago = timezone.now() - timedelta(days=1)
+        CandidateProfile.objects.update(updated_at=long_ago)
+        CandidateSearchDocument.objects.update(updated_at=long_ago, indexed_at=long_ago)
+        SavedSearch.objects.create(
+            recruiter=self.recruiter, name='Tous', signature=search_signature({}), last_evaluated_at=timezone.now()
+        )
+
+        # Approbation par update() (admin approve_profiles) : updated_at du profil inchangé
+        CandidateProfile.objects.filter(pk=profile.pk).update(is_profile_public=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            notify_profiles_changed([profile.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            stats = evaluate_saved_searches()
+
+        self.assertEqual(stats['new_matches'], 1)
+        self.assertEqual(stats['notifications'], 1)
+
+
+class ActivityRollupTests(RecruiterTestCase):
+    """Totaux identiques depuis la traîne (agrégée en SQL) et depuis les lignes journalières"""
+
+    def setUp(self):
+        super().setUp()
+        profile = self.profiles[0]
+        video = Video.objects.create(user=profile.user, title='Présentation', is_approved=True)
+        for duration, interest_level, rating in ((30, 4, 5), (None, None, None), (90, 2, 3)):
+            ProfileViewLog.objects.create(
+                candidate_profile=profile, recruiter=self.recruiter, view_duration=duration, interest_level=interest_level
+            )
+            VideoViewLog.objects.create(
+                video=video, viewer=self.recruiter, candidate_profile=profile, view_duration=duration, rating=rating
+            )
+        for interaction_type in ('video_view', 'cv_download', 'cv_download'):
+            CandidateInteraction.objects.create(
+                candidate=profile, recruiter=self.recruiter, interaction_type=interaction_type
+            )
+        self.expected = {
+            'profile_views': 3, 'profile_view_duration': 120, 'interest_sum': 6, 'interest_count': 2,
+            'video_views': 3, 'video_view_duration': 120, 'rating_sum': 8, 'rating_count': 2,
+            # Consultations doublées d'une interaction (signaux post_save)
+            'interaction_profile_view': 3, 'interaction_video_view': 4, 'interaction_cv_download': 2,
+        }
+
+    def assertTotals(self):
+        recruiter_totals = recruiter_activity([self.recruiter.pk])[self.recruiter.pk]
+        candidate_totals = candidate_activity([self.profiles[0].pk])[self.profiles[0].pk]
+        for field, value in self.expected.items():
+            self.assertEqual(recruiter_totals[field], value, field)
+            self.assertEqual(candidate_totals[field], value, field)
+        self.assertEqual(candidate_totals['video_viewer_ids'], {self.recruiter.pk})
+
+    @mock.patch('recruiter.rollups.run_once_in_background')
+    def test_tail_and_rollups(self, run_once_in_background):
+        self.assertTotals()
+        catch_up_activity_rollups({**get_activity_rollups_config(), 'settle_seconds': 0})
+        self.assertTotals()
+        run_once_in_background.assert_not_called()
+
+    @override_settings(ACTIVITY_ROLLUPS={'max_tail_events': 5})
+    @mock.patch('recruiter.rollups.run_once_in_background')
+    def test_long_tail_schedules_catch_up(self, run_once_in_background):
+        self.assertTotals()
+        run_once_in_background.assert_called_with('activity-rollups:refresh', catch_up_activity_rollups)
+
+
+class CandidateBatchTests(TestCase):
+    """Détail groupé : nombre de requêtes indépendant du nombre de profils"""
+
+    # ?fields= / ?include= et requêtes attendues
+    FIELDSETS = {
+        'sans relations': ({'include': ''}, 1),
+        'carte': ({'fields': 'id,full_name,university,major,experience_years,has_presentation_video,video_url'}, 1),
+        'carte + vidéo': ({
+            'fields': 'id,full_name,presentation_video.id,presentation_video.video_file,presentation_video.analytics',
+        }, 1),
+        # JSON pré-rendus absents : lecture des payloads, profils, tests qualité
+        'complet (serializer)': ({}, 3),
+    }
+
+    def setUp(self):
+        # Rendu des JSON manquants en arrière-plan désactivé
+        for target in ('candidate.payloads.run_after_commit', 'candidate.payloads.run_in_background'):
+            patcher = mock.patch(target)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.candidate_ids = []
+        # Documents de recherche synchronisés au commit
+        with self.captureOnCommitCallbacks(execute=True):
+            for position in range(CANDIDATE_BATCH_MAX_IDS):
+                user = User.objects.create(username=f'candidat-{position}')
+                video = Video.objects.create(user=user, title=f'Présentation {position}', is_approved=True)
+                QualityCheck.objects.bulk_create(
+                    QualityCheck(video=video, user=user, check_type=check_type, status='success', score=90)
+                    for check_type, _ in QualityCheck.CHECK_TYPES
+                )
+                RecordingSession.objects.create(video=video, user=user, duration_seconds=75)
+                VideoAnalytics.objects.create(video=video, view_count=position)
+                self.candidate_ids.append(CandidateProfile.objects.create(
+                    user=user, first_name='Candidat', last_name=str(position), presentation_video=video
+                ).pk)
+
+    def assertBatchQueries(self, expected, **params):
+        for size in (1, 10, CANDIDATE_BATCH_MAX_IDS):
+            with self.subTest(size=size), self.assertNumQueries(expected):
+                response = self.client.get('/api/recruiter/candidates/batch/', {
+                    'ids': ','.join(map(str, self.candidate_ids[:size])), **params
+                })
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['count'], size)
+
+    def test_fieldsets(self):
+        for name, (params, expected) in self.FIELDSETS.items():
+            with self.subTest(name):
+                self.assertBatchQueries(expected, **params)
+
+    def test_prerendered_payloads(self):
+        render_candidate_payloads(self.candidate_ids)
+        self.assertBatchQueries(1)
+
+    def test_missing_and_private_profiles(self):
+        private_id = self.candidate_ids[0]
+        CandidateProfile.objects.filter(pk=private_id).update(is_profile_public=False)
+        response = self.client.get('/api/recruiter/candidates/batch/', {
+            'ids': f'{private_id},{self.candidate_ids[1]},999999'
+        })
+        self.assertEqual(response.json()['missing'], [private_id, 999999])
+        self.assertEqual([result['id'] for result in response.json()['results']], [self.candidate_ids[1]])
+
+
+class DashboardQueryTests(TestCase):
+    """
+    Statistiques de dashboard en deux requêtes, mêmes valeurs que les requêtes
+    une par une sur les logs, avant, pendant et après l'intégration à l'activité journalière
+    """
+
+    EDUCATION_LEVELS = ['Bac+2', 'Bac+3', 'Bac+5', 'Doctorat', 'Bac', 'Bac+8', '']
+    UNIVERSITIES = ['UM5', 'UH2C', 'UCA', 'UIT', 'USMBA', 'UIZ', '']
+
+    def setUp(self):
+        patcher = mock.patch('candidate.payloads.run_after_commit')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        statuses = [status for status, _ in CandidateProfile.STATUS_CHOICES]
+
+        recruiters = [User.objects.create(username=f'recruteur-{position}') for position in range(3)]
+        for position, user in enumerate(recruiters):
+            RecruiterProfile.objects.create(user=user, company_name='Atlas', position='RH', is_active=position != 2)
+        self.recruiter_id = recruiters[0].pk
+
+        now = timezone.now()
+        profiles = []
+        for position in range(60):
+            user = User.objects.create(username=f'candidat-{position}')
+            video = None
+            if position % 3:
+                video = Video.objects.create(user=user, title=f'Présentation {position}', is_approved=position % 3 == 1)
+            profiles.append(CandidateProfile.objects.create(
+                user=user, first_name='Candidat', last_name=str(position),
+                education_level=self.EDUCATION_LEVELS[position % len(self.EDUCATION_LEVELS)],
+                university=self.UNIVERSITIES[(position * 3) % len(self.UNIVERSITIES)],
+                status=statuses[position % len(statuses)],
+                is_profile_public=position % 5 != 0,
+                presentation_video=video,
+            ))
+        CandidateProfile.objects.filter(pk__in=[profile.pk for profile in profiles[::4]]).update(video_quality_score=70)
+
+        for position, profile in enumerate(profiles):
+            recruiter = recruiters[(position // 2) % len(recruiters)]
+            # Dates réparties sur 60 jours (auto_now_add : corrigées après création)
+            viewed_at = now - timedelta(days=position % 60, hours=position % 24, minutes=10)
+            if profile.presentation_video_id:
+                log = VideoViewLog.objects.create(
+                    video_id=profile.presentation_video_id, viewer=recruiter, candidate_profile=profile
+                )
+                VideoViewLog.objects.filter(pk=log.pk).update(viewed_at=viewed_at)
+            log = ProfileViewLog.objects.create(candidate_profile=profile, recruiter=recruiter)
+            ProfileViewLog.objects.filter(pk=log.pk).update(viewed_at=viewed_at)
+            interaction = CandidateInteraction.objects.create(
+                candidate=profile, recruiter=recruiter,
+                interaction_type=('video_view', 'cv_download', 'profile_view')[position % 3]
+            )
+            CandidateInteraction.objects.filter(pk=interaction.pk).update(interaction_date=viewed_at)
+            if position % 7 == 0:
+                RecruiterFavorite.objects.create(recruiter=recruiter, candidate=profile)
+
+    def refresh_rollups(self, config):
+        while refresh_activity_rollups(config)[0]:
+            pass
+
+    def test_logs_not_rolled_up(self):
+        self.assertDashboards()
+
+    def test_partial_rollup(self):
+        # Derniers logs trop récents, laissés dans la traîne (settle_seconds)
+        now = timezone.now()
+        for model, field in ((ProfileViewLog, 'viewed_at'), (VideoViewLog, 'viewed_at'),
+                             (CandidateInteraction, 'interaction_date')):
+            latest = model.objects.order_by('-pk').values_list('pk', flat=True)[:3]
+            model.objects.filter(pk__in=list(latest)).update(**{field: now})
+        self.refresh_rollups(get_activity_rollups_config())
+        self.assertTrue(RecruiterDailyActivity.objects.exists())
+        self.assertDashboards()
+
+    def test_full_rollup(self):
+        self.refresh_rollups({**get_activity_rollups_config(), 'settle_seconds': 0})
+        self.assertDashboards()
+
+    def assertDashboards(self):
+        with self.assertNumQueries(2):
+            stats = compute_dashboard_stats(self.recruiter_id)
+        reference = self.reference_pool(30)
+        for key in ('total_candidates', 'active_candidates', 'candidates_with_video', 'recent_views'):
+            self.assertEqual(stats[key], reference[key], key)
+        self.assertEqual(stats['avg_video_quality'], round(reference['avg_video_quality'] or 0, 1))
+        self.assertTop(stats['education_stats'], 'education_level', reference['education'])
+
+        with self.assertNumQueries(2):
+            summary = compute_recruiter_dashboard(self.recruiter_id)
+        reference = self.reference_pool(7)
+        self.assertEqual(summary['my_recent_views'], reference['recent_views'])
+        self.assertEqual(summary['status_distribution'], reference['status'])
+        self.assertTop(summary['top_universities'], 'university', reference['university'])
+
+        with self.assertNumQueries(2):
+            activity_stats = recruiter_activity_stats()
+        self.assertEqual(activity_stats, self.reference_activity())
+
+        self.assertActivityMatchesLogs()
+
+    def assertTop(self, rows, field, counts, limit=5):
+        """rows : les limit valeurs les plus fréquentes de counts ({valeur: nombre}), avec leur nombre"""
+        for row in rows:
+            self.assertEqual(counts.get(row[field]), row['count'])
+        self.assertEqual([row['count'] for row in rows], sorted(counts.values(), reverse=True)[:limit])
+
+    def assertActivityMatchesLogs(self):
+        """Totaux de l'export, du rapport admin et du dashboard candidat"""
+        recruiter_ids = list(RecruiterProfile.objects.values_list('user_id', flat=True))
+        since_day = local_today() - timedelta(days=30)
+        for since in (None, since_day):
+            activity = recruiter_activity(recruiter_ids, since_day=since)
+            logs = {} if since is None else {'viewed_at__gte': day_start(since)}
+            interactions = {} if since is None else {'interaction_date__gte': day_start(since)}
+            for user_id in recruiter_ids:
+                with self.subTest(recruiter=user_id, since=since):
+                    self.assertEqual(
+                        activity[user_id]['profile_views'],
+                        ProfileViewLog.objects.filter(recruiter_id=user_id, **logs).count()
+                    )
+                    for interaction_type in ('video_view', 'cv_download'):
+                        self.assertEqual(
+                            activity[user_id][f'interaction_{interaction_type}'],
+                            CandidateInteraction.objects.filter(
+                                recruiter_id=user_id, interaction_type=interaction_type, **interactions
+                            ).count()
+                        )
+
+        candidate_ids = list(CandidateProfile.objects.values_list('pk', flat=True))
+        activity = candidate_activity(candidate_ids)
+        for candidate_id in candidate_ids:
+            views = VideoViewLog.objects.filter(candidate_profile_id=candidate_id)
+            self.assertEqual(activity[candidate_id]['video_views'], views.count())
+            self.assertEqual(activity[candidate_id]['video_viewer_ids'], set(views.values_list('viewer_id', flat=True)))
+
+    def reference_pool(self, days):
+        """Compteurs des profils publics calculés un par un (une requête par statistique)"""
+        public = CandidateProfile.objects.filter(is_profile_public=True)
+        return {
+            'total_candidates': public.count(),
+            'active_candidates': public.filter(status='active').count(),
+            'candidates_with_video': public.filter(
+                presentation_video__isnull=False, presentation_video__is_approved=True
+            ).count(),
+            'avg_video_quality': public.filter(presentation_video__isnull=False).aggregate(
+                avg=Avg('video_quality_score')
+            )['avg'],
+            'recent_views': VideoViewLog.objects.filter(
+                viewer_id=self.recruiter_id, viewed_at__gte=day_start(local_today() - timedelta(days=days))
+            ).count(),
+            'education': {
+                row['education_level']: row['count']
+                for row in public.values('education_level').annotate(count=Count('pk'))
+            },
+            'status': {row['status']: row['count'] for row in public.values('status').annotate(count=Count('pk'))},
+            'university': {
+                row['university']: row['count']
+                for row in public.exclude(university='').values('university').annotate(count=Count('pk'))
+            },
+        }
+
+    def reference_activity(self):
+        last_week = day_start(local_today() - timedelta(days=7))
+        return {
+            'total_recruiters': RecruiterProfile.objects.filter(is_active=True).count(),
+            'active_recruiters_week': ProfileViewLog.objects.filter(
+                viewed_at__gte=last_week
+            ).values('recruiter').distinct().count(),
+            'total_profile_views': ProfileViewLog.objects.count(),
+            'profile_views_week': ProfileViewLog.objects.filter(viewed_at__gte=last_week).count(),
+            'total_video_views': CandidateInteraction.objects.filter(interaction_type='video_view').count(),
+            'video_views_week': CandidateInteraction.objects.filter(
+                interaction_type='video_view', interaction_date__gte=last_week
+            ).count(),
+            'total_favorites': RecruiterFavorite.objects.count(),
+            'cv_downloads_week': CandidateInteraction.objects.filter(
+                interaction_type='cv_download', interaction_date__gte=last_week
+            ).count(),
+        }
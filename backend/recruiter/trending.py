@@ -0,0 +1,147 @@
+# backend/recruiter/trending.py
+"""
+Compteurs d'attention décroissants par candidat ("tendances de la semaine")
+
+score(t) = Σ poids · e^(−λ(t − t_i)). Chaque interaction applique
+score·e^(−λΔt) + poids, stocké sous la forme
+decay_key = ln(score) + λ·(t − EPOCH) : la clé ne dépend pas de l'instant
+de lecture, donc un index sur decay_key donne directement le top-k
+"""
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Exp, Greatest, Ln
+from django.utils import timezone
+
+
+# Origine fixe des clés (ne jamais modifier sans reconstruire la table)
+TRENDING_EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+DEFAULT_TRENDING_CONFIG = {
+    'half_life_days': 7,
+    'interaction_weights': {
+        'profile_view': 1.0,
+        'video_view': 2.0,
+        'cv_download': 3.0,
+        'favorite_added': 3.0,
+        'message_sent': 4.0,
+        'interview_request': 5.0,
+        'offer_sent': 5.0,
+        'favorite_removed': 0.0,
+    },
+}
+
+
+def get_trending_config():
+    """Configuration par défaut surchargée par settings.CANDIDATE_TRENDING"""
+    overrides = getattr(settings, 'CANDIDATE_TRENDING', {})
+    config = {**DEFAULT_TRENDING_CONFIG, **overrides}
+    config['interaction_weights'] = {
+        **DEFAULT_TRENDING_CONFIG['interaction_weights'],
+        **overrides.get('interaction_weights', {}),
+    }
+    return config
+
+
+def decay_rate(config=None):
+    """λ par seconde"""
+    config = config or get_trending_config()
+    return math.log(2) / (config['half_life_days'] * 86400)
+
+
+def time_offset(at, rate):
+    """λ·(t − EPOCH)"""
+    return rate * (at - TRENDING_EPOCH).total_seconds()
+
+
+def current_score(decay_key, now=None, rate=None):
+    """Valeur décroissante du compteur à l'instant `now`"""
+    now = now or timezone.now()
+    rate = rate or decay_rate()
+    return math.exp(decay_key - time_offset(now, rate))
+
+
+def interaction_key(interaction_type, at, config=None):
+    """Clé d'une interaction isolée, None si son poids est nul"""
+    config = config or get_trending_config()
+    weight = config['interaction_weights'].get(interaction_type, 0.0)
+    if weight <= 0:
+        return None
+    return math.log(weight) + time_offset(at, decay_rate(config))
+
+
+def combine_keys(key, other):
+    """ln(e^key + e^other) sans débordement"""
+    if key is None:
+        return other
+    if other is None:
+        return key
+    high, low = max(key, other), min(key, other)
+    return high + math.log1p(math.exp(low - high))
+
+
+def record_interaction(candidate_id, interaction_type, at=None):
+    """
+    Mettre à jour le compteur du candidat en O(1)
+    Un seul UPDATE : decay_key = ln(e^(decay_key − c) + poids) + c
+    """
+    from .models import CandidateTrend
+
+    config = get_trending_config()
+    weight = config['interaction_weights'].get(interaction_type, 0.0)
+    if weight <= 0:
+        return
+
+    at = at or timezone.now()
+    offset = time_offset(at, decay_rate(config))
+
+    updated = CandidateTrend.objects.filter(candidate_id=candidate_id).update(
+        decay_key=Ln(Exp(F('decay_key') - offset) + weight) + offset,
+        last_interaction_at=Greatest(F('last_interaction_at'), at),
+    )
+    if updated:
+        return
+
+    try:
+        with transaction.atomic():
+            CandidateTrend.objects.create(
+                candidate_id=candidate_id,
+                decay_key=math.log(weight) + offset,
+                last_interaction_at=at,
+            )
+    except IntegrityError:
+        # Créé entre-temps par une autre requête
+        record_interaction(candidate_id, interaction_type, at)
+
+
+def merge_keys(keys_by_candidate, last_seen_by_candidate):
+    """Fusionner des clés calculées hors base avec les compteurs existants"""
+    from .models import CandidateTrend
+
+    existing = CandidateTrend.objects.filter(
+        candidate_id__in=list(keys_by_candidate)
+    ).in_bulk(field_name='candidate_id')
+
+    trends = []
+    for candidate_id, key in keys_by_candidate.items():
+        current = existing.get(candidate_id)
+        last_seen = last_seen_by_candidate[candidate_id]
+        if current is not None:
+            key = combine_keys(current.decay_key, key)
+            last_seen = max(last_seen, current.last_interaction_at)
+        trends.append(CandidateTrend(
+            candidate_id=candidate_id,
+            decay_key=key,
+            last_interaction_at=last_seen,
+        ))
+
+    CandidateTrend.objects.bulk_create(
+        trends,
+        update_conflicts=True,
+        unique_fields=['candidate'],
+        update_fields=['decay_key', 'last_interaction_at'],
+    )
+    return len(trends)
@@ -6,6 +6,7 @@ from . import views
 # Router pour les ViewSets
 router = DefaultRouter()
 router.register(r'recruiter', views.RecruiterViewSet, basename='recruiter')
+router.register(r'saved-searches', views.SavedSearchViewSet, basename='saved-search')
 
 urlpatterns = [
     # URLs du router DRF
@@ -13,6 +14,7 @@ urlpatterns = [
     
     # Endpoints fonctionnels compatibles avec React
     path('candidates/', views.recruiter_candidate_list, name='recruiter-candidates'),
+    path('candidates/batch/', views.recruiter_candidate_batch, name='recruiter-candidate-batch'),
     path('candidates/<int:candidate_id>/', views.recruiter_candidate_detail, name='recruiter-candidate-detail'),
     path('video-views/log/', views.log_recruiter_video_view, name='log-video-view'),
     path('dashboard/stats/', views.recruiter_dashboard_stats, name='dashboard-stats'),
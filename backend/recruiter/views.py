@@ -1,19 +1,110 @@
 # backend/recruiter/views.py
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 from django.contrib.auth.models import User
+from django.core.paginator import InvalidPage
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.db.models import Q, Count, Avg, F
+from django.utils.decorators import method_decorator
+from django.db.models import F
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 import json
 
-from candidate.models import CandidateProfile, VideoViewLog
-from candidate.serializers import CandidateProfileDetailSerializer, CandidateProfileListSerializer
+from candidate.change_log import InvalidCursor, get_changes, latest_change
+from candidate.payloads import get_payloads, payload_version
+from candidate.models import CandidateProfile, CandidateSearchDocument, VideoViewLog
+from candidate.serializers import CandidateProfileDetailSerializer, CandidateSearchDocumentSerializer
 from videos.models import Video
 from notifications.models import create_video_viewed_notification
+from matching.ann import similar_candidates
+from matching.autocomplete import AUTOCOMPLETE_FIELDS, autocomplete
+from video_studio.conditional import conditional, make_etag
+from video_studio.response_cache import cached_response, profile_scope
+from video_studio.fieldsets import eager_loading, get_fieldset, select_fields
+from video_studio.renderers import json_response
+from .collaborative import also_shortlisted
+from .dashboard import get_dashboard_stats, get_recruiter_dashboard
+from .feeds import get_feed_page
+from .models import CandidateTrend, SavedSearch
+from .serializers import SavedSearchSerializer
+from .search import (
+    get_search_page, get_search_results, normalize_search_params, record_search, suggest_searches,
+)
+from .trending import current_score, decay_rate
+
+
+def _latest_change(request):
+    """Dernière entrée du journal des changements, lue une fois par requête (ETag et Last-Modified)"""
+    if not hasattr(request, '_latest_change'):
+        request._latest_change = latest_change()
+    return request._latest_change
+
+
+def candidates_etag(request, *args, **kwargs):
+    """Données publiques des profils : version du journal des changements"""
+    return make_etag(request, _latest_change(request)[0])
+
+
+def candidates_last_modified(request, *args, **kwargs):
+    return _latest_change(request)[1]
+
+
+def _dashboard_entry(request, get_entry):
+    """
+    Statistiques en cache du recruteur (?recruiter_id=), lues une fois par requête (validateurs et corps)
+    Lève ValueError pour un recruiter_id invalide
+    """
+    if not hasattr(request, '_dashboard_entry'):
+        request._dashboard_entry = get_entry(int(request.GET.get('recruiter_id', 1)))
+    return request._dashboard_entry
+
+
+def dashboard_conditional(get_entry):
+    """Dashboard : validateurs tirés du calcul servi (une valeur expirée servie garde les siens)"""
+    def computed_at(request, *args, **kwargs):
+        try:
+            return _dashboard_entry(request, get_entry)['computed_at']
+        except Exception:
+            # Erreur traitée par la vue
+            return None
+
+    def etag_func(request, *args, **kwargs):
+        at = computed_at(request)
+        return make_etag(request, at.isoformat()) if at else None
+
+    return conditional(etag_func, lambda request, *args, **kwargs: computed_at(request))
+
+
+def _candidate_payload_version(request, candidate_id=None, pk=None):
+    if not hasattr(request, '_payload_version'):
+        try:
+            request._payload_version = payload_version(int(candidate_id or pk))
+        except (TypeError, ValueError):
+            request._payload_version = None
+    return request._payload_version
+
+
+def candidate_detail_etag(request, candidate_id=None, pk=None):
+    """Détail d'un profil : version du JSON pré-rendu (aucun validateur tant qu'il n'est pas rendu)"""
+    version = _candidate_payload_version(request, candidate_id, pk)
+    return make_etag(request, *version) if version else None
+
+
+def candidate_detail_last_modified(request, candidate_id=None, pk=None):
+    version = _candidate_payload_version(request, candidate_id, pk)
+    return version[1] if version else None
+
+
+candidate_detail_conditional = conditional(candidate_detail_etag, candidate_detail_last_modified)
+
+
+def candidate_detail_scopes(request, candidate_id=None, pk=None):
+    return [profile_scope(candidate_id or pk)]
 
 
 class RecruiterViewSet(viewsets.ViewSet):
@@ -27,112 +118,54 @@ class RecruiterViewSet(viewsets.ViewSet):
     def candidate_search(self, request):
         """
         Recherche avancée de candidats pour recruteurs
+        Réponse paginée (PAGE_SIZE résultats par page) ; ?paginate=false rend
+        l'ancienne réponse non paginée {'count', 'results'}, limitée à
+        max_unpaginated_results résultats ('truncated' indique la coupure)
+        ?fields= restreint les champs des résultats (cartes)
         """
-        # Paramètres de recherche
-        search_query = request.query_params.get('q', '')
-        has_video = request.query_params.get('has_video', '')
-        status_filter = request.query_params.get('status', '')
-        min_video_score = request.query_params.get('min_video_score', '')
-        min_completeness = request.query_params.get('min_completeness', '')
-        education_level = request.query_params.get('education_level', '')
-        university = request.query_params.get('university', '')
-        experience_min = request.query_params.get('experience_min', '')
-        experience_max = request.query_params.get('experience_max', '')
-        order_by = request.query_params.get('order_by', '-updated_at')
-        
-        # Base queryset - seulement les profils publics
-        queryset = CandidateProfile.objects.filter(
-            is_profile_public=True
-        ).select_related('user', 'presentation_video')
-        
-        # Recherche textuelle
-        if search_query:
-            queryset = queryset.filter(
-                Q(first_name__icontains=search_query) |
-                Q(last_name__icontains=search_query) |
-                Q(university__icontains=search_query) |
-                Q(major__icontains=search_query) |
-                Q(user__email__icontains=search_query)
-            )
-        
-        # Filtre vidéo
-        if has_video == 'true':
-            queryset = queryset.filter(
-                presentation_video__isnull=False,
-                presentation_video__is_approved=True
+        filters = normalize_search_params(request.query_params)
+        if request.query_params.get('paginate', '').lower() in ('0', 'false', 'no'):
+            response = get_search_results(filters, limit=None)
+            record_search(_search_recruiter_id(request), filters, response['count'])
+            return Response({
+                'count': response['count'],
+                'truncated': response['truncated'],
+                'results': select_fields(response['results'], get_fieldset(request.query_params)['fields']),
+            })
+        try:
+            page_number = int(request.query_params.get('page', 1))
+            page = get_search_page(filters, page_number)
+        except (ValueError, InvalidPage):
+            raise NotFound('Page invalide.')
+        record_search(_search_recruiter_id(request), filters, page['count'])
+        
+        # Liens de pagination reconstruits (la page en cache ne dépend pas de l'URL)
+        url = request.build_absolute_uri()
+        page_size = api_settings.PAGE_SIZE
+        previous_link = None
+        if page_number > 1:
+            previous_link = (
+                remove_query_param(url, 'page') if page_number == 2
+                else replace_query_param(url, 'page', page_number - 1)
             )
-        elif has_video == 'false':
-            queryset = queryset.filter(presentation_video__isnull=True)
-        
-        # Filtre statut
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-        
-        # Filtre niveau d'études
-        if education_level:
-            queryset = queryset.filter(education_level__icontains=education_level)
-        
-        # Filtre université
-        if university:
-            queryset = queryset.filter(university__icontains=university)
-        
-        # Filtre expérience
-        if experience_min:
-            try:
-                queryset = queryset.filter(experience_years__gte=int(experience_min))
-            except ValueError:
-                pass
-        
-        if experience_max:
-            try:
-                queryset = queryset.filter(experience_years__lte=int(experience_max))
-            except ValueError:
-                pass
-        
-        # Filtre score vidéo
-        if min_video_score:
-            try:
-                queryset = queryset.filter(video_quality_score__gte=int(min_video_score))
-            except ValueError:
-                pass
-        
-        # Filtre complétude profil
-        if min_completeness:
-            try:
-                queryset = queryset.filter(profile_completeness__gte=int(min_completeness))
-            except ValueError:
-                pass
-        
-        # Tri
-        valid_orders = [
-            'created_at', '-created_at', 'updated_at', '-updated_at',
-            'profile_completeness', '-profile_completeness',
-            'video_quality_score', '-video_quality_score',
-            'first_name', '-first_name', 'last_name', '-last_name'
-        ]
-        if order_by in valid_orders:
-            queryset = queryset.order_by(order_by)
-        
-        # Sérialisation
-        serializer = CandidateProfileListSerializer(queryset, many=True)
-        
         return Response({
-            'count': queryset.count(),
-            'results': serializer.data
+            'count': page['count'],
+            'count_is_exact': page['count_is_exact'],
+            'next': replace_query_param(url, 'page', page_number + 1) if page_number * page_size < page['count'] else None,
+            'previous': previous_link,
+            'results': select_fields(page['results'], get_fieldset(request.query_params)['fields']),
         })
     
     @action(detail=True, methods=['get'])
+    @method_decorator(candidate_detail_conditional)
+    @method_decorator(cached_response('recruiter_candidate_detail_action', candidate_detail_scopes))
     def candidate_detail(self, request, pk=None):
         """
         Obtenir les détails complets d'un candidat
+        ?fields= / ?include= pour n'en charger qu'une partie
         """
         try:
-            candidate = CandidateProfile.objects.select_related(
-                'user', 'presentation_video'
-            ).get(id=pk, is_profile_public=True)
-            
-            serializer = CandidateProfileDetailSerializer(candidate)
-            return Response(serializer.data)
+            return Response(get_candidate_detail(pk, **get_fieldset(request.query_params)))
             
         except CandidateProfile.DoesNotExist:
             return Response(
@@ -140,6 +173,30 @@ class RecruiterViewSet(viewsets.ViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
     
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """
+        Profils proches d'un candidat ("plus de profils comme celui-ci")
+        Recherche approchée dans l'index IVF des embeddings
+        """
+        document = get_object_or_404(CandidateSearchDocument, pk=pk)
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 10)), 50))
+        except ValueError:
+            limit = 10
+        
+        similar = similar_candidates(document, limit)
+        serializer = CandidateSearchDocumentSerializer([candidate for candidate, _ in similar], many=True)
+        results = serializer.data
+        for data, (_, score) in zip(results, similar):
+            data['similarity'] = round(score, 4)
+        
+        return Response({
+            'candidate_id': document.pk,
+            'count': len(results),
+            'results': results
+        })
+    
     @action(detail=True, methods=['post'])
     def log_profile_view(self, request, pk=None):
         """
@@ -226,58 +283,20 @@ class RecruiterViewSet(viewsets.ViewSet):
             )
     
     @action(detail=False, methods=['get'])
+    @method_decorator(dashboard_conditional(get_dashboard_stats))
     def dashboard_stats(self, request):
         """
         Statistiques générales pour le dashboard recruteur
+        Servies depuis le cache (voir recruiter/dashboard.py)
         """
-        recruiter_id = request.query_params.get('recruiter_id', 1)
-        
-        # Statistiques générales
-        total_candidates = CandidateProfile.objects.filter(is_profile_public=True).count()
-        candidates_with_video = CandidateProfile.objects.filter(
-            is_profile_public=True,
-            presentation_video__isnull=False,
-            presentation_video__is_approved=True
-        ).count()
-        
-        # Candidats actifs
-        active_candidates = CandidateProfile.objects.filter(
-            is_profile_public=True,
-            status='active'
-        ).count()
-        
-        # Vues récentes du recruteur
-        recent_views = VideoViewLog.objects.filter(
-            viewer_id=recruiter_id,
-            viewed_at__gte=timezone.now() - timezone.timedelta(days=30)
-        ).count()
-        
-        # Candidats par niveau d'études
-        education_stats = CandidateProfile.objects.filter(
-            is_profile_public=True
-        ).values('education_level').annotate(
-            count=Count('id')
-        ).order_by('-count')[:5]
-        
-        # Score qualité vidéo moyen
-        avg_video_quality = CandidateProfile.objects.filter(
-            is_profile_public=True,
-            presentation_video__isnull=False
-        ).aggregate(
-            avg_quality=Avg('video_quality_score')
-        )['avg_quality'] or 0
-        
-        return Response({
-            'total_candidates': total_candidates,
-            'candidates_with_video': candidates_with_video,
-            'active_candidates': active_candidates,
-            'recent_views': recent_views,
-            'education_stats': list(education_stats),
-            'avg_video_quality': round(avg_video_quality, 1),
-            'video_percentage': round((candidates_with_video / total_candidates * 100), 1) if total_candidates > 0 else 0
-        })
+        try:
+            return Response(_dashboard_entry(request, get_dashboard_stats)['value'])
+        except ValueError:
+            return Response({'error': 'recruiter_id invalide'}, status=status.HTTP_400_BAD_REQUEST)
     
     @action(detail=False, methods=['get'])
+    @method_decorator(conditional(candidates_etag, candidates_last_modified))
+    @method_decorator(cached_response('recruiter_filter_options'))
     def filter_options(self, request):
         """
         Obtenir les options disponibles pour les filtres
@@ -323,80 +342,245 @@ class RecruiterViewSet(viewsets.ViewSet):
                 {'min': 10, 'max': 999, 'label': 'Expert (10+ ans)'}
             ]
         })
-
-
-# Vues fonctionnelles pour des endpoints spécifiques
-@csrf_exempt
-@api_view(['GET'])
-@permission_classes([permissions.AllowAny])
-def recruiter_candidate_list(request):
-    """
-    Endpoint simple pour obtenir la liste des candidats
-    Compatible avec l'interface React
-    """
-    try:
-        # Paramètres de recherche
-        filters = {
-            'q': request.GET.get('q', ''),
-            'has_video': request.GET.get('has_video', ''),
-            'status': request.GET.get('status', ''),
-            'min_video_score': request.GET.get('min_video_score', ''),
-            'min_completeness': request.GET.get('min_completeness', ''),
-            'order_by': request.GET.get('order_by', '-updated_at')
-        }
+    
+    @action(detail=False, methods=['get'])
+    def search_suggestions(self, request):
+        """
+        Recherches fréquentes commençant par la saisie (?q=)
+        Calculées par aggregate_popular_searches à partir de l'historique
+        """
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 10)), 50))
+        except ValueError:
+            limit = 10
         
-        # Base queryset
-        queryset = CandidateProfile.objects.filter(
-            is_profile_public=True
-        ).select_related('user', 'presentation_video')
+        suggestions = suggest_searches(request.query_params.get('q', ''), limit)
+        return Response({
+            'count': len(suggestions),
+            'results': suggestions
+        })
+    
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """
+        Suggestions pour une saisie partielle (?q=, ?field= optionnel)
+        Servies par l'index de préfixes en mémoire, sans requête SQL
+        """
+        field = request.query_params.get('field') or None
+        if field is not None and field not in AUTOCOMPLETE_FIELDS:
+            return Response(
+                {'error': f"Champ inconnu, valeurs possibles : {', '.join(AUTOCOMPLETE_FIELDS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 10)), 50))
+        except ValueError:
+            limit = 10
+        
+        suggestions = autocomplete(request.query_params.get('q', ''), field, limit)
+        return Response({
+            'count': len(suggestions),
+            'results': suggestions
+        })
+    
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """
+        Synchronisation incrémentale : profils modifiés depuis ?cursor=
+        Sans curseur, tous les profils publics ; ?has_video=true pour la vue
+        limitée aux profils avec vidéo (les profils sans vidéo deviennent des tombstones).
+        Rappeler avec le curseur retourné tant que has_more est vrai.
+        """
+        # Sans ?limit= : taille de page par défaut (plafonnée dans get_changes)
+        limit = request.query_params.get('limit')
+        if limit is not None:
+            try:
+                limit = max(1, int(limit))
+            except ValueError:
+                return Response(
+                    {'error': 'Paramètre limit invalide'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
         
-        # Appliquer les filtres
-        if filters['q']:
-            queryset = queryset.filter(
-                Q(first_name__icontains=filters['q']) |
-                Q(last_name__icontains=filters['q']) |
-                Q(university__icontains=filters['q']) |
-                Q(major__icontains=filters['q'])
+        try:
+            changes = get_changes(
+                cursor=request.query_params.get('cursor'),
+                limit=limit,
+                with_video_only=request.query_params.get('has_video') == 'true',
+            )
+        except InvalidCursor:
+            return Response(
+                {'error': 'Curseur invalide, relancer une synchronisation complète sans curseur'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(changes)
+
+    
+    @action(detail=False, methods=['get'])
+    def feed(self, request):
+        """
+        Flux de candidats recommandés pour le recruteur
+        Précalculé par refresh_recruiter_feeds, servi depuis le cache
+        202 avec une page vide tant que le premier flux est en construction
+        """
+        recruiter_id = request.query_params.get('recruiter_id', 1)
+        try:
+            recruiter_id = int(recruiter_id)
+            offset = max(0, int(request.query_params.get('offset', 0)))
+            limit = max(1, min(int(request.query_params.get('limit', 20)), 100))
+        except ValueError:
+            return Response(
+                {'error': 'Paramètres invalides'},
+                status=status.HTTP_400_BAD_REQUEST
             )
         
-        if filters['has_video'] == 'true':
-            queryset = queryset.filter(
-                presentation_video__isnull=False,
-                presentation_video__is_approved=True
+        page = get_feed_page(recruiter_id, offset, limit)
+        if page is None:
+            return Response(
+                {'error': 'Aucun profil recruteur actif'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        if page['pending']:
+            # Premier flux en cours de construction
+            return Response(page, status=status.HTTP_202_ACCEPTED)
+        return Response(page)
+    
+    @action(detail=False, methods=['get'])
+    def also_shortlisted(self, request):
+        """
+        Candidats retenus par les recruteurs au comportement proche (filtrage collaboratif)
+        ?candidate_id= : à partir d'un candidat plutôt que de l'historique du recruteur
+        """
+        try:
+            recruiter_id = int(request.query_params.get('recruiter_id', 1))
+            candidate_id = request.query_params.get('candidate_id')
+            candidate_id = int(candidate_id) if candidate_id else None
+            limit = max(1, min(int(request.query_params.get('limit', 20)), 100))
+        except ValueError:
+            return Response(
+                {'error': 'Paramètres invalides'},
+                status=status.HTTP_400_BAD_REQUEST
             )
-        elif filters['has_video'] == 'false':
-            queryset = queryset.filter(presentation_video__isnull=True)
         
-        if filters['status']:
-            queryset = queryset.filter(status=filters['status'])
+        recommendations = also_shortlisted(recruiter_id, candidate_id, limit)
+        serializer = CandidateSearchDocumentSerializer([document for document, _ in recommendations], many=True)
+        results = serializer.data
+        for data, (_, score) in zip(results, recommendations):
+            data['recommendation_score'] = round(score, 4)
         
-        if filters['min_video_score']:
-            try:
-                queryset = queryset.filter(video_quality_score__gte=int(filters['min_video_score']))
-            except ValueError:
-                pass
+        return Response({
+            'count': len(results),
+            'results': results
+        })
+    
+    @action(detail=False, methods=['get'])
+    @method_decorator(cached_response('recruiter_trending'))
+    def trending(self, request):
+        """
+        Candidats qui attirent l'attention en ce moment
+        Top-k lu sur l'index de CandidateTrend.decay_key (aucune agrégation)
+        """
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 20)), 100))
+        except ValueError:
+            limit = 20
+        
+        # Marge pour les profils devenus privés entre-temps
+        trends = list(CandidateTrend.objects.order_by('-decay_key')[:limit * 2])
+        documents = CandidateSearchDocument.objects.in_bulk(
+            [trend.candidate_id for trend in trends]
+        )
         
-        if filters['min_completeness']:
-            try:
-                queryset = queryset.filter(profile_completeness__gte=int(filters['min_completeness']))
-            except ValueError:
-                pass
+        now = timezone.now()
+        rate = decay_rate()
+        ranked = [
+            (documents[trend.candidate_id], current_score(trend.decay_key, now, rate))
+            for trend in trends if trend.candidate_id in documents
+        ][:limit]
         
-        # Tri
-        valid_orders = ['-updated_at', '-video_quality_score', '-profile_completeness', '-created_at']
-        if filters['order_by'] in valid_orders:
-            queryset = queryset.order_by(filters['order_by'])
+        serializer = CandidateSearchDocumentSerializer([document for document, _ in ranked], many=True)
+        results = serializer.data
+        for data, (_, score) in zip(results, ranked):
+            data['trend_score'] = round(score, 3)
         
-        # Limite pour performance
-        queryset = queryset[:50]
+        return Response({
+            'count': len(results),
+            'results': results
+        })
+
+
+class SavedSearchViewSet(viewsets.ModelViewSet):
+    """
+    Recherches enregistrées des recruteurs
+    Évaluées par evaluate_saved_searches : une notification groupée par recruteur
+    """
+    serializer_class = SavedSearchSerializer
+    permission_classes = [permissions.AllowAny]  # À remplacer par une authentification recruteur
+    
+    def get_queryset(self):
+        queryset = SavedSearch.objects.select_related('recruiter')
         
-        # Sérialiser
-        serializer = CandidateProfileListSerializer(queryset, many=True)
+        recruiter_id = self.request.query_params.get('recruiter')
+        if recruiter_id:
+            queryset = queryset.filter(recruiter_id=recruiter_id)
+        return queryset
+    
+    @action(detail=True, methods=['get'])
+    def new_matches(self, request, pk=None):
+        """Derniers profils signalés pour la recherche"""
+        saved_search = self.get_object()
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 20)), 100))
+        except ValueError:
+            limit = 20
+        
+        matches = list(saved_search.matches.values_list('candidate_id', 'matched_at')[:limit])
+        documents = CandidateSearchDocument.objects.in_bulk([candidate_id for candidate_id, _ in matches])
+        selected = [
+            (documents[candidate_id], matched_at)
+            for candidate_id, matched_at in matches if candidate_id in documents
+        ]
+        results = CandidateSearchDocumentSerializer([document for document, _ in selected], many=True).data
+        for data, (_, matched_at) in zip(results, selected):
+            data['matched_at'] = matched_at
         
-        return JsonResponse({
-            'results': serializer.data,
-            'count': len(serializer.data)
+        return Response({
+            'saved_search_id': saved_search.id,
+            'matches_count': saved_search.matches_count,
+            'count': len(results),
+            'results': results
         })
+
+
+def _search_recruiter_id(request):
+    """Auteur d'une recherche pour l'historique (utilisateur connecté ou ?recruiter_id)"""
+    if request.user.is_authenticated:
+        return request.user.pk
+    try:
+        return int(request.query_params.get('recruiter_id', ''))
+    except ValueError:
+        return None
+
+
+# Paramètres acceptés par la liste de l'interface React
+LIST_SEARCH_PARAMS = ['q', 'has_video', 'status', 'min_video_score', 'min_completeness', 'order_by']
+
+
+# Vues fonctionnelles pour des endpoints spécifiques
+@csrf_exempt
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def recruiter_candidate_list(request):
+    """
+    Endpoint simple pour obtenir la liste des candidats
+    Compatible avec l'interface React
+    """
+    try:
+        filters = normalize_search_params(request.GET, allowed=LIST_SEARCH_PARAMS)
+        response = get_search_results(filters, limit=50)
+        record_search(_search_recruiter_id(request), filters, response['count'])
+        # Cartes pré-rendues recopiées telles quelles
+        return json_response(response)
         
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
@@ -405,20 +589,115 @@ def recruiter_candidate_list(request):
 @csrf_exempt
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
+@candidate_detail_conditional
+@cached_response('recruiter_candidate_detail', candidate_detail_scopes)
 def recruiter_candidate_detail(request, candidate_id):
     """
     Obtenir les détails d'un candidat spécifique
+    ?fields= / ?include= pour n'en charger qu'une partie
     """
     try:
-        candidate = CandidateProfile.objects.select_related(
-            'user', 'presentation_video'
-        ).get(id=candidate_id, is_profile_public=True)
-        
-        serializer = CandidateProfileDetailSerializer(candidate)
-        return JsonResponse(serializer.data)
+        return json_response(get_candidate_detail(candidate_id, **get_fieldset(request.GET)))
         
     except CandidateProfile.DoesNotExist:
         return JsonResponse({'error': 'Candidat introuvable'}, status=404)
+    except ValidationError as e:
+        return JsonResponse(e.detail, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+def get_candidate_detail(candidate_id, fields=None, include=None):
+    """
+    Détail sérialisé d'un profil public, relations chargées selon les champs demandés
+    Détail complet : JSON pré-rendu (RawJSON) s'il est disponible
+    Lève CandidateProfile.DoesNotExist
+    """
+    if fields is None and include is None:
+        payload = get_payloads([int(candidate_id)], 'detail').get(int(candidate_id))
+        if payload is not None:
+            return payload
+    
+    serializer = CandidateProfileDetailSerializer(fields=fields, include=include)
+    serializer.instance = eager_loading(serializer, CandidateProfile.objects.all()).get(
+        id=candidate_id, is_profile_public=True
+    )
+    return serializer.data
+
+
+# Nombre maximal de profils par appel groupé
+CANDIDATE_BATCH_MAX_IDS = 50
+
+
+def parse_candidate_ids(raw_ids, max_ids=CANDIDATE_BATCH_MAX_IDS):
+    """Identifiants de ?ids=1,2,3 dédoublonnés dans l'ordre ; ValueError si invalides"""
+    try:
+        ids = list(dict.fromkeys(int(value) for value in raw_ids.split(',') if value.strip()))
+    except ValueError:
+        raise ValueError("Identifiants invalides : entiers séparés par des virgules attendus")
+    if not ids:
+        raise ValueError("Paramètre ids requis (ex. ids=1,2,3)")
+    if len(ids) > max_ids:
+        raise ValueError(f"{max_ids} candidats au maximum par appel")
+    return ids
+
+
+def get_candidate_details(candidate_ids, fields=None, include=None, use_payloads=True):
+    """
+    Détails sérialisés des profils publics demandés, dans l'ordre demandé
+    Détails complets : JSON pré-rendus (RawJSON), les autres sérialisés
+    Nombre de requêtes constant quel que soit le nombre de profils
+    Retourne (résultats, identifiants introuvables)
+    """
+    payloads = {}
+    if use_payloads and fields is None and include is None:
+        payloads = get_payloads(candidate_ids, 'detail')
+    
+    serializer = CandidateProfileDetailSerializer(many=True, fields=fields, include=include)
+    to_serialize = [candidate_id for candidate_id in candidate_ids if candidate_id not in payloads]
+    candidates = {}
+    if to_serialize:
+        candidates = eager_loading(
+            serializer, CandidateProfile.objects.filter(is_profile_public=True)
+        ).in_bulk(to_serialize)
+    serializer.instance = [candidates[candidate_id] for candidate_id in to_serialize if candidate_id in candidates]
+    serialized = dict(zip((candidate.pk for candidate in serializer.instance), serializer.data))
+    
+    results = [
+        payloads.get(candidate_id) or serialized[candidate_id]
+        for candidate_id in candidate_ids if candidate_id in payloads or candidate_id in serialized
+    ]
+    missing = [
+        candidate_id for candidate_id in candidate_ids
+        if candidate_id not in payloads and candidate_id not in serialized
+    ]
+    return results, missing
+
+
+@csrf_exempt
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def recruiter_candidate_batch(request):
+    """
+    Détails de plusieurs candidats en un appel (comparaison, shortlist)
+    ?ids=1,2,3 ; les profils introuvables ou privés sont listés dans missing
+    ?fields= / ?include= comme pour le détail
+    """
+    try:
+        candidate_ids = parse_candidate_ids(request.GET.get('ids', ''))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    try:
+        results, missing = get_candidate_details(candidate_ids, **get_fieldset(request.GET))
+        return json_response({
+            'count': len(results),
+            'results': results,
+            'missing': missing
+        })
+        
+    except ValidationError as e:
+        return JsonResponse(e.detail, status=400)
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
@@ -495,49 +774,16 @@ def log_recruiter_video_view(request):
 @csrf_exempt
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
+@dashboard_conditional(get_recruiter_dashboard)
 def recruiter_dashboard_stats(request):
     """
     Statistiques pour le dashboard recruteur
+    Servies depuis le cache (voir recruiter/dashboard.py)
     """
     try:
-        recruiter_id = request.GET.get('recruiter_id', 1)
-        
-        # Statistiques générales
-        stats = {
-            'total_candidates': CandidateProfile.objects.filter(is_profile_public=True).count(),
-            'active_candidates': CandidateProfile.objects.filter(
-                is_profile_public=True, status='active'
-            ).count(),
-            'candidates_with_video': CandidateProfile.objects.filter(
-                is_profile_public=True,
-                presentation_video__isnull=False,
-                presentation_video__is_approved=True
-            ).count(),
-            'my_recent_views': VideoViewLog.objects.filter(
-                viewer_id=recruiter_id,
-                viewed_at__gte=timezone.now() - timezone.timedelta(days=7)
-            ).count()
-        }
-        
-        # Répartition par statut
-        status_distribution = CandidateProfile.objects.filter(
-            is_profile_public=True
-        ).values('status').annotate(count=Count('id'))
-        
-        stats['status_distribution'] = {
-            item['status']: item['count'] for item in status_distribution
-        }
-        
-        # Top universités
-        top_universities = CandidateProfile.objects.filter(
-            is_profile_public=True
-        ).exclude(university='').values('university').annotate(
-            count=Count('id')
-        ).order_by('-count')[:5]
-        
-        stats['top_universities'] = list(top_universities)
-        
-        return JsonResponse(stats)
+        return JsonResponse(_dashboard_entry(request, get_recruiter_dashboard)['value'])
         
+    except ValueError:
+        return JsonResponse({'error': 'recruiter_id invalide'}, status=400)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
\ No newline at end of file
+        return JsonResponse({'error': str(e)}, status=500)
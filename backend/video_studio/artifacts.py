@@ -0,0 +1,76 @@
+# backend/video_studio/artifacts.py
+"""
+Artefacts NumPy versionnés sur disque (index, modèles)
+
+Chaque version est un dossier de fichiers .npy plus un meta.json ; le
+fichier CURRENT désigne la version active et est remplacé atomiquement.
+Les lecteurs ouvrent les tableaux en mmap : les pages sont partagées entre
+workers et une version supprimée reste lisible tant qu'elle est ouverte.
+"""
+import json
+import os
+import shutil
+
+import numpy as np
+from django.utils import timezone
+
+
+CURRENT_FILE = 'CURRENT'
+META_FILE = 'meta.json'
+
+
+def save_version(directory, arrays, meta=None):
+    """Écrire une nouvelle version puis basculer CURRENT, retourne son nom"""
+    version = timezone.now().strftime('%Y%m%d%H%M%S%f')
+    target = os.path.join(directory, version)
+    os.makedirs(target, exist_ok=True)
+    for name, values in arrays.items():
+        np.save(os.path.join(target, f'{name}.npy'), values)
+    with open(os.path.join(target, META_FILE), 'w') as meta_file:
+        json.dump(meta or {}, meta_file)
+
+    pointer = os.path.join(directory, CURRENT_FILE)
+    with open(pointer + '.tmp', 'w') as current:
+        current.write(version)
+    os.replace(pointer + '.tmp', pointer)
+    return version
+
+
+def current_version(directory):
+    """Nom de la version active, None si aucune"""
+    try:
+        with open(os.path.join(directory, CURRENT_FILE)) as current:
+            return current.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def load_version(directory, names):
+    """
+    Ouvrir la version active en mmap
+    Retourne (version, {nom: tableau}, meta) ou None
+    """
+    version = current_version(directory)
+    if version is None:
+        return None
+    target = os.path.join(directory, version)
+    try:
+        arrays = {
+            name: np.load(os.path.join(target, f'{name}.npy'), mmap_mode='r')
+            for name in names
+        }
+        with open(os.path.join(target, META_FILE)) as meta_file:
+            meta = json.load(meta_file)
+    except FileNotFoundError:
+        return None
+    return version, arrays, meta
+
+
+def prune_versions(directory, keep=2):
+    """Supprimer les anciennes versions (les workers les ayant en mmap gardent leurs pages)"""
+    versions = sorted(
+        name for name in os.listdir(directory)
+        if os.path.isdir(os.path.join(directory, name))
+    )
+    for name in versions[:-keep]:
+        shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
@@ -0,0 +1,81 @@
+# backend/video_studio/background.py
+"""
+Exécution de tâches en arrière-plan dans le processus web
+Pool de threads partagé ; chaque tâche ferme ses connexions à la base en fin d'exécution
+run_once_in_background : une seule tâche en cours par clé (constructions d'index en mémoire)
+Pool et tâches en cours oubliés dans un processus enfant (fork après import, gunicorn --preload)
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.db import connections, transaction
+
+
+logger = logging.getLogger('django')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'BACKGROUND_TASK_WORKERS', 2),
+                thread_name_prefix='background'
+            )
+        return _executor
+
+
+def _run(func, args, kwargs):
+    try:
+        return func(*args, **kwargs)
+    except Exception:
+        logger.exception("Échec de la tâche d'arrière-plan %s", getattr(func, '__name__', func))
+        raise
+    finally:
+        # Connexions propres à ce thread
+        connections.close_all()
+
+
+def run_in_background(func, *args, **kwargs):
+    """Lancer une tâche immédiatement, retourne un Future"""
+    return _get_executor().submit(_run, func, args, kwargs)
+
+
+def run_after_commit(func, *args, **kwargs):
+    """Lancer une tâche une fois la transaction courante validée (rien en cas de rollback)"""
+    transaction.on_commit(partial(run_in_background, func, *args, **kwargs))
+
+
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+def run_once_in_background(key, func, *args, **kwargs):
+    """
+    Lancer une tâche sauf si une tâche de même clé est déjà en cours dans le processus
+    Retourne le Future de la tâche en cours ou lancée
+    """
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        if future is None or future.done():
+            future = _in_flight[key] = run_in_background(func, *args, **kwargs)
+        return future
+
+
+def _reset_after_fork():
+    """Les threads du parent n'existent pas dans l'enfant : leurs Future ne se termineraient jamais"""
+    global _executor, _executor_lock, _in_flight_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+    _in_flight.clear()
+    _in_flight_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
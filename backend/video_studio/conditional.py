@@ -0,0 +1,49 @@
+# backend/video_studio/conditional.py
+"""
+Requêtes conditionnelles (ETag / Last-Modified) sans rendre le corps
+
+Le validateur d'un endpoint est calculé à partir de versions peu coûteuses
+(dernière entrée du journal des changements, génération du JSON pré-rendu,
+derniers ids) : si le client envoie If-None-Match / If-Modified-Since à jour,
+la réponse 304 part avant l'exécution de la vue, sans ses requêtes ni son
+rendu. Les réponses portent "Cache-Control: private, no-cache" : le
+navigateur garde le corps et revalide à chaque affichage.
+"""
+import hashlib
+from functools import wraps
+
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+
+def make_etag(request, *parts):
+    """ETag d'une représentation : URL complète (paramètres compris) et versions des données"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (request.get_full_path(), *parts):
+        digest.update(str(part).encode())
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+def conditional(etag_func=None, last_modified_func=None):
+    """
+    condition() de Django limitée aux réponses réussies, avec revalidation systématique
+    Les fonctions reçoivent les arguments de la vue et retournent None pour s'abstenir
+    Méthodes de ViewSet : method_decorator(conditional(...))
+    """
+    def decorator(view):
+        conditional_view = condition(etag_func=etag_func, last_modified_func=last_modified_func)(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            if not (200 <= response.status_code < 300 or response.status_code == 304):
+                # Erreurs : aucun validateur, elles ne doivent pas être revalidées en 304
+                for header in ('ETag', 'Last-Modified'):
+                    if response.has_header(header):
+                        del response.headers[header]
+            elif response.has_header('ETag') or response.has_header('Last-Modified'):
+                patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return wrapper
+    return decorator
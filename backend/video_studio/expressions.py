@@ -0,0 +1,31 @@
+# backend/video_studio/expressions.py
+"""
+Sous-requêtes scalaires combinables dans aggregate()
+
+Django refuse une Subquery dans aggregate() ("n'est pas une expression
+d'agrégat") : ScalarSubquery la déclare comme agrégat. Les compteurs de
+plusieurs tables tiennent ainsi dans un seul SELECT.
+"""
+from django.db.models import Count, Subquery, Sum, Value
+
+
+class ScalarSubquery(Subquery):
+    """Sous-requête scalaire indépendante de la table agrégée, acceptée par aggregate()"""
+    contains_aggregate = True
+
+
+def _scalar(queryset, aggregate):
+    # Regroupement sur une constante : une seule ligne, même sans résultat
+    return ScalarSubquery(
+        queryset.order_by().annotate(_one=Value(1)).values('_one').annotate(result=aggregate).values('result')
+    )
+
+
+def count_of(queryset):
+    """COUNT(*) du queryset en sous-requête scalaire"""
+    return _scalar(queryset, Count('pk'))
+
+
+def sum_of(queryset, field):
+    """SUM(field) du queryset en sous-requête scalaire (NULL sans ligne)"""
+    return _scalar(queryset, Sum(field))
@@ -0,0 +1,163 @@
+# backend/video_studio/fieldsets.py
+"""
+Champs partiels (?fields=) et relations incluses (?include=)
+
+?fields=id,full_name,presentation_video.video_file : seuls ces champs sont
+sérialisés ; un nom pointé sélectionne dans le serializer imbriqué, un nom
+de relation seul la garde entière.
+?include=presentation_video.analytics : relations imbriquées développées ;
+dès que include est présent (même vide), les relations imbriquées non
+listées sont retirées, à tous les niveaux.
+
+L'élagage porte sur le serializer, avant toute requête : eager_loading()
+déduit les select_related / prefetch_related des seuls champs restants, les
+jointures et préchargements des relations retirées ne sont pas exécutés.
+"""
+import json
+
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+def parse_field_paths(raw):
+    """'a,b.c,b.d' -> {'a': {}, 'b': {'c': {}, 'd': {}}} ; None si le paramètre est absent"""
+    if raw is None:
+        return None
+    tree = {}
+    for path in raw.split(','):
+        node = tree
+        for name in path.strip().split('.'):
+            if name:
+                node = node.setdefault(name, {})
+    return tree
+
+
+def get_fieldset(query_params):
+    """Arguments fields / include d'un serializer élagable à partir des paramètres de requête"""
+    return {
+        # ?fields= vide : aucune restriction
+        'fields': parse_field_paths(query_params.get('fields')) or None,
+        'include': parse_field_paths(query_params.get('include')),
+    }
+
+
+def _target(serializer):
+    return serializer.child if isinstance(serializer, serializers.ListSerializer) else serializer
+
+
+def _is_nested(field):
+    return isinstance(_target(field), serializers.BaseSerializer)
+
+
+def prune_serializer(serializer, fields=None, include=None):
+    """
+    Retirer du serializer (et de ses serializers imbriqués) les champs non demandés
+    Lève ValidationError pour un nom de champ inconnu
+    """
+    target = _target(serializer)
+    unknown = (set(fields or ()) | set(include or ())) - set(target.fields)
+    if unknown:
+        raise ValidationError({'fields': [f"Champ inconnu : {name}" for name in sorted(unknown)]})
+
+    for name, field in list(target.fields.items()):
+        if not _is_nested(field):
+            if fields is not None and name not in fields:
+                del target.fields[name]
+            continue
+
+        if (fields is not None or include is not None) and name not in (fields or {}) and name not in (include or {}):
+            del target.fields[name]
+            continue
+        nested_fields = (fields or {}).get(name) or None
+        nested_include = include.get(name) if include is not None else None
+        if nested_fields is not None or nested_include is not None:
+            prune_serializer(field, nested_fields, nested_include)
+
+
+def _is_multiple(model, name):
+    field = model._meta.get_field(name)
+    return field.one_to_many or field.many_to_many
+
+
+def relation_paths(serializer, prefix='', in_prefetch=False):
+    """
+    Relations lues par les champs restants du serializer : (select_related, prefetch_related)
+    Serializers imbriqués, et champs déclarés dans field_relations (propriétés du modèle)
+    """
+    target = _target(serializer)
+    model = getattr(getattr(target, 'Meta', None), 'model', None)
+    select, prefetch = [], []
+    if model is None:
+        return select, prefetch
+
+    def add(name):
+        """Ajouter la relation, retourne True si elle est préchargée"""
+        path = prefix + name
+        multiple = in_prefetch or _is_multiple(model, name)
+        (prefetch if multiple else select).append(path)
+        return multiple
+
+    for name, field in target.fields.items():
+        if _is_nested(field) and field.source != '*' and '.' not in field.source:
+            multiple = add(field.source)
+            nested_select, nested_prefetch = relation_paths(field, f'{prefix}{field.source}__', multiple)
+            select.extend(nested_select)
+            prefetch.extend(nested_prefetch)
+
+    for name, relation in getattr(target, 'field_relations', {}).items():
+        if name in target.fields and prefix + relation not in select + prefetch:
+            add(relation)
+    return select, prefetch
+
+
+def eager_loading(serializer, queryset):
+    """Queryset chargeant en un nombre fixe de requêtes ce que le serializer lira"""
+    select, prefetch = relation_paths(serializer)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+def select_fields(data, fields):
+    """Appliquer ?fields= à des données déjà sérialisées (résultats en cache, JSON pré-rendu)"""
+    if not fields:
+        return data
+    if isinstance(data, bytes):
+        data = json.loads(data)
+    if isinstance(data, list):
+        return [select_fields(item, fields) for item in data]
+    return {
+        name: select_fields(value, fields[name]) if isinstance(value, (dict, list)) else value
+        for name, value in data.items() if name in fields
+    }
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer élagable : Serializer(instance, fields=..., include=...)
+    field_relations : {champ: relation} pour les champs non imbriqués qui lisent une relation
+    """
+    field_relations = {}
+
+    def __init__(self, *args, fields=None, include=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None or include is not None:
+            prune_serializer(self, fields, include)
+
+
+class SparseFieldsetViewMixin:
+    """
+    ViewSet : ?fields= / ?include= appliqués aux lectures,
+    et chargement des relations déduit du serializer élagué
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        if self.request.method == 'GET' and issubclass(serializer_class, SparseFieldsetMixin):
+            kwargs.update(get_fieldset(self.request.query_params))
+        return super().get_serializer(*args, **kwargs)
+
+    def eager_load(self, queryset):
+        return eager_loading(self.get_serializer(), queryset)
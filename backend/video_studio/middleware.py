@@ -0,0 +1,90 @@
+# backend/video_studio/middleware.py
+"""
+Compression des réponses de l'API (brotli optionnel, gzip sinon)
+
+Seules les réponses non diffusées, d'un type textuel et au-delà d'une taille
+minimale sont compressées : en dessous, l'en-tête et le coût CPU dépassent le
+gain. Niveaux modérés par défaut (réponses calculées à chaque requête).
+Réglages dans settings.RESPONSE_COMPRESSION.
+"""
+import gzip
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    brotli = None
+
+
+DEFAULT_COMPRESSION_CONFIG = {
+    # Taille minimale du corps en octets
+    'min_size': 1024,
+    'gzip_level': 5,
+    'brotli_quality': 4,
+    'content_types': ['application/json', 'text/'],
+}
+
+
+def get_compression_config():
+    """Configuration par défaut surchargée par settings.RESPONSE_COMPRESSION"""
+    return {**DEFAULT_COMPRESSION_CONFIG, **getattr(settings, 'RESPONSE_COMPRESSION', {})}
+
+
+def _accepted_encodings(request):
+    """Encodages acceptés par le client (q=0 exclus)"""
+    accepted = set()
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        name, _, params = item.strip().partition(';')
+        if re.search(r'q=0(\.0*)?\s*$', params.strip()):
+            continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+def compress(content, encoding, config):
+    if encoding == 'br':
+        return brotli.compress(content, quality=config['brotli_quality'])
+    return gzip.compress(content, compresslevel=config['gzip_level'], mtime=0)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Content-Encoding br ou gzip selon Accept-Encoding"""
+
+    def process_response(self, request, response):
+        config = get_compression_config()
+        if (
+            response.streaming
+            or response.has_header('Content-Encoding')
+            or not 200 <= response.status_code < 300
+            or len(response.content) < config['min_size']
+        ):
+            return response
+        content_type = response.get('Content-Type', '')
+        if not any(content_type.startswith(accepted) for accepted in config['content_types']):
+            return response
+
+        # Le corps dépend désormais de l'en-tête, même pour un client qui ne compresse pas
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accepted = _accepted_encodings(request)
+        if brotli is not None and 'br' in accepted:
+            encoding = 'br'
+        elif 'gzip' in accepted:
+            encoding = 'gzip'
+        else:
+            return response
+
+        compressed = compress(response.content, encoding, config)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        response.headers['Content-Encoding'] = encoding
+        # Représentation différente : ETag faible (comparaison faible de If-None-Match)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        return response
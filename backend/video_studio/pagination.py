@@ -0,0 +1,108 @@
+# backend/video_studio/pagination.py
+"""
+Comptage approximatif pour les grosses tables
+Utilise les estimations du planificateur PostgreSQL (reltuples / EXPLAIN)
+au-delà d'un seuil, et un COUNT(*) exact en dessous
+"""
+import json
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+
+DEFAULT_APPROXIMATE_COUNT_THRESHOLD = 10000
+
+
+def get_count_threshold():
+    """Seuil au-delà duquel on se contente de l'estimation"""
+    return getattr(settings, 'APPROXIMATE_COUNT_THRESHOLD', DEFAULT_APPROXIMATE_COUNT_THRESHOLD)
+
+
+def estimate_count(queryset):
+    """
+    Estimation du nombre de lignes par le planificateur PostgreSQL
+    Retourne None si aucune estimation fiable n'est disponible
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    query = queryset.query
+    if query.is_sliced or query.distinct or query.combinator:
+        return None
+
+    # Table entière : statistiques de pg_class (aucun parcours)
+    if not query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        # reltuples vaut -1 tant que la table n'a jamais été analysée
+        if row and row[0] is not None and row[0] >= 0:
+            return int(row[0])
+        return None
+
+    # Requête filtrée : estimation de lignes du plan EXPLAIN
+    try:
+        plan = json.loads(queryset.order_by().explain(format='json'))
+        return int(plan[0]['Plan']['Plan Rows'])
+    except (ValueError, KeyError, IndexError, TypeError):
+        return None
+
+
+def approximate_count(queryset, threshold=None):
+    """
+    Compter les lignes d'un queryset
+    Retourne un tuple (count, is_exact)
+    """
+    if threshold is None:
+        threshold = get_count_threshold()
+
+    estimate = estimate_count(queryset)
+    if estimate is None or estimate < threshold:
+        return queryset.count(), True
+    return estimate, False
+
+
+class ApproximateCountPaginator(Paginator):
+    """Paginator Django (admin et DRF) basé sur approximate_count"""
+
+    count_threshold = None
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, 'query'):
+            self.count_is_exact = True
+            return len(self.object_list)
+
+        count, self.count_is_exact = approximate_count(self.object_list, self.count_threshold)
+        return count
+
+
+class ApproximateCountPagination(PageNumberPagination):
+    """Pagination DRF qui signale si le total est exact"""
+
+    django_paginator_class = ApproximateCountPaginator
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.page.paginator.count,
+            'count_is_exact': self.page.paginator.count_is_exact,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_is_exact'] = {
+            'type': 'boolean',
+            'example': True,
+        }
+        return response_schema
@@ -0,0 +1,71 @@
+# backend/video_studio/renderers.py
+"""
+Rendu JSON par orjson (dépendance optionnelle)
+
+Même sortie que le JSONRenderer de DRF : les dates et tout type non natif
+passent par l'encodeur de DRF. Sans orjson, ou pour une sortie indentée
+(API navigable, Accept: application/json; indent=4), rendu de DRF.
+
+Les fragments RawJSON (JSON déjà rendu et stocké) sont recopiés tels quels
+dans la réponse : orjson les remplace par un jeton, substitué ensuite par
+les octets du fragment, sans les décoder.
+"""
+import json
+import re
+import secrets
+
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    orjson = None
+
+
+class RawJSON(bytes):
+    """Fragment JSON déjà rendu, inséré tel quel par ORJSONRenderer"""
+
+
+class RawJSONEncoder(JSONEncoder):
+    """Encodeur de DRF acceptant les fragments (décodés, chemin de repli)"""
+
+    def default(self, obj):
+        if isinstance(obj, RawJSON):
+            return json.loads(obj)
+        return super().default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer accéléré par orjson"""
+
+    encoder_class = RawJSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        fragments = []
+        token = secrets.token_hex(8)
+        encoder_default = self.encoder_class().default
+
+        def default(obj):
+            if isinstance(obj, RawJSON):
+                fragments.append(obj)
+                return f'\x00{token}:{len(fragments) - 1}\x00'
+            return encoder_default(obj)
+
+        rendered = orjson.dumps(
+            data, default=default, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        )
+        if not fragments:
+            return rendered
+        # Jeton rendu "\u0000<token>:<n>\u0000" (guillemets compris) remplacé par le fragment
+        placeholder = re.compile(rb'"\\u0000' + token.encode() + rb':(\d+)\\u0000"')
+        return placeholder.sub(lambda match: fragments[int(match.group(1))], rendered)
+
+
+def json_response(data, status=200):
+    """HttpResponse JSON rendue par ORJSONRenderer (vues Django hors DRF)"""
+    return HttpResponse(ORJSONRenderer().render(data), status=status, content_type='application/json')
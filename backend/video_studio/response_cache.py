@@ -0,0 +1,217 @@
+# backend/video_studio/response_cache.py
+"""
+Cache des réponses des endpoints de lecture, invalidé par générations
+
+Chaque réponse en cache est rangée sous une clé qui combine :
+- le nom de l'endpoint et ses arguments d'URL ;
+- les paramètres de requête normalisés (ordre des clés et des valeurs
+  indifférent) ;
+- la génération courante de chaque périmètre dont elle dépend : un profil
+  ('profile:<id>'), une vidéo ('video:<id>'), un recruteur
+  ('recruiter:<id>') ou l'ensemble des profils (PUBLIC_POOL).
+
+Les signaux (candidate.signals) changent la génération des périmètres
+touchés après le commit. Les anciennes entrées ne sont alors plus jamais
+lues et expirent d'elles-mêmes : aucun parcours de clés. Durée de vie et
+activation sont réglables par endpoint (settings.RESPONSE_CACHE).
+Générations et réponses passent par le cache à deux niveaux
+(video_studio.tiered_cache) : les clés chaudes restent dans la mémoire du
+worker, une génération changée ailleurs y est retirée au plus tard après
+TIERED_CACHE['sync_interval'].
+Compteurs de hits / misses par endpoint partagés entre processus :
+commande response_cache_stats.
+"""
+import hashlib
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+
+from .tiered_cache import get_tiered_cache
+
+
+DEFAULT_RESPONSE_CACHE_CONFIG = {
+    'enabled': True,
+    # Durée de vie par défaut (secondes) ; filet de sécurité pour les écritures sans signal (update())
+    'timeout': 60,
+    # {nom de l'endpoint: {'timeout': ..., 'enabled': ...}}
+    'endpoints': {},
+    'key_prefix': 'response_cache',
+}
+
+PUBLIC_POOL = 'public_pool'
+
+METRIC_OUTCOMES = ('hits', 'misses')
+
+# Endpoints déclarés par cached_response (métriques)
+_endpoints = set()
+
+
+def get_response_cache_config():
+    """Configuration par défaut surchargée par settings.RESPONSE_CACHE"""
+    return {**DEFAULT_RESPONSE_CACHE_CONFIG, **getattr(settings, 'RESPONSE_CACHE', {})}
+
+
+def endpoint_config(name):
+    """{'enabled', 'timeout'} d'un endpoint"""
+    config = get_response_cache_config()
+    return {
+        'enabled': config['enabled'],
+        'timeout': config['timeout'],
+        **config['endpoints'].get(name, {}),
+    }
+
+
+def profile_scope(profile_id):
+    return f'profile:{profile_id}'
+
+
+def video_scope(video_id):
+    return f'video:{video_id}'
+
+
+def recruiter_scope(recruiter_id):
+    return f'recruiter:{recruiter_id}'
+
+
+# Générations
+
+def _generation_key(scope):
+    return f"{get_response_cache_config()['key_prefix']}:generation:{scope}"
+
+
+def get_generations(scopes):
+    """
+    Génération courante de chaque périmètre, en un aller-retour au cache
+    Un périmètre sans génération (jamais invalidé, ou évincé) en reçoit une nouvelle :
+    les entrées rangées sous une génération disparue ne peuvent plus être relues
+    """
+    tiered = get_tiered_cache()
+    keys = {scope: _generation_key(scope) for scope in scopes}
+    stored = tiered.get_many(list(keys.values()))
+    generations = {}
+    for scope, key in keys.items():
+        if key not in stored:
+            # add : un autre processus peut avoir initialisé le périmètre entre-temps
+            tiered.add(key, uuid.uuid4().hex, timeout=None)
+            stored[key] = tiered.get(key)
+        generations[scope] = stored[key]
+    return generations
+
+
+def bump_generations(scopes):
+    """
+    Invalider les réponses des périmètres donnés, après le commit de la transaction courante
+    (avant, une lecture concurrente rangerait les anciennes données sous la nouvelle génération)
+    """
+    keys = {_generation_key(scope) for scope in scopes}
+    if keys:
+        transaction.on_commit(
+            lambda: get_tiered_cache().set_many({key: uuid.uuid4().hex for key in keys}, timeout=None)
+        )
+
+
+# Métriques
+
+def _metric_key(name, outcome):
+    return f"{get_response_cache_config()['key_prefix']}:metrics:{name}:{outcome}"
+
+
+def _record(name, outcome):
+    key = _metric_key(name, outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Compteur absent (premier appel ou évincé)
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def get_metrics(names=None):
+    """{endpoint: {'hits', 'misses', 'hit_rate'}} des endpoints déclarés et configurés"""
+    names = sorted(names or _endpoints | set(get_response_cache_config()['endpoints']))
+    counters = cache.get_many([_metric_key(name, outcome) for name in names for outcome in METRIC_OUTCOMES])
+    metrics = {}
+    for name in names:
+        hits, misses = (counters.get(_metric_key(name, outcome), 0) for outcome in METRIC_OUTCOMES)
+        metrics[name] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 3) if hits + misses else None,
+        }
+    return metrics
+
+
+def reset_metrics(names=None):
+    names = names or _endpoints | set(get_response_cache_config()['endpoints'])
+    cache.delete_many([_metric_key(name, outcome) for name in names for outcome in METRIC_OUTCOMES])
+
+
+# Réponses
+
+def normalized_query(query_params):
+    """Paramètres de requête triés (clés puis valeurs) : deux URL équivalentes, une seule entrée"""
+    return sorted((name, sorted(values)) for name, values in query_params.lists())
+
+
+def response_cache_key(name, request, view_kwargs, generations):
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (
+        normalized_query(request.GET),
+        sorted(view_kwargs.items()),
+        # Négociation de contenu (indentation, API navigable)
+        request.META.get('HTTP_ACCEPT', ''),
+        sorted(generations.items()),
+    ):
+        digest.update(repr(part).encode())
+        digest.update(b'\x00')
+    return f"{get_response_cache_config()['key_prefix']}:{name}:{digest.hexdigest()}"
+
+
+def cached_response(name, scopes=None):
+    """
+    Mettre en cache les réponses 200 d'une vue GET (corps rendu, type, statut)
+    scopes(request, *args, **kwargs) : périmètres dont dépend la réponse (PUBLIC_POOL par défaut)
+    Méthodes de ViewSet : method_decorator(cached_response(...))
+    """
+    _endpoints.add(name)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            config = endpoint_config(name)
+            if request.method not in ('GET', 'HEAD') or not config['enabled']:
+                return view(request, *args, **kwargs)
+
+            generations = get_generations(scopes(request, *args, **kwargs) if scopes else [PUBLIC_POOL])
+            key = response_cache_key(name, request, kwargs, generations)
+            tiered = get_tiered_cache()
+            cached = tiered.get(key)
+            if cached is not None:
+                _record(name, 'hits')
+                status, content_type, content = cached
+                return HttpResponse(content, status=status, content_type=content_type)
+            _record(name, 'misses')
+
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200 or response.streaming:
+                return response
+
+            def store(rendered):
+                # Clé versionnée par les générations : sa valeur ne change pas, rien à diffuser
+                tiered.set(
+                    key, (rendered.status_code, rendered['Content-Type'], rendered.content), config['timeout'],
+                    broadcast=False,
+                )
+
+            # Response de DRF : rendue après la vue
+            if getattr(response, 'is_rendered', True):
+                store(response)
+            else:
+                response.add_post_render_callback(store)
+            return response
+        return wrapper
+    return decorator
@@ -39,11 +39,14 @@ INSTALLED_APPS = [
     'candidate',
     'notifications',
     'recruiter',        # 🆕 AJOUTER CETTE LIGNE
+    'matching',
 ]
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Avant les middlewares qui lisent le corps : la compression s'applique en dernier
+    'video_studio.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -124,17 +127,21 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',  # Pour le développement
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        # JSONRenderer de DRF accéléré par orjson s'il est installé
+        'video_studio.renderers.ORJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
         'rest_framework.parsers.MultiPartParser',
         'rest_framework.parsers.FileUploadParser',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'video_studio.pagination.ApproximateCountPagination',
     'PAGE_SIZE': 20
 }
 
+# Comptage approximatif (estimations PostgreSQL au-delà de ce nombre de lignes)
+APPROXIMATE_COUNT_THRESHOLD = int(os.getenv('APPROXIMATE_COUNT_THRESHOLD', '10000'))
+
 # CORS settings (pour React)
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",  # React dev server
@@ -148,6 +155,143 @@ MAX_VIDEO_SIZE = 50 * 1024 * 1024  # 50MB
 ALLOWED_VIDEO_FORMATS = ['mp4', 'webm', 'avi', 'mov']
 VIDEO_QUALITY_THRESHOLD = 75  # Score minimum pour valider une vidéo
 
+# Classement composite des candidats (voir candidate/ranking.py pour les valeurs par défaut)
+CANDIDATE_RANKING = {
+    'weights': {
+        'video_quality': 0.30,
+        'completeness': 0.25,
+        'recency': 0.15,
+        'status': 0.10,
+        'engagement': 0.20,
+    },
+    'recency_half_life_days': 30,
+    'engagement_half_life_days': 14,
+}
+
+# Tendances candidats : compteurs décroissants (voir recruiter/trending.py)
+CANDIDATE_TRENDING = {
+    'half_life_days': 7,
+}
+
+# Matching offres-candidats : index TF-IDF en mémoire (voir matching/index.py)
+MATCHING = {
+    'sync_interval_seconds': 5,
+    'rebuild_ratio': 0.05,
+}
+
+# Recherche recruteur : cache des résultats, historique, recherches populaires (voir recruiter/search.py)
+CANDIDATE_SEARCH = {
+    'cache_timeout': 300,
+    'popular_window_days': 30,
+    'warm_top': 100,
+}
+
+# Recherches enregistrées : alertes incrémentales (voir recruiter/saved_searches.py)
+SAVED_SEARCHES = {
+    'overlap_seconds': 60,
+}
+
+# Journal des changements de profils et synchronisation par curseur (voir candidate/change_log.py)
+CANDIDATE_CHANGE_LOG = {
+    'page_size': 500,
+    'visibility_lag_seconds': 2,
+}
+
+# Cache des réponses des endpoints de lecture, invalidé par générations (voir video_studio/response_cache.py)
+RESPONSE_CACHE = {
+    'timeout': 60,
+    'endpoints': {
+        # Listes de choix : changent rarement, invalidées à chaque écriture de profil
+        'recruiter_filter_options': {'timeout': 600},
+        'recruiter_candidate_detail': {'timeout': 300},
+        'recruiter_candidate_detail_action': {'timeout': 300},
+        'candidate_profile_detail': {'timeout': 300},
+        'video_detail': {'timeout': 300},
+        # Scores décroissants dans le temps : durée de vie courte, sans invalidation
+        'recruiter_trending': {'timeout': 30},
+    },
+}
+
+# Cache à deux niveaux : LRU par worker devant CACHES['default'] (voir video_studio/tiered_cache.py)
+TIERED_CACHE = {
+    'l1_max_entries': 2000,
+    'l1_max_bytes': 32 * 1024 * 1024,
+    'l1_timeout': 10,
+    'sync_interval': 0.5,
+}
+
+# Agrégats coûteux : calcul unique par clé, valeur expirée servie pendant son recalcul (voir video_studio/single_flight.py)
+SINGLE_FLIGHT = {
+    'lock_timeout': 30,
+    'wait_timeout': 10,
+}
+
+# Statistiques des dashboards recruteur (voir recruiter/dashboard.py)
+RECRUITER_DASHBOARD = {
+    'timeout': 60,
+    'stale_timeout': 600,
+}
+
+# Activité journalière par recruteur et par candidat, maintenue par refresh_activity_rollups
+# (commande à planifier toutes les minutes, rattrapage en arrière-plan au-delà de max_tail_events, voir recruiter/rollups.py)
+ACTIVITY_ROLLUPS = {
+    'timezone': TIME_ZONE,
+    'settle_seconds': 60,
+    'batch_size': 10000,
+    'max_tail_events': 50000,
+}
+
+# Export de l'activité des recruteurs en flux : CSV, JSON Lines, Parquet (voir recruiter/exports.py)
+RECRUITER_EXPORTS = {
+    'chunk_size': 2000,
+    'gzip_level': 6,
+}
+
+# Statistiques de notifications par utilisateur (voir notifications/stats.py)
+NOTIFICATION_STATS_CACHE = {
+    'timeout': 30,
+    'stale_timeout': 300,
+}
+
+# Compression des réponses, brotli s'il est installé (voir video_studio/middleware.py)
+RESPONSE_COMPRESSION = {
+    'min_size': 1024,
+    'gzip_level': 5,
+    'brotli_quality': 4,
+}
+
+# Autocomplétion des filtres : index de préfixes en mémoire (voir matching/autocomplete.py)
+AUTOCOMPLETE = {
+    'sync_interval_seconds': 5,
+    'rebuild_interval_seconds': 3600,
+}
+
+# Flux de candidats recommandés par recruteur (voir recruiter/feeds.py)
+RECRUITER_FEEDS = {
+    'size': 200,
+    'history_days': 90,
+}
+
+# Recommandations par filtrage collaboratif (voir recruiter/collaborative.py)
+CANDIDATE_RECOMMENDER = {
+    'artifacts_dir': os.path.join(BASE_DIR, 'var', 'recommender'),
+    'factors': 32,
+    'iterations': 10,
+}
+
+# Profils similaires : index IVF persisté sur disque (voir matching/ann.py)
+CANDIDATE_SIMILARITY = {
+    'index_dir': os.path.join(BASE_DIR, 'var', 'similarity'),
+    'nprobe': 8,
+    'latency_target_ms': 50,
+}
+
+# Tâches d'arrière-plan dans le processus web (voir video_studio/background.py)
+BACKGROUND_TASK_WORKERS = 2
+
+# Extraction du texte des CV : pool de processus (voir candidate/cv_extraction.py)
+CV_EXTRACTION_WORKERS = 2
+
 # Configuration notifications
 NOTIFICATIONS_ENABLED = True
 NOTIFICATION_EMAIL_ENABLED = os.getenv('NOTIFICATION_EMAIL_ENABLED', 'False') == 'True'
@@ -214,6 +358,11 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': True,
         },
+        'matching': {
+            'handlers': ['file', 'console'],
+            'level': 'INFO',
+            'propagate': True,
+        },
     },
 }
 
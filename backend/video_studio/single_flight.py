@@ -0,0 +1,198 @@
+# backend/video_studio/single_flight.py
+"""
+Valeurs coûteuses en cache : calcul unique par clé et stale-while-revalidate
+
+get_or_compute(key, compute, timeout, stale_timeout) :
+- valeur fraîche (moins de timeout secondes) : servie telle quelle ;
+- valeur expirée depuis moins de stale_timeout secondes : servie, et
+  recalculée en arrière-plan par un seul worker ;
+- pas de valeur : les requêtes concurrentes attendent un calcul unique.
+  Verrou par clé dans le processus (les threads d'un worker), puis verrou
+  distribué dans le cache partagé (cache.add, les autres workers) ; les
+  perdants relisent le cache jusqu'à la fin du calcul, puis calculent
+  eux-mêmes si le détenteur du verrou ne répond plus (wait_timeout).
+
+invalidate(key) incrémente une version propre à la clé, enregistrée dans
+chaque entrée : un calcul commencé avant l'invalidation (recalcul en
+arrière-plan notamment) n'est pas mis en cache, et une entrée d'une version
+précédente est ignorée à la lecture.
+
+Réglages dans settings.SINGLE_FLIGHT.
+"""
+import threading
+import time
+import uuid
+import weakref
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .background import run_in_background
+
+
+DEFAULT_SINGLE_FLIGHT_CONFIG = {
+    # Durée de vie du verrou distribué : borne un calcul dont le worker a disparu
+    'lock_timeout': 30,
+    # Attente maximale du calcul d'un autre worker
+    'wait_timeout': 10,
+    'poll_interval': 0.05,
+}
+
+_local_locks = weakref.WeakValueDictionary()
+_local_locks_guard = threading.Lock()
+
+
+def get_single_flight_config():
+    """Configuration par défaut surchargée par settings.SINGLE_FLIGHT"""
+    return {**DEFAULT_SINGLE_FLIGHT_CONFIG, **getattr(settings, 'SINGLE_FLIGHT', {})}
+
+
+def _local_lock(key):
+    with _local_locks_guard:
+        lock = _local_locks.get(key)
+        if lock is None:
+            lock = _local_locks[key] = threading.Lock()
+        return lock
+
+
+def _lock_key(key):
+    return f'{key}:lock'
+
+
+def _acquire(key, config):
+    """Jeton du verrou distribué, None s'il est déjà pris"""
+    token = uuid.uuid4().hex
+    return token if cache.add(_lock_key(key), token, config['lock_timeout']) else None
+
+
+def _release(key, token):
+    if cache.get(_lock_key(key)) == token:
+        cache.delete(_lock_key(key))
+
+
+def _version_key(key):
+    return f'{key}:version'
+
+
+def _current(key):
+    """Entrée en cache de la version courante de la clé, None sinon"""
+    version_key = _version_key(key)
+    values = cache.get_many([key, version_key])
+    entry = values.get(key)
+    if entry is not None and entry.get('version') != values.get(version_key):
+        return None
+    return entry
+
+
+def _is_fresh(entry):
+    return entry is not None and entry['fresh_until'] > time.time()
+
+
+def _store(key, compute, timeout, stale_timeout):
+    """Calculer l'entrée, mise en cache sauf invalidation pendant le calcul"""
+    version = cache.get(_version_key(key))
+    value = compute()
+    now = time.time()
+    entry = {
+        'value': value,
+        'computed_at': timezone.now(),
+        'fresh_until': now + timeout,
+        'expires_at': now + timeout + stale_timeout,
+        'version': version,
+    }
+    if cache.get(_version_key(key)) == version:
+        cache.set(key, entry, timeout + stale_timeout)
+    return entry
+
+
+def _refresh(key, compute, timeout, stale_timeout):
+    """Recalcul en arrière-plan d'une valeur expirée, par un seul worker"""
+    local = _local_lock(key)
+    if not local.acquire(blocking=False):
+        return
+    try:
+        config = get_single_flight_config()
+        token = _acquire(key, config)
+        if token is None:
+            return
+        try:
+            run_in_background(_refresh_locked, key, compute, timeout, stale_timeout, token)
+            # Le verrou distribué est libéré par la tâche
+            token = None
+        finally:
+            if token is not None:
+                _release(key, token)
+    finally:
+        local.release()
+
+
+def _refresh_locked(key, compute, timeout, stale_timeout, token):
+    try:
+        _store(key, compute, timeout, stale_timeout)
+    finally:
+        _release(key, token)
+
+
+def get_entry(key, compute, timeout, stale_timeout=0):
+    """
+    Entrée en cache {'value', 'computed_at', 'fresh_until', 'expires_at', 'version'}, calculée si besoin (voir le module)
+    compute : fonction sans argument, son résultat doit être picklable
+    """
+    entry = _current(key)
+    if _is_fresh(entry):
+        return entry
+    if entry is not None:
+        _refresh(key, compute, timeout, stale_timeout)
+        return entry
+
+    config = get_single_flight_config()
+    # Un seul thread du processus attend ou calcule, les autres relisent son résultat
+    with _local_lock(key):
+        entry = _current(key)
+        if entry is not None:
+            return entry
+        deadline = time.monotonic() + config['wait_timeout']
+        while True:
+            token = _acquire(key, config)
+            if token is not None:
+                try:
+                    return _store(key, compute, timeout, stale_timeout)
+                finally:
+                    _release(key, token)
+            time.sleep(config['poll_interval'])
+            entry = _current(key)
+            if entry is not None:
+                return entry
+            if time.monotonic() > deadline:
+                # Détenteur du verrou trop lent : calcul sans verrou plutôt qu'une erreur
+                return _store(key, compute, timeout, stale_timeout)
+
+
+def get_or_compute(key, compute, timeout, stale_timeout=0):
+    """Valeur en cache, calculée une seule fois pour les requêtes concurrentes"""
+    return get_entry(key, compute, timeout, stale_timeout)['value']
+
+
+def invalidate(key):
+    """
+    Supprimer la valeur : la prochaine lecture attend un calcul unique
+    Les calculs en cours ne seront pas mis en cache (version incrémentée)
+    """
+    version_key = _version_key(key)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        # Version absente (première invalidation ou évincée)
+        cache.add(version_key, 0, timeout=None)
+        cache.incr(version_key)
+    cache.delete(key)
+
+
+def expire(key):
+    """Marquer la valeur comme expirée : encore servie, recalculée en arrière-plan"""
+    entry = _current(key)
+    remaining = entry['expires_at'] - time.time() if entry is not None else 0
+    if remaining > 0:
+        entry['fresh_until'] = 0
+        cache.set(key, entry, remaining)
@@ -0,0 +1,133 @@
+import multiprocessing
+import tempfile
+import uuid
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+
+from .single_flight import expire, get_entry, get_or_compute, invalidate
+from .tiered_cache import TieredCache
+
+
+class TieredCacheInvalidationTests(SimpleTestCase):
+    """Deux workers (deux TieredCache) devant le même cache partagé"""
+
+    def setUp(self):
+        shared = LocMemCache(f'tiered-{uuid.uuid4().hex}', {})
+        self.addCleanup(shared.clear)
+        # sync_interval=0 : journal relu à chaque lecture
+        self.first, self.second = (
+            TieredCache(shared=shared, sync_interval=0, l1_max_bytes=1024 * 1024) for _ in range(2)
+        )
+        self.shared = shared
+
+    def test_reads_served_from_local_tier(self):
+        self.first.set('options', {'version': 1})
+        self.assertEqual(self.second.get('options'), {'version': 1})
+        # Écriture hors TieredCache (non annoncée) : le niveau 1 sert encore la valeur lue
+        self.shared.set('options', {'version': 2})
+        self.assertEqual(self.second.get('options'), {'version': 1})
+        self.assertEqual(self.second.stats()['hits'], 1)
+
+    def test_write_invalidates_other_worker(self):
+        self.first.set('options', {'version': 1})
+        self.assertEqual(self.second.get('options'), {'version': 1})
+        self.first.set('options', {'version': 2})
+        self.assertEqual(self.first.get('options'), {'version': 2})
+        self.assertEqual(self.second.get('options'), {'version': 2})
+
+    def test_delete_invalidates_other_worker(self):
+        self.first.set('options', {'version': 1})
+        self.assertEqual(self.second.get('options'), {'version': 1})
+        self.second.delete('options')
+        self.assertIsNone(self.first.get('options'))
+
+    def test_stale_until_sync_interval(self):
+        worker = TieredCache(shared=self.shared, sync_interval=3600)
+        self.first.set('options', {'version': 1})
+        self.assertEqual(worker.get('options'), {'version': 1})
+        self.first.set('options', {'version': 2})
+        self.assertEqual(worker.get('options'), {'version': 1})
+        worker.sync(force=True)
+        self.assertEqual(worker.get('options'), {'version': 2})
+
+    def test_lost_journal_entries_clear_local_tier(self):
+        self.first.set('options', {'version': 1})
+        self.assertEqual(self.second.get('options'), {'version': 1})
+        self.first.set('options', {'version': 2})
+        # Entrée du journal expirée avant la relecture
+        self.shared.delete(self.first._journal_key(self.shared.get(self.first._sequence_key)))
+        self.assertEqual(self.second.get('options'), {'version': 2})
+
+    def test_local_tier_memory_bound(self):
+        for position in range(200):
+            self.first.set(f'bulk:{position}', b'x' * 16 * 1024, broadcast=False)
+        self.assertLessEqual(self.first.stats()['bytes'], 1024 * 1024)
+        self.assertEqual(self.second.get('bulk:199'), b'x' * 16 * 1024)
+
+
+def _write_from_other_process(location, key, value):
+    """Autre worker (processus lancé par spawn) : écriture ou suppression annoncée dans le journal"""
+    import django
+    django.setup()
+    worker = TieredCache(shared=FileBasedCache(location, {}), sync_interval=0)
+    if value is None:
+        worker.delete(key)
+    else:
+        worker.set(key, value)
+
+
+class TieredCacheProcessTests(SimpleTestCase):
+    """
+    Workers dans des processus distincts devant un cache fichier partagé
+    Écritures successives : incr n'est pas atomique avec ce backend, les
+    écritures concurrentes reposent sur Redis
+    """
+
+    def setUp(self):
+        location = tempfile.TemporaryDirectory()
+        self.addCleanup(location.cleanup)
+        self.location = location.name
+        self.worker = TieredCache(shared=FileBasedCache(self.location, {}), sync_interval=0)
+
+    def run_in_other_process(self, key, value):
+        process = multiprocessing.get_context('spawn').Process(
+            target=_write_from_other_process, args=(self.location, key, value)
+        )
+        process.start()
+        process.join(timeout=60)
+        self.assertEqual(process.exitcode, 0)
+
+    def test_writes_from_other_process_invalidate_local_tier(self):
+        self.worker.set('options', {'version': 1})
+        for _ in range(2):
+            self.assertEqual(self.worker.get('options'), {'version': 1})
+        # Seconde lecture servie par le niveau 1
+        self.assertEqual(self.worker.stats()['hits'], 1)
+
+        self.run_in_other_process('options', {'version': 2})
+        self.assertEqual(self.worker.get('options'), {'version': 2})
+
+        self.run_in_other_process('options', None)
+        self.assertIsNone(self.worker.get('options'))
+class SingleFlightInvalidationTests(SimpleTestCase):
+    def setUp(self):
+        self.key = f'single-flight-{uuid.uuid4().hex}'
+        self.addCleanup(cache.delete_many, [self.key, f'{self.key}:version', f'{self.key}:lock'])
+
+    def test_refresh_started_before_invalidation_not_stored(self):
+        get_entry(self.key, lambda: 'ancien', timeout=60, stale_timeout=60)
+        expire(self.key)
+
+        def compute_then_invalidated():
+            # Invalidation validée pendant le recalcul en arrière-plan
+            invalidate(self.key)
+            return 'périmé'
+
+        with mock.patch('video_studio.single_flight.run_in_background', side_effect=lambda func, *args: func(*args)):
+            self.assertEqual(get_entry(self.key, compute_then_invalidated, 60, 60)['value'], 'ancien')
+
+        self.assertEqual(get_or_compute(self.key, lambda: 'nouveau', 60, 60), 'nouveau')
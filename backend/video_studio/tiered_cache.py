@@ -0,0 +1,278 @@
+# backend/video_studio/tiered_cache.py
+"""
+Cache à deux niveaux : LRU en mémoire du processus devant le cache partagé
+
+Niveau 1 : LRU propre à chaque worker, borné en nombre d'entrées et en
+octets (taille picklée), durée de vie courte. Les clés chaudes (générations
+du cache des réponses, options de filtres, statistiques) ne font plus
+d'aller-retour vers Redis.
+Niveau 2 : CACHES[alias], partagé par tous les workers.
+
+Invalidation entre workers : chaque écriture (set, delete) ajoute ses clés
+à un journal dans le cache partagé (compteur de séquence + une entrée par
+numéro). Chaque worker relit le journal au plus toutes les sync_interval
+secondes et retire de son niveau 1 les clés écrites ailleurs ; s'il a
+manqué des entrées (expirées, compteur réinitialisé), il vide son niveau 1.
+Une valeur périmée reste donc visible au plus sync_interval secondes dans
+un autre worker. Le compteur repose sur incr, atomique avec Redis.
+Réglages dans settings.TIERED_CACHE.
+"""
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+
+DEFAULT_TIERED_CACHE_CONFIG = {
+    'alias': DEFAULT_CACHE_ALIAS,
+    # Niveau 1 (par processus)
+    'l1_max_entries': 2000,
+    'l1_max_bytes': 32 * 1024 * 1024,
+    'l1_timeout': 10,
+    # Relecture du journal d'invalidation (secondes)
+    'sync_interval': 0.5,
+    # Durée de vie des entrées du journal ; un worker inactif plus longtemps vide son niveau 1
+    'journal_timeout': 300,
+    # Au-delà de ce retard, vider le niveau 1 plutôt que relire le journal
+    'journal_max_lag': 1000,
+    'key_prefix': 'tiered',
+}
+
+_MISSING = object()
+
+
+def get_tiered_cache_config():
+    """Configuration par défaut surchargée par settings.TIERED_CACHE"""
+    return {**DEFAULT_TIERED_CACHE_CONFIG, **getattr(settings, 'TIERED_CACHE', {})}
+
+
+class LocalLRU:
+    """LRU en mémoire borné en entrées et en octets, avec expiration par entrée (non thread-safe)"""
+
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()  # clé -> (expiration, valeur, taille)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        if entry[0] <= time.monotonic():
+            self.delete(key)
+            return _MISSING
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key, value, timeout):
+        try:
+            size = len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        self.delete(key)
+        if size > self.max_bytes or timeout <= 0:
+            return
+        self._entries[key] = (time.monotonic() + timeout, value, size)
+        self.size += size
+        while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self.size -= evicted_size
+
+    def delete(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+
+class TieredCache:
+    """
+    Sous-ensemble de l'API des caches Django (get, get_many, set, set_many, add, delete,
+    delete_many, get_or_set) sur deux niveaux
+    """
+
+    def __init__(self, shared=None, **options):
+        config = {**get_tiered_cache_config(), **options}
+        self.shared = shared if shared is not None else caches[config['alias']]
+        self.config = config
+        self.local = LocalLRU(config['l1_max_entries'], config['l1_max_bytes'])
+        self.hits = self.misses = 0
+        self._lock = threading.RLock()
+        self._seen = None  # Dernière entrée du journal appliquée
+        self._synced_at = 0.0
+        self._sequence_key = f"{config['key_prefix']}:journal"
+
+    # Journal d'invalidation
+
+    def _journal_key(self, sequence):
+        return f'{self._sequence_key}:{sequence}'
+
+    def _publish(self, keys):
+        """Annoncer aux autres workers les clés écrites"""
+        try:
+            sequence = self.shared.incr(self._sequence_key)
+        except ValueError:
+            self.shared.add(self._sequence_key, 0, timeout=None)
+            sequence = self.shared.incr(self._sequence_key)
+        self.shared.set(self._journal_key(sequence), list(keys), self.config['journal_timeout'])
+
+    def sync(self, force=False):
+        """Appliquer les invalidations publiées depuis la dernière lecture du journal"""
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._synced_at < self.config['sync_interval']:
+                return
+            self._synced_at = now
+            latest = self.shared.get(self._sequence_key, 0)
+            if self._seen is None:
+                # Premier passage : les écritures faites avant n'ont pas de position dans le journal
+                self.local.clear()
+                self._seen = latest
+                return
+            if latest == self._seen:
+                return
+            if latest < self._seen or latest - self._seen > self.config['journal_max_lag']:
+                self.local.clear()
+            else:
+                sequences = range(self._seen + 1, latest + 1)
+                entries = self.shared.get_many([self._journal_key(sequence) for sequence in sequences])
+                if len(entries) < len(sequences):
+                    # Entrées expirées ou pas encore écrites : clés inconnues
+                    self.local.clear()
+                else:
+                    for keys in entries.values():
+                        for key in keys:
+                            self.local.delete(key)
+            self._seen = latest
+
+    # Lectures
+
+    def _l1_timeout(self, timeout):
+        if timeout is DEFAULT_TIMEOUT or timeout is None:
+            return self.config['l1_timeout']
+        return min(timeout, self.config['l1_timeout'])
+
+    def get(self, key, default=None):
+        self.sync()
+        with self._lock:
+            value = self.local.get(key)
+            seen = self._seen
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = self.shared.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        self._fill({key: value}, seen)
+        return value
+
+    def get_many(self, keys):
+        self.sync()
+        found, missing = {}, []
+        with self._lock:
+            seen = self._seen
+            for key in keys:
+                value = self.local.get(key)
+                if value is _MISSING:
+                    missing.append(key)
+                else:
+                    found[key] = value
+        self.hits += len(found)
+        self.misses += len(missing)
+        if missing:
+            shared = self.shared.get_many(missing)
+            self._fill(shared, seen)
+            found.update(shared)
+        return found
+
+    def _fill(self, values, seen):
+        """
+        Recopier au niveau 1 des valeurs lues au niveau 2
+        Abandonné si le journal a avancé pendant la lecture : une invalidation
+        appliquée entre-temps porterait peut-être sur ces clés
+        """
+        with self._lock:
+            if self._seen != seen:
+                return
+            for key, value in values.items():
+                self.local.set(key, value, self.config['l1_timeout'])
+
+    # Écritures
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, broadcast=True):
+        self.set_many({key: value}, timeout, broadcast)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, broadcast=True):
+        """broadcast=False : clés dont la valeur ne change jamais (clés versionnées), rien à invalider"""
+        if not data:
+            return
+        self.shared.set_many(data, timeout)
+        if broadcast:
+            self._publish(data)
+        with self._lock:
+            for key, value in data.items():
+                self.local.set(key, value, self._l1_timeout(timeout))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT):
+        """Écrire si la clé est absente du niveau 2 (les niveaux 1 n'ont pas cette clé à jour)"""
+        added = self.shared.add(key, value, timeout)
+        if added:
+            self._publish([key])
+        return added
+
+    def delete(self, key):
+        self.delete_many([key])
+
+    def delete_many(self, keys):
+        keys = list(keys)
+        if not keys:
+            return
+        self.shared.delete_many(keys)
+        self._publish(keys)
+        with self._lock:
+            for key in keys:
+                self.local.delete(key)
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = default() if callable(default) else default
+            self.set(key, value, timeout)
+        return value
+
+    def clear_local(self):
+        with self._lock:
+            self.local.clear()
+
+    def stats(self):
+        return {
+            'entries': len(self.local),
+            'bytes': self.local.size,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+_tiered_cache = None
+_tiered_cache_lock = threading.Lock()
+
+
+def get_tiered_cache():
+    """Cache à deux niveaux du processus (créé au premier appel)"""
+    global _tiered_cache
+    with _tiered_cache_lock:
+        if _tiered_cache is None:
+            _tiered_cache = TieredCache()
+        return _tiered_cache
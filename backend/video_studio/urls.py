@@ -40,9 +40,21 @@ def api_status(request):
             # API Recruteurs - NOUVEAU
             'recruiter_candidates': '/api/recruiter/candidates/',
             'recruiter_candidate_detail': '/api/recruiter/candidates/{candidate_id}/',
+            'recruiter_candidate_batch': '/api/recruiter/candidates/batch/?ids={id1},{id2}',
             'recruiter_video_log': '/api/recruiter/video-views/log/',
             'recruiter_dashboard': '/api/recruiter/dashboard/stats/',
             'recruiter_search': '/api/recruiter/recruiter/candidate_search/',
+            'saved_searches': '/api/recruiter/saved-searches/?recruiter={recruiter_id}',
+            'recruiter_search_suggestions': '/api/recruiter/recruiter/search_suggestions/?q={prefix}',
+            'recruiter_changes': '/api/recruiter/recruiter/changes/?cursor={cursor}',
+            'recruiter_autocomplete': '/api/recruiter/recruiter/autocomplete/?q={prefix}&field={field}',
+            'recruiter_feed': '/api/recruiter/recruiter/feed/?recruiter_id={recruiter_id}',
+            'recruiter_also_shortlisted': '/api/recruiter/recruiter/also_shortlisted/?recruiter_id={recruiter_id}',
+            'recruiter_similar': '/api/recruiter/recruiter/{candidate_id}/similar/',
+            
+            # API Matching
+            'job_postings': '/api/matching/jobs/',
+            'job_matches': '/api/matching/jobs/{job_id}/matches/',
             
             # API Notifications
             'notifications': '/api/notifications/notifications/',
@@ -78,6 +90,7 @@ urlpatterns = [
     path('api/candidate/', include('candidate.urls')),       # API Candidats  
     path('api/notifications/', include('notifications.urls')), # API Notifications
     path('api/recruiter/', include('recruiter.urls')),       # API Recruteurs - NOUVEAU
+    path('api/matching/', include('matching.urls')),         # API Matching offres-candidats
     
     # Endpoints de documentation (optionnels)
     # path('api/docs/', include('docs.urls')),
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from video_studio.fieldsets import SparseFieldsetMixin
 from .models import Video, QualityCheck, RecordingSession, VideoAnalytics
 
 
@@ -55,13 +56,16 @@ class VideoAnalyticsSerializer(serializers.ModelSerializer):
         ]
 
 
-class VideoListSerializer(serializers.ModelSerializer):
+class VideoListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer pour la liste des vidéos (version légère)"""
     user = UserSerializer(read_only=True)
     duration_formatted = serializers.ReadOnlyField(source='get_duration_formatted')
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     quality_checks_count = serializers.SerializerMethodField()
     
+    # Compté sur les tests préchargés
+    field_relations = {'quality_checks_count': 'quality_checks'}
+    
     class Meta:
         model = Video
         fields = [
@@ -75,7 +79,7 @@ class VideoListSerializer(serializers.ModelSerializer):
         return obj.quality_checks.count()
 
 
-class VideoDetailSerializer(serializers.ModelSerializer):
+class VideoDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer détaillé pour une vidéo (avec relations)"""
     user = UserSerializer(read_only=True)
     quality_checks = QualityCheckSerializer(many=True, read_only=True)
@@ -10,6 +10,8 @@ from django.utils.decorators import method_decorator
 from django.utils import timezone
 import json
 
+from video_studio.fieldsets import SparseFieldsetViewMixin
+from video_studio.response_cache import cached_response, video_scope
 from .models import Video, QualityCheck, RecordingSession, VideoAnalytics
 from .serializers import (
     VideoListSerializer, VideoDetailSerializer, VideoCreateSerializer,
@@ -19,10 +21,11 @@ from .serializers import (
 )
 
 
-class VideoViewSet(viewsets.ModelViewSet):
+class VideoViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet pour la gestion complète des vidéos
     Compatible avec le frontend React VideoStudio + intégration candidat
+    Lectures : ?fields= / ?include= (voir video_studio/fieldsets.py)
     """
     queryset = Video.objects.all()
     parser_classes = (MultiPartParser, FormParser, JSONParser)
@@ -43,9 +46,12 @@ class VideoViewSet(viewsets.ModelViewSet):
         user_id = self.request.query_params.get('user_id', None)
         if user_id is not None:
             queryset = queryset.filter(user_id=user_id)
-        return queryset.select_related('user').prefetch_related(
-            'quality_checks', 'recording_session', 'analytics'
-        )
+        # Relations chargées selon les champs que le serializer (élagué) lira
+        return self.eager_load(queryset)
+    
+    @method_decorator(cached_response('video_detail', lambda request, pk=None: [video_scope(pk)]))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
     
     def perform_create(self, serializer):
         """Associer la vidéo à l'utilisateur courant ou demo"""